@@ -8,7 +8,8 @@ from fastapi import APIRouter
 # user: 用户相关的API端点
 # match: 对局相关的API端点
 # analysis: 分析相关的API端点
-from app.api.v1.endpoints import chat, hero, user, match, analysis
+# equipment: 装备相关的API端点
+from app.api.v1.endpoints import chat, hero, user, match, analysis, equipment
 
 # ==================== v1版本API路由器初始化 ====================
 
@@ -47,3 +48,9 @@ api_router.include_router(match.router, prefix="/match", tags=["match"])
 # prefix="/analysis": 所有分析API的路径前缀为 /analysis
 # tags=["analysis"]: 在API文档中分组显示，标签为"analysis"
 api_router.include_router(analysis.router, prefix="/analysis", tags=["analysis"])
+
+# 注册装备相关的API端点
+# equipment.router: 装备模块的路由器
+# prefix="/equipment": 所有装备API的路径前缀为 /equipment
+# tags=["equipment"]: 在API文档中分组显示，标签为"equipment"
+api_router.include_router(equipment.router, prefix="/equipment", tags=["equipment"])
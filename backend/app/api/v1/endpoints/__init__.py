@@ -14,6 +14,7 @@ API端点包初始化模块
     - user: 用户API端点
     - match: 对局API端点
     - analysis: 分析API端点
+    - equipment: 装备API端点
 
 使用示例:
     from app.api.v1.endpoints import chat, hero, user, match, analysis
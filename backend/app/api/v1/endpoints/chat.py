@@ -2,19 +2,36 @@
 # APIRouter: 用于创建API路由
 # Depends: 用于依赖注入
 # HTTPException: 用于处理HTTP异常
-from fastapi import APIRouter, Depends, HTTPException
+# Query: 用于查询参数
+# WebSocket: WebSocket连接
+# WebSocketDisconnect: WebSocket断开异常
+# BackgroundTasks: 响应返回后执行的后台任务
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, BackgroundTasks
 
 # 导入Session类
 # Session: SQLAlchemy的数据库会话，用于与数据库交互
 from sqlalchemy.orm import Session
 
 # 导入类型提示
+# Any: 任意类型
 # List: 列表类型
-from typing import List
+# Optional: 可选类型（可以为None）
+from typing import Any, List, Optional
+
+# 导入异步IO模块和JSON模块（WebSocket消息处理）
+import asyncio
+import json
+
+# 导入aclosing，客户端断开时立即关闭流式回复
+from contextlib import aclosing
 
 # 导入数据库依赖
 # get_db: 获取数据库会话的依赖函数
-from app.core.database import get_db
+# SessionLocal: 会话工厂（WebSocket连接建立时读取用户设置）
+from app.core.database import get_db, SessionLocal
+
+# 导入日志记录器
+from app.core.logger import get_logger
 
 # 导入聊天服务
 # ChatService: 聊天服务，负责处理聊天逻辑
@@ -24,7 +41,34 @@ from app.services.chat_service import ChatService
 # ChatRequest: 聊天请求模型
 # ChatResponse: 聊天响应模型
 # MessageHistory: 消息历史模型
-from app.schemas.chat import ChatRequest, ChatResponse, MessageHistory
+# AnswerTicket: 回答凭据模型
+# HeroDialogueRequest: 英雄角色扮演请求模型
+# HeroDialogueResponse: 英雄角色扮演响应模型
+# ChatSearchResponse: 对话搜索响应模型
+from app.schemas.chat import (
+    ChatRequest, ChatResponse, MessageHistory, AnswerTicket,
+    HeroDialogueRequest, HeroDialogueResponse, ChatSearchResponse
+)
+
+# 导入回答凭据服务
+# answer_ticket_service: 管理后台补全的AI回答
+from app.services.answer_ticket_service import answer_ticket_service
+
+# 导入WebSocket会话和连接管理
+# ChatSession: 单个连接的会话状态
+# ChatConnection: 封装WebSocket，保证发送串行
+# chat_connection_manager: 在线连接管理器，用于服务端推送
+from app.services.chat_session_service import ChatSession, ChatConnection, chat_connection_manager
+
+# 导入用户服务，用于读取用户偏好设置
+from app.services.user_service import UserService
+
+# 导入数据清除服务
+# data_purge_service: 后台分批删除对话历史
+from app.services.data_purge_service import data_purge_service
+
+# 模块日志记录器
+logger = get_logger(__name__)
 
 # 创建API路由器
 router = APIRouter()
@@ -76,6 +120,260 @@ async def send_message(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _optional_id(value: Any) -> Optional[int]:
+    """
+    将客户端消息中的英雄ID、对局ID转换为整数
+
+    参数:
+        value: 消息中的值（整数、数字字符串或None）
+
+    返回:
+        Optional[int]: ID，没有提供时返回None
+
+    异常:
+        ValueError: 不是整数（如"abc"、对象、布尔值）
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        raise ValueError(value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value.strip())
+    raise ValueError(value)
+
+
+def _load_preferences(user_id: str):
+    """
+    读取用户偏好设置（WebSocket连接建立时调用一次）
+    
+    参数:
+        user_id: 用户ID
+    
+    返回:
+        UserPreferences: 用户偏好设置
+    """
+    db = SessionLocal()
+    try:
+        return UserService().get_preferences(user_id, db)
+    finally:
+        db.close()
+
+
+@router.websocket("/ws/{user_id}")
+async def chat_websocket(websocket: WebSocket, user_id: str):
+    """
+    WebSocket聊天通道
+    
+    参数:
+        websocket: WebSocket连接
+        user_id: 用户ID（路径参数）
+    
+    功能:
+        - 连接期间保持会话状态（用户设置、对话上下文、关注的英雄）
+        - 流式返回AI回复
+        - 接收服务端推送（如后台补全的回答）
+        - 用于游戏内悬浮窗（float_window_enabled）
+    
+    客户端消息:
+        - {"type": "message", "message": "...", "hero_id": 1}: 发送聊天消息
+        - {"type": "focus", "hero_id": 1, "match_id": "..."}: 切换关注的英雄/对局
+        - {"type": "reset"}: 清空会话上下文
+        - {"type": "reload_preferences"}: 重新读取用户设置
+        - {"type": "ping"}: 心跳
+    
+    服务端消息:
+        - ready/session: 会话状态
+        - start/token/end: 流式回复
+        - answer_upgrade: 后台补全的完整回答
+        - pong: 心跳响应
+        - error: 错误信息
+    
+    设计说明:
+        - 空闲连接只占用一个等待接收的协程，不持有数据库会话
+        - 用户设置只在连接建立时读取一次
+    
+    路径:
+        - /api/v1/chat/ws/{user_id}
+    """
+    # 接受连接
+    await websocket.accept()
+    
+    # 读取用户设置并建立会话
+    preferences = await asyncio.to_thread(_load_preferences, user_id)
+    session = ChatSession(user_id, preferences)
+    connection = ChatConnection(websocket, session)
+    
+    # 登记连接，用于服务端推送
+    chat_connection_manager.register(connection)
+    
+    try:
+        # 发送会话状态
+        await connection.send({"type": "ready", "session": session.describe()})
+        
+        while True:
+            # 等待客户端消息
+            raw = await websocket.receive_text()
+            
+            # 解析JSON消息
+            try:
+                data = json.loads(raw)
+            except ValueError:
+                await connection.send({"type": "error", "detail": "消息格式错误，需要JSON"})
+                continue
+            
+            # 消息必须是JSON对象（如[1]、"hi"也是合法的JSON）
+            if not isinstance(data, dict):
+                await connection.send({"type": "error", "detail": "消息格式错误，需要JSON对象"})
+                continue
+            
+            message_type = data.get("type", "message")
+            
+            if message_type == "message":
+                # 聊天消息
+                text = data.get("message")
+                text = text.strip() if isinstance(text, str) else ""
+                if not text:
+                    await connection.send({"type": "error", "detail": "消息内容不能为空"})
+                    continue
+                try:
+                    hero_id = _optional_id(data.get("hero_id"))
+                    match_id = _optional_id(data.get("match_id"))
+                except ValueError:
+                    await connection.send({"type": "error", "detail": "hero_id和match_id需要是整数"})
+                    continue
+                try:
+                    # 流式返回AI回复
+                    # aclosing: 客户端断开时立即关闭流式回复，不等待AI回复生成完
+                    async with aclosing(chat_service.stream_message(
+                        session, text, hero_id, match_id
+                    )) as events:
+                        async for event in events:
+                            await connection.send(event)
+                except WebSocketDisconnect:
+                    raise
+                except Exception as e:
+                    # 不把内部异常信息发给客户端
+                    logger.exception("WebSocket消息处理失败: %s", e)
+                    await connection.send({"type": "error", "detail": "消息处理失败，请稍后重试"})
+            elif message_type == "focus":
+                # 切换关注的英雄/对局（ID无效时不修改会话）
+                try:
+                    hero_id = _optional_id(data.get("hero_id"))
+                    match_id = _optional_id(data.get("match_id", session.match_id))
+                except ValueError:
+                    await connection.send({"type": "error", "detail": "hero_id和match_id需要是整数"})
+                    continue
+                session.hero_id = hero_id
+                session.match_id = match_id
+                await connection.send({"type": "session", "session": session.describe()})
+            elif message_type == "reset":
+                # 清空会话上下文
+                session.context.clear()
+                await connection.send({"type": "session", "session": session.describe()})
+            elif message_type == "reload_preferences":
+                # 重新读取用户设置
+                session.apply_preferences(await asyncio.to_thread(_load_preferences, user_id))
+                await connection.send({"type": "session", "session": session.describe()})
+            elif message_type == "ping":
+                # 心跳
+                await connection.send({"type": "pong"})
+            else:
+                await connection.send({"type": "error", "detail": f"未知的消息类型: {message_type}"})
+    except WebSocketDisconnect:
+        # 客户端断开连接
+        pass
+    finally:
+        # 移除连接
+        chat_connection_manager.unregister(connection)
+
+
+@router.get("/ticket/{ticket_id}", response_model=AnswerTicket)
+async def get_answer_ticket(
+    ticket_id: str,
+    wait: float = Query(0, ge=0, le=30)
+):
+    """
+    查询回答凭据
+    
+    参数:
+        ticket_id: 回答凭据ID（路径参数，来自/chat/send的ticket_id）
+        wait: 最长等待秒数（查询参数，默认0立即返回，最大30）
+    
+    返回:
+        AnswerTicket: 凭据状态，完成后包含完整的AI回答
+    
+    功能:
+        - 查询后台生成中的完整AI回答
+        - 支持长轮询：wait>0时等待回答完成或超时后再返回
+    
+    业务逻辑:
+        1. 调用凭据服务查询（或等待）凭据
+        2. 如果凭据不存在或已过期，返回404错误
+        3. 返回凭据状态
+    
+    HTTP方法:
+        - GET: 用于获取数据
+    
+    路径:
+        - /api/v1/chat/ticket/{ticket_id}
+    """
+    # 查询凭据，wait>0时等待完成
+    ticket = await answer_ticket_service.wait(ticket_id, wait)
+    
+    # 如果凭据不存在或已过期，返回404错误
+    if not ticket:
+        raise HTTPException(status_code=404, detail="回答凭据不存在或已过期")
+    
+    return ticket
+
+
+@router.post("/hero-dialogue", response_model=HeroDialogueResponse)
+async def hero_dialogue(request: HeroDialogueRequest):
+    """
+    英雄角色扮演对话
+    
+    参数:
+        request: 英雄角色扮演请求，包含英雄名称和用户消息
+    
+    返回:
+        HeroDialogueResponse: 英雄的角色扮演回复
+    
+    功能:
+        - 以英雄的身份和语言风格回答用户
+        - 打招呼等常见问题直接从预生成的回复池返回
+        - 重复的问题直接返回缓存的回复
+    
+    业务逻辑:
+        1. 调用AI服务生成英雄对话
+        2. 如果英雄不存在，返回404错误
+        3. 返回英雄回复
+        4. 如果发生其他异常，返回500错误
+    
+    HTTP方法:
+        - POST: 用于发送数据
+    
+    路径:
+        - /api/v1/chat/hero-dialogue
+    """
+    try:
+        # 调用AI服务生成英雄对话
+        reply = await chat_service.ai_service.generate_hero_dialogue(request.hero_name, request.message)
+        
+        # 如果英雄不存在，返回404错误
+        if reply is None:
+            raise HTTPException(status_code=404, detail="英雄不存在")
+        
+        return HeroDialogueResponse(hero_name=request.hero_name, response=reply)
+    except HTTPException:
+        # 如果是HTTP异常，直接抛出
+        raise
+    except Exception as e:
+        # 如果发生异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/history/{user_id}", response_model=List[MessageHistory])
 async def get_chat_history(
     user_id: str,
@@ -118,9 +416,57 @@ async def get_chat_history(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/search/{user_id}", response_model=ChatSearchResponse)
+async def search_chat_history(
+    user_id: str,
+    q: str = Query(..., min_length=1, max_length=100),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    搜索聊天历史
+    
+    参数:
+        user_id: 用户ID（路径参数）
+        q: 搜索词（查询参数，多个关键词用空格分隔）
+        page: 页码（查询参数，默认1）
+        page_size: 每页数量（查询参数，默认20，最大100）
+        db: 数据库会话对象（通过依赖注入自动获取）
+    
+    返回:
+        ChatSearchResponse: 匹配总数和当前页的对话记录
+    
+    功能:
+        - 在用户消息和AI回复中搜索包含所有关键词的对话
+        - 按相关度排序，分页返回
+    
+    业务逻辑:
+        1. 调用聊天服务搜索对话历史
+        2. 返回搜索结果
+        3. 搜索词中没有两个字以上的关键词返回400，其他异常返回500错误
+    
+    HTTP方法:
+        - GET: 用于获取数据
+    
+    路径:
+        - /api/v1/chat/search/{user_id}
+    """
+    try:
+        # 调用聊天服务搜索对话历史
+        return await chat_service.search_history(user_id, q, page, page_size, db)
+    except ValueError as e:
+        # 单字关键词无法检索
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        # 如果发生异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/history/{user_id}")
 async def clear_chat_history(
     user_id: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -131,16 +477,17 @@ async def clear_chat_history(
         db: 数据库会话对象（通过依赖注入自动获取）
     
     返回:
-        dict: 操作结果消息
+        dict: 操作结果消息和删除任务ID
     
     功能:
         - 删除用户的所有对话记录
         - 用于用户清理对话历史
     
     业务逻辑:
-        1. 调用聊天服务清除历史记录
-        2. 返回成功消息
-        3. 如果发生异常，返回500错误
+        1. 调用聊天服务创建删除任务（对话立即对用户不可见）
+        2. 在后台分批删除对话
+        3. 立即返回任务ID，可通过 /user/data/purge/{job_id} 查询进度
+        4. 如果发生异常，返回500错误
     
     HTTP方法:
         - DELETE: 用于删除数据
@@ -152,10 +499,12 @@ async def clear_chat_history(
         - 此操作不可逆，请谨慎使用
     """
     try:
-        # 调用聊天服务清除历史记录
-        await chat_service.clear_history(user_id, db)
-        # 返回成功消息
-        return {"message": "对话历史已清除"}
+        # 调用聊天服务创建删除任务
+        job_id = await chat_service.clear_history(user_id, db)
+        # 响应返回后在后台分批删除
+        background_tasks.add_task(data_purge_service.run, job_id)
+        # 返回任务ID
+        return {"message": "对话历史正在清除", "job_id": job_id}
     except Exception as e:
         # 如果发生异常，返回500错误
         raise HTTPException(status_code=500, detail=str(e))
@@ -181,6 +530,7 @@ async def get_intents():
         - match_analysis: 复盘分析
         - monster_timer: 野怪计时
         - entertainment: 娱乐问答
+        - tier_list: 版本强势
     
     快捷命令:
         - 我的常用英雄出装
@@ -203,7 +553,8 @@ async def get_intents():
             {"id": "bp_suggestion", "name": "BP建议", "description": "获取阵容BP建议"},
             {"id": "match_analysis", "name": "复盘分析", "description": "对局复盘分析"},
             {"id": "monster_timer", "name": "野怪计时", "description": "野怪计时提醒"},
-            {"id": "entertainment", "name": "娱乐问答", "description": "趣味问答"}
+            {"id": "entertainment", "name": "娱乐问答", "description": "趣味问答"},
+            {"id": "tier_list", "name": "版本强势", "description": "查询当前版本强势英雄"}
         ],
         # 快捷命令列表
         "quick_commands": [
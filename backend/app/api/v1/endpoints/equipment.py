@@ -0,0 +1,288 @@
+# 导入FastAPI相关模块
+# APIRouter: 用于创建API路由
+# Depends: 用于依赖注入
+# HTTPException: 用于处理HTTP异常
+# Query: 用于查询参数
+# Request: 请求对象，用于读取If-None-Match请求头
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+# 导入Session类
+# Session: SQLAlchemy的数据库会话，用于与数据库交互
+from sqlalchemy.orm import Session
+
+# 导入类型提示
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+from typing import List, Optional
+
+# 导入数据库依赖
+# get_db: 获取数据库会话的依赖函数
+from app.core.database import get_db
+
+# 导入配置设置
+from app.core.config import settings
+
+# 导入预编码响应缓存
+# ResponseCache: 缓存编码后的JSON字节，支持ETag和304
+from app.core.response_cache import ResponseCache
+
+# 导入装备目录
+# equipment_catalog: 内存中的装备数据快照，按名称、类型和价格建立索引
+from app.services.equipment_catalog import equipment_catalog
+
+# 导入装备合成图服务
+# equipment_graph_service: 内存中的装备合成图，查询合成树和升级路线
+from app.services.equipment_graph import equipment_graph_service
+
+# 导入金币预算出装优化器
+from app.services.build_optimizer import build_optimizer
+
+# 导入装备相关的Schema
+# EquipmentSummary: 装备列表项模型
+# EquipmentDetail: 装备详情模型
+# EquipmentSearchResult: 装备搜索结果模型
+# EquipmentTreeNode: 装备合成树节点模型
+# UpgradePlanRequest: 升级路线请求模型
+# UpgradePlan: 升级路线响应模型
+# BuildOptimizeRequest: 金币预算出装优化请求模型
+# BuildOptimization: 金币预算出装优化响应模型
+from app.schemas.equipment import (
+    EquipmentSummary, EquipmentDetail, EquipmentSearchResult, EquipmentTreeNode, UpgradePlanRequest, UpgradePlan, BuildOptimizeRequest, BuildOptimization
+)
+
+# 创建API路由器
+router = APIRouter()
+
+# 创建预编码响应缓存
+# 以装备目录的版本号作为数据版本，装备数据重新加载后自动失效
+response_cache = ResponseCache(max_age=settings.EQUIPMENT_RESPONSE_MAX_AGE)
+
+
+@router.get("/list", response_model=List[EquipmentSummary])
+async def get_equipment_list(
+    request: Request,
+    type: Optional[str] = None,
+    min_price: Optional[int] = Query(None, ge=0),
+    max_price: Optional[int] = Query(None, ge=0),
+    db: Session = Depends(get_db)
+):
+    """
+    获取装备列表
+
+    参数:
+        type: 装备类型（查询参数，可选），如"攻击装备"
+        min_price: 最低价格（查询参数，可选，包含）
+        max_price: 最高价格（查询参数，可选，包含）
+        db: 数据库会话对象（通过依赖注入自动获取）
+
+    返回:
+        List[EquipmentSummary]: 装备列表（按价格升序）
+
+    功能:
+        - 按类型和价格区间筛选装备
+        - 响应预先编码并缓存（带ETag，If-None-Match一致时返回304）
+
+    路径:
+        - /api/v1/equipment/list
+    """
+    try:
+        catalog = equipment_catalog.get(db)
+        items = response_cache.get(
+            ("list", type, min_price, max_price), catalog.version,
+            lambda: catalog.list_equipment(type, min_price, max_price)
+        )
+        return response_cache.respond(request, items)
+    except Exception as e:
+        # 如果发生异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/types")
+async def get_equipment_types(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    获取装备类型列表
+
+    返回:
+        dict: 装备类型列表
+
+    路径:
+        - /api/v1/equipment/types
+    """
+    try:
+        catalog = equipment_catalog.get(db)
+        types = response_cache.get(("types",), catalog.version, lambda: {"types": list(catalog.types)})
+        return response_cache.respond(request, types)
+    except Exception as e:
+        # 如果发生异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/search", response_model=List[EquipmentSearchResult])
+async def search_equipment(
+    request: Request,
+    q: str = Query(..., min_length=1, description="搜索词（汉字、全拼或首字母）"),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """
+    搜索装备
+
+    参数:
+        q: 搜索词（查询参数），如"无尽"、"wujin"、"wjzr"
+        limit: 返回数量（查询参数，默认10）
+        db: 数据库会话对象（通过依赖注入自动获取）
+
+    返回:
+        List[EquipmentSearchResult]: 按相关度排序的装备
+
+    路径:
+        - /api/v1/equipment/search
+    """
+    try:
+        catalog = equipment_catalog.get(db)
+        results = response_cache.get(
+            ("search", q, limit), catalog.version,
+            lambda: catalog.search(q, limit)
+        )
+        return response_cache.respond(request, results)
+    except Exception as e:
+        # 如果发生异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/plan", response_model=UpgradePlan)
+async def get_upgrade_plan(
+    request: UpgradePlanRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    计算出装升级路线
+
+    参数:
+        request: 目标出装、已有装备和当前金币（请求体）
+        db: 数据库会话对象（通过依赖注入自动获取）
+
+    返回:
+        UpgradePlan: 按顺序的购买步骤、剩余金币和完成出装还需要的金币
+
+    功能:
+        - 已有装备按配件抵扣，计算最便宜的合成路线
+        - 金币不够买下目标装备时，推荐买得起的配件
+
+    HTTP方法:
+        - POST: 请求体包含目标出装和已有装备
+
+    路径:
+        - /api/v1/equipment/plan
+    """
+    try:
+        graph = equipment_graph_service.get(db)
+        return graph.plan(request.targets, request.inventory, request.gold)
+    except Exception as e:
+        # 如果发生异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/optimize", response_model=BuildOptimization)
+async def optimize_build(
+    request: BuildOptimizeRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    在金币预算内优化出装的购买方案
+
+    参数:
+        request: 目标出装和金币预算（请求体）
+        db: 数据库会话对象（通过依赖注入自动获取）
+
+    返回:
+        BuildOptimization: 推荐购买的装备和配件（按每金币属性价值排序）及获得的属性
+
+    功能:
+        - 在目标装备的合成树中选择整件装备或部分配件，使预算内获得的属性价值最大
+
+    路径:
+        - /api/v1/equipment/optimize
+    """
+    try:
+        graph = equipment_graph_service.get(db)
+        return build_optimizer.optimize(graph, request.targets, request.gold)
+    except Exception as e:
+        # 如果发生异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{equipment_id}", response_model=EquipmentDetail)
+async def get_equipment_detail(
+    equipment_id: int,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    获取装备详情
+
+    参数:
+        equipment_id: 装备ID（路径参数）
+        db: 数据库会话对象（通过依赖注入自动获取）
+
+    返回:
+        EquipmentDetail: 装备详情，包含属性、技能描述和合成关系
+
+    路径:
+        - /api/v1/equipment/{equipment_id}
+    """
+    try:
+        catalog = equipment_catalog.get(db)
+        detail = response_cache.get(
+            ("detail", equipment_id), catalog.version,
+            lambda: catalog.details.get(equipment_id)
+        )
+
+        # 如果装备不存在，返回404错误
+        if detail is None:
+            raise HTTPException(status_code=404, detail="装备不存在")
+
+        return response_cache.respond(request, detail)
+    except HTTPException:
+        # 如果是HTTP异常，直接抛出
+        raise
+    except Exception as e:
+        # 如果发生其他异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{equipment_id}/tree", response_model=EquipmentTreeNode)
+async def get_equipment_tree(
+    equipment_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    获取装备的合成树
+
+    参数:
+        equipment_id: 装备ID（路径参数）
+        db: 数据库会话对象（通过依赖注入自动获取）
+
+    返回:
+        EquipmentTreeNode: 完整的合成树，包含每一层的合成费用和总花费
+
+    路径:
+        - /api/v1/equipment/{equipment_id}/tree
+    """
+    try:
+        tree = equipment_graph_service.get(db).tree(equipment_id)
+
+        # 如果装备不存在，返回404错误
+        if tree is None:
+            raise HTTPException(status_code=404, detail="装备不存在")
+
+        return tree
+    except HTTPException:
+        # 如果是HTTP异常，直接抛出
+        raise
+    except Exception as e:
+        # 如果发生其他异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
@@ -3,7 +3,11 @@
 # Depends: 用于依赖注入
 # HTTPException: 用于处理HTTP异常
 # Query: 用于查询参数
-from fastapi import APIRouter, Depends, HTTPException, Query
+# Request: 请求对象，用于读取If-None-Match请求头
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+# 导入JSON响应类，用于返回部分字段的英雄列表并附带分页游标
+from fastapi.responses import JSONResponse
 
 # 导入Session类
 # Session: SQLAlchemy的数据库会话，用于与数据库交互
@@ -18,15 +22,56 @@ from typing import List, Optional
 # get_db: 获取数据库会话的依赖函数
 from app.core.database import get_db
 
+# 导入配置设置
+from app.core.config import settings
+
+# 导入预编码响应缓存
+# ResponseCache: 缓存编码后的JSON字节，支持ETag和304
+from app.core.response_cache import ResponseCache
+
 # 导入英雄服务
 # HeroService: 英雄服务，负责处理英雄相关逻辑
 from app.services.hero_service import HeroService
 
+# 导入选人会话服务
+# draft_session_service: 管理BP阶段逐步提交的选人会话
+from app.services.draft_session_service import draft_session_service
+
+# 导入英雄目录，用其版本号作为响应缓存的数据版本
+from app.services.hero_catalog import hero_catalog
+
+# 导入英雄对局统计服务，对局统计的版本号也是响应缓存数据版本的一部分
+from app.services.hero_stats_service import hero_stats_service, ALL_RANKS
+
+# 导入版本强势英雄榜服务
+# tier_list_service: 按对局数据预先计算的强势英雄榜
+from app.services.tier_list_service import tier_list_service
+
+# 导入装备相关的Schema
+# UpgradePlan: 升级路线响应模型
+# BuildOptimization: 金币预算出装优化响应模型
+from app.schemas.equipment import UpgradePlan, BuildOptimization
+
 # 导入英雄相关的Schema
 # HeroResponse: 英雄响应模型
 # HeroDetailResponse: 英雄详情响应模型
 # EquipmentResponse: 装备响应模型
-from app.schemas.hero import HeroResponse, HeroDetailResponse, EquipmentResponse
+# DraftRequest: 选人推荐请求模型
+# DraftSuggestion: 选人推荐响应模型
+# DraftEvent: 选人事件模型
+# DraftSessionResponse: 选人会话响应模型
+# HeroSearchResult: 英雄搜索结果模型
+# HeroMatchStatsResponse: 英雄对局统计模型
+# TierListResponse: 版本强势英雄榜模型
+# HeroRelationsResponse: 英雄克制关系模型
+# CommonCountersResponse: 共同克制者模型
+# CounterPickRequest: 克制阵容推荐请求模型
+# CounterPickResponse: 克制阵容推荐响应模型
+from app.schemas.hero import (
+    HeroResponse, HeroDetailResponse, EquipmentResponse,
+    DraftRequest, DraftSuggestion, DraftEvent, DraftSessionResponse, HeroSearchResult, HeroMatchStatsResponse,
+    TierListResponse, HeroRelationsResponse, CommonCountersResponse, CounterPickRequest, CounterPickResponse
+)
 
 # 创建API路由器
 router = APIRouter()
@@ -34,12 +79,52 @@ router = APIRouter()
 # 创建英雄服务实例
 hero_service = HeroService()
 
+# 创建响应缓存实例
+# 缓存英雄详情、出装、铭文和分类接口编码后的响应，英雄数据或对局统计的胜率、选用率变化后清除受影响的响应
+response_cache = ResponseCache(max_age=settings.HERO_RESPONSE_MAX_AGE)
+
+# 版本强势英雄榜的响应缓存，以榜单版本号作为数据版本，重新计算后失效
+tier_list_cache = ResponseCache(max_age=settings.HERO_RESPONSE_MAX_AGE)
+
+
+# 按英雄缓存的响应（缓存键的第二项为英雄ID）
+PER_HERO_RESPONSES = ("detail", "equipment", "inscription")
+
+
+def _data_version() -> Optional[tuple]:
+    """
+    获取英雄数据版本（英雄目录和对局统计的版本号，英雄目录未加载时为None，此时不缓存响应）
+
+    英雄目录只更新了部分英雄时（英雄数据版本切换），只清除这些英雄的响应和分类响应；
+    对局统计只改变了部分英雄的胜率、选用率时，只清除这些英雄的详情和列表类响应
+    """
+    snapshot = hero_catalog.snapshot()
+    if snapshot is None:
+        return None
+    stats_version, stats_base, stats_changed = hero_stats_service.last_change()
+    version = (snapshot.version, stats_version)
+    if snapshot.base_version is not None:
+        response_cache.rebase(
+            (snapshot.base_version, stats_version), version,
+            lambda key: key[0] not in PER_HERO_RESPONSES or key[1] in snapshot.changed
+        )
+    if stats_base is not None:
+        changed = {snapshot.by_name[name].id for name in stats_changed if name in snapshot.by_name}
+        response_cache.rebase(
+            (snapshot.version, stats_base), version,
+            lambda key: key[0] not in PER_HERO_RESPONSES or (key[0] == "detail" and key[1] in changed)
+        )
+    return version
+
 
 @router.get("/list", response_model=List[HeroResponse])
 async def get_hero_list(
     position: Optional[str] = None,
     difficulty: Optional[str] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    fields: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
@@ -49,21 +134,26 @@ async def get_hero_list(
         position: 英雄位置过滤（查询参数，可选）
         difficulty: 难度过滤（查询参数，可选）
         search: 搜索关键词（查询参数，可选）
+        cursor: 分页游标（查询参数，可选），取上一页响应头X-Next-Cursor的值
+        limit: 每页数量（查询参数，可选，最大100），不指定时返回全部英雄
+        fields: 需要返回的字段（查询参数，可选），逗号分隔，如"id,name,image_url"
         db: 数据库会话对象（通过依赖注入自动获取）
     
     返回:
-        List[HeroResponse]: 英雄列表
+        List[HeroResponse]: 英雄列表（指定fields时只包含这些字段）
     
     功能:
         - 查询英雄列表
         - 支持按位置过滤
         - 支持按难度过滤
         - 支持关键词搜索
+        - 支持游标分页和部分字段
     
     业务逻辑:
-        1. 调用英雄服务获取英雄列表
-        2. 返回英雄列表
-        3. 如果发生异常，返回500错误
+        1. 没有分页和字段参数时，返回完整列表（与之前的行为一致）
+        2. 否则分页获取，下一页游标通过响应头X-Next-Cursor返回（没有下一页时不返回）
+        3. 字段名称或游标无效时返回400错误
+        4. 如果发生异常，返回500错误
     
     HTTP方法:
         - GET: 用于获取数据
@@ -72,17 +162,160 @@ async def get_hero_list(
         - /api/v1/hero/list
     """
     try:
-        # 调用英雄服务获取英雄列表
-        heroes = hero_service.get_hero_list(position, difficulty, search, db)
-        return heroes
+        # 没有分页和字段参数，返回完整列表
+        if cursor is None and limit is None and fields is None:
+            return hero_service.get_hero_list(position, difficulty, search, db)
+        
+        # 分页获取
+        field_list = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+        heroes, next_cursor = hero_service.get_hero_page(
+            position, difficulty, search, cursor, limit, field_list, db
+        )
+        
+        # 下一页游标放在响应头中，响应体仍然是英雄数组
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return JSONResponse(content=heroes, headers=headers)
+    except ValueError as e:
+        # 字段名称或游标无效
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        # 如果发生异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/search", response_model=List[HeroSearchResult])
+async def search_heroes(
+    q: str = Query(..., min_length=1, description="搜索词（汉字、全拼或首字母）"),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """
+    搜索英雄（输入提示）
+    
+    参数:
+        q: 搜索词（查询参数），如"鲁班"、"luban"、"lbqh"、"火球"
+        limit: 返回数量（查询参数，默认10）
+        db: 数据库会话对象（通过依赖注入自动获取）
+    
+    返回:
+        List[HeroSearchResult]: 按相关度排序的英雄，包含匹配的字段和原文
+    
+    功能:
+        - 匹配名称、别名、称号、技能名称和描述
+        - 支持拼音全拼和首字母，支持前缀匹配和中间匹配
+        - 使用内存索引，适合输入时实时请求
+    
+    路径:
+        - /api/v1/hero/search
+    """
+    try:
+        return hero_service.search_heroes(q, limit, db)
     except Exception as e:
         # 如果发生异常，返回500错误
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/tier-list", response_model=TierListResponse)
+async def get_tier_list(
+    request: Request,
+    rank: str = Query(ALL_RANKS, description="段位大类，如\"钻石\"，默认全部段位"),
+    position: str = Query("", description="位置，如archer，默认全部位置"),
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """
+    获取版本强势英雄榜
+    
+    参数:
+        rank: 段位大类（查询参数，默认"全部"）
+        position: 位置（查询参数，默认全部位置）
+        limit: 返回的英雄数量（查询参数，默认全部）
+        db: 数据库会话对象（通过依赖注入自动获取）
+    
+    返回:
+        TierListResponse: 按综合评分降序的英雄及其梯队、平滑后的胜率、选用率和禁用率
+    
+    功能:
+        - 返回预先计算的榜单，不在请求时计算
+        - 该段位、位置还没有榜单而对局数据已有变化时，先重新计算一次
+        - 响应预先编码并缓存（带ETag，If-None-Match一致时返回304）
+        - 榜单尚未计算（英雄数据加载失败）时返回503
+    
+    路径:
+        - /api/v1/hero/tier-list
+    """
+    try:
+        snapshot = tier_list_service.get(db, rank, position)
+        
+        # 如果榜单尚未计算，返回503错误
+        if snapshot is None:
+            raise HTTPException(status_code=503, detail="版本强势英雄榜尚未生成，请稍后再试")
+        
+        tier_list = tier_list_cache.get(
+            (rank, position, limit), snapshot.version,
+            lambda: _truncate(snapshot.get(rank, position), limit)
+        )
+        
+        # 如果该段位、位置没有榜单，返回404错误
+        if tier_list is None:
+            raise HTTPException(status_code=404, detail="没有该段位或位置的榜单")
+        
+        return tier_list_cache.respond(request, tier_list)
+    except HTTPException:
+        # 如果是HTTP异常，直接抛出
+        raise
+    except Exception as e:
+        # 如果发生其他异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _truncate(tier_list: Optional[TierListResponse], limit: Optional[int]) -> Optional[TierListResponse]:
+    """
+    截取榜单的前limit个英雄
+    """
+    if tier_list is None or limit is None:
+        return tier_list
+    return tier_list.model_copy(update={"heroes": tier_list.heroes[:limit]})
+
+
+@router.get("/counters", response_model=CommonCountersResponse)
+async def get_common_counters(
+    heroes: str = Query(..., min_length=1, description="英雄名称，逗号分隔，如\"亚瑟,妲己\""),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """
+    查询同时克制所有指定英雄的英雄
+    
+    参数:
+        heroes: 英雄名称，逗号分隔（查询参数）
+        limit: 返回数量（查询参数，默认10）
+        db: 数据库会话对象（通过依赖注入自动获取）
+    
+    返回:
+        CommonCountersResponse: 共同克制者（按克制权重之和降序），以及英雄表中没有的名称
+    
+    功能:
+        - 使用按英雄ID建立的克制关系邻接索引求交集，索引未加载时在数据库中按索引查询
+    
+    路径:
+        - /api/v1/hero/counters
+    """
+    try:
+        names = [name.strip() for name in heroes.split(",") if name.strip()]
+        return hero_service.get_common_counters(names, limit, db)
+    except ValueError as e:
+        # 如果没有已知的英雄，返回400错误
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        # 如果发生其他异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{hero_id}", response_model=HeroDetailResponse)
 async def get_hero_detail(
     hero_id: int,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
@@ -100,9 +333,9 @@ async def get_hero_detail(
         - 包含技能、克制关系等信息
     
     业务逻辑:
-        1. 调用英雄服务获取英雄详情
+        1. 从响应缓存获取编码后的英雄详情（未缓存时调用英雄服务获取）
         2. 如果英雄不存在，返回404错误
-        3. 如果英雄存在，返回英雄详情
+        3. 如果英雄存在，返回英雄详情（带ETag，If-None-Match一致时返回304）
         4. 如果发生异常，返回500错误
     
     HTTP方法:
@@ -112,14 +345,17 @@ async def get_hero_detail(
         - /api/v1/hero/{hero_id}
     """
     try:
-        # 调用英雄服务获取英雄详情
-        hero = hero_service.get_hero_detail(hero_id, db)
+        # 从响应缓存获取英雄详情
+        hero = response_cache.get(
+            ("detail", hero_id), _data_version(),
+            lambda: hero_service.get_hero_detail(hero_id, db)
+        )
         
         # 如果英雄不存在，返回404错误
         if not hero:
             raise HTTPException(status_code=404, detail="英雄不存在")
         
-        return hero
+        return response_cache.respond(request, hero)
     except HTTPException:
         # 如果是HTTP异常，直接抛出
         raise
@@ -131,7 +367,9 @@ async def get_hero_detail(
 @router.get("/{hero_id}/equipment", response_model=List[EquipmentResponse])
 async def get_hero_equipment(
     hero_id: int,
+    request: Request,
     rank: Optional[str] = "全部",
+    position: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
@@ -140,19 +378,20 @@ async def get_hero_equipment(
     参数:
         hero_id: 英雄ID（路径参数）
         rank: 段位（查询参数，默认"全部"）
+        position: 位置（查询参数，可选，不传表示全部位置）
         db: 数据库会话对象（通过依赖注入自动获取）
     
     返回:
-        List[EquipmentResponse]: 装备推荐列表
+        List[EquipmentResponse]: 装备推荐列表（按胜率、选用率降序）
     
     功能:
         - 查询英雄的装备推荐
-        - 支持按段位过滤
+        - 支持按段位、位置过滤
         - 提供不同位置的出装建议
     
     业务逻辑:
-        1. 调用英雄服务获取装备推荐
-        2. 返回装备推荐列表
+        1. 从响应缓存获取编码后的装备推荐（未缓存时调用英雄服务获取）
+        2. 返回装备推荐列表（带ETag，If-None-Match一致时返回304）
         3. 如果发生异常，返回500错误
     
     HTTP方法:
@@ -162,9 +401,12 @@ async def get_hero_equipment(
         - /api/v1/hero/{hero_id}/equipment
     """
     try:
-        # 调用英雄服务获取装备推荐
-        equipment = hero_service.get_hero_equipment(hero_id, rank, db)
-        return equipment
+        # 从响应缓存获取装备推荐
+        equipment = response_cache.get(
+            ("equipment", hero_id, rank, position), _data_version(),
+            lambda: hero_service.get_hero_equipment(hero_id, rank, db, position)
+        )
+        return response_cache.respond(request, equipment)
     except Exception as e:
         # 如果发生异常，返回500错误
         raise HTTPException(status_code=500, detail=str(e))
@@ -173,6 +415,7 @@ async def get_hero_equipment(
 @router.get("/{hero_id}/inscription")
 async def get_hero_inscription(
     hero_id: int,
+    request: Request,
     rank: Optional[str] = "全部",
     db: Session = Depends(get_db)
 ):
@@ -193,8 +436,8 @@ async def get_hero_inscription(
         - 返回铭文配置和描述
     
     业务逻辑:
-        1. 调用英雄服务获取铭文推荐
-        2. 返回铭文推荐数据
+        1. 从响应缓存获取编码后的铭文推荐（未缓存时调用英雄服务获取）
+        2. 返回铭文推荐数据（带ETag，If-None-Match一致时返回304）
         3. 如果发生异常，返回500错误
     
     HTTP方法:
@@ -204,14 +447,178 @@ async def get_hero_inscription(
         - /api/v1/hero/{hero_id}/inscription
     """
     try:
-        # 调用英雄服务获取铭文推荐
-        inscription = hero_service.get_hero_inscription(hero_id, rank, db)
-        return inscription
+        # 从响应缓存获取铭文推荐
+        inscription = response_cache.get(
+            ("inscription", hero_id, rank), _data_version(),
+            lambda: hero_service.get_hero_inscription(hero_id, rank, db)
+        )
+        return response_cache.respond(request, inscription)
     except Exception as e:
         # 如果发生异常，返回500错误
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{hero_id}/stats", response_model=HeroMatchStatsResponse)
+async def get_hero_stats(
+    hero_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    获取英雄的对局统计
+    
+    参数:
+        hero_id: 英雄ID（路径参数）
+        db: 数据库会话对象（通过依赖注入自动获取）
+    
+    返回:
+        HeroMatchStatsResponse: 由对局数据汇总的对局数、胜率、选用率和场均数据（汇总和按段位、位置细分）
+    
+    功能:
+        - 导入、删除对局后实时更新，不需要重新扫描对局表
+        - live为true时，英雄列表、详情和BP建议使用对局统计的胜率和选用率
+    
+    路径:
+        - /api/v1/hero/{hero_id}/stats
+    """
+    try:
+        stats = hero_service.get_hero_stats(hero_id, db)
+        
+        # 如果英雄不存在，返回404错误
+        if stats is None:
+            raise HTTPException(status_code=404, detail="英雄不存在")
+        
+        return stats
+    except HTTPException:
+        # 如果是HTTP异常，直接抛出
+        raise
+    except Exception as e:
+        # 如果发生其他异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{hero_id}/relations", response_model=HeroRelationsResponse)
+async def get_hero_relations(
+    hero_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    获取英雄的克制关系
+    
+    参数:
+        hero_id: 英雄ID（路径参数）
+        db: 数据库会话对象（通过依赖注入自动获取）
+    
+    返回:
+        HeroRelationsResponse: 被该英雄克制的英雄和克制该英雄的英雄（按权重降序）
+    
+    功能:
+        - 两个方向来自同一组克制关系，始终一致
+        - 两边英雄数据都记录的克制关系权重为1，只有一边记录的为0.5
+    
+    路径:
+        - /api/v1/hero/{hero_id}/relations
+    """
+    try:
+        relations = hero_service.get_hero_relations(hero_id, db)
+        
+        # 如果英雄不存在，返回404错误
+        if relations is None:
+            raise HTTPException(status_code=404, detail="英雄不存在")
+        
+        return relations
+    except HTTPException:
+        # 如果是HTTP异常，直接抛出
+        raise
+    except Exception as e:
+        # 如果发生其他异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{hero_id}/build-plan", response_model=UpgradePlan)
+async def get_hero_build_plan(
+    hero_id: int,
+    gold: Optional[int] = Query(None, ge=0),
+    inventory: List[str] = Query(default=[]),
+    position: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    获取英雄的出装升级路线（下一步买什么）
+    
+    参数:
+        hero_id: 英雄ID（路径参数）
+        gold: 当前金币（查询参数，可选，不传表示不限金币）
+        inventory: 已有装备（查询参数，可以重复，如inventory=铁剑&inventory=匕首）
+        position: 位置（查询参数，可选）
+        db: 数据库会话对象（通过依赖注入自动获取）
+    
+    返回:
+        UpgradePlan: 按顺序的购买步骤、剩余金币和完成出装还需要的金币
+    
+    功能:
+        - 以英雄的推荐出装为目标，已有装备按配件抵扣
+        - 回答"我有1500金币下一步买什么"
+    
+    路径:
+        - /api/v1/hero/{hero_id}/build-plan
+    """
+    try:
+        plan = hero_service.get_build_plan(hero_id, gold, inventory, position, db)
+        
+        # 如果英雄不存在，返回404错误
+        if plan is None:
+            raise HTTPException(status_code=404, detail="英雄不存在")
+        
+        return plan
+    except HTTPException:
+        # 如果是HTTP异常，直接抛出
+        raise
+    except Exception as e:
+        # 如果发生其他异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{hero_id}/build-optimizer", response_model=BuildOptimization)
+async def optimize_hero_build(
+    hero_id: int,
+    gold: int = Query(..., ge=0, le=30000),
+    position: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    在金币预算内优化英雄推荐出装的购买方案
+    
+    参数:
+        hero_id: 英雄ID（路径参数）
+        gold: 金币预算（查询参数）
+        position: 位置（查询参数，可选）
+        db: 数据库会话对象（通过依赖注入自动获取）
+    
+    返回:
+        BuildOptimization: 推荐购买的装备和配件（按每金币属性价值排序）及获得的属性
+    
+    功能:
+        - 以英雄的推荐出装为目标，在预算内选择属性价值最大的装备和配件
+    
+    路径:
+        - /api/v1/hero/{hero_id}/build-optimizer
+    """
+    try:
+        result = hero_service.optimize_build(hero_id, gold, position, db)
+        
+        # 如果英雄不存在，返回404错误
+        if result is None:
+            raise HTTPException(status_code=404, detail="英雄不存在")
+        
+        return result
+    except HTTPException:
+        # 如果是HTTP异常，直接抛出
+        raise
+    except Exception as e:
+        # 如果发生其他异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/bp/suggestion")
 async def get_bp_suggestion(
     our_heroes: List[str],
@@ -255,8 +662,193 @@ async def get_bp_suggestion(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/bp/counters", response_model=CounterPickResponse)
+async def get_counter_picks(request: CounterPickRequest, db: Session = Depends(get_db)):
+    """
+    推荐最克制敌方阵容的英雄
+    
+    参数:
+        request: 敌方英雄、定位过滤、可选英雄、排除的英雄和推荐数量（请求体）
+        db: 数据库会话对象（通过依赖注入自动获取）
+    
+    返回:
+        CounterPickResponse: 按克制权重之和降序的推荐英雄及其克制的敌方英雄
+    
+    功能:
+        - 合并预先排好序的倒排列表（敌方英雄 -> 克制该英雄的英雄和权重），提前终止，不遍历全部英雄
+        - 可以只推荐某些定位的英雄，或只从我方还能选的英雄中推荐
+    
+    路径:
+        - /api/v1/hero/bp/counters
+    """
+    try:
+        return hero_service.get_counter_picks(request, db)
+    except ValueError as e:
+        # 如果没有已知的敌方英雄，返回400错误
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        # 如果发生其他异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/bp/draft", response_model=DraftSuggestion)
+async def get_draft_suggestion(
+    request: DraftRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    获取选人和禁用推荐
+    
+    参数:
+        request: 当前的选人状态（请求体）
+        db: 数据库会话对象（通过依赖注入自动获取）
+    
+    返回:
+        DraftSuggestion: 选人推荐、禁用推荐和搜索统计
+    
+    功能:
+        - 在剩余英雄池中搜索后续选人（束搜索，敌方贪心应对）
+        - 综合克制关系、胜率和位置覆盖排序
+        - 搜索受时间预算限制（默认50毫秒）
+    
+    HTTP方法:
+        - POST: 用于发送数据
+    
+    路径:
+        - /api/v1/hero/bp/draft
+    """
+    try:
+        # 调用英雄服务获取选人推荐
+        return hero_service.get_draft_suggestion(request, db)
+    except ValueError as e:
+        # 英雄不存在
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        # 如果发生异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/bp/session", response_model=DraftSessionResponse)
+async def create_draft_session(
+    request: DraftRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    创建选人会话
+    
+    参数:
+        request: 初始的选人状态（请求体，可以为空）
+        db: 数据库会话对象（通过依赖注入自动获取）
+    
+    返回:
+        DraftSessionResponse: 会话ID、当前状态和快速推荐
+    
+    功能:
+        - 选人过程中逐个提交选人和禁用，不需要每次提交完整的英雄列表
+        - 会话保存在内存中，30分钟没有操作后过期
+    
+    路径:
+        - /api/v1/hero/bp/session
+    """
+    try:
+        return draft_session_service.create(request, db)
+    except ValueError as e:
+        # 英雄不存在
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        # 如果发生异常，返回500错误
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/bp/session/{session_id}", response_model=DraftSessionResponse)
+async def get_draft_session(session_id: str):
+    """
+    获取选人会话的当前状态
+    
+    参数:
+        session_id: 会话ID（路径参数）
+    
+    返回:
+        DraftSessionResponse: 当前状态和快速推荐
+    
+    路径:
+        - /api/v1/hero/bp/session/{session_id}
+    """
+    session = draft_session_service.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="选人会话不存在或已过期")
+    return session
+
+
+@router.post("/bp/session/{session_id}/event", response_model=DraftSessionResponse)
+async def apply_draft_event(session_id: str, event: DraftEvent):
+    """
+    提交一次选人或禁用
+    
+    参数:
+        session_id: 会话ID（路径参数）
+        event: 选人事件（请求体）
+    
+    返回:
+        DraftSessionResponse: 更新后的状态和快速推荐
+    
+    业务逻辑:
+        1. 增量更新克制得分和位置覆盖（O(英雄数)）
+        2. 返回按下一次选人收益排序的快速推荐
+        3. 会话不存在返回404，英雄无效或禁用英雄已达上限返回400
+    
+    路径:
+        - /api/v1/hero/bp/session/{session_id}/event
+    """
+    try:
+        session = draft_session_service.apply(session_id, event)
+    except ValueError as e:
+        # 英雄不存在、已被选择或禁用，该方已选满，或禁用英雄已达上限
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if session is None:
+        raise HTTPException(status_code=404, detail="选人会话不存在或已过期")
+    return session
+
+
+@router.get("/bp/session/{session_id}/suggestion", response_model=DraftSuggestion)
+async def get_draft_session_suggestion(session_id: str):
+    """
+    对选人会话的当前状态执行完整搜索
+    
+    参数:
+        session_id: 会话ID（路径参数）
+    
+    返回:
+        DraftSuggestion: 束搜索的选人和禁用推荐（同一状态下重复请求复用结果）
+    
+    路径:
+        - /api/v1/hero/bp/session/{session_id}/suggestion
+    """
+    suggestion = draft_session_service.suggest(session_id)
+    if suggestion is None:
+        raise HTTPException(status_code=404, detail="选人会话不存在或已过期")
+    return suggestion
+
+
+@router.delete("/bp/session/{session_id}")
+async def close_draft_session(session_id: str):
+    """
+    结束选人会话
+    
+    参数:
+        session_id: 会话ID（路径参数）
+    
+    路径:
+        - /api/v1/hero/bp/session/{session_id}
+    """
+    if not draft_session_service.close(session_id):
+        raise HTTPException(status_code=404, detail="选人会话不存在或已过期")
+    return {"message": "选人会话已结束"}
+
+
 @router.get("/categories/positions")
-async def get_positions():
+async def get_positions(request: Request):
     """
     获取英雄位置列表
     
@@ -281,8 +873,8 @@ async def get_positions():
     路径:
         - /api/v1/hero/categories/positions
     """
-    # 返回位置列表
-    return {
+    # 返回位置列表（带ETag，If-None-Match一致时返回304）
+    positions = response_cache.get(("positions",), _data_version(), lambda: {
         "positions": [
             {"id": "tank", "name": "坦克"},
             {"id": "warrior", "name": "战士"},
@@ -291,11 +883,12 @@ async def get_positions():
             {"id": "archer", "name": "射手"},
             {"id": "support", "name": "辅助"}
         ]
-    }
+    })
+    return response_cache.respond(request, positions)
 
 
 @router.get("/categories/difficulties")
-async def get_difficulties():
+async def get_difficulties(request: Request):
     """
     获取难度列表
     
@@ -317,11 +910,12 @@ async def get_difficulties():
     路径:
         - /api/v1/hero/categories/difficulties
     """
-    # 返回难度列表
-    return {
+    # 返回难度列表（带ETag，If-None-Match一致时返回304）
+    difficulties = response_cache.get(("difficulties",), _data_version(), lambda: {
         "difficulties": [
             {"id": "easy", "name": "简单"},
             {"id": "medium", "name": "中等"},
             {"id": "hard", "name": "困难"}
         ]
-    }
+    })
+    return response_cache.respond(request, difficulties)
@@ -2,7 +2,8 @@
 # APIRouter: 用于创建API路由
 # Depends: 用于依赖注入
 # HTTPException: 用于处理HTTP异常
-from fastapi import APIRouter, Depends, HTTPException
+# BackgroundTasks: 响应返回后执行的后台任务
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 
 # 导入Session类
 # Session: SQLAlchemy的数据库会话，用于与数据库交互
@@ -15,7 +16,15 @@ from app.core.database import get_db
 # 导入用户相关的Schema
 # UserProfile: 用户资料模型
 # UserPreferences: 用户偏好设置模型
-from app.schemas.user import UserProfile, UserPreferences
+# PurgeJobStatus: 数据清除任务状态模型
+from app.schemas.user import UserProfile, UserPreferences, PurgeJobStatus
+
+# 导入数据清除服务
+# data_purge_service: 后台分批删除用户数据
+from app.services.data_purge_service import data_purge_service
+
+# 导入用户数据正在删除的异常（修改正在删除的用户时返回409）
+from app.services.user_service import UserPurgingError
 
 # 创建API路由器
 router = APIRouter()
@@ -100,7 +109,7 @@ async def update_user_profile(
     业务逻辑:
         1. 调用用户服务更新用户资料
         2. 返回更新后的用户资料
-        3. 如果发生异常，返回500错误
+        3. 用户数据正在后台删除返回409错误，其他异常返回500错误
     
     HTTP方法:
         - PUT: 用于更新数据
@@ -119,6 +128,9 @@ async def update_user_profile(
         # 调用用户服务更新用户资料
         updated_profile = user_service.update_profile(user_id, profile, db)
         return updated_profile
+    except UserPurgingError as e:
+        # 用户数据正在后台删除，返回409错误
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         # 如果发生异常，返回500错误
         raise HTTPException(status_code=500, detail=str(e))
@@ -194,7 +206,7 @@ async def update_user_preferences(
     业务逻辑:
         1. 调用用户服务更新用户偏好设置
         2. 返回更新后的用户偏好设置
-        3. 如果发生异常，返回500错误
+        3. 用户数据正在后台删除返回409错误，其他异常返回500错误
     
     HTTP方法:
         - PUT: 用于更新数据
@@ -213,6 +225,9 @@ async def update_user_preferences(
         # 调用用户服务更新用户偏好设置
         updated = user_service.update_preferences(user_id, preferences, db)
         return updated
+    except UserPurgingError as e:
+        # 用户数据正在后台删除，返回409错误
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         # 如果发生异常，返回500错误
         raise HTTPException(status_code=500, detail=str(e))
@@ -221,6 +236,7 @@ async def update_user_preferences(
 @router.delete("/data/{user_id}")
 async def clear_user_data(
     user_id: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -231,17 +247,18 @@ async def clear_user_data(
         db: 数据库会话对象（通过依赖注入自动获取）
     
     返回:
-        dict: 操作结果消息
+        dict: 操作结果消息和删除任务ID
     
     功能:
         - 删除用户的所有数据
-        - 包括对话记录、对局记录和用户账户
+        - 包括对话记录、对局记录、分析报告和用户账户
         - 用于用户注销或数据清理
     
     业务逻辑:
-        1. 调用用户服务清除用户数据
-        2. 返回成功消息
-        3. 如果发生异常，返回500错误
+        1. 调用用户服务创建删除任务（数据立即对用户不可见）
+        2. 在后台分批删除数据
+        3. 立即返回任务ID，可通过 /user/data/purge/{job_id} 查询进度
+        4. 如果发生异常，返回500错误
     
     HTTP方法:
         - DELETE: 用于删除数据
@@ -260,11 +277,50 @@ async def clear_user_data(
         # 创建用户服务实例
         user_service = UserService()
         
-        # 调用用户服务清除用户数据
-        user_service.clear_all_data(user_id, db)
+        # 调用用户服务创建删除任务
+        job_id = user_service.clear_all_data(user_id, db)
+        
+        # 响应返回后在后台分批删除
+        background_tasks.add_task(data_purge_service.run, job_id)
         
-        # 返回成功消息
-        return {"message": "用户数据已清除"}
+        # 返回任务ID
+        return {"message": "用户数据正在清除", "job_id": job_id}
     except Exception as e:
         # 如果发生异常，返回500错误
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/data/purge/{job_id}", response_model=PurgeJobStatus)
+async def get_purge_status(
+    job_id: str,
+    db: Session = Depends(get_db)
+):
+    """
+    查询数据清除进度
+    
+    参数:
+        job_id: 删除任务ID（路径参数，来自清除对话历史或清除用户数据的响应）
+        db: 数据库会话对象（通过依赖注入自动获取）
+    
+    返回:
+        PurgeJobStatus: 任务状态和删除进度
+    
+    业务逻辑:
+        1. 调用数据清除服务查询任务
+        2. 如果任务不存在，返回404错误
+        3. 返回任务状态
+    
+    HTTP方法:
+        - GET: 用于获取数据
+    
+    路径:
+        - /api/v1/user/data/purge/{job_id}
+    """
+    # 查询任务状态
+    status = data_purge_service.get_status(job_id, db)
+    
+    # 如果任务不存在，返回404错误
+    if not status:
+        raise HTTPException(status_code=404, detail="删除任务不存在")
+    
+    return status
@@ -11,6 +11,10 @@
 包含的模块:
     - config: 应用配置，包含API密钥、数据库连接等配置
     - database: 数据库配置，包含数据库引擎和会话管理
+    - cache: 进程内缓存工具，包含带过期时间的LRU缓存
+    - text: 文本处理工具，包含中文字符二元组切分
+    - response_cache: 预编码响应缓存，支持ETag和304
+    - logger: 日志工具，包含日志初始化（configure_logging，在main.py中调用）和模块日志记录器（get_logger）
 
 使用示例:
     from app.core import settings, get_db
@@ -0,0 +1,186 @@
+# 导入有序字典，用于实现LRU（最近最少使用）淘汰顺序
+from collections import OrderedDict
+
+# 导入线程锁，保证多线程（线程池中的同步端点、后台任务）访问缓存时的安全
+from threading import Lock
+
+# 导入单调时钟，用于计算过期时间（不受系统时间调整影响）
+from time import monotonic
+
+# 导入类型提示
+# Any: 任意类型
+# Callable: 可调用对象类型
+# Hashable: 可哈希类型（可作为字典的键）
+# Optional: 可选类型（可以为None）
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    带过期时间的LRU内存缓存
+
+    主要功能:
+        - 按键存取任意对象
+        - 每个条目在ttl秒后自动失效
+        - 超过最大容量时淘汰最久未使用的条目
+
+    设计说明:
+        - 纯内存实现，属于单个进程（单个worker）
+        - 过期条目在访问时惰性清理，不需要后台线程
+        - 所有操作都在锁内完成，可以在线程池和事件循环中同时使用
+
+    使用场景:
+        - 聊天回答凭据（ticket）的暂存
+        - 热点问题的回答缓存
+        - 有时效的会话状态
+
+    使用示例:
+        cache = TTLCache(max_size=1000, ttl=60)
+        cache.set("key", value)
+        value = cache.get("key")
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 300.0):
+        """
+        初始化缓存
+
+        参数:
+            max_size: 最大条目数量，超出后淘汰最久未使用的条目
+            ttl: 默认过期时间（秒）
+        """
+        # 最大条目数量
+        self.max_size = max_size
+
+        # 默认过期时间（秒）
+        self.ttl = ttl
+
+        # 存储结构: key -> (过期时间点, 值)
+        # OrderedDict的顺序即LRU顺序，末尾为最近使用
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+        # 互斥锁
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        读取缓存
+
+        参数:
+            key: 缓存键
+            default: 未命中或已过期时的返回值
+
+        返回:
+            Any: 缓存的值或default
+        """
+        with self._lock:
+            # 查找条目
+            item = self._data.get(key)
+
+            # 未命中
+            if item is None:
+                return default
+
+            expires_at, value = item
+
+            # 已过期，删除后按未命中处理
+            if expires_at <= monotonic():
+                del self._data[key]
+                return default
+
+            # 命中，移动到末尾（标记为最近使用）
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        写入缓存
+
+        参数:
+            key: 缓存键
+            value: 缓存值
+            ttl: 本条目的过期时间（秒），为None时使用默认值
+        """
+        with self._lock:
+            # 计算过期时间点
+            expires_at = monotonic() + (self.ttl if ttl is None else ttl)
+
+            # 写入并标记为最近使用
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+
+            # 超出容量时淘汰最久未使用的条目
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        删除并返回缓存条目
+
+        参数:
+            key: 缓存键
+            default: 条目不存在时的返回值
+
+        返回:
+            Any: 被删除的值或default
+        """
+        with self._lock:
+            item = self._data.pop(key, None)
+
+            # 不存在或已过期
+            if item is None or item[0] <= monotonic():
+                return default
+
+            return item[1]
+
+    def touch(self, key: Hashable, ttl: Optional[float] = None) -> bool:
+        """
+        刷新条目的过期时间
+
+        参数:
+            key: 缓存键
+            ttl: 新的过期时间（秒），为None时使用默认值
+
+        返回:
+            bool: 条目存在且已刷新返回True
+        """
+        with self._lock:
+            item = self._data.get(key)
+
+            # 不存在或已过期
+            if item is None or item[0] <= monotonic():
+                self._data.pop(key, None)
+                return False
+
+            # 以新的过期时间重新写入
+            self._data[key] = (monotonic() + (self.ttl if ttl is None else ttl), item[1])
+            self._data.move_to_end(key)
+            return True
+
+    def discard(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        删除键满足条件的条目
+
+        参数:
+            predicate: 判断函数，参数为缓存键，返回True的条目被删除
+
+        返回:
+            int: 删除的条目数量
+        """
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self):
+        """
+        清空缓存
+        """
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        """
+        返回当前条目数量（包含尚未清理的过期条目）
+        """
+        return len(self._data)
@@ -119,6 +119,126 @@ class Settings(BaseSettings):
     # 0.9: 从概率最高的90%的词中选择
     AI_TOP_P: float = 0.9
     
+    # ==================== 聊天响应时限配置 ====================
+    
+    # 聊天回复的时间预算（秒）
+    # AI在该时间内未完成回复时，先返回快速模板回答和凭据（ticket）
+    # 完整的AI回答在后台继续生成，完成后可通过凭据获取
+    CHAT_RESPONSE_DEADLINE: float = 0.8
+    
+    # 回答凭据的保留时间（秒）
+    # 超过该时间未被查询的凭据会被清理
+    CHAT_TICKET_TTL: int = 600
+    
+    # 英雄角色扮演回复的缓存时间（秒）
+    # 相同英雄的相同问题在该时间内直接返回缓存的回复
+    HERO_DIALOGUE_CACHE_TTL: int = 3600
+    
+    # 每次回复后预计算回答的建议数量
+    # 回复下方排名靠前的建议会在后台提前生成回答，用户点击时直接返回
+    # 0: 关闭预计算
+    CHAT_PREFETCH_SUGGESTIONS: int = 2
+    
+    # 预计算回答的保留时间（秒）
+    # 建议通常在回复后很快被点击，过期后按普通消息处理
+    CHAT_PREFETCH_TTL: int = 120
+    
+    # 调用AI预计算回答的建议需要的最少展示次数
+    # 快速路径（英雄数据）无法回答的建议，需要先积累点击数据
+    CHAT_PREFETCH_AI_MIN_SHOWN: int = 20
+    
+    # 调用AI预计算回答的建议需要的最低点击率
+    # 点击率低于该值的建议不调用AI预计算，避免每轮回复都产生额外的AI调用
+    CHAT_PREFETCH_AI_MIN_CLICK_RATE: float = 0.2
+    
+    # ==================== 英雄知识检索配置 ====================
+    
+    # 每次回复附加到提示词中的资料条数
+    # 资料来自英雄、出装、铭文和装备数据，帮助AI给出准确简短的回答
+    KNOWLEDGE_TOP_K: int = 5
+    
+    # 英雄数据变化的检查间隔（秒）
+    # 导入脚本更新数据后，内存中的检索索引、人设等在该时间内重新加载
+    HERO_DATA_CHECK_INTERVAL: int = 60
+    
+    # ==================== 对话搜索配置 ====================
+    
+    # 内存中保留倒排索引的最大用户数
+    # 超出后淘汰最久未搜索的用户，下次搜索时重新从数据库构建
+    CHAT_SEARCH_MAX_USERS: int = 1000
+    
+    # 用户倒排索引的保留时间（秒）
+    CHAT_SEARCH_INDEX_TTL: int = 1800
+    
+    # ==================== 数据清除配置 ====================
+    
+    # 后台删除用户数据时每批删除的记录数量
+    # 每批单独提交，避免长时间锁表
+    PURGE_BATCH_SIZE: int = 500
+    
+    # 批次之间的停顿时间（秒），让其他写入有机会执行
+    PURGE_BATCH_PAUSE: float = 0.05
+    
+    # 删除任务出错时的最大尝试次数（包括第一次执行）
+    PURGE_MAX_ATTEMPTS: int = 3
+    
+    # 第一次重试前的等待时间（秒），之后每次重试等待时间翻倍
+    PURGE_RETRY_DELAY: float = 2.0
+    
+    # ==================== 英雄接口缓存配置 ====================
+    
+    # 英雄详情、出装、铭文、分类接口的Cache-Control max-age（秒）
+    # 过期后客户端携带ETag重新验证，数据未变化时返回304
+    HERO_RESPONSE_MAX_AGE: int = 300
+    
+    # 装备列表、详情、搜索接口的Cache-Control max-age（秒）
+    EQUIPMENT_RESPONSE_MAX_AGE: int = 300
+    
+    # ==================== BP选人推荐配置 ====================
+    
+    # 选人推荐的搜索时间预算（毫秒）
+    # 超时后返回最后一层完整搜索的结果
+    DRAFT_TIME_BUDGET_MS: float = 50.0
+    
+    # 每个候选首选英雄保留的搜索分支数量（束宽）
+    DRAFT_BEAM_WIDTH: int = 4
+    
+    # 参与深度搜索的候选首选英雄数量
+    DRAFT_ROOT_CANDIDATES: int = 8
+    
+    # 向后搜索的选人步数（包括双方的选人）
+    DRAFT_SEARCH_DEPTH: int = 4
+    
+    # 选人会话的保留时间（秒），每次操作后重新计时
+    DRAFT_SESSION_TTL: int = 1800
+    
+    # 内存中保留的最大选人会话数量
+    DRAFT_SESSION_MAX: int = 10000
+    
+    # ==================== 出装优化配置 ====================
+    
+    # 金币预算的计算精度（金币）
+    # 背包动态规划按该精度离散化金币，越小越精确、计算越慢
+    BUILD_GOLD_STEP: int = 10
+    
+    # ==================== 英雄对局统计配置 ====================
+    
+    # 使用对局统计的最少对局数
+    # 英雄的对局数达到该值后，英雄接口和BP建议使用对局统计的胜率和选用率，否则使用英雄数据中的值
+    HERO_STATS_MIN_GAMES: int = 20
+    
+    # ==================== 版本强势英雄榜配置 ====================
+    
+    # 平滑的先验强度（对局数）
+    # 英雄的胜率、选用率向英雄数据中的值收缩，对局数远大于该值时以对局统计为准
+    TIER_LIST_PRIOR_GAMES: int = 50
+    
+    # 新增（或删除）多少场对局后重新计算榜单
+    TIER_LIST_REFRESH_MATCHES: int = 50
+    
+    # 对局数据有变化时，最长多久重新计算一次榜单（秒）
+    TIER_LIST_REFRESH_INTERVAL: int = 600
+    
     @field_validator('CORS_ORIGINS', mode='before')
     @classmethod
     def parse_cors_origins(cls, v):
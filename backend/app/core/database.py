@@ -123,7 +123,7 @@ def init_db():
     """
     # 导入所有模型模块
     # 必须先导入模型，Base才能感知到所有表定义
-    from app.models import hero, user, conversation, match
+    from app.models import hero, user, conversation, match, purge
     
     # 创建所有表
     # create_all会检查表是否存在，只创建不存在的表
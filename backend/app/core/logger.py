@@ -0,0 +1,43 @@
+# 导入日志模块
+import logging
+
+# 导入配置设置
+from app.core.config import settings
+
+
+# 日志格式: 时间 级别 模块名称 消息
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# 只输出WARNING及以上级别的第三方库（INFO级别会记录每一次HTTP请求）
+QUIET_LOGGERS = ("httpx", "httpcore")
+
+
+def configure_logging():
+    """
+    按配置的日志级别初始化根日志记录器（在应用入口main.py中调用一次）
+    
+    说明:
+        - 导入本模块不会修改日志配置，脚本和测试可以自行配置
+        - 已经配置过时basicConfig不重复添加处理器
+    """
+    logging.basicConfig(level=settings.LOG_LEVEL, format=LOG_FORMAT)
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    获取日志记录器
+    
+    参数:
+        name: 日志记录器名称（通常为模块的__name__）
+    
+    返回:
+        logging.Logger: 日志记录器（应用启动后级别由LOG_LEVEL配置）
+    
+    使用:
+        from app.core.logger import get_logger
+        logger = get_logger(__name__)
+        logger.warning("...")
+    """
+    return logging.getLogger(name)
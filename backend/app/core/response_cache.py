@@ -0,0 +1,182 @@
+# 导入类型提示
+# Any: 任意类型
+# Callable: 可调用对象类型
+# Hashable: 可哈希类型（可以作为字典键）
+# Optional: 可选类型（可以为None）
+from typing import Any, Callable, Hashable, Optional
+
+# 导入哈希模块，用于根据响应内容生成ETag
+import hashlib
+
+# 导入json模块，用于序列化响应
+import json
+
+# 导入线程锁，保证版本切换时清空缓存的原子性
+from threading import Lock
+
+# 导入FastAPI的请求和响应类
+from fastapi import Request, Response
+
+# 导入FastAPI的JSON编码函数，将Pydantic模型转换为可序列化的数据
+from fastapi.encoders import jsonable_encoder
+
+# 导入进程内缓存，用于保存编码后的响应
+from app.core.cache import TTLCache
+
+
+class EncodedResponse:
+    """
+    编码后的响应
+
+    字段说明:
+        body: JSON字节
+        etag: 强ETag（响应内容的哈希值，带引号）
+    """
+
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def encode_response(content: Any) -> EncodedResponse:
+    """
+    将响应内容编码为JSON字节
+
+    参数:
+        content: 响应内容（Pydantic模型、字典、列表等）
+
+    返回:
+        EncodedResponse: 编码后的响应
+
+    说明:
+        - 编码方式与FastAPI默认的JSONResponse相同，响应内容与之前一致
+    """
+    body = json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":")
+    ).encode("utf-8")
+    return EncodedResponse(body)
+
+
+class ResponseCache:
+    """
+    预编码响应缓存
+
+    缓存只随数据导入变化的接口响应，直接返回编码好的JSON字节
+
+    主要功能:
+        - 按数据版本和请求参数缓存编码后的响应
+        - 为响应生成强ETag，并设置Cache-Control
+        - 请求的If-None-Match与ETag一致时返回304，不返回响应体
+
+    设计说明:
+        - 数据版本变化时整体清空缓存，不需要逐个失效
+        - 只有部分数据变化时（如英雄数据版本只修改了几个英雄），可以用rebase()只清除受影响的响应
+        - 版本为None（数据没有版本，例如内存目录未加载）时不缓存，
+          每次重新生成响应，但仍然支持ETag和304
+        - 构建结果为None（如英雄不存在）时不缓存，由调用方处理
+
+    使用场景:
+        - 英雄详情、出装、铭文、分类等读多写少的接口
+    """
+
+    def __init__(self, max_size: int = 4096, max_age: int = 300):
+        """
+        初始化响应缓存
+
+        参数:
+            max_size: 最多缓存的响应数量
+            max_age: Cache-Control的max-age（秒）
+        """
+        # 编码后的响应: 缓存键 -> EncodedResponse
+        # 版本变化时清空，过期时间只用于淘汰长期不访问的响应
+        self._entries = TTLCache(max_size=max_size, ttl=3600)
+
+        # 当前缓存对应的数据版本
+        self._version: Optional[Hashable] = None
+
+        # 版本切换锁
+        self._lock = Lock()
+
+        # Cache-Control响应头
+        self.cache_control = f"public, max-age={max_age}"
+
+    def get(
+        self,
+        key: Hashable,
+        version: Optional[Hashable],
+        build: Callable[[], Any]
+    ) -> Optional[EncodedResponse]:
+        """
+        获取编码后的响应（未缓存时构建并缓存）
+
+        参数:
+            key: 缓存键（接口和请求参数）
+            version: 数据版本，None表示不缓存
+            build: 构建响应内容的函数，返回None表示资源不存在
+
+        返回:
+            Optional[EncodedResponse]: 编码后的响应，资源不存在返回None
+        """
+        if version is None:
+            content = build()
+            return encode_response(content) if content is not None else None
+
+        # 数据版本变化，清空旧版本的响应
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._entries.clear()
+                    self._version = version
+
+        entry = self._entries.get(key)
+        if entry is None:
+            content = build()
+            if content is None:
+                return None
+            entry = encode_response(content)
+            self._entries.set(key, entry)
+        return entry
+
+    def rebase(self, old_version: Hashable, version: Hashable, stale: Callable[[Hashable], bool]):
+        """
+        切换到新的数据版本，只清除受影响的响应
+
+        参数:
+            old_version: 新版本所基于的数据版本（缓存不是该版本时不做处理，之后按版本变化整体清空）
+            version: 新的数据版本
+            stale: 判断函数，参数为缓存键，返回True表示该响应受影响
+        """
+        if self._version != old_version:
+            return
+        with self._lock:
+            if self._version == old_version:
+                self._entries.discard(stale)
+                self._version = version
+
+    def respond(self, request: Request, entry: EncodedResponse) -> Response:
+        """
+        生成HTTP响应（If-None-Match命中时返回304）
+
+        参数:
+            request: 请求对象
+            entry: 编码后的响应
+
+        返回:
+            Response: 200（带响应体）或304（不带响应体）
+        """
+        headers = {"ETag": entry.etag, "Cache-Control": self.cache_control}
+
+        # If-None-Match可以包含多个ETag（逗号分隔）或"*"
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            if "*" in tags or entry.etag in tags:
+                return Response(status_code=304, headers=headers)
+
+        return Response(content=entry.body, media_type="application/json", headers=headers)
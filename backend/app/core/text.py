@@ -0,0 +1,69 @@
+# 导入正则表达式模块，用于文本规范化
+import re
+
+# 导入类型提示
+# List: 列表类型
+from typing import List
+
+
+# 空白、标点和下划线（规范化时去除，切分查询时作为分隔符）
+_SEPARATORS = re.compile(r"[\s\W_]+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    规范化文本（去除空白和标点，转为小写）
+
+    参数:
+        text: 文本
+
+    返回:
+        str: 规范化后的文本
+    """
+    return _SEPARATORS.sub("", text or "").lower()
+
+
+def char_bigrams(text: str) -> List[str]:
+    """
+    将文本切分为字符二元组（bigram）
+
+    参数:
+        text: 文本
+
+    返回:
+        List[str]: 词项列表（单字文本返回该字本身）
+
+    设计说明:
+        - 中文没有空格分词，字符二元组无需词典即可匹配英雄名、装备名等词语
+    """
+    normalized = normalize_text(text)
+    if len(normalized) < 2:
+        return [normalized] if normalized else []
+    return [normalized[i:i + 2] for i in range(len(normalized) - 1)]
+
+
+def query_bigrams(query: str) -> List[str]:
+    """
+    将搜索词切分为字符二元组
+
+    参数:
+        query: 搜索词（可以用空格分隔多个关键词）
+
+    返回:
+        List[str]: 去重后的词项列表
+
+    设计说明:
+        - 按空白和标点拆分关键词后分别切分，避免产生跨关键词的二元组
+        - 单字关键词只能切出单字，无法匹配按二元组建立的索引：
+          有两个字以上的关键词时忽略单字关键词，只有单字关键词时原样返回
+    """
+    segments = [segment for segment in _SEPARATORS.split(query or "") if segment]
+    if any(len(segment) >= 2 for segment in segments):
+        segments = [segment for segment in segments if len(segment) >= 2]
+
+    terms: List[str] = []
+    for segment in segments:
+        for term in char_bigrams(segment):
+            if term not in terms:
+                terms.append(term)
+    return terms
@@ -11,18 +11,72 @@ from fastapi.staticfiles import StaticFiles
 # 导入异步上下文管理器，用于管理应用的生命周期（启动和关闭）
 from contextlib import asynccontextmanager
 
+# 导入异步IO模块，用于运行英雄数据的定期检查任务
+import asyncio
+
 # 导入Uvicorn服务器，用于运行FastAPI应用
 import uvicorn
 
 # 导入应用配置模块，包含项目的各种配置信息
 from app.core.config import settings
 
+# 导入日志工具
+# configure_logging: 按LOG_LEVEL初始化日志（应用入口调用一次）
+# get_logger: 获取模块日志记录器
+from app.core.logger import configure_logging, get_logger
+
 # 导入数据库初始化和关闭函数
 from app.core.database import init_db, close_db
 
 # 导入API路由模块，包含所有API端点
 from app.api import api_router
 
+# 导入英雄人设服务，启动时预编译英雄角色扮演的人设
+from app.services.persona_service import persona_service
+
+# 导入英雄知识检索服务，启动时构建检索索引
+from app.services.knowledge_service import knowledge_service
+
+# 导入英雄目录，启动时加载英雄数据快照
+from app.services.hero_catalog import hero_catalog
+
+# 导入克制矩阵服务，启动时构建英雄克制矩阵
+from app.services.counter_matrix import counter_matrix_service
+
+# 导入英雄关系服务，启动时加载克制关系的邻接索引
+from app.services.hero_relation_service import hero_relation_service
+
+# 导入英雄搜索服务，启动时构建英雄搜索索引
+from app.services.hero_search_service import hero_search_service
+
+# 导入出装铭文推荐服务，启动时重建物化推荐表
+from app.services.build_recommendation_service import build_recommendation_service
+
+# 导入装备合成图服务，启动时构建装备合成图
+from app.services.equipment_graph import equipment_graph_service
+
+# 导入装备目录，启动时加载装备数据快照
+from app.services.equipment_catalog import equipment_catalog
+
+# 导入英雄对局统计服务，启动时加载对局统计计数
+from app.services.hero_stats_service import hero_stats_service
+
+# 导入版本强势英雄榜服务，启动时计算榜单并定期重新计算
+from app.services.tier_list_service import tier_list_service
+
+# 导入英雄数据监视器，负责加载上述内存缓存并在数据变化后重新加载
+from app.services.hero_data_watcher import hero_data_watcher
+
+# 导入数据清除服务，启动时继续未完成的删除任务
+from app.services.data_purge_service import data_purge_service
+
+
+# 初始化日志（只在应用入口配置，导入其他模块不会修改日志配置）
+configure_logging()
+
+# 模块日志记录器
+logger = get_logger(__name__)
+
 
 # 定义应用生命周期管理函数
 # 这是一个异步上下文管理器，用于在应用启动和关闭时执行特定操作
@@ -41,8 +95,15 @@ async def lifespan(app: FastAPI):
     """
     # 应用启动时执行初始化操作
     startup()
+    # 启动英雄数据的定期检查，数据变化后重新加载内存缓存
+    watch_task = asyncio.create_task(hero_data_watcher.watch(settings.HERO_DATA_CHECK_INTERVAL))
+    # 启动版本强势英雄榜的定期计算，对局数据变化后重新计算榜单
+    tier_list_task = asyncio.create_task(tier_list_service.watch(settings.TIER_LIST_REFRESH_INTERVAL))
     # yield 让应用正常运行
     yield
+    # 停止定期检查
+    watch_task.cancel()
+    tier_list_task.cancel()
     # 应用关闭时执行清理操作
     shutdown()
 
@@ -54,10 +115,61 @@ def startup():
     功能:
         - 初始化数据库连接
         - 创建数据库表（如果不存在）
+        - 预热内存缓存
+        - 继续未完成的数据删除任务
         - 执行其他启动时的必要操作
     """
     # 调用数据库初始化函数
     init_db()
+    
+    # 预热内存缓存
+    warm_up_caches()
+    
+    # 在后台继续上次未完成的数据删除任务
+    data_purge_service.resume_unfinished()
+
+
+def warm_up_caches():
+    """
+    预热内存缓存
+    
+    功能:
+        - 加载英雄目录快照（英雄查询接口不再访问数据库）
+        - 预编译英雄角色扮演的人设提示词和回复池
+        - 构建英雄知识检索索引
+        - 加载英雄克制关系的邻接索引（关系表为空时先由英雄的克制列表迁移）
+        - 由邻接索引构建英雄克制矩阵（选人推荐与克制查询使用同一组关系和权重）
+        - 构建英雄搜索索引（名称、别名、技能、拼音）
+        - 检查出装铭文推荐表（内容与出装、铭文数据一致时不写数据库）
+        - 构建装备合成图（合成树和升级路线）
+        - 加载装备目录快照（装备列表、详情、搜索接口不再访问数据库）
+        - 加载英雄对局统计（计数与对局表不一致时重建）
+        - 计算版本强势英雄榜（按段位大类和位置平滑计算胜率、选用率和禁用率）
+    
+    注意:
+        - 加载函数登记到英雄数据监视器，数据变化后自动重新加载
+        - 英雄数据版本切换时，英雄目录和英雄人设只更新变化的英雄，装备、出装铭文推荐表和对局统计不重新加载
+        - 预热失败不影响应用启动，相关功能会退化为按需处理
+    """
+    # 登记加载函数
+    hero_data_watcher.add_loader("英雄目录", hero_catalog.load, hero_catalog.update)
+    hero_data_watcher.add_loader("英雄人设", persona_service.load, persona_service.update)
+    hero_data_watcher.add_loader("知识检索索引", knowledge_service.load)
+    hero_data_watcher.add_loader("英雄关系索引", hero_relation_service.load)
+    hero_data_watcher.add_loader("克制矩阵", counter_matrix_service.load)
+    hero_data_watcher.add_loader("英雄搜索索引", hero_search_service.load)
+    hero_data_watcher.add_loader("出装铭文推荐表", build_recommendation_service.refresh, hero_data_watcher.unaffected)
+    hero_data_watcher.add_loader("装备合成图", equipment_graph_service.load, hero_data_watcher.unaffected)
+    hero_data_watcher.add_loader("装备目录", equipment_catalog.load, hero_data_watcher.unaffected)
+    hero_data_watcher.add_loader("英雄对局统计", hero_stats_service.load, hero_data_watcher.unaffected)
+    hero_data_watcher.add_loader("版本强势英雄榜", tier_list_service.load)
+    
+    try:
+        # 执行所有加载函数
+        hero_data_watcher.reload_all()
+    except Exception as e:
+        # 预热失败时记录错误，继续启动
+        logger.error("缓存预热失败: %s", e)
 
 
 def shutdown():
@@ -105,6 +217,9 @@ app.add_middleware(
     # 允许的HTTP头（如Content-Type、Authorization等）
     # * 表示允许所有头
     allow_headers=["*"],
+    # 允许前端读取的响应头
+    # X-Next-Cursor: 英雄列表分页的下一页游标
+    expose_headers=["X-Next-Cursor"],
 )
 
 # 包含API路由
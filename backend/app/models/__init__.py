@@ -10,9 +10,10 @@
 
 包含的模型:
     - user: 用户数据模型
-    - hero: 英雄、装备、铭文数据模型
+    - hero: 英雄、装备、铭文、英雄数据版本、英雄关系模型
     - conversation: 对话记录数据模型
-    - match: 对局、分析数据模型
+    - match: 对局、分析、英雄对局统计数据模型
+    - purge: 数据清除任务模型
 
 使用示例:
     from app.models import User, Hero, Conversation, Match
@@ -1,6 +1,6 @@
 # 导入SQLAlchemy的Column类，用于定义表的列
 # Column是ORM中定义字段的基本单位
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, JSON, ForeignKey, Index
 
 # 导入relationship函数，用于定义表之间的关系
 # relationship用于建立ORM对象之间的关系（一对多、多对多等）
@@ -243,6 +243,9 @@ class HeroEquipment(Base):
     # 指定数据库表名
     __tablename__ = "hero_equipments"
     
+    # 组合索引: 按英雄和段位查询出装推荐
+    __table_args__ = (Index("idx_hero_equipments_hero_rank", "hero_id", "rank"),)
+    
     # 主键
     id = Column(Integer, primary_key=True, index=True)
     
@@ -321,6 +324,9 @@ class HeroInscription(Base):
     # 指定数据库表名
     __tablename__ = "hero_inscriptions"
     
+    # 组合索引: 按英雄和段位查询铭文推荐
+    __table_args__ = (Index("idx_hero_inscriptions_hero_rank", "hero_id", "rank"),)
+    
     # 主键
     id = Column(Integer, primary_key=True, index=True)
     
@@ -363,6 +369,68 @@ class HeroInscription(Base):
     hero = relationship("Hero", back_populates="inscriptions")
 
 
+class HeroBuildRecommendation(Base):
+    """
+    英雄出装铭文推荐表（物化）
+    
+    由hero_equipments和hero_inscriptions汇总生成，每个(英雄, 段位, 位置)一行
+    
+    数据库表名: hero_build_recommendations
+    
+    主要功能:
+        - 预先按胜率、选用率排好出装推荐和铭文推荐
+        - 出装和铭文接口按唯一索引一次查询得到结果，不需要扫描和排序
+    
+    字段说明:
+        id: 记录唯一标识符
+        hero_id: 关联的英雄ID
+        rank: 段位（"全部"表示所有段位的汇总）
+        position: 位置（空字符串表示所有位置的汇总）
+        equipment: 排好序的出装推荐列表（与出装接口返回一致）
+        inscriptions: 排好序的铭文推荐列表（与铭文接口返回一致，只在位置汇总行中保存）
+        updated_at: 生成时间
+    
+    注意:
+        - 数据导入后由build_recommendation_service整体重建，不要直接修改
+    """
+    
+    # 指定数据库表名
+    __tablename__ = "hero_build_recommendations"
+    
+    # 唯一组合索引: 按(英雄, 段位, 位置)点查
+    __table_args__ = (
+        Index("idx_hero_build_recommendations_key", "hero_id", "rank", "position", unique=True),
+    )
+    
+    # 主键
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # 关联的英雄ID
+    # ondelete="CASCADE": 英雄删除时同时删除推荐
+    hero_id = Column(Integer, ForeignKey("heroes.id", ondelete="CASCADE"), nullable=False)
+    
+    # 段位
+    # "全部": 所有段位的汇总
+    rank = Column(String(20), nullable=False)
+    
+    # 位置
+    # 空字符串: 所有位置的汇总
+    position = Column(String(20), nullable=False, default="")
+    
+    # 出装推荐
+    # JSON: 按胜率、选用率降序排列的出装推荐
+    # 示例: [{"id": 1, "rank": "全部", "position": "打野", "equipment_list": [...], "win_rate": 0.55, "pick_rate": 0.45}]
+    equipment = Column(JSON)
+    
+    # 铭文推荐
+    # JSON: 按胜率降序排列的铭文推荐
+    # 示例: [{"id": 1, "rank": "全部", "inscription_name": "刺客通用", "inscription_config": {...}, "description": "...", "win_rate": 0.52}]
+    inscriptions = Column(JSON)
+    
+    # 生成时间
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
 class Equipment(Base):
     """
     装备模型
@@ -455,3 +523,169 @@ class Equipment(Base):
     
     # 更新时间
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class HeroDataVersion(Base):
+    """
+    英雄数据版本模型
+    
+    每次导入英雄数据生成一个版本，记录与上一个生效版本的差异
+    
+    数据库表名: hero_data_versions
+    
+    主要功能:
+        - 标记当前生效的英雄数据版本（同一时间只有一个active版本）
+        - 记录相对上一个生效版本新增、修改、删除的英雄，内存缓存只更新这些英雄
+        - 保留历史版本，可以切换回旧版本
+    
+    字段说明:
+        id: 版本号（自增）
+        previous_id: 生效时替换的版本号（第一个版本为空）
+        status: 版本状态（staged: 已写入未生效，active: 当前生效，superseded: 已被替换）
+        source: 数据来源（如导入脚本名称）
+        hero_count: 版本包含的英雄数量
+        added: 新增的英雄ID列表
+        changed: 修改的英雄ID列表
+        removed: 删除的英雄ID列表
+        created_at: 创建时间
+        activated_at: 生效时间
+    
+    注意:
+        - 由hero_version_service写入和切换，不要直接修改
+    """
+    
+    # 指定数据库表名
+    __tablename__ = "hero_data_versions"
+    
+    # 版本号，主键
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # 生效时替换的版本号
+    # 沿previous_id可以从当前版本追溯到任意旧版本，合并各版本的差异
+    previous_id = Column(Integer)
+    
+    # 版本状态
+    # 可选值: "staged", "active", "superseded"
+    status = Column(String(20), nullable=False, default="staged", index=True)
+    
+    # 数据来源
+    source = Column(String(100))
+    
+    # 版本包含的英雄数量
+    hero_count = Column(Integer, default=0)
+    
+    # 与上一个生效版本的差异（英雄ID列表）
+    # 示例: [3, 15]
+    added = Column(JSON)
+    changed = Column(JSON)
+    removed = Column(JSON)
+    
+    # 创建时间
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # 生效时间
+    activated_at = Column(DateTime)
+
+
+class HeroRevision(Base):
+    """
+    英雄数据版本内容模型
+    
+    某个数据版本中一个英雄的完整数据
+    
+    数据库表名: hero_revisions
+    
+    主要功能:
+        - 保存每个版本的全部英雄数据，切换版本时按内容哈希找出变化的英雄
+    
+    字段说明:
+        id: 记录唯一标识符
+        version_id: 所属的数据版本
+        hero_name: 英雄名称（英雄按名称对应到heroes表）
+        content_hash: 英雄数据的SHA-256哈希
+        data: 英雄数据（与heroes表的字段一致，不包括ID和时间戳）
+    """
+    
+    # 指定数据库表名
+    __tablename__ = "hero_revisions"
+    
+    # 唯一组合索引: 按(版本, 英雄名称)查找
+    __table_args__ = (
+        Index("idx_hero_revisions_version_name", "version_id", "hero_name", unique=True),
+    )
+    
+    # 主键
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # 所属的数据版本
+    # ondelete="CASCADE": 版本删除时同时删除版本内容
+    version_id = Column(Integer, ForeignKey("hero_data_versions.id", ondelete="CASCADE"), nullable=False)
+    
+    # 英雄名称
+    hero_name = Column(String(50), nullable=False)
+    
+    # 英雄数据的哈希
+    # 与当前数据的哈希比较即可判断英雄是否变化，不需要逐个字段比较
+    content_hash = Column(String(64), nullable=False)
+    
+    # 英雄数据
+    data = Column(JSON)
+
+
+class HeroRelation(Base):
+    """
+    英雄关系模型
+    
+    英雄之间的有向关系（如克制），按英雄ID建立索引
+    
+    数据库表名: hero_relations
+    
+    主要功能:
+        - 替代英雄的counter_heroes / countered_by_heroes名称列表，关系可以按索引查询、与英雄表连接
+        - 只保存一个方向（A克制B），反方向（B被A克制）按target_id索引查询得到，两个方向始终一致
+    
+    字段说明:
+        id: 记录唯一标识符
+        hero_id: 关系的发起英雄ID（如克制方）
+        target_id: 关系的目标英雄ID（如被克制方）
+        relation: 关系类型（counters: 克制）
+        weight: 关系权重（0~1，两边英雄数据都记录了该关系时为1）
+        source: 关系来源（json: 由英雄数据的克制列表迁移）
+        updated_at: 生成时间
+    
+    注意:
+        - 由hero_relation_service根据英雄数据重建，不要直接修改
+    """
+    
+    # 指定数据库表名
+    __tablename__ = "hero_relations"
+    
+    # 唯一组合索引: 按(发起英雄, 目标英雄, 关系类型)去重，同时用于正方向查询
+    # 组合索引: 按(目标英雄, 关系类型)查询反方向
+    __table_args__ = (
+        Index("idx_hero_relations_key", "hero_id", "target_id", "relation", unique=True),
+        Index("idx_hero_relations_target", "target_id", "relation"),
+    )
+    
+    # 主键
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # 发起英雄ID
+    # ondelete="CASCADE": 英雄删除时同时删除关系
+    hero_id = Column(Integer, ForeignKey("heroes.id", ondelete="CASCADE"), nullable=False)
+    
+    # 目标英雄ID
+    target_id = Column(Integer, ForeignKey("heroes.id", ondelete="CASCADE"), nullable=False)
+    
+    # 关系类型
+    # 可选值: "counters"
+    relation = Column(String(20), nullable=False, default="counters")
+    
+    # 关系权重
+    weight = Column(Float, nullable=False, default=1.0)
+    
+    # 关系来源
+    source = Column(String(20))
+    
+    # 生成时间
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -1,6 +1,6 @@
 # 导入SQLAlchemy的Column类，用于定义表的列
 # Column是ORM中定义字段的基本单位
-from sqlalchemy import Column, String, DateTime, JSON, Integer, ForeignKey, Float, Text
+from sqlalchemy import Column, String, DateTime, JSON, Integer, ForeignKey, Float, Text, Index
 
 # 导入relationship函数，用于定义表之间的关系
 # relationship用于建立ORM对象之间的关系（一对多、多对多等）
@@ -348,3 +348,97 @@ class Analysis(Base):
     # default=datetime.utcnow: 默认值为当前UTC时间
     # 用途: 记录分析报告的创建时间
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class HeroMatchStats(Base):
+    """
+    英雄对局统计表（汇总计数）
+    
+    由matches表汇总得到的计数器，每个(英雄, 段位, 位置)一行
+    
+    数据库表名: hero_match_stats
+    
+    主要功能:
+        - 保存每个英雄的对局数、胜场数和各项表现数据之和
+        - 导入或删除对局时按差值增减计数，不需要重新扫描matches表
+    
+    字段说明:
+        id: 记录唯一标识符
+        hero_name: 英雄名称（对局中的hero_name）
+        rank: 段位大类（"全部"表示所有段位的汇总）
+        position: 位置（空字符串表示所有位置的汇总）
+        games: 对局数
+        wins: 胜场数
+        kills / deaths / assists: 击杀、死亡、助攻之和
+        gold / damage / damage_taken / healing: 经济、伤害、承伤、治疗之和
+        duration: 对局时长之和（秒）
+        kda / participation_rate: KDA、参团率之和
+        updated_at: 最后更新时间
+    
+    注意:
+        - 平均值 = 总和 / 对局数，由hero_stats_service计算
+        - 由hero_stats_service维护，不要直接修改
+    """
+    
+    # 指定数据库表名
+    __tablename__ = "hero_match_stats"
+    
+    # 唯一组合索引: 按(英雄, 段位, 位置)定位计数行
+    __table_args__ = (
+        Index("idx_hero_match_stats_key", "hero_name", "rank", "position", unique=True),
+    )
+    
+    # 主键
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # 英雄名称
+    # 对局可能只有英雄名称没有英雄ID（如批量导入的样例数据），按名称汇总
+    hero_name = Column(String(50), nullable=False)
+    
+    # 段位大类
+    # "全部": 所有段位的汇总
+    # 示例: "钻石"（"钻石II"、"钻石III"都计入"钻石"）
+    rank = Column(String(50), nullable=False)
+    
+    # 位置
+    # 空字符串: 所有位置的汇总
+    position = Column(String(20), nullable=False, default="")
+    
+    # 对局数
+    games = Column(Integer, nullable=False, default=0)
+    
+    # 胜场数
+    wins = Column(Integer, nullable=False, default=0)
+    
+    # 击杀数之和
+    kills = Column(Integer, nullable=False, default=0)
+    
+    # 死亡数之和
+    deaths = Column(Integer, nullable=False, default=0)
+    
+    # 助攻数之和
+    assists = Column(Integer, nullable=False, default=0)
+    
+    # 经济之和
+    gold = Column(Integer, nullable=False, default=0)
+    
+    # 输出伤害之和
+    damage = Column(Integer, nullable=False, default=0)
+    
+    # 承受伤害之和
+    damage_taken = Column(Integer, nullable=False, default=0)
+    
+    # 治疗量之和
+    healing = Column(Integer, nullable=False, default=0)
+    
+    # 对局时长之和（秒）
+    duration = Column(Integer, nullable=False, default=0)
+    
+    # KDA之和
+    kda = Column(Float, nullable=False, default=0.0)
+    
+    # 参团率之和
+    participation_rate = Column(Float, nullable=False, default=0.0)
+    
+    # 最后更新时间
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
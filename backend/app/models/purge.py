@@ -0,0 +1,97 @@
+# 导入SQLAlchemy的Column类，用于定义表的列
+# Column是ORM中定义字段的基本单位
+from sqlalchemy import Column, String, DateTime, Text, Integer
+
+# 导入datetime类，用于处理日期时间
+from datetime import datetime
+
+# 导入Base基类，所有ORM模型都继承自Base
+from app.core.database import Base
+
+
+class PurgeJob(Base):
+    """
+    数据清除任务模型
+
+    表示一次在后台分批执行的用户数据删除
+
+    数据库表名: purge_jobs
+
+    主要功能:
+        - 记录删除范围和删除进度
+        - 记录删除开始时的数据边界，任务完成前边界内的数据对用户不可见
+        - 应用重启后继续执行未完成的任务
+
+    字段说明:
+        id: 任务唯一标识符
+        user_id: 被清除数据的用户ID
+        scope: 删除范围（history: 对话历史，all: 用户全部数据）
+        status: 任务状态（pending: 等待中，running: 执行中，completed: 已完成，failed: 失败）
+        conversation_watermark: 需要删除的最大对话ID（不删除任务创建后的新对话）
+        match_cutoff: 需要删除的对局的最晚创建时间（scope为all时有效）
+        total_conversations: 需要删除的对话数量（任务创建时统计）
+        total_matches: 需要删除的对局数量（任务创建时统计）
+        deleted_conversations: 已删除的对话数量
+        deleted_matches: 已删除的对局数量
+        deleted_analyses: 已删除的分析报告数量
+        error: 失败原因
+        created_at: 任务创建时间
+        finished_at: 任务完成时间
+    """
+
+    # ==================== 表定义 ====================
+
+    # 指定数据库表名
+    __tablename__ = "purge_jobs"
+
+    # ==================== 主键字段 ====================
+
+    # 任务ID，主键
+    # String(50): UUID字符串
+    id = Column(String(50), primary_key=True, index=True)
+
+    # ==================== 任务字段 ====================
+
+    # 用户ID
+    # index=True: 读取对话、对局时按用户查询未完成的任务
+    user_id = Column(String(50), nullable=False, index=True)
+
+    # 删除范围
+    # 可选值: "history"（对话历史）, "all"（用户全部数据）
+    scope = Column(String(20), nullable=False)
+
+    # 任务状态
+    # 可选值: "pending", "running", "completed", "failed"
+    status = Column(String(20), default="pending", index=True)
+
+    # ==================== 数据边界字段 ====================
+
+    # 需要删除的最大对话ID
+    # 任务完成前，ID不大于该值的对话对用户不可见
+    conversation_watermark = Column(Integer, default=0)
+
+    # 需要删除的对局的最晚创建时间
+    # 任务完成前，不晚于该时间的对局对用户不可见
+    match_cutoff = Column(DateTime)
+
+    # ==================== 进度字段 ====================
+
+    # 需要删除的记录数量（任务创建时统计）
+    total_conversations = Column(Integer, default=0)
+    total_matches = Column(Integer, default=0)
+
+    # 已删除的记录数量
+    deleted_conversations = Column(Integer, default=0)
+    deleted_matches = Column(Integer, default=0)
+    deleted_analyses = Column(Integer, default=0)
+
+    # 失败原因
+    error = Column(Text)
+
+    # ==================== 时间戳字段 ====================
+
+    # 任务创建时间
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # 任务完成时间
+    finished_at = Column(DateTime)
@@ -14,6 +14,7 @@
     - match: 对局相关的数据验证模型
     - analysis: 分析相关的数据验证模型
     - user: 用户相关的数据验证模型
+    - equipment: 装备合成树和升级路线的数据验证模型
 
 技术栈:
     - Pydantic: 数据验证和序列化库
@@ -88,6 +88,8 @@ class ChatResponse(BaseModel):
         confidence: 意图识别的置信度
         suggestions: 相关建议列表
         related_heroes: 相关英雄ID列表
+        ticket_id: 回答凭据ID（AI超时返回快速回答时才有值）
+        is_final: 是否为最终回答（False表示完整回答仍在后台生成）
     """
     
     # AI回复内容
@@ -122,6 +124,17 @@ class ChatResponse(BaseModel):
     # 用途: 提供相关的英雄推荐
     # 示例: [1, 2, 3]
     related_heroes: Optional[List[int]] = []
+    
+    # 回答凭据ID
+    # Optional[str]: 可选的字符串类型，默认为None
+    # 用途: AI未在时间预算内完成时，用该凭据获取完整回答
+    # 示例: "3f2a9c..."
+    ticket_id: Optional[str] = None
+    
+    # 是否为最终回答
+    # bool: 布尔类型，默认为True
+    # 用途: False表示当前是快速回答，完整回答仍在后台生成
+    is_final: bool = True
 
 
 class MessageHistory(BaseModel):
@@ -229,3 +242,107 @@ class IntentResult(BaseModel):
     #   "skill": "大招"
     # }
     entities: Dict[str, Any]
+
+
+class AnswerTicket(BaseModel):
+    """
+    回答凭据模型
+    
+    用于查询后台生成中的完整AI回答
+    
+    功能:
+        - 表示后台回答的生成状态
+        - 完成后携带完整的AI回答
+    
+    使用场景:
+        - 聊天回复超时后，前端轮询获取完整回答
+    
+    字段说明:
+        ticket_id: 凭据ID
+        status: 状态（pending: 生成中，completed: 已完成，failed: 失败）
+        conversation_id: 对应的对话记录ID
+        intent: 识别的意图类型
+        response: 完整的AI回答（完成后才有值，失败时为最终的降级回答）
+    """
+    
+    # 凭据ID
+    ticket_id: str
+    
+    # 生成状态
+    # 示例: "pending"、"completed"、"failed"
+    status: str
+    
+    # 对应的对话记录ID
+    conversation_id: int
+    
+    # 识别的意图类型
+    intent: str
+    
+    # 完整的AI回答
+    # 生成中时为None，失败时为已写回对话记录的降级回答
+    response: Optional[str] = None
+
+
+class HeroDialogueRequest(BaseModel):
+    """
+    英雄角色扮演请求模型
+    
+    用于接收与英雄对话的消息
+    
+    使用场景:
+        - 娱乐互动中的英雄语音对话
+    
+    字段说明:
+        hero_name: 英雄名称（必填）
+        message: 用户消息内容（必填）
+    """
+    
+    # 英雄名称
+    # 示例: "鲁班七号"
+    hero_name: str
+    
+    # 用户消息内容
+    # 示例: "你好"
+    message: str
+
+
+class HeroDialogueResponse(BaseModel):
+    """
+    英雄角色扮演响应模型
+    
+    用于返回英雄的角色扮演回复
+    
+    字段说明:
+        hero_name: 英雄名称
+        response: 英雄的回复
+    """
+    
+    # 英雄名称
+    hero_name: str
+    
+    # 英雄的回复
+    response: str
+
+
+class ChatSearchResponse(BaseModel):
+    """
+    对话搜索响应模型
+    
+    字段说明:
+        total: 匹配的对话总数
+        page: 当前页码（从1开始）
+        page_size: 每页数量
+        results: 当前页的对话记录（按相关度排序）
+    """
+    
+    # 匹配的对话总数
+    total: int
+    
+    # 当前页码
+    page: int
+    
+    # 每页数量
+    page_size: int
+    
+    # 当前页的对话记录
+    results: List[MessageHistory]
@@ -0,0 +1,295 @@
+# 导入Pydantic的BaseModel和Field类
+# BaseModel: 创建数据验证和序列化模型
+# Field: 为字段提供额外的验证和元数据
+from pydantic import BaseModel, Field
+
+# 导入类型提示
+from typing import Any, Dict, List, Optional
+
+
+class EquipmentSummary(BaseModel):
+    """
+    装备列表项模型
+
+    用于装备列表和装备搜索
+
+    字段说明:
+        id: 装备ID
+        name: 装备名称
+        type: 装备类型
+        price: 装备价格
+        stats: 装备属性
+    """
+
+    # 装备ID
+    id: int
+
+    # 装备名称
+    name: str
+
+    # 装备类型
+    # 示例: "攻击装备"、"法术装备"、"防御装备"、"移动装备"
+    type: Optional[str] = None
+
+    # 装备价格
+    price: int = 0
+
+    # 装备属性
+    # 示例: {"物理攻击": 120, "暴击率": 20}
+    stats: Dict[str, Any] = Field(default_factory=dict)
+
+
+class EquipmentSearchResult(EquipmentSummary):
+    """
+    装备搜索结果模型
+
+    字段说明:
+        score: 相关度得分（完全匹配 > 前缀匹配 > 中间匹配，汉字匹配 > 拼音匹配）
+    """
+
+    # 相关度得分
+    score: float
+
+
+class EquipmentDetail(EquipmentSummary):
+    """
+    装备详情模型
+
+    字段说明:
+        passive: 被动技能描述
+        active: 主动技能描述
+        build_from: 合成所需的装备（[{"id": 1, "name": "铁剑"}]）
+        build_into: 可以合成的装备（[{"id": 10, "name": "无尽战刃"}]）
+        version: 游戏版本
+    """
+
+    # 被动技能描述
+    passive: Optional[str] = None
+
+    # 主动技能描述
+    active: Optional[str] = None
+
+    # 合成所需的装备
+    build_from: List[Dict[str, Any]] = Field(default_factory=list)
+
+    # 可以合成的装备
+    build_into: List[Dict[str, Any]] = Field(default_factory=list)
+
+    # 游戏版本
+    version: Optional[str] = None
+
+
+class EquipmentTreeNode(BaseModel):
+    """
+    装备合成树节点模型
+
+    用于返回一件装备的完整合成树
+
+    使用场景:
+        - 查看大件装备由哪些小件合成
+        - 计算装备的合成总花费
+
+    字段说明:
+        id: 装备ID
+        name: 装备名称
+        price: 装备价格（总价）
+        combine_cost: 合成费用（总价减去直接配件的价格）
+        total_cost: 从基础装备开始购买的总花费（合成费用与所有配件花费之和）
+        components: 直接配件的合成树（同一配件需要多个时重复出现）
+    """
+
+    # 装备ID
+    id: int
+
+    # 装备名称
+    name: str
+
+    # 装备价格
+    price: int
+
+    # 合成费用
+    combine_cost: int
+
+    # 从基础装备开始购买的总花费
+    total_cost: int
+
+    # 直接配件的合成树
+    components: List["EquipmentTreeNode"] = Field(default_factory=list)
+
+
+class UpgradePlanRequest(BaseModel):
+    """
+    升级路线请求模型
+
+    用于根据目标出装、已有装备和当前金币计算购买顺序
+
+    使用场景:
+        - "我有1500金币下一步买什么"
+        - 计算补全出装还需要多少金币
+
+    字段说明:
+        targets: 目标出装（装备名称，按购买优先级排序）
+        inventory: 已有装备（装备名称，可以是配件）
+        gold: 当前金币，为空表示不限金币（返回完整的购买路线）
+    """
+
+    # 目标出装
+    # 示例: ["无尽战刃", "破晓"]
+    targets: List[str] = Field(min_length=1, max_length=6)
+
+    # 已有装备
+    # 示例: ["暴风巨剑"]
+    inventory: List[str] = Field(default_factory=list, max_length=6)
+
+    # 当前金币
+    gold: Optional[int] = Field(default=None, ge=0)
+
+
+class PurchaseStep(BaseModel):
+    """
+    购买步骤模型
+
+    字段说明:
+        name: 购买的装备名称
+        cost: 实际花费（已有配件自动抵扣）
+        price: 装备价格
+        target: 该步骤服务的目标装备
+        completes_target: 是否直接买下目标装备
+    """
+
+    # 购买的装备名称
+    name: str
+
+    # 实际花费
+    cost: int
+
+    # 装备价格
+    price: int
+
+    # 该步骤服务的目标装备
+    target: str
+
+    # 是否直接买下目标装备
+    completes_target: bool
+
+
+class UpgradePlan(BaseModel):
+    """
+    升级路线响应模型
+
+    用于返回按顺序的购买步骤和剩余花费
+
+    字段说明:
+        purchases: 购买步骤（第一步就是下一步要买的装备）
+        spent: 本次购买的总花费
+        gold_left: 购买后剩余的金币（不限金币时为None）
+        remaining_cost: 完成全部目标出装还需要的金币
+        completed: 已经完成的目标装备
+        unknown: 装备数据中不存在的目标装备
+    """
+
+    # 购买步骤
+    purchases: List[PurchaseStep]
+
+    # 本次购买的总花费
+    spent: int
+
+    # 购买后剩余的金币
+    gold_left: Optional[int]
+
+    # 完成全部目标出装还需要的金币
+    remaining_cost: int
+
+    # 已经完成的目标装备
+    completed: List[str]
+
+    # 装备数据中不存在的目标装备
+    unknown: List[str] = Field(default_factory=list)
+
+
+class BuildOptimizeRequest(BaseModel):
+    """
+    金币预算出装优化请求模型
+
+    用于在金币预算内选择目标出装中的装备和配件
+
+    字段说明:
+        targets: 目标出装（装备名称）
+        gold: 金币预算
+    """
+
+    # 目标出装
+    # 示例: ["无尽战刃", "破晓", "急速战靴"]
+    targets: List[str] = Field(min_length=1, max_length=6)
+
+    # 金币预算
+    gold: int = Field(ge=0, le=30000)
+
+
+class OptimizedPurchase(BaseModel):
+    """
+    优化后的购买项模型
+
+    字段说明:
+        name: 装备名称
+        cost: 花费（从基础装备开始购买的总花费）
+        target: 该装备所属的目标装备
+        completes_target: 是否为目标装备本身
+        value: 属性价值（按属性权重折算）
+        efficiency: 每1000金币的属性价值
+    """
+
+    # 装备名称
+    name: str
+
+    # 花费
+    cost: int
+
+    # 该装备所属的目标装备
+    target: str
+
+    # 是否为目标装备本身
+    completes_target: bool
+
+    # 属性价值
+    value: float
+
+    # 每1000金币的属性价值
+    efficiency: float
+
+
+class BuildOptimization(BaseModel):
+    """
+    金币预算出装优化响应模型
+
+    字段说明:
+        purchases: 购买项（按每金币属性价值降序，即推荐的购买顺序）
+        spent: 总花费
+        gold_left: 剩余金币
+        value: 总属性价值
+        stats: 购买后获得的属性总和
+        unknown: 装备数据中不存在的目标装备
+        elapsed_ms: 计算耗时（毫秒）
+    """
+
+    # 购买项
+    purchases: List[OptimizedPurchase]
+
+    # 总花费
+    spent: int
+
+    # 剩余金币
+    gold_left: int
+
+    # 总属性价值
+    value: float
+
+    # 购买后获得的属性总和
+    # 示例: {"物理攻击": 160, "暴击率": 20}
+    stats: Dict[str, float]
+
+    # 装备数据中不存在的目标装备
+    unknown: List[str] = Field(default_factory=list)
+
+    # 计算耗时（毫秒）
+    elapsed_ms: float
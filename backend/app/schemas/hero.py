@@ -1,7 +1,8 @@
 # 导入Pydantic的BaseModel和Field类
 # BaseModel: 创建数据验证和序列化模型
 # Field: 为字段提供额外的验证和元数据
-from pydantic import BaseModel, Field
+# model_validator: 定义跨字段的验证规则
+from pydantic import BaseModel, Field, model_validator
 
 # 导入类型提示
 from typing import List, Optional, Dict, Any
@@ -159,6 +160,29 @@ class HeroResponse(BaseModel):
         from_attributes = True
 
 
+class HeroSearchResult(HeroResponse):
+    """
+    英雄搜索结果模型
+    
+    在英雄基本信息的基础上增加匹配信息，用于搜索框的输入提示
+    
+    字段说明:
+        score: 匹配得分（越高越相关）
+        matched_field: 匹配的字段（name: 名称，alias: 别名，title: 称号，skill: 技能，description: 描述）
+        matched_text: 匹配的原文（如匹配到的技能名称）
+    """
+    
+    # 匹配得分
+    score: float
+    
+    # 匹配的字段
+    matched_field: Optional[str] = None
+    
+    # 匹配的原文
+    # 示例: 搜索"hqs"时为"火球术"
+    matched_text: Optional[str] = None
+
+
 class HeroDetailResponse(BaseModel):
     """
     英雄详情响应模型（完整版）
@@ -451,3 +475,515 @@ class BPSuggestion(BaseModel):
     # 用途: 当前阵容的综合评分
     # 示例: "S"、"A"、"B"、"C"、"D"
     overall_rating: str
+
+
+class DraftRequest(BaseModel):
+    """
+    选人推荐请求模型
+    
+    用于接收当前的选人状态
+    
+    使用场景:
+        - BP阶段请求选人和禁用推荐
+    
+    字段说明:
+        our_picks: 我方已选英雄
+        enemy_picks: 敌方已选英雄
+        bans: 双方已禁用的英雄
+        first_pick: 我方是否为先选方
+        top_k: 推荐数量
+    
+    验证规则:
+        - 每方最多5个英雄，同一方不能重复
+        - 同一个英雄不能同时出现在双方
+        - 最多禁用10个英雄
+        - 不符合时返回422错误
+    """
+    
+    # 我方已选英雄
+    # 示例: ["亚瑟", "妲己"]
+    our_picks: List[str] = Field(default_factory=list, max_length=5)
+    
+    # 敌方已选英雄
+    # 示例: ["后羿"]
+    enemy_picks: List[str] = Field(default_factory=list, max_length=5)
+    
+    # 双方已禁用的英雄（最多10个，每方5个）
+    bans: List[str] = Field(default_factory=list, max_length=10)
+    
+    # 我方是否为先选方
+    # 决定后续选人轮次（1-2-2-2-2-1）
+    first_pick: bool = True
+    
+    # 推荐数量
+    top_k: int = Field(default=5, ge=1, le=20)
+    
+    @model_validator(mode="after")
+    def check_picks(self):
+        """
+        检查双方已选英雄：同一方不能重复，双方不能选择同一个英雄
+        """
+        for side, picks in (("我方", self.our_picks), ("敌方", self.enemy_picks)):
+            if len(set(picks)) != len(picks):
+                raise ValueError(f"{side}已选英雄重复")
+        
+        overlap = set(self.our_picks) & set(self.enemy_picks)
+        if overlap:
+            raise ValueError(f"双方不能选择同一个英雄: {'、'.join(sorted(overlap))}")
+        return self
+
+
+class DraftCandidate(BaseModel):
+    """
+    选人推荐项模型
+    
+    字段说明:
+        hero_id: 英雄ID
+        hero_name: 英雄名称
+        position: 英雄位置
+        win_rate: 英雄胜率
+        score: 推荐评分（选人为搜索到的最好阵容评分，禁用为敌方选择该英雄的收益）
+    """
+    
+    # 英雄ID
+    hero_id: int
+    
+    # 英雄名称
+    hero_name: str
+    
+    # 英雄位置
+    position: Optional[str]
+    
+    # 英雄胜率
+    win_rate: float
+    
+    # 推荐评分，越高越推荐
+    score: float
+
+
+class DraftSuggestion(BaseModel):
+    """
+    选人推荐响应模型
+    
+    用于返回选人推荐、禁用推荐和搜索统计
+    
+    使用场景:
+        - BP阶段的选人和禁用推荐
+    
+    字段说明:
+        picks: 选人推荐（按评分降序）
+        bans: 禁用推荐（按评分降序）
+        depth: 完成搜索的选人步数
+        nodes: 搜索生成的节点数量
+        elapsed_ms: 搜索耗时（毫秒）
+        complete: 是否在时间预算内完成全部搜索
+    """
+    
+    # 选人推荐
+    picks: List[DraftCandidate]
+    
+    # 禁用推荐
+    bans: List[DraftCandidate]
+    
+    # 完成搜索的选人步数
+    depth: int
+    
+    # 搜索生成的节点数量
+    nodes: int
+    
+    # 搜索耗时（毫秒）
+    elapsed_ms: float
+    
+    # 是否在时间预算内完成全部搜索
+    # False表示超时，结果来自最后一层完整搜索
+    complete: bool
+
+
+class DraftEvent(BaseModel):
+    """
+    选人事件模型
+    
+    用于向选人会话提交一次选人或禁用
+    
+    字段说明:
+        action: 操作类型（pick: 选人，ban: 禁用）
+        hero_name: 英雄名称
+        side: 选人的一方（our: 我方，enemy: 敌方），禁用时忽略
+    """
+    
+    # 操作类型
+    # 可选值: "pick", "ban"
+    action: str = Field(pattern="^(pick|ban)$")
+    
+    # 英雄名称
+    hero_name: str
+    
+    # 选人的一方
+    # 可选值: "our", "enemy"
+    side: str = Field(default="our", pattern="^(our|enemy)$")
+
+
+class DraftSessionResponse(BaseModel):
+    """
+    选人会话响应模型
+    
+    用于返回选人会话的当前状态和推荐
+    
+    字段说明:
+        session_id: 会话ID
+        first_pick: 我方是否为先选方
+        our_picks: 我方已选英雄
+        enemy_picks: 敌方已选英雄
+        bans: 已禁用英雄
+        next_side: 下一个选人的一方（our / enemy），选人结束为None
+        suggestion: 当前推荐
+    """
+    
+    # 会话ID
+    session_id: str
+    
+    # 我方是否为先选方
+    first_pick: bool
+    
+    # 我方已选英雄
+    our_picks: List[str]
+    
+    # 敌方已选英雄
+    enemy_picks: List[str]
+    
+    # 已禁用英雄
+    bans: List[str]
+    
+    # 下一个选人的一方
+    next_side: Optional[str]
+    
+    # 当前推荐
+    suggestion: DraftSuggestion
+
+
+class HeroStatsLine(BaseModel):
+    """
+    英雄对局统计项模型
+    
+    用于返回某个英雄在某个段位、位置下的对局统计
+    
+    字段说明:
+        rank: 段位大类（"全部"表示所有段位）
+        position: 位置（空字符串表示所有位置）
+        games: 对局数
+        wins: 胜场数
+        win_rate: 胜率
+        pick_rate: 选用率（按每局10名玩家折算）
+        avg_kills / avg_deaths / avg_assists: 场均击杀、死亡、助攻
+        avg_kda: 场均KDA
+        avg_gold / avg_damage / avg_damage_taken / avg_healing: 场均经济、伤害、承伤、治疗
+        avg_duration: 平均对局时长（秒）
+        avg_participation_rate: 平均参团率
+    """
+    
+    # 段位大类
+    rank: str
+    
+    # 位置
+    position: str
+    
+    # 对局数
+    games: int
+    
+    # 胜场数
+    wins: int
+    
+    # 胜率
+    win_rate: float
+    
+    # 选用率
+    pick_rate: float
+    
+    # 场均击杀
+    avg_kills: float
+    
+    # 场均死亡
+    avg_deaths: float
+    
+    # 场均助攻
+    avg_assists: float
+    
+    # 场均KDA
+    avg_kda: float
+    
+    # 场均经济
+    avg_gold: float
+    
+    # 场均输出伤害
+    avg_damage: float
+    
+    # 场均承受伤害
+    avg_damage_taken: float
+    
+    # 场均治疗量
+    avg_healing: float
+    
+    # 平均对局时长（秒）
+    avg_duration: float
+    
+    # 平均参团率
+    avg_participation_rate: float
+
+
+class HeroMatchStatsResponse(BaseModel):
+    """
+    英雄对局统计响应模型
+    
+    用于返回由对局数据实时汇总的英雄统计
+    
+    字段说明:
+        hero_id: 英雄ID
+        hero_name: 英雄名称
+        live: 对局数是否达到阈值（达到后英雄接口和BP建议使用对局统计的胜率和选用率）
+        overall: 所有段位、所有位置的汇总（没有对局时为None）
+        breakdown: 按段位、位置细分的统计（对局数降序）
+    """
+    
+    # 英雄ID
+    hero_id: int
+    
+    # 英雄名称
+    hero_name: str
+    
+    # 对局数是否达到阈值
+    live: bool
+    
+    # 汇总统计
+    overall: Optional[HeroStatsLine] = None
+    
+    # 细分统计
+    breakdown: List[HeroStatsLine] = Field(default_factory=list)
+
+
+class TierListEntry(BaseModel):
+    """
+    版本强势英雄榜条目模型
+    
+    字段说明:
+        hero_id: 英雄ID
+        hero_name: 英雄名称
+        position: 英雄定位
+        tier: 强度梯队（T0最强，依次为T1、T2、T3、T4）
+        score: 综合评分（平滑后的胜率、选用率、禁用率标准化后加权）
+        win_rate: 平滑后的胜率
+        pick_rate: 平滑后的选用率
+        ban_rate: 禁用率
+        games: 对局数
+    """
+    
+    # 英雄ID
+    hero_id: int
+    
+    # 英雄名称
+    hero_name: str
+    
+    # 英雄定位
+    position: Optional[str] = None
+    
+    # 强度梯队
+    # 示例: "T0"、"T1"
+    tier: str
+    
+    # 综合评分
+    score: float
+    
+    # 平滑后的胜率
+    win_rate: float
+    
+    # 平滑后的选用率
+    pick_rate: float
+    
+    # 禁用率
+    ban_rate: float
+    
+    # 对局数
+    games: int
+
+
+class TierListResponse(BaseModel):
+    """
+    版本强势英雄榜响应模型
+    
+    字段说明:
+        rank: 段位大类（"全部"表示所有段位）
+        position: 位置（空字符串表示所有位置）
+        version: 榜单版本号（每次重新计算递增）
+        updated_at: 计算时间
+        games: 该段位、位置的对局总数
+        heroes: 按综合评分降序的英雄
+    """
+    
+    # 段位大类
+    rank: str
+    
+    # 位置
+    position: str
+    
+    # 榜单版本号
+    version: int
+    
+    # 计算时间
+    updated_at: datetime
+    
+    # 对局总数
+    games: int
+    
+    # 英雄列表
+    heroes: List[TierListEntry]
+
+
+class HeroRelationEntry(BaseModel):
+    """
+    英雄关系条目模型
+    
+    字段说明:
+        hero_id: 英雄ID
+        hero_name: 英雄名称
+        position: 英雄定位
+        weight: 关系权重（多个英雄时为权重之和）
+    """
+    
+    # 英雄ID
+    hero_id: int
+    
+    # 英雄名称
+    hero_name: str
+    
+    # 英雄定位
+    position: Optional[str] = None
+    
+    # 关系权重
+    # 两边英雄数据都记录了克制关系时为1，只有一边记录时为0.5
+    weight: float
+
+
+class HeroRelationsResponse(BaseModel):
+    """
+    英雄克制关系响应模型
+    
+    由英雄关系表生成，克制和被克制两个方向始终一致
+    
+    字段说明:
+        hero_id: 英雄ID
+        hero_name: 英雄名称
+        counters: 被该英雄克制的英雄（按权重降序）
+        countered_by: 克制该英雄的英雄（按权重降序）
+    """
+    
+    # 英雄ID
+    hero_id: int
+    
+    # 英雄名称
+    hero_name: str
+    
+    # 被该英雄克制的英雄
+    counters: List[HeroRelationEntry]
+    
+    # 克制该英雄的英雄
+    countered_by: List[HeroRelationEntry]
+
+
+class CommonCountersResponse(BaseModel):
+    """
+    共同克制者响应模型
+    
+    用于返回同时克制所有指定英雄的英雄
+    
+    字段说明:
+        heroes: 参与查询的英雄名称
+        unknown: 英雄表中没有的名称（不参与查询）
+        counters: 同时克制所有英雄的英雄（按权重之和降序）
+    """
+    
+    # 参与查询的英雄名称
+    heroes: List[str]
+    
+    # 未知的英雄名称
+    unknown: List[str] = []
+    
+    # 共同克制者
+    counters: List[HeroRelationEntry]
+
+
+class CounterPickRequest(BaseModel):
+    """
+    克制阵容推荐请求模型
+    
+    字段说明:
+        enemy_heroes: 敌方英雄
+        positions: 只推荐这些定位的英雄（为空表示不限）
+        pool: 只从这些英雄中推荐（如我方还能选的英雄，为空表示不限）
+        exclude: 不参与推荐的英雄（如已选、已禁用的英雄）
+        top_k: 推荐数量
+    """
+    
+    # 敌方英雄
+    # 示例: ["后羿", "妲己", "程咬金"]
+    enemy_heroes: List[str]
+    
+    # 定位过滤
+    # 示例: ["mage", "assassin"]
+    positions: List[str] = Field(default_factory=list)
+    
+    # 可选英雄
+    pool: Optional[List[str]] = None
+    
+    # 排除的英雄
+    exclude: List[str] = Field(default_factory=list)
+    
+    # 推荐数量
+    top_k: int = Field(default=5, ge=1, le=20)
+
+
+class CounterPick(BaseModel):
+    """
+    克制阵容推荐项模型
+    
+    字段说明:
+        hero_id: 英雄ID
+        hero_name: 英雄名称
+        position: 英雄定位
+        score: 克制权重之和
+        countered: 该英雄克制的敌方英雄
+    """
+    
+    # 英雄ID
+    hero_id: int
+    
+    # 英雄名称
+    hero_name: str
+    
+    # 英雄定位
+    position: Optional[str] = None
+    
+    # 克制权重之和
+    score: float
+    
+    # 克制的敌方英雄
+    # 示例: ["妲己", "程咬金"]
+    countered: List[str]
+
+
+class CounterPickResponse(BaseModel):
+    """
+    克制阵容推荐响应模型
+    
+    字段说明:
+        enemy_heroes: 参与计算的敌方英雄
+        unknown: 英雄表中没有的名称（不参与计算）
+        picks: 推荐的英雄（按克制权重之和降序）
+    """
+    
+    # 参与计算的敌方英雄
+    enemy_heroes: List[str]
+    
+    # 未知的英雄名称
+    unknown: List[str] = []
+    
+    # 推荐的英雄
+    picks: List[CounterPick]
@@ -10,6 +10,9 @@ from pydantic import BaseModel
 # Any: 任意类型
 from typing import List, Optional, Dict, Any
 
+# 导入datetime类，用于处理日期时间
+from datetime import datetime
+
 
 class UserProfile(BaseModel):
     """
@@ -195,3 +198,44 @@ class UserCreate(BaseModel):
     # 用途: 用户头像图片的链接地址
     # 如果不提供，可以使用默认头像
     avatar: Optional[str] = None
+
+
+
+class PurgeJobStatus(BaseModel):
+    """
+    数据清除任务状态模型
+    
+    用于返回后台删除任务的进度
+    
+    使用场景:
+        - 清除对话历史、清除用户数据后查询删除进度
+    
+    字段说明:
+        id: 任务ID
+        user_id: 用户ID
+        scope: 删除范围（history: 对话历史，all: 用户全部数据）
+        status: 任务状态（pending, running, completed, failed）
+        total_conversations: 需要删除的对话数量
+        total_matches: 需要删除的对局数量
+        deleted_conversations: 已删除的对话数量
+        deleted_matches: 已删除的对局数量
+        deleted_analyses: 已删除的分析报告数量
+        progress: 完成比例（0.0-1.0）
+        error: 失败原因
+        created_at: 任务创建时间
+        finished_at: 任务完成时间
+    """
+    
+    id: str
+    user_id: str
+    scope: str
+    status: str
+    total_conversations: int = 0
+    total_matches: int = 0
+    deleted_conversations: int = 0
+    deleted_matches: int = 0
+    deleted_analyses: int = 0
+    progress: float = 0.0
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -16,6 +16,28 @@
     - match_service: 对局服务
     - analysis_service: 分析服务
     - user_service: 用户服务
+    - answer_ticket_service: 回答凭据服务，管理超时后在后台补全的AI回答
+    - persona_service: 英雄人设服务，预编译角色扮演提示词和回复池
+    - chat_session_service: WebSocket聊天会话和在线连接管理
+    - suggestion_prefetch_service: 建议预计算服务，提前生成建议按钮的回答
+    - knowledge_service: 英雄知识检索服务，为AI提示词检索相关的英雄资料
+    - hero_data_watcher: 英雄数据监视器，数据变化后重新加载内存缓存
+    - chat_search_service: 对话搜索服务，维护每个用户的对话倒排索引
+    - data_purge_service: 数据清除服务，在后台分批删除对话历史和用户数据
+    - hero_catalog: 英雄目录，内存中的不可变英雄数据快照
+    - counter_matrix: 英雄克制矩阵，向量化计算克制得分
+    - draft_engine: 选人推荐引擎，在时间预算内束搜索后续选人
+    - draft_session_service: 选人会话服务，逐个接收选人事件并增量更新推荐
+    - hero_search_service: 英雄搜索服务，支持别名、技能名称和拼音首字母的输入提示
+    - build_recommendation_service: 出装铭文推荐服务，维护按英雄、段位、位置预排序的物化推荐表
+    - equipment_graph: 装备合成图，查询合成树、总花费和出装升级路线
+    - build_optimizer: 金币预算出装优化器，在目标出装的合成树上做背包动态规划
+    - equipment_catalog: 装备目录，内存中按名称、类型、价格索引的装备数据快照
+    - hero_stats_service: 英雄对局统计服务，导入和删除对局时增量维护英雄的对局数、胜率和场均数据
+    - tier_list_service: 版本强势英雄榜服务，按段位大类和位置向量化计算平滑后的强势英雄榜
+    - hero_version_service: 英雄数据版本服务，导入时写入新版本、计算差异并在一个事务中切换生效版本
+    - hero_data_loader: 英雄数据导入器，从数据文件批量导入英雄、装备、出装和铭文，按内容哈希跳过未变化的记录
+    - hero_relation_service: 英雄关系服务，由英雄的克制列表迁移生成按英雄ID索引的克制关系表，提供邻接索引和倒排列表查询
 
 设计模式:
     - 服务层模式（Service Layer）
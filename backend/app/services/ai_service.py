@@ -3,12 +3,39 @@
 # Optional: 可选类型（可以为None）
 # Dict: 字典类型
 # Any: 任意类型
-from typing import List, Optional, Dict, Any
+# AsyncIterator: 异步迭代器类型（流式回复）
+from typing import List, Optional, Dict, Any, AsyncIterator
+
+# 导入异步IO模块
+# 智谱AI的SDK是同步调用，需要放到线程中执行，避免阻塞事件循环
+import asyncio
+
+# 导入线程模块，用于通知读取流式回复的线程提前停止
+import threading
 
 # 导入配置设置
 # settings: 应用配置，包含API密钥等敏感信息
 from app.core.config import settings
 
+# 导入英雄人设服务
+# persona_service: 预编译的英雄人设提示词、回复池和回复缓存
+from app.services.persona_service import persona_service
+
+# 导入英雄知识检索服务
+# knowledge_service: 检索与问题相关的英雄、出装、铭文和装备资料
+from app.services.knowledge_service import knowledge_service
+
+# 导入英雄目录
+# hero_catalog: 内存中的英雄、出装和铭文数据，快速回答直接使用
+from app.services.hero_catalog import hero_catalog
+
+
+# 快速回答引用的资料条数
+FAST_RESPONSE_FACTS = 3
+
+# 可以用英雄资料回答的意图（其他意图没有对应的数据，使用模板回答）
+DATA_INTENTS = ("equipment", "inscription", "unknown")
+
 
 class AIService:
     """
@@ -187,54 +214,149 @@ class AIService:
         # 如果意图不在映射中，返回未知意图的回复
         return mock_responses.get(intent, mock_responses["unknown"])
     
-    async def generate_response(
+    def get_fast_response(
         self,
         message: str,
         intent: str,
-        context: List[Dict[str, Any]],
-        hero_id: Optional[int] = None
+        pending: bool = True,
+        hero_id: Optional[int] = None,
+        hero_name: Optional[str] = None
     ) -> str:
         """
-        生成AI回复
+        获取快速回答
         
         参数:
             message: 用户的消息内容
             intent: 识别的意图类型
-            context: 对话上下文列表
+            pending: 完整回答是否在后台继续生成（有回答凭据时为True）
             hero_id: 关联的英雄ID（可选）
+            hero_name: 消息中提到的英雄名称（可选）
         
         返回:
-            str: AI生成的回复内容
+            str: 快速回答
         
         功能:
-            - 使用AI模型生成回复
-            - 支持对话上下文
-            - 处理模拟模式
+            - 在AI无法按时回复时，立即给出一个有用的回答
+            - 优先使用内存中的英雄出装、铭文和检索到的资料，没有数据时使用意图模板
+            - 完整回答在后台生成时，提示用户稍候
+        
+        使用场景:
+            - 聊天回复超过时间预算（移动端超时较短）
+            - AI调用失败时的降级回答（pending=False，不会有完整回答，不加提示）
+        """
+        # 基于数据的回答，没有数据时使用意图模板
+        response = self._data_response(message, intent, hero_id, hero_name) or \
+            self._get_mock_response(message, intent)
+        
+        # 完整回答生成中时加上提示
+        if pending:
+            response += "\n\n（完整回答生成中，请稍候…）"
+        return response
+    
+    def _data_response(
+        self,
+        message: str,
+        intent: str,
+        hero_id: Optional[int],
+        hero_name: Optional[str]
+    ) -> Optional[str]:
+        """
+        使用英雄目录和知识检索生成回答（私有方法）
+        
+        参数:
+            message: 用户的消息内容
+            intent: 识别的意图类型
+            hero_id: 关联的英雄ID（可选）
+            hero_name: 消息中提到的英雄名称（可选）
+        
+        返回:
+            Optional[str]: 回答，没有相关数据时返回None
         
         业务逻辑:
-            1. 如果使用模拟模式，返回预设回复
-            2. 构建消息列表（包含系统提示词）
-            3. 添加对话上下文
-            4. 添加当前用户消息和意图信息
-            5. 调用AI API生成回复
-            6. 返回AI回复
+            1. 按英雄ID、英雄名称或消息中出现的英雄名称确定英雄
+            2. 询问出装、铭文时直接使用该英雄的推荐（已按胜率排序）
+            3. 其他可以用资料回答的问题，返回检索到的前几条资料
+        """
+        if intent not in DATA_INTENTS:
+            return None
+        
+        # 确定英雄
+        hero = None
+        snapshot = hero_catalog.snapshot()
+        if snapshot is not None:
+            if hero_id is not None:
+                hero = snapshot.details.get(hero_id)
+            if hero is None and hero_name:
+                hero = snapshot.by_name.get(hero_name)
+            if hero is None:
+                # 消息中出现的最长的英雄名称
+                names = [name for name in snapshot.by_name if name in message]
+                if names:
+                    hero = snapshot.by_name[max(names, key=len)]
+        
+        if hero is not None and intent == "equipment":
+            names = []
+            for build in snapshot.list_equipment(hero.id, None):
+                for item in build.equipment_list or []:
+                    if item.get("name") and item["name"] not in names:
+                        names.append(item["name"])
+            if names:
+                return f"{hero.name}推荐出装：{'、'.join(names[:6])}。后期可以根据对局情况调整防御装。"
+        
+        if hero is not None and intent == "inscription":
+            inscriptions = snapshot.list_inscriptions(hero.id, None)[:2]
+            if inscriptions:
+                lines = [f"{hero.name}推荐铭文："]
+                for ins in inscriptions:
+                    name = (ins["inscription_config"] or {}).get("name") or ins["inscription_name"]
+                    lines.append(f"• {name}" + (f"：{ins['description']}" if ins["description"] else ""))
+                return "\n".join(lines)
+        
+        # 检索到的资料
+        facts = knowledge_service.search(
+            message, hero_id=hero.id if hero is not None else None, top_k=FAST_RESPONSE_FACTS
+        )
+        if facts:
+            return "相关资料：\n" + "\n".join(f"• {fact}" for fact in facts)
+        return None
+    
+    def _build_messages(
+        self,
+        message: str,
+        intent: str,
+        context: List[Dict[str, Any]],
+        hero_id: Optional[int] = None
+    ) -> List[Dict[str, str]]:
+        """
+        构建发送给AI模型的消息列表
         
-        异步处理:
-            - async: 异步方法，不阻塞主线程
-            - await: 等待AI API的响应
+        参数:
+            message: 用户的消息内容
+            intent: 识别的意图类型
+            context: 对话上下文列表
+            hero_id: 关联的英雄ID（可选）
         
-        错误处理:
-            - 如果API调用失败，返回错误信息
+        返回:
+            List[Dict[str, str]]: 消息列表
+        
+        私有方法:
+            - 普通回复和流式回复共用
+        
+        参考资料:
+            - 系统提示词后附带检索到的最相关的KNOWLEDGE_TOP_K条英雄资料
         """
-        # 如果使用模拟模式，返回预设的模拟回复
-        if self.use_mock:
-            return self._get_mock_response(message, intent)
+        # 检索与问题相关的资料
+        # 附加到系统提示词中，AI依据真实数据回答，无需编造
+        system_prompt = self.system_prompt
+        facts = knowledge_service.search(message, hero_id=hero_id)
+        if facts:
+            system_prompt += "\n参考资料（回答时优先依据以下数据）：\n" + "\n".join(f"- {fact}" for fact in facts)
         
         # 构建消息列表
         # 消息列表用于传递给AI模型
         messages = [
-            # 添加系统提示词
-            {"role": "system", "content": self.system_prompt},
+            # 添加系统提示词（附带参考资料）
+            {"role": "system", "content": system_prompt},
         ]
         
         # 添加对话上下文
@@ -258,10 +380,64 @@ class AIService:
             "content": f"{message}{context_info}"
         })
         
+        return messages
+    
+    async def generate_response(
+        self,
+        message: str,
+        intent: str,
+        context: List[Dict[str, Any]],
+        hero_id: Optional[int] = None,
+        fallback_on_error: bool = True
+    ) -> str:
+        """
+        生成AI回复
+        
+        参数:
+            message: 用户的消息内容
+            intent: 识别的意图类型
+            context: 对话上下文列表
+            hero_id: 关联的英雄ID（可选）
+            fallback_on_error: API调用失败时是否返回错误提示（False时抛出异常，由调用方处理）
+        
+        返回:
+            str: AI生成的回复内容
+        
+        功能:
+            - 使用AI模型生成回复
+            - 支持对话上下文
+            - 处理模拟模式
+        
+        业务逻辑:
+            1. 如果使用模拟模式，返回预设回复
+            2. 构建消息列表（包含系统提示词）
+            3. 添加对话上下文
+            4. 添加当前用户消息和意图信息
+            5. 调用AI API生成回复
+            6. 返回AI回复
+        
+        异步处理:
+            - async: 异步方法，不阻塞主线程
+            - await: 等待AI API的响应
+        
+        错误处理:
+            - 如果API调用失败，返回错误信息
+            - fallback_on_error为False时抛出异常
+        """
+        # 如果使用模拟模式，返回预设的模拟回复
+        if self.use_mock:
+            return self._get_mock_response(message, intent)
+        
+        # 构建消息列表
+        # 包含系统提示词、对话上下文和当前用户消息
+        messages = self._build_messages(message, intent, context, hero_id)
+        
         # 尝试调用AI API生成回复
         try:
             # 调用智谱AI的chat.completions接口
-            response = self.client.chat.completions.create(
+            # SDK是同步调用，放到线程中执行，避免阻塞事件循环
+            response = await asyncio.to_thread(
+                self.client.chat.completions.create,
                 # 使用GLM-4模型
                 model="glm-4",
                 # 传递消息列表
@@ -276,14 +452,134 @@ class AIService:
             # 返回AI生成的回复
             return response.choices[0].message.content
         except Exception as e:
+            # 调用方要求自行处理错误时，直接抛出
+            if not fallback_on_error:
+                raise
             # 如果API调用失败，返回错误信息
             return f"抱歉，助手暂时离线，请稍后再试。错误：{str(e)}"
     
+    async def stream_response(
+        self,
+        message: str,
+        intent: str,
+        context: List[Dict[str, Any]],
+        hero_id: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        流式生成AI回复
+        
+        参数:
+            message: 用户的消息内容
+            intent: 识别的意图类型
+            context: 对话上下文列表
+            hero_id: 关联的英雄ID（可选）
+        
+        返回:
+            AsyncIterator[str]: 逐段产出的回复文本
+        
+        功能:
+            - 边生成边返回回复内容，用于WebSocket实时展示
+            - 处理模拟模式（按小段切分模拟回复）
+        
+        业务逻辑:
+            1. 如果使用模拟模式，把模拟回复切成小段依次产出
+            2. 构建消息列表
+            3. 在线程中调用流式API，通过队列把片段交给事件循环
+            4. 依次产出片段，直到结束
+        
+        错误处理:
+            - 如果API调用失败，产出错误信息后结束
+        
+        提前结束:
+            - 调用方提前关闭迭代器（如客户端断开连接）时，通知线程停止读取，不等待上游流式回复结束
+        """
+        # 如果使用模拟模式，把模拟回复切成小段依次产出
+        if self.use_mock:
+            reply = self._get_mock_response(message, intent)
+            for i in range(0, len(reply), 8):
+                yield reply[i:i + 8]
+                # 让出事件循环，模拟逐段到达
+                await asyncio.sleep(0)
+            return
+        
+        # 构建消息列表
+        messages = self._build_messages(message, intent, context, hero_id)
+        
+        # 事件循环和片段队列
+        # 线程中产生的片段通过队列交给事件循环
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        # 停止信号: 调用方提前结束时设置，线程读到下一个片段时停止
+        stop = threading.Event()
+        
+        def post(item):
+            """
+            把片段交给事件循环（已停止时丢弃）
+            """
+            if not stop.is_set():
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+        
+        def produce():
+            """
+            在线程中读取流式API的片段
+            """
+            try:
+                # 调用智谱AI的流式接口
+                chunks = self.client.chat.completions.create(
+                    model="glm-4",
+                    messages=messages,
+                    temperature=settings.AI_TEMPERATURE,
+                    top_p=settings.AI_TOP_P,
+                    max_tokens=settings.AI_MAX_TOKENS,
+                    stream=True
+                )
+                for chunk in chunks:
+                    # 调用方已提前结束，停止读取
+                    if stop.is_set():
+                        break
+                    # 取出本片段的文本
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        post(delta)
+            except Exception as e:
+                # 把异常交给事件循环处理
+                post(e)
+            finally:
+                # None表示结束
+                post(None)
+        
+        # 在线程池中启动读取
+        producer = loop.run_in_executor(None, produce)
+        
+        # 线程是否已经读完
+        finished = False
+        
+        try:
+            while True:
+                item = await queue.get()
+                # 结束
+                if item is None:
+                    finished = True
+                    break
+                # 调用失败，产出错误信息后结束
+                if isinstance(item, Exception):
+                    yield f"抱歉，助手暂时离线，请稍后再试。错误：{str(item)}"
+                    break
+                yield item
+        finally:
+            if finished:
+                # 线程已经读完，等待它退出
+                await producer
+            else:
+                # 提前结束（调用方关闭迭代器或出错）: 通知线程停止，不等待上游流式回复结束
+                stop.set()
+    
     async def generate_hero_dialogue(
         self,
         hero_name: str,
         message: str
-    ) -> str:
+    ) -> Optional[str]:
         """
         生成英雄角色扮演对话
         
@@ -292,7 +588,7 @@ class AIService:
             message: 用户的消息内容
         
         返回:
-            str: 英雄角色扮演的回复
+            Optional[str]: 英雄角色扮演的回复，英雄没有人设（不存在）时返回None
         
         功能:
             - 使用AI模型生成英雄角色扮演对话
@@ -300,10 +596,12 @@ class AIService:
             - 处理模拟模式
         
         业务逻辑:
-            1. 如果使用模拟模式，返回预设的对话
-            2. 构建英雄角色提示词
-            3. 调用AI API生成对话
-            4. 返回英雄对话
+            1. 英雄没有人设时返回None（接口返回404）
+            2. 如果是打招呼等常见问题，直接返回预生成的回复
+            3. 如果问题已被回答过，返回缓存的回复
+            4. 如果使用模拟模式，返回预设的对话
+            5. 使用预编译的英雄人设提示词调用AI API生成对话
+            6. 缓存并返回英雄对话
         
         异步处理:
             - async: 异步方法，不阻塞主线程
@@ -314,6 +612,20 @@ class AIService:
             - 英雄角色扮演
             - 个性化对话体验
         """
+        # 英雄不存在（没有预编译的人设）
+        if not persona_service.has_persona(hero_name):
+            return None
+        
+        # 常见问题（打招呼、技能、定位、克制）直接从回复池返回
+        instant_reply = persona_service.get_instant_reply(hero_name, message)
+        if instant_reply:
+            return instant_reply
+        
+        # 重复的问题直接返回缓存的回复
+        cached_reply = persona_service.get_cached_reply(hero_name, message)
+        if cached_reply:
+            return cached_reply
+        
         # 如果使用模拟模式，返回预设的英雄对话
         if self.use_mock:
             # 定义不同英雄的对话映射表
@@ -331,10 +643,9 @@ class AIService:
             # 如果英雄不在映射中，返回默认对话
             return hero_dialogues.get(hero_name, f"我是{hero_name}，很高兴认识你！")
         
-        # 构建英雄角色提示词
-        # 提示AI以特定英雄的身份和风格回答
-        hero_prompt = f"""你现在是王者荣耀英雄{hero_name}，请用该英雄的语音风格和语气回答用户的问题。
-保持角色设定，使用符合英雄性格的语言风格。"""
+        # 获取预编译的英雄人设提示词
+        # 包含英雄称号、定位、背景和技能，启动时已构建好
+        hero_prompt = persona_service.get_prompt(hero_name)
         
         # 构建消息列表
         messages = [
@@ -347,7 +658,9 @@ class AIService:
         # 尝试调用AI API生成对话
         try:
             # 调用智谱AI的chat.completions接口
-            response = self.client.chat.completions.create(
+            # SDK是同步调用，放到线程中执行，避免阻塞事件循环
+            response = await asyncio.to_thread(
+                self.client.chat.completions.create,
                 # 使用GLM-4模型
                 model="glm-4",
                 # 传递消息列表
@@ -357,8 +670,14 @@ class AIService:
                 # 设置最大token数
                 max_tokens=500
             )
+            # 获取AI生成的英雄对话
+            reply = response.choices[0].message.content
+            
+            # 缓存回复，相同问题再次出现时直接返回
+            persona_service.cache_reply(hero_name, message, reply)
+            
             # 返回AI生成的英雄对话
-            return response.choices[0].message.content
+            return reply
         except Exception as e:
             # 如果API调用失败，返回友好的错误信息
             return f"抱歉，{hero_name}现在不在线~"
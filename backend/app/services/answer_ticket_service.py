@@ -0,0 +1,277 @@
+# 导入类型提示
+# Optional: 可选类型（可以为None）
+# Callable: 可调用对象类型
+# List: 列表类型
+from typing import Callable, List, Optional
+
+# 导入异步IO模块，用于后台等待AI回答
+import asyncio
+
+# 导入uuid模块，用于生成凭据ID
+import uuid
+
+# 导入进程内缓存，用于暂存凭据
+from app.core.cache import TTLCache
+
+# 导入配置设置
+from app.core.config import settings
+
+# 导入日志记录器
+from app.core.logger import get_logger
+
+# 导入会话工厂
+# 后台任务在请求结束后运行，不能复用请求的数据库会话
+from app.core.database import SessionLocal
+
+# 导入对话模型
+from app.models.conversation import Conversation
+
+# 导入回答凭据的Schema
+from app.schemas.chat import AnswerTicket
+
+# 导入对话搜索服务，完整回答写回后更新索引
+from app.services.chat_search_service import chat_search_service
+
+
+# 日志记录器
+logger = get_logger(__name__)
+
+
+class _PendingAnswer:
+    """
+    待完成回答的内部状态
+
+    字段说明:
+        ticket_id: 凭据ID
+        user_id: 用户ID
+        conversation_id: 对应的对话记录ID
+        intent: 识别的意图类型
+        status: 状态（pending: 生成中，completed: 已完成，failed: 失败）
+        response: 完整的AI回答（完成后才有值，失败时为最终的降级回答）
+        fallback: 生成失败时写回对话记录的最终回答（不带"完整回答生成中"的提示）
+        done: 完成事件，用于等待回答
+        task: 后台任务的引用，防止任务被垃圾回收
+    """
+
+    # 限定属性，减少大量凭据时的内存占用
+    __slots__ = (
+        "ticket_id", "user_id", "conversation_id", "intent", "status", "response", "fallback", "done", "task"
+    )
+
+    def __init__(self, ticket_id: str, user_id: str, conversation_id: int, intent: str, fallback: str):
+        self.ticket_id = ticket_id
+        self.user_id = user_id
+        self.conversation_id = conversation_id
+        self.intent = intent
+        self.status = "pending"
+        self.response = None
+        self.fallback = fallback
+        self.done = asyncio.Event()
+        self.task = None
+
+    def to_schema(self) -> AnswerTicket:
+        """
+        转换为响应模型
+        """
+        return AnswerTicket(
+            ticket_id=self.ticket_id,
+            status=self.status,
+            conversation_id=self.conversation_id,
+            intent=self.intent,
+            response=self.response
+        )
+
+
+class AnswerTicketService:
+    """
+    回答凭据服务类
+
+    负责管理"先返回快速回答，后台补全AI回答"的凭据
+
+    主要功能:
+        - 为超时的AI回答创建凭据
+        - 在后台等待AI回答完成
+        - 完成后更新数据库中的对话记录
+        - 提供凭据查询和等待（长轮询）
+        - 回答完成时通知监听者（如WebSocket推送）
+
+    设计说明:
+        - 凭据保存在进程内存中，有过期时间
+        - 后台任务持有AI回答任务的引用，请求结束后继续执行
+
+    使用场景:
+        - 移动端超时较短，AI回答较慢时的降级处理
+    """
+
+    def __init__(self):
+        """
+        初始化凭据服务
+        """
+        # 凭据存储: ticket_id -> _PendingAnswer
+        self._tickets = TTLCache(max_size=10000, ttl=settings.CHAT_TICKET_TTL)
+        
+        # 回答完成的监听者列表
+        # 每个监听者是异步函数: (user_id, AnswerTicket) -> None
+        self._listeners: List[Callable] = []
+
+    def add_listener(self, listener: Callable):
+        """
+        注册回答完成的监听者
+
+        参数:
+            listener: 异步函数，参数为(user_id, AnswerTicket)
+        """
+        self._listeners.append(listener)
+
+    def create(
+        self,
+        answer_task: "asyncio.Task",
+        user_id: str,
+        conversation_id: int,
+        intent: str,
+        fallback: str
+    ) -> str:
+        """
+        创建回答凭据
+
+        参数:
+            answer_task: 正在生成AI回答的异步任务
+            user_id: 用户ID
+            conversation_id: 已保存的对话记录ID（当前内容为快速回答）
+            intent: 识别的意图类型
+            fallback: 生成失败时写回对话记录的最终回答
+
+        返回:
+            str: 凭据ID
+
+        业务逻辑:
+            1. 生成凭据ID并保存待完成状态
+            2. 启动后台任务等待AI回答
+        """
+        # 生成凭据ID
+        ticket_id = uuid.uuid4().hex
+
+        # 保存待完成状态
+        pending = _PendingAnswer(ticket_id, user_id, conversation_id, intent, fallback)
+        self._tickets.set(ticket_id, pending)
+
+        # 启动后台任务，等待AI回答完成后更新对话记录
+        pending.task = asyncio.create_task(self._complete(pending, answer_task))
+
+        return ticket_id
+
+    def get(self, ticket_id: str) -> Optional[AnswerTicket]:
+        """
+        查询凭据状态
+
+        参数:
+            ticket_id: 凭据ID
+
+        返回:
+            Optional[AnswerTicket]: 凭据状态，不存在或已过期返回None
+        """
+        pending = self._tickets.get(ticket_id)
+        return pending.to_schema() if pending else None
+
+    async def wait(self, ticket_id: str, timeout: float) -> Optional[AnswerTicket]:
+        """
+        等待凭据完成（长轮询）
+
+        参数:
+            ticket_id: 凭据ID
+            timeout: 最长等待时间（秒）
+
+        返回:
+            Optional[AnswerTicket]: 凭据状态（超时后返回当前状态），不存在返回None
+        """
+        pending = self._tickets.get(ticket_id)
+
+        # 凭据不存在
+        if pending is None:
+            return None
+
+        # 等待完成或超时
+        if timeout > 0 and not pending.done.is_set():
+            try:
+                await asyncio.wait_for(pending.done.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        return pending.to_schema()
+
+    async def _complete(self, pending: _PendingAnswer, answer_task: "asyncio.Task"):
+        """
+        后台等待AI回答并更新对话记录
+
+        参数:
+            pending: 待完成状态
+            answer_task: 正在生成AI回答的异步任务
+
+        业务逻辑:
+            1. 等待AI回答完成
+            2. 成功时更新数据库中的对话记录
+            3. 失败时把对话记录中"完整回答生成中"的快速回答改写为最终的降级回答，标记凭据失败
+            4. 通知等待者
+            5. 回答成功时通知监听者
+        """
+        try:
+            # 等待AI回答
+            answer = await answer_task
+
+            # 在线程中更新数据库，避免阻塞事件循环
+            await asyncio.to_thread(self._save_answer, pending.user_id, pending.conversation_id, answer)
+
+            # 标记完成
+            pending.response = answer
+            pending.status = "completed"
+        except Exception as e:
+            # AI回答失败，对话记录改写为最终的降级回答（不再提示完整回答生成中）
+            pending.status = "failed"
+            pending.response = pending.fallback
+            logger.warning("后台生成回答失败: %s", e)
+            try:
+                await asyncio.to_thread(self._save_answer, pending.user_id, pending.conversation_id, pending.fallback)
+            except Exception as e:
+                logger.error("写回降级回答失败: %s", e)
+        finally:
+            # 通知所有等待者
+            pending.done.set()
+
+        # 回答成功时通知监听者（如推送给用户的WebSocket连接）
+        if pending.status == "completed":
+            for listener in self._listeners:
+                try:
+                    await listener(pending.user_id, pending.to_schema())
+                except Exception as e:
+                    logger.warning("回答完成通知失败: %s", e)
+
+    def _save_answer(self, user_id: str, conversation_id: int, answer: str):
+        """
+        将完整回答写回对话记录，并更新对话搜索索引
+
+        参数:
+            user_id: 用户ID
+            conversation_id: 对话记录ID
+            answer: 完整的AI回答
+        """
+        # 后台任务使用独立的数据库会话
+        db = SessionLocal()
+        try:
+            db.query(Conversation).filter(
+                Conversation.id == conversation_id
+            ).update({Conversation.ai_response: answer})
+            db.commit()
+
+            # 用完整回答替换索引中的快速回答
+            user_message = db.query(Conversation.user_message).filter(
+                Conversation.id == conversation_id
+            ).scalar()
+            if user_message is not None:
+                chat_search_service.add(user_id, conversation_id, user_message, answer)
+        finally:
+            db.close()
+
+
+# 创建全局凭据服务实例
+# 聊天服务和API端点共享同一个实例
+answer_ticket_service = AnswerTicketService()
@@ -0,0 +1,238 @@
+# 导入类型提示
+# Dict: 字典类型
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+from typing import Dict, List, Optional
+
+# 导入time模块，用于统计计算耗时
+import time
+
+# 导入numpy，用于向量化计算属性价值和背包动态规划
+import numpy as np
+
+# 导入配置设置
+from app.core.config import settings
+
+# 导入装备合成图
+from app.services.equipment_graph import EquipmentGraph
+
+# 导入装备相关的Schema
+from app.schemas.equipment import BuildOptimization, OptimizedPurchase
+
+
+def _max_plus(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    (max, +)卷积: result[k] = max(a[k - j] + b[j])
+
+    参数:
+        a: 第一组选择在每个花费下的最大价值（不可达为-inf）
+        b: 第二组选择在每个花费下的最大价值（不可达为-inf）
+
+    说明:
+        - 只遍历b中可达的花费，每次用一次向量运算更新整行，
+          子树的可达花费很少，复杂度接近O(预算)
+    """
+    size = len(a)
+    result = np.full(size, -np.inf)
+    for j in np.flatnonzero(np.isfinite(b)):
+        np.maximum(result[j:], a[:size - j] + b[j], out=result[j:])
+    return result
+
+
+class BuildOptimizer:
+    """
+    金币预算出装优化器
+
+    在金币预算内，从目标出装的合成树中选择要购买的装备和配件，使获得的属性价值最大
+
+    主要功能:
+        - 按整个装备目录的属性分布计算属性权重，折算每件装备的属性价值（向量化）
+        - 树形背包动态规划：每个节点可以整件购买，或者只购买其中一部分配件
+        - 按每金币属性价值排序，给出购买顺序
+
+    设计说明:
+        - 属性权重 = 1 / 该属性在装备目录中的中位数，一件典型装备的某项属性约折算为1
+        - 金币按BUILD_GOLD_STEP离散化，花费向上取整，结果不会超出预算
+        - 选中的装备在合成树中互不包含（整件购买时配件已经合成进去），可以按任意顺序购买
+
+    使用场景:
+        - "我只有3000金币，这套出装先买哪些"
+    """
+
+    def optimize(
+        self,
+        graph: EquipmentGraph,
+        targets: List[str],
+        gold: int,
+        items: Optional[Dict[str, dict]] = None
+    ) -> BuildOptimization:
+        """
+        在金币预算内优化购买方案
+
+        参数:
+            graph: 装备合成图
+            targets: 目标出装（装备名称）
+            gold: 金币预算
+            items: 合成图中不存在的装备（名称 -> {"price": 价格, "stats": 属性}），按没有配件的装备处理
+
+        返回:
+            BuildOptimization: 购买项（推荐顺序）、花费和获得的属性
+
+        业务逻辑:
+            1. 展开目标装备的合成树，每个节点对应一次可能的购买
+            2. 用属性矩阵一次计算所有节点的属性价值
+            3. 自底向上计算每个子树在每个花费下的最大价值，再合并所有目标装备
+            4. 取预算内价值最大（相同时花费最少）的方案，回溯出选中的节点
+        """
+        started = time.perf_counter()
+        step = settings.BUILD_GOLD_STEP
+        size = len(graph.names)
+
+        # 合成图中不存在的装备，下标接在合成图的装备之后
+        extras = [name for name in items or {} if name not in graph.index]
+        extra_index = {name: size + k for k, name in enumerate(extras)}
+
+        def lookup(name: str) -> Optional[int]:
+            return graph.index.get(name, extra_index.get(name))
+
+        def name_of(i: int) -> str:
+            return graph.names[i] if i < size else extras[i - size]
+
+        def stats_of(i: int) -> Dict[str, float]:
+            return graph.stats[i] if i < size else items[extras[i - size]].get("stats") or {}
+
+        unknown = [name for name in targets if lookup(name) is None]
+
+        # 展开合成树: 节点 -> (装备下标, 子节点, 所属目标)
+        node_items: List[int] = []
+        node_children: List[List[int]] = []
+        node_targets: List[str] = []
+
+        def expand(i: int, target: str) -> int:
+            node = len(node_items)
+            node_items.append(i)
+            node_children.append([])
+            node_targets.append(target)
+            for c in graph.components[i] if i < size else ():
+                node_children[node].append(expand(c, target))
+            return node
+
+        roots = [expand(lookup(name), name) for name in targets if lookup(name) is not None]
+
+        # 属性矩阵: 装备目录 + 合成图中不存在的装备
+        extra_stats = sorted({
+            key for name in extras for key, value in (items[name].get("stats") or {}).items()
+            if key not in graph.stat_names and isinstance(value, (int, float))
+        })
+        stat_names = list(graph.stat_names) + extra_stats
+        columns = {key: k for k, key in enumerate(stat_names)}
+        catalog = np.zeros((size + len(extras), len(stat_names)))
+        catalog[:size, :len(graph.stat_names)] = graph.stat_matrix
+        for k, name in enumerate(extras):
+            for key, value in (items[name].get("stats") or {}).items():
+                if isinstance(value, (int, float)):
+                    catalog[size + k, columns[key]] = value
+
+        # 属性权重（向量化）: 1 / 正值的中位数
+        positive = np.where(catalog > 0, catalog, np.nan)
+        weights = np.zeros(len(stat_names))
+        present = ~np.isnan(positive).all(axis=0)
+        if present.any():
+            weights[present] = 1.0 / np.nanmedian(positive[:, present], axis=0)
+
+        # 所有节点的属性价值和花费（向量化）
+        node_index = np.array(node_items, dtype=np.intp)
+        values = catalog[node_index] @ weights
+        prices = np.array([
+            graph.total_costs[i] if i < size else items[extras[i - size]].get("price") or 0
+            for i in node_items
+        ], dtype=np.int64)
+        units = -(-prices // step)
+
+        # 树形背包: f[节点][k] = 子树中花费k个单位时的最大价值
+        budget = gold // step
+        empty = np.full(budget + 1, -np.inf)
+        empty[0] = 0.0
+        best: Dict[int, np.ndarray] = {}
+        prefixes: Dict[int, List[np.ndarray]] = {}
+        buy: Dict[int, bool] = {}
+
+        def combine(children: List[int]) -> List[np.ndarray]:
+            """
+            依次合并子树，返回每一步的前缀结果（用于回溯）
+            """
+            result = [empty]
+            for child in children:
+                result.append(_max_plus(result[-1], best[child]))
+            return result
+
+        for node in reversed(range(len(node_items))):
+            # 子节点的下标都大于父节点，倒序遍历保证子树先计算
+            prefixes[node] = combine(node_children[node])
+            f = prefixes[node][-1].copy()
+            cost = units[node]
+            buy[node] = cost <= budget and values[node] >= f[cost] and (cost > 0 or values[node] > 0)
+            if buy[node]:
+                f[cost] = values[node]
+            best[node] = f
+
+        root_prefixes = combine(roots)
+        total = root_prefixes[-1]
+        spend = int(np.argmax(total))
+
+        # 回溯选中的节点
+        chosen: List[int] = []
+
+        def backtrack(children: List[int], parts: List[np.ndarray], k: int):
+            for position in reversed(range(len(children))):
+                child = children[position]
+                previous, f = parts[position], best[child]
+                j = int(np.argmax(previous[k::-1] + f[:k + 1]))
+                pick(child, j)
+                k -= j
+
+        def pick(node: int, k: int):
+            if buy[node] and k == units[node] and best[node][k] == values[node]:
+                chosen.append(node)
+                return
+            if k == 0:
+                return
+            backtrack(node_children[node], prefixes[node], k)
+
+        backtrack(roots, root_prefixes, spend)
+
+        # 购买顺序: 每金币属性价值降序，相同时按目标顺序
+        chosen.sort(key=lambda node: (-values[node] / max(prices[node], 1), node))
+        purchases = [
+            OptimizedPurchase(
+                name=name_of(node_items[node]),
+                cost=int(prices[node]),
+                target=node_targets[node],
+                completes_target=node in roots,
+                value=round(float(values[node]), 3),
+                efficiency=round(float(values[node]) * 1000 / max(int(prices[node]), 1), 3)
+            )
+            for node in chosen
+        ]
+
+        stats: Dict[str, float] = {}
+        for node in chosen:
+            for key, value in stats_of(node_items[node]).items():
+                if isinstance(value, (int, float)):
+                    stats[key] = stats.get(key, 0) + value
+
+        spent = sum(purchase.cost for purchase in purchases)
+        return BuildOptimization(
+            purchases=purchases,
+            spent=spent,
+            gold_left=gold - spent,
+            value=round(float(sum(values[node] for node in chosen)), 3),
+            stats=stats,
+            unknown=unknown,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 3)
+        )
+
+
+# 创建全局出装优化器实例
+# 优化器本身没有状态，API端点和脚本共享同一个实例
+build_optimizer = BuildOptimizer()
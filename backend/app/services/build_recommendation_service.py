@@ -0,0 +1,261 @@
+# 导入类型提示
+# Dict: 字典类型
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+# Tuple: 元组类型
+from typing import Dict, List, Optional, Tuple
+
+# 导入hashlib和json模块，用于计算推荐表内容的摘要
+import hashlib
+import json
+
+# 导入datetime类，用于记录生成时间
+from datetime import datetime
+
+# 导入Session类
+# Session: SQLAlchemy的数据库会话，用于与数据库交互
+from sqlalchemy.orm import Session
+
+# 导入英雄相关的模型
+from app.models.hero import HeroEquipment, HeroInscription, HeroBuildRecommendation
+
+
+# 汇总行的段位和位置
+ALL_RANKS = "全部"
+ALL_POSITIONS = ""
+
+
+def equipment_sort_key(item) -> Tuple[float, float, int]:
+    """
+    出装推荐的排序键：胜率降序、选用率降序，相同时按ID
+
+    参数:
+        item: 出装推荐（HeroEquipment或EquipmentResponse）
+    """
+    return (-(item.win_rate or 0.0), -(item.pick_rate or 0.0), item.id)
+
+
+def inscription_sort_key(item) -> Tuple[float, int]:
+    """
+    铭文推荐的排序键：胜率降序，相同时按ID
+
+    参数:
+        item: 铭文推荐（HeroInscription）
+    """
+    return (-(item.win_rate or 0.0), item.id)
+
+
+def equipment_to_dict(eq: HeroEquipment) -> dict:
+    """
+    出装推荐转换为字典（与EquipmentResponse字段一致）
+    """
+    return {
+        "id": eq.id,
+        "rank": eq.rank,
+        "position": eq.position,
+        "equipment_list": eq.equipment_list or [],
+        "win_rate": eq.win_rate,
+        "pick_rate": eq.pick_rate
+    }
+
+
+def inscription_to_dict(ins: HeroInscription) -> dict:
+    """
+    铭文推荐转换为字典（与铭文接口返回一致）
+    """
+    return {
+        "id": ins.id,
+        "rank": ins.rank,
+        "inscription_name": ins.inscription_name,
+        "inscription_config": ins.inscription_config,
+        "description": ins.description,
+        "win_rate": ins.win_rate
+    }
+
+
+class BuildRecommendationService:
+    """
+    出装铭文推荐服务类
+
+    负责生成和查询物化的出装铭文推荐表（hero_build_recommendations）
+
+    主要功能:
+        - 数据导入后，把出装和铭文推荐按(英雄, 段位, 位置)汇总并排好序，整体重建推荐表
+        - 应用启动和数据变化时检查推荐表，内容与出装、铭文数据一致时不写数据库
+        - 按(英雄, 段位, 位置)点查推荐结果
+
+    设计说明:
+        - 段位"全部"的行汇总所有段位，位置为空的行汇总所有位置，
+          与接口"段位为空或全部时不过滤"的语义一致
+        - 重建在一个事务中完成（先删除再批量插入），读者不会看到一半的数据
+        - 查询命中唯一组合索引，一次查询返回排好序的列表，不需要扫描和排序
+
+    使用场景:
+        - 英雄出装推荐、铭文推荐接口（英雄目录未加载时）
+        - 数据导入脚本导入完成后重建
+        - 英雄数据监视器加载时检查（refresh）
+    """
+
+    def refresh(self, db: Session) -> int:
+        """
+        检查推荐表，内容过期时重建
+
+        参数:
+            db: 数据库会话对象
+
+        返回:
+            int: 重建时返回生成的推荐记录数量，内容一致时返回0
+
+        业务逻辑:
+            1. 按出装和铭文数据生成推荐行（只读）
+            2. 与推荐表现有内容的摘要比较（不比较生成时间）
+            3. 摘要一致时直接返回，不删除、不写入；不一致时重建
+
+        注意:
+            - 数据导入已经在出装、铭文变化时重建推荐表，这里只是兜底，
+              应用启动时数据一致则不产生任何写操作
+        """
+        rows = self._build_rows(db)
+        stored = [
+            {
+                "hero_id": row.hero_id,
+                "rank": row.rank,
+                "position": row.position,
+                "equipment": row.equipment or [],
+                "inscriptions": row.inscriptions or []
+            }
+            for row in db.query(HeroBuildRecommendation).all()
+        ]
+        if self._digest(rows) == self._digest(stored):
+            return 0
+
+        return self._write(db, rows)
+
+    def rebuild(self, db: Session) -> int:
+        """
+        重建推荐表
+
+        参数:
+            db: 数据库会话对象
+
+        返回:
+            int: 生成的推荐记录数量
+
+        业务逻辑:
+            1. 读取全部出装和铭文推荐，按排序键排序
+            2. 按(英雄, 段位, 位置)分组，同时生成段位汇总和位置汇总
+            3. 删除旧记录，批量插入新记录，提交事务
+        """
+        return self._write(db, self._build_rows(db))
+
+    def _build_rows(self, db: Session) -> List[dict]:
+        """
+        按出装和铭文数据生成推荐行（私有方法，只读）
+
+        参数:
+            db: 数据库会话对象
+
+        返回:
+            List[dict]: 推荐行，按(英雄ID, 段位, 位置)排序，不含生成时间
+        """
+        equipments = sorted(db.query(HeroEquipment).all(), key=equipment_sort_key)
+        inscriptions = sorted(db.query(HeroInscription).all(), key=inscription_sort_key)
+
+        # 出装推荐: (英雄ID, 段位, 位置) -> 排好序的列表
+        # 每条推荐同时属于具体段位/位置和汇总行，排序后依次追加，各分组内仍然有序
+        equipment_groups: Dict[Tuple[int, str, str], List[dict]] = {}
+        for eq in equipments:
+            item = equipment_to_dict(eq)
+            for rank in {eq.rank or ALL_RANKS, ALL_RANKS}:
+                for position in {eq.position or ALL_POSITIONS, ALL_POSITIONS}:
+                    equipment_groups.setdefault((eq.hero_id, rank, position), []).append(item)
+
+        # 铭文推荐: (英雄ID, 段位) -> 排好序的列表
+        inscription_groups: Dict[Tuple[int, str], List[dict]] = {}
+        for ins in inscriptions:
+            item = inscription_to_dict(ins)
+            for rank in {ins.rank or ALL_RANKS, ALL_RANKS}:
+                inscription_groups.setdefault((ins.hero_id, rank), []).append(item)
+
+        # 铭文只保存在位置汇总行中
+        keys = set(equipment_groups)
+        keys.update((hero_id, rank, ALL_POSITIONS) for hero_id, rank in inscription_groups)
+
+        return [
+            {
+                "hero_id": hero_id,
+                "rank": rank,
+                "position": position,
+                "equipment": equipment_groups.get((hero_id, rank, position), []),
+                "inscriptions": inscription_groups.get((hero_id, rank), []) if position == ALL_POSITIONS else []
+            }
+            for hero_id, rank, position in sorted(keys)
+        ]
+
+    def _write(self, db: Session, rows: List[dict]) -> int:
+        """
+        删除旧记录并批量插入推荐行，在一个事务中提交（私有方法）
+
+        参数:
+            db: 数据库会话对象
+            rows: 推荐行
+
+        返回:
+            int: 写入的推荐记录数量
+        """
+        now = datetime.utcnow()
+        rows = [{**row, "updated_at": now} for row in rows]
+
+        try:
+            db.query(HeroBuildRecommendation).delete(synchronize_session=False)
+            if rows:
+                # 传入字典列表时SQLAlchemy按executemany批量插入
+                db.bulk_insert_mappings(HeroBuildRecommendation, rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        return len(rows)
+
+    @staticmethod
+    def _digest(rows: List[dict]) -> str:
+        """
+        计算推荐行的摘要（与行的顺序无关）
+        """
+        lines = sorted(json.dumps(row, ensure_ascii=False, sort_keys=True, default=str) for row in rows)
+        return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+    def get(
+        self,
+        hero_id: int,
+        rank: Optional[str],
+        position: Optional[str],
+        db: Session
+    ) -> Optional[HeroBuildRecommendation]:
+        """
+        按(英雄, 段位, 位置)查询推荐
+
+        参数:
+            hero_id: 英雄ID
+            rank: 段位，为空表示全部段位
+            position: 位置，为空表示全部位置
+            db: 数据库会话对象
+
+        返回:
+            Optional[HeroBuildRecommendation]: 推荐记录，没有推荐时返回None
+        """
+        return (
+            db.query(HeroBuildRecommendation)
+            .filter(
+                HeroBuildRecommendation.hero_id == hero_id,
+                HeroBuildRecommendation.rank == (rank or ALL_RANKS),
+                HeroBuildRecommendation.position == (position or ALL_POSITIONS)
+            )
+            .first()
+        )
+
+
+# 创建全局出装铭文推荐服务实例
+# 导入脚本和英雄服务共享同一个实例
+build_recommendation_service = BuildRecommendationService()
@@ -0,0 +1,288 @@
+# 导入类型提示
+# Dict: 字典类型
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+# Tuple: 元组类型
+from typing import Dict, List, Optional, Tuple
+
+# 导入数学模块，用于计算IDF
+import math
+
+# 导入计数器，用于统计词频
+from collections import Counter
+
+# 导入线程锁，索引可能同时被请求线程和后台任务修改
+from threading import Lock
+
+# 导入Session类
+# Session: SQLAlchemy的数据库会话，用于与数据库交互
+from sqlalchemy.orm import Session
+
+# 导入进程内缓存，用于保存最近使用的用户索引
+from app.core.cache import TTLCache
+
+# 导入配置设置
+from app.core.config import settings
+
+# 导入字符二元组切分函数
+from app.core.text import char_bigrams, query_bigrams
+
+# 导入对话模型
+from app.models.conversation import Conversation
+
+
+# BM25参数（与英雄知识检索相同）
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+class _UserIndex:
+    """
+    单个用户的对话倒排索引
+
+    字段说明:
+        postings: 倒排表，词项 -> {对话ID: 词频}
+        doc_terms: 对话ID -> 词频计数（更新或删除对话时使用）
+        doc_lengths: 对话ID -> 词项数量
+        total_length: 所有对话的词项总数（计算平均长度）
+        max_id: 从数据库补齐到的最大对话ID（用于补齐其他进程写入的对话）
+        lock: 互斥锁
+    """
+
+    __slots__ = ("postings", "doc_terms", "doc_lengths", "total_length", "max_id", "lock")
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.doc_terms: Dict[int, Counter] = {}
+        self.doc_lengths: Dict[int, int] = {}
+        self.total_length = 0
+        self.max_id = 0
+        self.lock = Lock()
+
+    def add(self, conversation_id: int, user_message: str, ai_response: Optional[str], from_db: bool = False):
+        """
+        添加（或替换）一条对话
+
+        参数:
+            conversation_id: 对话记录ID
+            user_message: 用户消息
+            ai_response: AI回复
+            from_db: 是否为从数据库补齐的对话（只有补齐时才推进max_id，
+                     避免本进程写入的对话跳过其他进程写入的较小ID）
+        """
+        with self.lock:
+            self._remove(conversation_id)
+            terms = Counter(char_bigrams(user_message) + char_bigrams(ai_response or ""))
+            for term, tf in terms.items():
+                self.postings.setdefault(term, {})[conversation_id] = tf
+            self.doc_terms[conversation_id] = terms
+            self.doc_lengths[conversation_id] = sum(terms.values())
+            self.total_length += self.doc_lengths[conversation_id]
+            if from_db:
+                self.max_id = max(self.max_id, conversation_id)
+
+    def _remove(self, conversation_id: int):
+        """
+        删除一条对话（调用方持有锁）
+        """
+        terms = self.doc_terms.pop(conversation_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(conversation_id, None)
+                if not postings:
+                    del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(conversation_id)
+
+    def search(self, query: str) -> List[Tuple[int, float]]:
+        """
+        检索包含所有搜索词的对话
+
+        参数:
+            query: 搜索词
+
+        返回:
+            List[Tuple[int, float]]: (对话ID, 得分)列表，按得分降序、ID降序排列
+        """
+        terms = query_bigrams(query)
+        if not terms:
+            return []
+
+        with self.lock:
+            # 按文档频率从小到大处理，先用最稀有的词项缩小候选集
+            posting_lists = []
+            for term in terms:
+                postings = self.postings.get(term)
+                if not postings:
+                    # 有词项没有出现过，没有对话能包含全部搜索词
+                    return []
+                posting_lists.append((term, postings))
+            posting_lists.sort(key=lambda item: len(item[1]))
+
+            candidates = set(posting_lists[0][1])
+            for _, postings in posting_lists[1:]:
+                candidates &= postings.keys()
+                if not candidates:
+                    return []
+
+            # BM25打分
+            total = len(self.doc_terms)
+            average = self.total_length / total if total else 1.0
+            scores = []
+            for conversation_id in candidates:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[conversation_id] / (average or 1.0))
+                score = 0.0
+                for _, postings in posting_lists:
+                    tf = postings[conversation_id]
+                    idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                    score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+                scores.append((conversation_id, score))
+
+        # 得分相同时较新的对话在前
+        scores.sort(key=lambda item: (item[1], item[0]), reverse=True)
+        return scores
+
+
+class ChatSearchService:
+    """
+    对话历史搜索服务类
+
+    负责维护每个用户的对话倒排索引，提供全文搜索
+
+    主要功能:
+        - 首次搜索时从数据库加载该用户的对话，构建倒排索引
+        - 保存对话、更新回答、清除历史时同步维护索引
+        - 搜索时按BM25相关度排序并分页
+
+    设计说明:
+        - 使用字符二元组作为词项，适用于没有空格分词的中文
+        - 索引按用户划分，只保留最近搜索过的用户的索引
+        - 搜索前补齐ID大于已索引最大ID的对话（其他进程写入的对话）
+        - 搜索结果只返回ID，再按ID批量查询对话内容
+
+    使用场景:
+        - 用户搜索过去的对话
+    """
+
+    def __init__(self):
+        """
+        初始化搜索服务
+        """
+        # 用户索引: user_id -> _UserIndex
+        self._indexes = TTLCache(max_size=settings.CHAT_SEARCH_MAX_USERS, ttl=settings.CHAT_SEARCH_INDEX_TTL)
+
+    def add(self, user_id: str, conversation_id: int, user_message: str, ai_response: Optional[str]):
+        """
+        将新保存（或更新了回答）的对话加入索引
+
+        参数:
+            user_id: 用户ID
+            conversation_id: 对话记录ID
+            user_message: 用户消息
+            ai_response: AI回复
+
+        说明:
+            - 该用户的索引尚未加载时不处理，首次搜索时会从数据库加载
+        """
+        index = self._indexes.get(user_id)
+        if index is not None:
+            index.add(conversation_id, user_message, ai_response)
+
+    def clear(self, user_id: str):
+        """
+        丢弃用户的索引（清除对话历史后调用）
+
+        参数:
+            user_id: 用户ID
+        """
+        self._indexes.pop(user_id)
+
+    def search(
+        self,
+        user_id: str,
+        query: str,
+        page: int,
+        page_size: int,
+        db: Session,
+        hidden_until: int = 0
+    ) -> Tuple[int, List[Conversation]]:
+        """
+        搜索用户的对话历史
+
+        参数:
+            user_id: 用户ID
+            query: 搜索词
+            page: 页码（从1开始）
+            page_size: 每页数量
+            db: 数据库会话对象
+            hidden_until: 正在后台删除的最大对话ID（这些对话不加入索引）
+
+        返回:
+            Tuple[int, List[Conversation]]: (匹配总数, 当前页的对话记录)
+
+        异常:
+            ValueError: 搜索词中没有两个字以上的关键词（单字无法匹配二元组索引）
+
+        业务逻辑:
+            1. 获取用户索引（未加载时从数据库构建）
+            2. 补齐索引之后新写入的对话
+            3. 检索并按相关度排序
+            4. 按ID批量查询当前页的对话记录
+        """
+        # 索引只有二元组，至少需要一个两个字以上的关键词（单字关键词会被忽略）
+        if not any(len(term) >= 2 for term in query_bigrams(query)):
+            raise ValueError("搜索词至少需要包含一个两个字以上的关键词")
+
+        index = self._get_index(user_id, db, hidden_until)
+
+        # 检索
+        ranked = index.search(query)
+
+        # 分页
+        start = (page - 1) * page_size
+        page_ids = [conversation_id for conversation_id, _ in ranked[start:start + page_size]]
+        if not page_ids:
+            return len(ranked), []
+
+        # 按ID批量查询，保持相关度顺序
+        conversations = db.query(Conversation).filter(Conversation.id.in_(page_ids)).all()
+        by_id = {conversation.id: conversation for conversation in conversations}
+        return len(ranked), [by_id[conversation_id] for conversation_id in page_ids if conversation_id in by_id]
+
+    def _get_index(self, user_id: str, db: Session, hidden_until: int = 0) -> _UserIndex:
+        """
+        获取用户索引，并补齐尚未索引的对话
+
+        参数:
+            user_id: 用户ID
+            db: 数据库会话对象
+            hidden_until: 正在后台删除的最大对话ID
+
+        返回:
+            _UserIndex: 用户索引
+        """
+        index = self._indexes.get(user_id)
+        if index is None:
+            index = _UserIndex()
+            # 正在后台删除的对话不加入索引
+            index.max_id = hidden_until
+            self._indexes.set(user_id, index)
+
+        # 只查询ID大于已索引最大ID的对话（首次加载时即全部对话）
+        rows = db.query(
+            Conversation.id, Conversation.user_message, Conversation.ai_response
+        ).filter(
+            Conversation.user_id == user_id,
+            Conversation.id > index.max_id
+        ).all()
+        for conversation_id, user_message, ai_response in rows:
+            index.add(conversation_id, user_message, ai_response, from_db=True)
+
+        return index
+
+
+# 创建全局搜索服务实例
+# 聊天服务、回答凭据服务和API端点共享同一个实例
+chat_search_service = ChatSearchService()
@@ -3,7 +3,14 @@
 # Optional: 可选类型（可以为None）
 # Dict: 字典类型
 # Any: 任意类型
-from typing import List, Optional, Dict, Any
+# AsyncIterator: 异步迭代器类型（流式回复）
+from typing import List, Optional, Dict, Any, AsyncIterator
+
+# 导入异步IO模块，用于控制AI回复的时间预算
+import asyncio
+
+# 导入aclosing，流式回复提前结束时立即关闭异步迭代器
+from contextlib import aclosing
 
 # 导入Session类
 # Session: SQLAlchemy的数据库会话，用于与数据库交互
@@ -13,7 +20,8 @@ from sqlalchemy.orm import Session
 # ChatRequest: 聊天请求模型
 # ChatResponse: 聊天响应模型
 # MessageHistory: 消息历史模型
-from app.schemas.chat import ChatRequest, ChatResponse, MessageHistory
+# ChatSearchResponse: 对话搜索响应模型
+from app.schemas.chat import ChatRequest, ChatResponse, MessageHistory, ChatSearchResponse
 
 # 导入对话模型
 # Conversation: 数据库中的对话记录表映射类
@@ -27,6 +35,38 @@ from app.services.ai_service import AIService
 # IntentService: 意图识别服务，负责识别用户问题类型
 from app.services.intent_service import IntentService
 
+# 导入配置设置
+# settings: 包含聊天回复的时间预算
+from app.core.config import settings
+
+# 导入回答凭据服务
+# answer_ticket_service: 管理后台补全的AI回答
+from app.services.answer_ticket_service import answer_ticket_service
+
+# 导入会话工厂
+# WebSocket会话不持有数据库会话，保存对话时短暂获取
+from app.core.database import SessionLocal
+
+# 导入WebSocket聊天会话
+# ChatSession: 单个连接的会话状态（用户、上下文、关注的英雄）
+from app.services.chat_session_service import ChatSession
+
+# 导入建议预计算服务
+# suggestion_prefetch_service: 提前生成建议的回答，用户点击建议时直接返回
+from app.services.suggestion_prefetch_service import suggestion_prefetch_service
+
+# 导入对话搜索服务
+# chat_search_service: 对话历史的倒排索引，保存和清除对话时同步维护
+from app.services.chat_search_service import chat_search_service
+
+# 导入数据清除服务
+# data_purge_service: 后台分批删除对话历史，删除完成前隐藏边界内的对话
+from app.services.data_purge_service import data_purge_service
+
+# 导入版本强势英雄榜服务
+# tier_list_service: 按对局数据预先计算的强势英雄榜，"当前版本强势英雄"类问题直接回答
+from app.services.tier_list_service import tier_list_service
+
 
 class ChatService:
     """
@@ -97,11 +137,18 @@ class ChatService:
         业务逻辑:
             1. 识别用户消息的意图
             2. 限制上下文长度为最近5轮
-            3. 调用AI服务生成回复
-            4. 保存对话记录到数据库
-            5. 生成相关建议
-            6. 提取相关英雄
-            7. 返回响应
+            3. 用户点击的建议已预计算时直接使用预计算的回答
+            4. 否则调用AI服务生成回复（限定时间预算）
+            5. 超时则先使用快速回答，并创建回答凭据
+            6. 保存对话记录到数据库
+            7. 生成相关建议，并在后台预计算排名靠前的建议的回答
+            8. 提取相关英雄
+            9. 返回响应
+        
+        时间预算:
+            - AI在CHAT_RESPONSE_DEADLINE秒内未完成时，立即返回快速回答
+            - AI回答在后台继续生成，完成后更新对话记录
+            - 前端通过ticket_id查询完整回答
         
         异步处理:
             - async: 异步方法，不阻塞主线程
@@ -111,21 +158,56 @@ class ChatService:
         # 调用意图识别服务，返回意图识别结果
         intent_result = self.intent_service.recognize(request.message)
         
+        # 消息中提到的英雄（快速回答和建议预计算使用）
+        hero_name = intent_result.entities.get("hero_name")
+        
         # 限制对话上下文长度
         # 只保留最近5轮对话，避免上下文过长
         # 如果上下文超过5轮，截取最后5轮
         # 如果上下文不超过5轮，使用全部上下文
         context = request.context[-5:] if len(request.context) > 5 else request.context
         
-        # 调用AI服务生成回复
-        # await: 等待异步操作完成
-        # 传入用户消息、意图、上下文和英雄ID
-        ai_response = await self.ai_service.generate_response(
-            message=request.message,
-            intent=intent_result.intent,
-            context=context,
-            hero_id=request.hero_id
-        )
+        # 是否需要后台补全回答
+        needs_upgrade = False
+        
+        # 用户点击的建议已预计算时直接返回
+        ai_response = suggestion_prefetch_service.take(request.user_id, request.message)
+        
+        # 询问版本强势英雄时直接使用预先计算的榜单
+        if ai_response is None and intent_result.intent == "tier_list":
+            ai_response = tier_list_service.answer(request.message, db)
+        
+        if ai_response is None:
+            # 创建AI回复任务
+            # 传入用户消息、意图、上下文和英雄ID
+            # fallback_on_error=False: 失败时抛出异常，由这里统一降级为快速回答
+            answer_task = asyncio.create_task(self.ai_service.generate_response(
+                message=request.message,
+                intent=intent_result.intent,
+                context=context,
+                hero_id=request.hero_id,
+                fallback_on_error=False
+            ))
+            
+            try:
+                # 在时间预算内等待AI回复
+                # shield: 超时时不取消任务，让它在后台继续执行
+                ai_response = await asyncio.wait_for(
+                    asyncio.shield(answer_task),
+                    timeout=settings.CHAT_RESPONSE_DEADLINE
+                )
+            except asyncio.TimeoutError:
+                # 超时，先使用快速回答，完整回答在后台继续生成
+                ai_response = self.ai_service.get_fast_response(
+                    request.message, intent_result.intent, hero_id=request.hero_id, hero_name=hero_name
+                )
+                needs_upgrade = True
+            except Exception:
+                # AI调用失败，降级为快速回答（没有后台补全，不提示完整回答生成中）
+                ai_response = self.ai_service.get_fast_response(
+                    request.message, intent_result.intent, pending=False,
+                    hero_id=request.hero_id, hero_name=hero_name
+                )
         
         # 创建对话记录对象
         conversation = Conversation(
@@ -150,10 +232,37 @@ class ChatService:
         # 提交事务，保存对话记录
         db.commit()
         
+        # 加入对话搜索索引
+        chat_search_service.add(request.user_id, conversation.id, request.message, ai_response)
+        
+        # 如果使用了快速回答，创建回答凭据
+        # 后台任务完成后会把完整回答写回这条对话记录
+        ticket_id = None
+        if needs_upgrade:
+            ticket_id = answer_ticket_service.create(
+                answer_task, request.user_id, conversation.id, intent_result.intent,
+                fallback=self.ai_service.get_fast_response(
+                    request.message, intent_result.intent, pending=False,
+                    hero_id=request.hero_id, hero_name=hero_name
+                )
+            )
+        
         # 生成相关建议
         # 根据识别的意图生成后续建议
         suggestions = self._generate_suggestions(intent_result.intent)
         
+        # 在后台预计算排名靠前的建议的回答
+        # 上下文包含本轮对话，预计算的回答能够衔接当前话题
+        suggestion_prefetch_service.schedule(
+            self.ai_service,
+            self.intent_service,
+            request.user_id,
+            suggestions,
+            (context + [{"user_message": request.message, "ai_response": ai_response}])[-5:],
+            hero_id=request.hero_id,
+            hero_name=hero_name
+        )
+        
         # 提取相关英雄
         # 从AI回复中提取相关英雄ID
         related_heroes = self._extract_related_heroes(ai_response)
@@ -169,8 +278,162 @@ class ChatService:
             # 相关建议列表
             suggestions=suggestions,
             # 相关英雄ID列表
-            related_heroes=related_heroes
+            related_heroes=related_heroes,
+            # 回答凭据ID（仅快速回答时有值）
+            ticket_id=ticket_id,
+            # 是否为最终回答
+            is_final=not needs_upgrade
+        )
+    
+    async def stream_message(
+        self,
+        session: ChatSession,
+        message: str,
+        hero_id: Optional[int] = None,
+        match_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        流式处理用户消息（WebSocket）
+        
+        参数:
+            session: WebSocket聊天会话，包含用户、上下文和关注的英雄
+            message: 用户消息内容
+            hero_id: 本轮关联的英雄ID（可选，默认使用会话关注的英雄）
+            match_id: 本轮关联的对局ID（可选，默认使用会话关注的对局）
+        
+        返回:
+            AsyncIterator[Dict[str, Any]]: 依次产出的事件
+                - start: 意图识别结果
+                - token: 回复片段
+                - end: 完整回复、建议和对话记录ID
+        
+        业务逻辑:
+            1. 识别用户消息的意图
+            2. 使用会话中保存的上下文，客户端不需要重复发送
+            3. 用户点击的建议已预计算时直接产出，否则流式生成AI回复，逐段产出
+            4. 保存对话记录到数据库
+            5. 更新会话上下文
+            6. 在后台预计算排名靠前的建议的回答
+            7. 产出完整回复和建议
+        """
+        # 识别用户消息的意图
+        intent_result = self.intent_service.recognize(message)
+        
+        # 本轮关联的英雄和对局，默认使用会话关注的
+        hero_id = hero_id if hero_id is not None else session.hero_id
+        match_id = match_id if match_id is not None else session.match_id
+        
+        # 会话中保存的上下文
+        context = session.context_list()
+        
+        # 产出意图识别结果
+        yield {
+            "type": "start",
+            "intent": intent_result.intent,
+            "confidence": intent_result.confidence
+        }
+        
+        # 用户点击的建议已预计算时直接产出完整回复
+        ai_response = suggestion_prefetch_service.take(session.user_id, message)
+        
+        # 询问版本强势英雄时直接使用预先计算的榜单
+        if ai_response is None and intent_result.intent == "tier_list":
+            ai_response = tier_list_service.answer(message)
+        
+        if ai_response is not None:
+            yield {"type": "token", "content": ai_response}
+        else:
+            # 流式生成AI回复
+            # aclosing: 本迭代器被提前关闭（客户端断开）时立即关闭流式回复，通知读取线程停止
+            chunks = []
+            async with aclosing(self.ai_service.stream_response(
+                message=message,
+                intent=intent_result.intent,
+                context=context,
+                hero_id=hero_id
+            )) as stream:
+                async for chunk in stream:
+                    chunks.append(chunk)
+                    yield {"type": "token", "content": chunk}
+            
+            # 拼接完整回复
+            ai_response = "".join(chunks)
+        
+        # 在线程中保存对话记录，避免阻塞事件循环
+        conversation_id = await asyncio.to_thread(
+            self._save_conversation,
+            session.user_id, message, ai_response, intent_result.intent, context, hero_id, match_id
         )
+        
+        # 更新会话上下文
+        session.remember(message, ai_response)
+        
+        # 生成相关建议，并在后台预计算排名靠前的建议的回答
+        suggestions = self._generate_suggestions(intent_result.intent)
+        suggestion_prefetch_service.schedule(
+            self.ai_service,
+            self.intent_service,
+            session.user_id,
+            suggestions,
+            (context + [{"user_message": message, "ai_response": ai_response}])[-5:],
+            hero_id=hero_id,
+            hero_name=intent_result.entities.get("hero_name")
+        )
+        
+        # 产出完整回复和建议
+        yield {
+            "type": "end",
+            "response": ai_response,
+            "intent": intent_result.intent,
+            "conversation_id": conversation_id,
+            "suggestions": suggestions,
+            "related_heroes": self._extract_related_heroes(ai_response)
+        }
+    
+    def _save_conversation(
+        self,
+        user_id: str,
+        message: str,
+        ai_response: str,
+        intent: str,
+        context: List[Dict[str, Any]],
+        hero_id: Optional[int],
+        match_id: Optional[str]
+    ) -> int:
+        """
+        使用独立的数据库会话保存对话记录
+        
+        参数:
+            user_id: 用户ID
+            message: 用户消息
+            ai_response: AI回复
+            intent: 识别的意图
+            context: 对话上下文
+            hero_id: 关联的英雄ID
+            match_id: 关联的对局ID
+        
+        返回:
+            int: 对话记录ID
+        """
+        db = SessionLocal()
+        try:
+            conversation = Conversation(
+                user_id=user_id,
+                user_message=message,
+                ai_response=ai_response,
+                intent=intent,
+                context=context,
+                hero_id=hero_id,
+                match_id=match_id
+            )
+            db.add(conversation)
+            db.commit()
+            
+            # 加入对话搜索索引
+            chat_search_service.add(user_id, conversation.id, message, ai_response)
+            return conversation.id
+        finally:
+            db.close()
     
     async def get_history(
         self,
@@ -208,8 +471,10 @@ class ChatService:
         # order_by: 按创建时间倒序排列（desc()表示降序）
         # limit(): 限制返回的记录数量
         # all(): 获取所有匹配的记录
+        # 正在后台删除的对话不返回
         conversations = db.query(Conversation).filter(
-            Conversation.user_id == user_id
+            Conversation.user_id == user_id,
+            Conversation.id > data_purge_service.hidden_conversation_id(user_id, db)
         ).order_by(Conversation.created_at.desc()).limit(limit).all()
         
         # 将数据库记录转换为消息历史对象列表
@@ -226,7 +491,60 @@ class ChatService:
             for conv in conversations
         ]
     
-    async def clear_history(self, user_id: str, db: Session):
+    async def search_history(
+        self,
+        user_id: str,
+        query: str,
+        page: int,
+        page_size: int,
+        db: Session
+    ) -> ChatSearchResponse:
+        """
+        搜索用户的对话历史
+        
+        参数:
+            user_id: 用户ID
+            query: 搜索词（可以用空格分隔多个关键词）
+            page: 页码（从1开始）
+            page_size: 每页数量
+            db: 数据库会话对象
+        
+        返回:
+            ChatSearchResponse: 匹配总数和当前页的对话记录
+        
+        异常:
+            ValueError: 搜索词中没有两个字以上的关键词
+        
+        功能:
+            - 在用户消息和AI回复中搜索包含所有关键词的对话
+            - 按相关度排序，分页返回
+        
+        业务逻辑:
+            1. 使用倒排索引检索，不扫描对话表
+            2. 将当前页的对话记录转换为消息历史对象
+        """
+        total, conversations = chat_search_service.search(
+            user_id, query, page, page_size, db,
+            hidden_until=data_purge_service.hidden_conversation_id(user_id, db)
+        )
+        
+        return ChatSearchResponse(
+            total=total,
+            page=page,
+            page_size=page_size,
+            results=[
+                MessageHistory(
+                    id=conv.id,
+                    user_message=conv.user_message,
+                    ai_response=conv.ai_response or "",
+                    intent=conv.intent,
+                    created_at=conv.created_at
+                )
+                for conv in conversations
+            ]
+        )
+    
+    async def clear_history(self, user_id: str, db: Session) -> str:
         """
         清除用户的对话历史
         
@@ -235,15 +553,16 @@ class ChatService:
             db: 数据库会话对象
         
         返回:
-            None
+            str: 删除任务ID，用于查询删除进度
         
         功能:
             - 删除用户的所有对话记录
             - 用于用户清理对话历史
         
         业务逻辑:
-            1. 根据用户ID删除所有对话记录
-            2. 提交事务
+            1. 创建删除任务，记录当前最大对话ID作为删除边界
+            2. 边界内的对话立即对用户不可见（历史、搜索）
+            3. 由调用方在后台执行任务，分批删除
         
         注意:
             - 此操作不可逆，请谨慎使用
@@ -252,15 +571,8 @@ class ChatService:
         异步处理:
             - async: 异步方法，不阻塞主线程
         """
-        # 删除用户的所有对话记录
-        # filter: 添加查询条件（用户ID等于指定值）
-        # delete(): 删除所有匹配的记录
-        db.query(Conversation).filter(
-            Conversation.user_id == user_id
-        ).delete()
-        
-        # 提交事务，保存删除操作
-        db.commit()
+        # 创建删除任务（同时丢弃该用户的搜索索引）
+        return data_purge_service.create_job(user_id, "history", db)
     
     def _generate_suggestions(self, intent: str) -> List[str]:
         """
@@ -304,7 +616,10 @@ class ChatService:
             "monster_timer": ["开启野怪计时", "查看技能冷却", "查看开团时机"],
             
             # 娱乐互动相关的建议
-            "entertainment": ["英雄语音对话", "趣味问答", "战绩卡片"]
+            "entertainment": ["英雄语音对话", "趣味问答", "战绩卡片"],
+            
+            # 版本强势英雄相关的建议
+            "tier_list": ["钻石局强势射手", "当前版本强势刺客", "查看出装推荐"]
         }
         
         # 根据意图获取对应的建议
@@ -0,0 +1,223 @@
+# 导入类型提示
+# Any: 任意类型
+# Dict: 字典类型
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+# Set: 集合类型
+from typing import Any, Dict, List, Optional, Set
+
+# 导入异步IO模块，用于发送锁和推送
+import asyncio
+
+# 导入双端队列，用于保存固定轮数的对话上下文
+from collections import deque
+
+# 导入WebSocket类型
+from fastapi import WebSocket
+
+# 导入回答凭据的Schema
+from app.schemas.chat import AnswerTicket
+
+# 导入用户偏好设置的Schema
+from app.schemas.user import UserPreferences
+
+# 导入回答凭据服务，后台补全的回答完成后推送给在线连接
+from app.services.answer_ticket_service import answer_ticket_service
+
+
+class ChatSession:
+    """
+    WebSocket聊天会话
+
+    保存单个连接的会话状态，整个连接期间只建立一次
+
+    字段说明:
+        user_id: 用户ID
+        preferences: 用户偏好设置（连接时读取一次）
+        context: 最近几轮的对话上下文（在服务端维护，客户端不需要重复发送）
+        hero_id: 当前关注的英雄ID（悬浮窗中正在使用的英雄）
+        match_id: 当前关注的对局ID
+
+    设计说明:
+        - 使用__slots__，大量空闲连接时减少内存占用
+        - 不持有数据库会话，每轮对话需要时才短暂获取
+    """
+
+    __slots__ = ("user_id", "preferences", "context", "hero_id", "match_id")
+
+    def __init__(self, user_id: str, preferences: UserPreferences):
+        """
+        初始化会话
+
+        参数:
+            user_id: 用户ID
+            preferences: 用户偏好设置
+        """
+        self.user_id = user_id
+        self.preferences = preferences
+        self.context = deque(maxlen=max(preferences.context_rounds, 0))
+        self.hero_id: Optional[int] = None
+        self.match_id: Optional[str] = None
+
+    def apply_preferences(self, preferences: UserPreferences):
+        """
+        更新偏好设置（保留不超过新轮数的上下文）
+
+        参数:
+            preferences: 新的用户偏好设置
+        """
+        self.preferences = preferences
+        self.context = deque(self.context, maxlen=max(preferences.context_rounds, 0))
+
+    def remember(self, user_message: str, ai_response: str):
+        """
+        记录一轮对话到上下文
+
+        参数:
+            user_message: 用户消息
+            ai_response: AI回复
+        """
+        # 用户开启了自动清除上下文时不保留
+        if self.preferences.auto_clear_context:
+            return
+        self.context.append({"user_message": user_message, "ai_response": ai_response})
+
+    def context_list(self) -> List[Dict[str, Any]]:
+        """
+        返回上下文列表（供AI服务使用）
+        """
+        return list(self.context)
+
+    def describe(self) -> Dict[str, Any]:
+        """
+        返回会话状态的描述（发送给客户端）
+        """
+        return {
+            "user_id": self.user_id,
+            "hero_id": self.hero_id,
+            "match_id": self.match_id,
+            "context_rounds": self.context.maxlen,
+            "float_window_enabled": self.preferences.float_window_enabled
+        }
+
+
+class ChatConnection:
+    """
+    WebSocket连接
+
+    封装WebSocket和会话，保证同一连接上的发送串行执行
+
+    字段说明:
+        websocket: WebSocket连接
+        session: 会话状态
+        send_lock: 发送锁（流式回复和服务端推送可能同时发送）
+    """
+
+    __slots__ = ("websocket", "session", "send_lock")
+
+    def __init__(self, websocket: WebSocket, session: ChatSession):
+        self.websocket = websocket
+        self.session = session
+        self.send_lock = asyncio.Lock()
+
+    async def send(self, payload: Dict[str, Any]):
+        """
+        发送一条JSON消息
+
+        参数:
+            payload: 消息内容
+        """
+        async with self.send_lock:
+            await self.websocket.send_json(payload)
+
+
+class ChatConnectionManager:
+    """
+    WebSocket连接管理器
+
+    负责登记在线连接，并向指定用户推送消息
+
+    主要功能:
+        - 登记和移除连接
+        - 向用户的所有连接推送消息
+        - 后台补全的AI回答完成时推送给用户
+
+    使用场景:
+        - 游戏内悬浮窗的实时对话
+        - 服务端主动推送
+    """
+
+    def __init__(self):
+        """
+        初始化连接管理器
+        """
+        # 在线连接: user_id -> 连接集合
+        self._connections: Dict[str, Set[ChatConnection]] = {}
+
+    def register(self, connection: ChatConnection):
+        """
+        登记连接
+
+        参数:
+            connection: WebSocket连接
+        """
+        self._connections.setdefault(connection.session.user_id, set()).add(connection)
+
+    def unregister(self, connection: ChatConnection):
+        """
+        移除连接
+
+        参数:
+            connection: WebSocket连接
+        """
+        connections = self._connections.get(connection.session.user_id)
+        if connections is None:
+            return
+        connections.discard(connection)
+        # 用户没有连接时删除键，避免空集合堆积
+        if not connections:
+            del self._connections[connection.session.user_id]
+
+    def connection_count(self) -> int:
+        """
+        返回在线连接总数
+        """
+        return sum(len(connections) for connections in self._connections.values())
+
+    async def push(self, user_id: str, payload: Dict[str, Any]) -> int:
+        """
+        向用户的所有连接推送消息
+
+        参数:
+            user_id: 用户ID
+            payload: 消息内容
+
+        返回:
+            int: 成功推送的连接数量
+        """
+        delivered = 0
+        for connection in list(self._connections.get(user_id, ())):
+            try:
+                await connection.send(payload)
+                delivered += 1
+            except Exception:
+                # 连接已断开，移除
+                self.unregister(connection)
+        return delivered
+
+    async def on_answer_completed(self, user_id: str, ticket: AnswerTicket):
+        """
+        后台补全的AI回答完成时推送给用户
+
+        参数:
+            user_id: 用户ID
+            ticket: 已完成的回答凭据
+        """
+        await self.push(user_id, {"type": "answer_upgrade", "ticket": ticket.model_dump()})
+
+
+# 创建全局连接管理器实例
+chat_connection_manager = ChatConnectionManager()
+
+# 后台补全的AI回答完成时，推送给用户的WebSocket连接
+answer_ticket_service.add_listener(chat_connection_manager.on_answer_completed)
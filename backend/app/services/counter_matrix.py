@@ -0,0 +1,306 @@
+# 导入类型提示
+# Dict: 字典类型
+# Iterable: 可迭代类型
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+# Tuple: 元组类型
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 导入线程锁，保证版本号递增和矩阵替换的原子性
+from threading import Lock
+
+# 导入NumPy，用于构建稠密矩阵和向量化打分
+import numpy as np
+
+# 导入Session类
+# Session: SQLAlchemy的数据库会话，用于与数据库交互
+from sqlalchemy.orm import Session
+
+# 导入英雄模型
+from app.models.hero import Hero
+
+# 导入英雄对局统计服务，对局数足够的英雄使用对局统计的胜率
+from app.services.hero_stats_service import hero_stats_service
+
+# 导入英雄关系服务，克制关系和权重来自英雄关系邻接索引
+from app.services.hero_relation_service import hero_relation_service, RelationIndex
+
+
+# 英雄位置（位置编码即在此元组中的下标）
+POSITIONS = ("tank", "warrior", "assassin", "mage", "archer", "support")
+
+
+class CounterMatrix:
+    """
+    英雄克制矩阵（不可变）
+
+    由英雄关系邻接索引（hero_relation_service）构建的稠密矩阵，
+    matrix[i, j] = 权重 表示英雄i克制英雄j（两边英雄数据都记录为1.0，只有一边记录为0.5）
+
+    字段说明:
+        version: 矩阵版本号（每次重新构建递增）
+        names: 英雄名称（下标 -> 名称）
+        index: 英雄名称 -> 下标
+        hero_ids: 英雄ID数组
+        id_index: 英雄ID -> 下标
+        positions: 英雄位置（下标 -> 位置）
+        position_codes: 位置编码数组（POSITIONS中的下标，未知位置为-1）
+        win_rates: 胜率数组（对局数足够的英雄为对局统计的胜率）
+        base_win_rates: 英雄数据中的胜率数组
+        stats_version: 胜率数组对应的对局统计版本号（None表示尚未使用对局统计）
+        ban_rates: 禁用率数组
+        matrix: 克制矩阵，形状为(英雄数, 英雄数)，float32
+
+    设计说明:
+        - 克制关系和权重与英雄关系接口、克制查询接口使用同一个邻接索引，结果一致
+        - 只包含英雄表中的英雄，克制列表中出现但不在英雄表中的名称没有关系记录
+        - 构建后只读，打分时直接对矩阵做切片和求和
+        - 对局统计变化时只替换胜率数组（with_stats），克制矩阵共享，不重新构建
+    """
+
+    __slots__ = (
+        "version", "names", "index", "hero_ids", "id_index",
+        "positions", "position_codes", "win_rates", "ban_rates", "matrix",
+        "base_win_rates", "stats_version"
+    )
+
+    def __init__(self, version: int, heroes: List[Hero], relations: RelationIndex):
+        """
+        从英雄记录和英雄关系邻接索引构建克制矩阵
+
+        参数:
+            version: 矩阵版本号
+            heroes: 英雄记录（提供胜率、禁用率和位置）
+            relations: 英雄关系邻接索引（提供克制关系和权重）
+        """
+        self.version = version
+
+        heroes = sorted(heroes, key=lambda hero: hero.id)
+        size = len(heroes)
+        self.names: Tuple[str, ...] = tuple(hero.name for hero in heroes)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.id_index: Dict[int, int] = {hero.id: i for i, hero in enumerate(heroes)}
+
+        # 英雄属性数组
+        self.hero_ids = np.array([hero.id for hero in heroes], dtype=np.int64)
+        self.win_rates = np.array(
+            [hero.win_rate if hero.win_rate is not None else 0.5 for hero in heroes],
+            dtype=np.float32
+        )
+        self.ban_rates = np.array([hero.ban_rate or 0.0 for hero in heroes], dtype=np.float32)
+        self.positions: Tuple[Optional[str], ...] = tuple(hero.position for hero in heroes)
+        self.position_codes = np.array(
+            [POSITIONS.index(position) if position in POSITIONS else -1 for position in self.positions],
+            dtype=np.intp
+        )
+
+        # 克制矩阵
+        self.matrix = np.zeros((size, size), dtype=np.float32)
+        for hero_id, targets in relations.counters.items():
+            i = self.id_index.get(hero_id)
+            if i is None:
+                continue
+            for target_id, weight in targets.items():
+                j = self.id_index.get(target_id)
+                if j is not None:
+                    self.matrix[i, j] = weight
+
+        # 英雄不克制自己
+        np.fill_diagonal(self.matrix, 0.0)
+
+        # 构建完成后设为只读
+        for array in (self.hero_ids, self.position_codes, self.win_rates, self.ban_rates, self.matrix):
+            array.flags.writeable = False
+        self.base_win_rates = self.win_rates
+        self.stats_version: Optional[int] = None
+
+    def with_stats(self, stats_version: int) -> "CounterMatrix":
+        """
+        使用对局统计的胜率生成新的矩阵（其余数组与当前矩阵共享）
+
+        参数:
+            stats_version: 对局统计的版本号
+
+        返回:
+            CounterMatrix: 新的矩阵，对局数达到阈值的英雄使用对局统计的胜率，其他英雄使用英雄数据中的胜率
+        """
+        clone = object.__new__(CounterMatrix)
+        for name in self.__slots__:
+            setattr(clone, name, getattr(self, name))
+
+        win_rates = self.base_win_rates.copy()
+        for i in range(len(self.names)):
+            win_rates[i] = hero_stats_service.win_rate(self.names[i], float(win_rates[i]))
+        win_rates.flags.writeable = False
+
+        clone.win_rates = win_rates
+        clone.stats_version = stats_version
+        return clone
+
+    def indices(self, names: Iterable[str]) -> np.ndarray:
+        """
+        将英雄名称转换为下标数组（忽略未知名称）
+
+        参数:
+            names: 英雄名称
+
+        返回:
+            np.ndarray: 下标数组
+        """
+        return np.fromiter(
+            (self.index[name] for name in names if name in self.index),
+            dtype=np.intp
+        )
+
+    def counter_scores(self, enemy: np.ndarray) -> np.ndarray:
+        """
+        计算每个英雄对敌方阵容的克制得分
+
+        参数:
+            enemy: 敌方英雄下标数组
+
+        返回:
+            np.ndarray: 每个英雄的得分 = 克制敌方英雄的权重之和 - 被敌方英雄克制的权重之和
+        """
+        if enemy.size == 0:
+            return np.zeros(len(self.names), dtype=np.float32)
+        return self.matrix[:, enemy].sum(axis=1) - self.matrix[enemy, :].sum(axis=0)
+
+    def best_counters(
+        self,
+        enemy_heroes: Iterable[str],
+        exclude: Iterable[str] = (),
+        top_k: int = 5
+    ) -> List[Tuple[str, float]]:
+        """
+        推荐克制敌方阵容的英雄
+
+        参数:
+            enemy_heroes: 敌方英雄名称
+            exclude: 不参与推荐的英雄名称（如已选、已禁用的英雄）
+            top_k: 返回数量
+
+        返回:
+            List[Tuple[str, float]]: (英雄名称, 克制得分)列表，按得分降序，只包含得分大于0的英雄
+        """
+        enemy = self.indices(enemy_heroes)
+        scores = self.counter_scores(enemy)
+
+        # 屏蔽敌方英雄和排除的英雄
+        mask = np.ones(len(self.names), dtype=bool)
+        mask[enemy] = False
+        mask[self.indices(exclude)] = False
+        scores = np.where(mask, scores, -np.inf)
+
+        # 先用argpartition取前k个，再对这k个排序
+        top_k = min(top_k, len(self.names))
+        if top_k <= 0:
+            return []
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.lexsort((top, -scores[top]))]
+        return [(self.names[i], float(scores[i])) for i in top if scores[i] > 0]
+
+    def matchup(self, our_heroes: Iterable[str], enemy_heroes: Iterable[str]) -> float:
+        """
+        计算双方阵容的克制差
+
+        参数:
+            our_heroes: 我方英雄名称
+            enemy_heroes: 敌方英雄名称
+
+        返回:
+            float: 我方克制敌方的权重之和 - 敌方克制我方的权重之和
+        """
+        our = self.indices(our_heroes)
+        enemy = self.indices(enemy_heroes)
+        if our.size == 0 or enemy.size == 0:
+            return 0.0
+        return float(self.matrix[np.ix_(our, enemy)].sum() - self.matrix[np.ix_(enemy, our)].sum())
+
+
+class CounterMatrixService:
+    """
+    克制矩阵服务类
+
+    持有当前的克制矩阵，负责构建和原子替换
+
+    主要功能:
+        - 启动时从英雄数据和英雄关系邻接索引构建克制矩阵
+        - 英雄数据变化后重新构建，整体替换
+        - 对局统计变化后替换胜率数组（克制矩阵不重新构建）
+
+    设计说明:
+        - 与英雄目录相同，读取时取得当前矩阵的引用后只读访问，不需要加锁
+        - 未加载时matrix()返回None，调用方退回到逐个读取克制列表
+
+    使用场景:
+        - BP建议、选人推荐等需要批量计算克制关系的场景
+    """
+
+    def __init__(self):
+        """
+        初始化克制矩阵服务
+        """
+        # 当前矩阵
+        self._matrix: Optional[CounterMatrix] = None
+
+        # 版本号
+        self._version = 0
+
+        # 构建锁（保证版本号递增）
+        self._lock = Lock()
+
+    def load(self, db: Session):
+        """
+        从数据库读取英雄数据和英雄关系邻接索引，构建并替换克制矩阵
+
+        参数:
+            db: 数据库会话对象
+
+        说明:
+            - 英雄关系索引在克制矩阵之前加载（见main.warm_up_caches），
+              未加载时从关系表临时构建
+        """
+        heroes = db.query(Hero).all()
+        relations = hero_relation_service.current(db)
+
+        with self._lock:
+            self._version += 1
+            self._matrix = CounterMatrix(self._version, heroes, relations)
+
+    def get(self, db: Session) -> CounterMatrix:
+        """
+        获取当前克制矩阵，未加载时从数据库构建
+
+        参数:
+            db: 数据库会话对象
+
+        返回:
+            CounterMatrix: 当前矩阵
+        """
+        if self._matrix is None:
+            self.load(db)
+        return self.matrix()
+
+    def matrix(self) -> Optional[CounterMatrix]:
+        """
+        获取当前克制矩阵
+
+        返回:
+            Optional[CounterMatrix]: 当前矩阵（胜率与对局统计同步），未加载时返回None
+        """
+        matrix = self._matrix
+        stats_version = hero_stats_service.version
+        if matrix is None or matrix.stats_version == stats_version:
+            return matrix
+
+        # 对局统计变化，替换胜率数组
+        with self._lock:
+            if self._matrix is matrix:
+                self._matrix = matrix.with_stats(stats_version)
+            return self._matrix
+
+
+# 创建全局克制矩阵服务实例
+# 应用启动时构建，英雄数据变化后重新构建
+counter_matrix_service = CounterMatrixService()
@@ -0,0 +1,350 @@
+# 导入类型提示
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+from typing import List, Optional
+
+# 导入线程模块，应用重启后在后台线程中继续未完成的任务
+import threading
+
+# 导入时间模块，用于批次之间的短暂停顿
+import time
+
+# 导入uuid模块，用于生成任务ID
+import uuid
+
+# 导入datetime类，用于处理日期时间
+from datetime import datetime
+
+# 导入SQLAlchemy的聚合函数和查询构造函数
+from sqlalchemy import func
+
+# 导入Session类
+# Session: SQLAlchemy的数据库会话，用于与数据库交互
+from sqlalchemy.orm import Session
+
+# 导入配置设置
+from app.core.config import settings
+
+# 导入日志记录器
+from app.core.logger import get_logger
+
+# 导入会话工厂
+# 删除任务在请求结束后运行，使用独立的数据库会话
+from app.core.database import SessionLocal
+
+# 导入相关的模型
+from app.models.conversation import Conversation
+from app.models.match import Match, Analysis
+from app.models.purge import PurgeJob
+from app.models.user import User
+
+# 导入数据清除任务状态的Schema
+from app.schemas.user import PurgeJobStatus
+
+# 导入对话搜索服务，清除数据时丢弃用户的索引
+from app.services.chat_search_service import chat_search_service
+
+# 导入英雄对局统计服务，删除对局时减去对应的计数
+from app.services.hero_stats_service import hero_stats_service
+
+
+# 模块日志记录器
+logger = get_logger(__name__)
+
+# 正在执行或等待执行的任务状态，只有这些任务会隐藏用户数据
+ACTIVE_STATUSES = ["pending", "running"]
+
+
+class DataPurgeService:
+    """
+    数据清除服务类
+
+    负责把用户数据的删除转为后台任务，分批执行
+
+    主要功能:
+        - 创建删除任务，记录数据边界（请求立即返回）
+        - 在后台分批删除对话、对局、分析报告和用户账户
+        - 记录删除进度，供前端查询
+        - 任务完成前，边界内的数据对用户不可见（逻辑隐藏）
+        - 任务出错时按退避间隔重试，多次失败后标记为failed并记录原因
+
+    设计说明:
+        - 每批删除PURGE_BATCH_SIZE条记录并单独提交，批次之间短暂停顿，
+          SQLite不会被长时间锁住，其他写入可以穿插执行
+        - 对话按ID边界删除，对局按创建时间边界删除，任务创建后的新数据不受影响
+        - 删除对局时在同一批次中删除其分析报告，只会删除任务所属用户的数据
+        - 最终失败的任务不再隐藏数据，已经删除的部分无法恢复，剩余数据重新对用户可见，
+          应用重启时会再次执行失败的任务
+
+    使用场景:
+        - 清除对话历史
+        - 注销账户、清除用户全部数据
+    """
+
+    def create_job(self, user_id: str, scope: str, db: Session) -> str:
+        """
+        创建删除任务
+
+        参数:
+            user_id: 用户ID
+            scope: 删除范围（history: 对话历史，all: 用户全部数据）
+            db: 数据库会话对象
+
+        返回:
+            str: 任务ID
+
+        业务逻辑:
+            1. 记录当前最大对话ID（和当前时间）作为删除边界
+            2. 统计需要删除的记录数量
+            3. 保存任务并丢弃用户的对话搜索索引
+        """
+        # 对话的删除边界
+        watermark = db.query(func.max(Conversation.id)).filter(
+            Conversation.user_id == user_id
+        ).scalar() or 0
+
+        job = PurgeJob(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            scope=scope,
+            status="pending",
+            conversation_watermark=watermark,
+            total_conversations=db.query(func.count(Conversation.id)).filter(
+                Conversation.user_id == user_id,
+                Conversation.id <= watermark
+            ).scalar() or 0
+        )
+
+        # 清除全部数据时，对局按当前时间划定边界
+        if scope == "all":
+            job.match_cutoff = datetime.utcnow()
+            job.total_matches = db.query(func.count(Match.id)).filter(
+                Match.user_id == user_id
+            ).scalar() or 0
+
+        db.add(job)
+        db.commit()
+
+        # 丢弃用户的对话搜索索引
+        chat_search_service.clear(user_id)
+
+        return job.id
+
+    def run(self, job_id: str):
+        """
+        执行删除任务（在后台运行）
+
+        参数:
+            job_id: 任务ID
+
+        业务逻辑:
+            1. 分批删除边界内的对话
+            2. 清除全部数据时，分批删除对局及其分析报告，最后删除用户账户
+            3. 出错时回滚当前批次，等待后重试（等待时间逐次翻倍），
+               达到PURGE_MAX_ATTEMPTS次后标记为失败
+            4. 更新任务状态
+        """
+        db = SessionLocal()
+        try:
+            job = db.query(PurgeJob).filter(PurgeJob.id == job_id).first()
+            if job is None or job.status == "completed":
+                return
+
+            job.status = "running"
+            job.finished_at = None
+            db.commit()
+
+            delay = settings.PURGE_RETRY_DELAY
+            for attempt in range(1, settings.PURGE_MAX_ATTEMPTS + 1):
+                try:
+                    self._execute(job, db)
+                    job.status = "completed"
+                    job.error = None
+                    job.finished_at = datetime.utcnow()
+                    db.commit()
+                    return
+                except Exception as e:
+                    db.rollback()
+                    job.error = f"第{attempt}次执行失败: {e}"
+                    if attempt >= settings.PURGE_MAX_ATTEMPTS:
+                        # 最终失败：不再隐藏剩余数据
+                        job.status = "failed"
+                        job.finished_at = datetime.utcnow()
+                        db.commit()
+                        logger.error("数据清除任务%s失败（已尝试%d次）: %s", job_id, attempt, e)
+                        return
+
+                    db.commit()
+                    logger.warning("数据清除任务%s第%d次执行失败，%.1f秒后重试: %s", job_id, attempt, delay, e)
+                    time.sleep(delay)
+                    delay *= 2
+        finally:
+            db.close()
+
+    def _execute(self, job: PurgeJob, db: Session):
+        """
+        分批删除任务范围内的数据（私有方法）
+
+        已删除的批次已经提交，重试时从剩余的数据继续删除
+
+        参数:
+            job: 删除任务
+            db: 数据库会话对象
+        """
+        # 删除对话
+        while self._delete_conversations(job, db):
+            time.sleep(settings.PURGE_BATCH_PAUSE)
+
+        if job.scope == "all":
+            # 删除对局及其分析报告
+            while self._delete_matches(job, db):
+                time.sleep(settings.PURGE_BATCH_PAUSE)
+
+            # 删除用户账户（任务创建后重新注册的账户保留）
+            db.query(User).filter(
+                User.id == job.user_id,
+                User.created_at <= job.match_cutoff
+            ).delete(synchronize_session=False)
+
+    def resume_unfinished(self):
+        """
+        在后台线程中继续未完成的任务（应用启动时调用）
+
+        失败的任务也会重新执行，执行期间剩余数据重新隐藏
+        """
+        db = SessionLocal()
+        try:
+            job_ids = [job_id for (job_id,) in db.query(PurgeJob.id).filter(
+                PurgeJob.status.in_(ACTIVE_STATUSES + ["failed"])
+            ).all()]
+        finally:
+            db.close()
+
+        if job_ids:
+            threading.Thread(target=lambda: [self.run(job_id) for job_id in job_ids], daemon=True).start()
+
+    def get_status(self, job_id: str, db: Session) -> Optional[PurgeJobStatus]:
+        """
+        查询任务进度
+
+        参数:
+            job_id: 任务ID
+            db: 数据库会话对象
+
+        返回:
+            Optional[PurgeJobStatus]: 任务状态，不存在返回None
+        """
+        job = db.query(PurgeJob).filter(PurgeJob.id == job_id).first()
+        if job is None:
+            return None
+
+        # 完成比例（按记录数量计算）
+        total = (job.total_conversations or 0) + (job.total_matches or 0)
+        done = (job.deleted_conversations or 0) + (job.deleted_matches or 0)
+        if job.status == "completed":
+            progress = 1.0
+        else:
+            progress = min(done / total, 1.0) if total else 0.0
+
+        return PurgeJobStatus(
+            id=job.id,
+            user_id=job.user_id,
+            scope=job.scope,
+            status=job.status,
+            total_conversations=job.total_conversations or 0,
+            total_matches=job.total_matches or 0,
+            deleted_conversations=job.deleted_conversations or 0,
+            deleted_matches=job.deleted_matches or 0,
+            deleted_analyses=job.deleted_analyses or 0,
+            progress=progress,
+            error=job.error,
+            created_at=job.created_at,
+            finished_at=job.finished_at
+        )
+
+    def hidden_conversation_id(self, user_id: str, db: Session) -> int:
+        """
+        获取用户不可见的最大对话ID
+
+        参数:
+            user_id: 用户ID
+            db: 数据库会话对象
+
+        返回:
+            int: ID不大于该值的对话正在删除，对用户不可见（没有进行中的删除任务时返回0）
+        """
+        return db.query(func.max(PurgeJob.conversation_watermark)).filter(
+            PurgeJob.user_id == user_id,
+            PurgeJob.status.in_(ACTIVE_STATUSES)
+        ).scalar() or 0
+
+    def hidden_match_cutoff(self, user_id: str, db: Session) -> Optional[datetime]:
+        """
+        获取用户不可见的对局的最晚创建时间
+
+        参数:
+            user_id: 用户ID
+            db: 数据库会话对象
+
+        返回:
+            Optional[datetime]: 不晚于该时间的对局正在删除，对用户不可见（没有进行中的删除任务时返回None）
+        """
+        return db.query(func.max(PurgeJob.match_cutoff)).filter(
+            PurgeJob.user_id == user_id,
+            PurgeJob.scope == "all",
+            PurgeJob.status.in_(ACTIVE_STATUSES)
+        ).scalar()
+
+    def _delete_conversations(self, job: PurgeJob, db: Session) -> bool:
+        """
+        删除一批对话
+
+        返回:
+            bool: 本批删除了记录返回True（可能还有剩余）
+        """
+        ids = self._batch_ids(db.query(Conversation.id).filter(
+            Conversation.user_id == job.user_id,
+            Conversation.id <= job.conversation_watermark
+        ))
+        if not ids:
+            return False
+
+        db.query(Conversation).filter(Conversation.id.in_(ids)).delete(synchronize_session=False)
+        job.deleted_conversations = (job.deleted_conversations or 0) + len(ids)
+        db.commit()
+        return True
+
+    def _delete_matches(self, job: PurgeJob, db: Session) -> bool:
+        """
+        删除一批对局及其分析报告
+
+        返回:
+            bool: 本批删除了记录返回True（可能还有剩余）
+        """
+        ids = self._batch_ids(db.query(Match.id).filter(
+            Match.user_id == job.user_id,
+            Match.created_at <= job.match_cutoff
+        ))
+        if not ids:
+            return False
+
+        # 从英雄对局统计中减去这批对局（与删除一起提交）
+        hero_stats_service.remove(db, Match.id.in_(ids))
+
+        # 先删除分析报告（子记录），再删除对局
+        analyses = db.query(Analysis).filter(Analysis.match_id.in_(ids)).delete(synchronize_session=False)
+        db.query(Match).filter(Match.id.in_(ids)).delete(synchronize_session=False)
+        job.deleted_matches = (job.deleted_matches or 0) + len(ids)
+        job.deleted_analyses = (job.deleted_analyses or 0) + analyses
+        db.commit()
+        return True
+
+    def _batch_ids(self, query) -> List:
+        """
+        取一批记录ID
+        """
+        return [row_id for (row_id,) in query.limit(settings.PURGE_BATCH_SIZE).all()]
+
+
+# 创建全局数据清除服务实例
+data_purge_service = DataPurgeService()
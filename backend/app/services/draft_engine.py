@@ -0,0 +1,408 @@
+# 导入类型提示
+# Dict: 字典类型
+# Iterable: 可迭代类型
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+# Tuple: 元组类型
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 导入时间模块，用于控制搜索时间预算
+import time
+
+# 导入NumPy，用于向量化计算候选英雄的收益
+import numpy as np
+
+# 导入配置设置
+from app.core.config import settings
+
+# 导入克制矩阵
+from app.services.counter_matrix import CounterMatrix, POSITIONS
+
+# 导入选人推荐的Schema
+from app.schemas.hero import DraftCandidate, DraftSuggestion
+
+
+# 双方标识
+OUR = "our"
+ENEMY = "enemy"
+
+# 排位赛选人顺序（A为先选方）：1-2-2-2-2-1
+PICK_ORDER = "ABBAABBAAB"
+
+# 每方选人数量
+TEAM_SIZE = 5
+
+# 双方合计最多禁用的英雄数量（每方5个）
+MAX_BANS = 10
+
+# 评分权重
+# 克制关系：每一对克制关系按关系权重计分（两边英雄数据都记录为1分，只有一边记录为0.5分）
+WEIGHT_COUNTER = 1.0
+# 胜率：相对50%的偏差（胜率52%计0.2分）
+WEIGHT_WIN_RATE = 10.0
+# 位置覆盖：补上一个阵容缺少的位置
+WEIGHT_COVERAGE = 0.5
+# 禁用推荐中禁用率的权重（禁用率30%计0.3分）
+WEIGHT_BAN_RATE = 1.0
+
+
+class DraftState:
+    """
+    选人状态
+
+    记录双方已选英雄、已禁用英雄，以及为增量计算维护的中间结果
+
+    字段说明:
+        matrix: 克制矩阵
+        picks: 双方已选英雄的下标（OUR / ENEMY -> 下标列表）
+        bans: 已禁用英雄的下标
+        available: 布尔数组，英雄是否还能被选择（未被选择、未被禁用）
+        coverage: 双方已覆盖的位置（布尔数组，长度为位置数+1，最后一位恒为True，
+                  供未知位置的英雄使用）
+        vs: 每个英雄加入该方后与对方已选英雄的克制得分（OUR / ENEMY -> 数组）
+
+    设计说明:
+        - 每次选人或禁用只更新一行/一列，时间复杂度为O(英雄数)
+        - 搜索时复制状态后修改，原状态不变
+    """
+
+    __slots__ = ("matrix", "picks", "bans", "available", "coverage", "vs")
+
+    def __init__(self, matrix: CounterMatrix):
+        """
+        创建空的选人状态
+
+        参数:
+            matrix: 克制矩阵
+        """
+        size = len(matrix.names)
+        self.matrix = matrix
+        self.picks: Dict[str, List[int]] = {OUR: [], ENEMY: []}
+        self.bans: List[int] = []
+        self.available = np.ones(size, dtype=bool)
+        self.coverage = {side: self._empty_coverage() for side in (OUR, ENEMY)}
+        self.vs = {side: np.zeros(size, dtype=np.float32) for side in (OUR, ENEMY)}
+
+    @staticmethod
+    def _empty_coverage() -> np.ndarray:
+        coverage = np.zeros(len(POSITIONS) + 1, dtype=bool)
+        coverage[-1] = True
+        return coverage
+
+    @classmethod
+    def from_names(
+        cls,
+        matrix: CounterMatrix,
+        our_picks: Iterable[str],
+        enemy_picks: Iterable[str],
+        bans: Iterable[str] = ()
+    ) -> "DraftState":
+        """
+        根据英雄名称构建选人状态
+
+        参数:
+            matrix: 克制矩阵
+            our_picks: 我方已选英雄
+            enemy_picks: 敌方已选英雄
+            bans: 已禁用英雄
+
+        异常:
+            ValueError: 有英雄不在克制矩阵中（英雄不存在），或禁用英雄超过MAX_BANS个
+        """
+        our_picks, enemy_picks, bans = list(our_picks), list(enemy_picks), list(bans)
+        unknown = [name for name in dict.fromkeys(our_picks + enemy_picks + bans) if name not in matrix.index]
+        if unknown:
+            raise ValueError(f"英雄不存在: {'、'.join(unknown)}")
+        if len(bans) > MAX_BANS:
+            raise ValueError(f"最多禁用{MAX_BANS}个英雄")
+
+        state = cls(matrix)
+        for i in matrix.indices(bans):
+            state.ban(int(i))
+        for i in matrix.indices(our_picks):
+            state.pick(OUR, int(i))
+        for i in matrix.indices(enemy_picks):
+            state.pick(ENEMY, int(i))
+        return state
+
+    def copy(self) -> "DraftState":
+        """
+        复制状态（克制矩阵共享）
+        """
+        state = DraftState.__new__(DraftState)
+        state.matrix = self.matrix
+        state.picks = {side: list(picks) for side, picks in self.picks.items()}
+        state.bans = list(self.bans)
+        state.available = self.available.copy()
+        state.coverage = {side: coverage.copy() for side, coverage in self.coverage.items()}
+        state.vs = {side: vs.copy() for side, vs in self.vs.items()}
+        return state
+
+    def pick(self, side: str, index: int):
+        """
+        一方选择英雄
+
+        参数:
+            side: OUR或ENEMY
+            index: 英雄下标
+        """
+        matrix = self.matrix.matrix
+        self.picks[side].append(index)
+        self.available[index] = False
+        self.coverage[side][self.matrix.position_codes[index]] = True
+
+        # 对方的每个英雄与新英雄的克制关系
+        opponent = ENEMY if side == OUR else OUR
+        self.vs[opponent] += matrix[:, index] - matrix[index, :]
+
+    def ban(self, index: int):
+        """
+        禁用英雄
+
+        参数:
+            index: 英雄下标
+        """
+        self.bans.append(index)
+        self.available[index] = False
+
+    def gains(self, side: str) -> np.ndarray:
+        """
+        计算每个英雄加入某方阵容的收益（不可选的英雄为负无穷）
+
+        参数:
+            side: OUR或ENEMY
+
+        返回:
+            np.ndarray: 收益 = 克制得分 + 胜率偏差 + 补位收益
+        """
+        matrix = self.matrix
+        new_position = ~self.coverage[side][matrix.position_codes]
+        gains = (
+            WEIGHT_COUNTER * self.vs[side]
+            + WEIGHT_WIN_RATE * (matrix.win_rates - 0.5)
+            + WEIGHT_COVERAGE * new_position
+        )
+        return np.where(self.available, gains, -np.inf)
+
+    def remaining_turns(self, first_pick: bool) -> List[str]:
+        """
+        按排位赛选人顺序计算剩余的选人轮次
+
+        参数:
+            first_pick: 我方是否为先选方
+
+        返回:
+            List[str]: 剩余轮次（OUR / ENEMY）
+        """
+        sides = {"A": OUR, "B": ENEMY} if first_pick else {"A": ENEMY, "B": OUR}
+        taken = {OUR: len(self.picks[OUR]), ENEMY: len(self.picks[ENEMY])}
+        turns = []
+        for slot in PICK_ORDER:
+            side = sides[slot]
+            if taken[side] > 0:
+                # 已经选过的英雄依次占用该方最早的轮次
+                taken[side] -= 1
+            else:
+                turns.append(side)
+        return turns
+
+
+def _top(scores: np.ndarray, k: int) -> List[int]:
+    """
+    取得分最高的k个下标（按得分降序，不含负无穷）
+    """
+    k = min(k, scores.size)
+    if k <= 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.lexsort((top, -scores[top]))]
+    return [int(i) for i in top if np.isfinite(scores[i])]
+
+
+class DraftEngine:
+    """
+    选人推荐引擎
+
+    根据当前选人状态，在剩余英雄池中搜索后续选人，给出选人和禁用推荐
+
+    主要功能:
+        - 选人推荐：束搜索（beam search）后续若干轮选人，按搜索到的最好阵容评分排序
+        - 快速推荐：只看下一次选人的收益，O(英雄数)，用于选人过程中的即时刷新
+        - 禁用推荐：对敌方收益最大（并且禁用率高）的英雄
+        - 搜索受时间预算限制，超时返回最后一层完整搜索的结果
+
+    搜索方法:
+        - 我方轮次：每个候选首选英雄保留收益最高的DRAFT_BEAM_WIDTH个分支
+        - 敌方轮次：假设敌方选择对自己收益最大的英雄（贪心应对）
+        - 阵容评分为每次选人收益之和（我方为正，敌方为负），
+          等于双方克制关系差 + 胜率差 + 位置覆盖差
+        - 按层推进，每层完成后才更新结果，保证各候选英雄在同一深度下比较
+
+    使用场景:
+        - BP阶段的选人和禁用推荐
+    """
+
+    def search(
+        self,
+        state: DraftState,
+        first_pick: bool = True,
+        top_k: int = 5,
+        time_budget_ms: Optional[float] = None,
+        depth: Optional[int] = None
+    ) -> DraftSuggestion:
+        """
+        搜索选人和禁用推荐
+
+        参数:
+            state: 当前选人状态（不会被修改）
+            first_pick: 我方是否为先选方
+            top_k: 推荐数量
+            time_budget_ms: 搜索时间预算（毫秒），默认使用配置
+            depth: 搜索步数，默认使用配置
+
+        返回:
+            DraftSuggestion: 选人推荐、禁用推荐和搜索统计
+        """
+        started = time.perf_counter()
+        budget = settings.DRAFT_TIME_BUDGET_MS if time_budget_ms is None else time_budget_ms
+        deadline = started + budget / 1000
+        depth = settings.DRAFT_SEARCH_DEPTH if depth is None else depth
+
+        turns = state.remaining_turns(first_pick)[:max(depth, 1)]
+        root_scores, depth_reached, nodes, complete = self._search_picks(state, turns, deadline)
+
+        picks = [
+            self._candidate(state.matrix, index, score)
+            for index, score in sorted(root_scores.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+        ]
+        bans = self._ban_candidates(state, top_k)
+
+        return DraftSuggestion(
+            picks=picks,
+            bans=bans,
+            depth=depth_reached,
+            nodes=nodes,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 3),
+            complete=complete
+        )
+
+    def rank(self, state: DraftState, top_k: int = 5) -> DraftSuggestion:
+        """
+        快速推荐：按下一次选人的收益排序（不向后搜索）
+
+        参数:
+            state: 当前选人状态
+            top_k: 推荐数量
+
+        返回:
+            DraftSuggestion: 选人推荐和禁用推荐（depth为1）
+        """
+        started = time.perf_counter()
+        gains = state.gains(OUR)
+        picks = [self._candidate(state.matrix, index, float(gains[index])) for index in _top(gains, top_k)]
+        return DraftSuggestion(
+            picks=picks,
+            bans=self._ban_candidates(state, top_k),
+            depth=1,
+            nodes=len(picks),
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 3),
+            complete=True
+        )
+
+    def _search_picks(
+        self,
+        state: DraftState,
+        turns: List[str],
+        deadline: float
+    ) -> Tuple[Dict[int, float], int, int, bool]:
+        """
+        按层束搜索我方的下一次选人
+
+        参数:
+            state: 当前选人状态
+            turns: 参与搜索的轮次
+            deadline: 截止时间（perf_counter）
+
+        返回:
+            Tuple: (候选首选英雄 -> 评分, 完成的层数, 生成的节点数, 是否在时间预算内完成)
+        """
+        if OUR not in turns:
+            return {}, 0, 0, True
+
+        # 每个候选首选英雄的分支: 首选英雄下标 -> [(评分, 状态)]
+        # 我方首次选人之前（敌方先选）的分支挂在None下
+        beams: Dict[Optional[int], List[Tuple[float, DraftState]]] = {None: [(0.0, state)]}
+        root_scores: Dict[int, float] = {}
+        depth_reached = 0
+        nodes = 0
+
+        for layer, side in enumerate(turns):
+            next_beams: Dict[Optional[int], List[Tuple[float, DraftState]]] = {}
+            for root, branches in beams.items():
+                children = []
+                for value, branch in branches:
+                    gains = branch.gains(side)
+                    if side == ENEMY:
+                        # 敌方贪心应对
+                        for index in _top(gains, 1):
+                            child = branch.copy()
+                            child.pick(side, index)
+                            next_beams.setdefault(root, []).append((value - float(gains[index]), child))
+                            nodes += 1
+                    elif root is None:
+                        # 我方首次选人：产生候选首选英雄
+                        for index in _top(gains, settings.DRAFT_ROOT_CANDIDATES):
+                            child = branch.copy()
+                            child.pick(side, index)
+                            next_beams[index] = [(value + float(gains[index]), child)]
+                            nodes += 1
+                    else:
+                        for index in _top(gains, settings.DRAFT_BEAM_WIDTH):
+                            child = branch.copy()
+                            child.pick(side, index)
+                            children.append((value + float(gains[index]), child))
+                            nodes += 1
+
+                    # 超时：放弃未完成的这一层（产生候选首选英雄的一层必须完成）
+                    if time.perf_counter() > deadline and root_scores:
+                        return root_scores, depth_reached, nodes, False
+
+                if children:
+                    # 保留评分最高的分支
+                    children.sort(key=lambda item: -item[0])
+                    next_beams[root] = children[:settings.DRAFT_BEAM_WIDTH]
+
+            if not next_beams:
+                break
+            beams = next_beams
+            depth_reached = layer + 1
+
+            # 本层完成，更新候选首选英雄的评分（取最好的分支）
+            if None not in beams:
+                root_scores = {root: max(value for value, _ in branches) for root, branches in beams.items()}
+
+        return root_scores, depth_reached, nodes, True
+
+    def _ban_candidates(self, state: DraftState, top_k: int) -> List[DraftCandidate]:
+        """
+        推荐禁用英雄：敌方选择后收益最大、并且禁用率高的英雄
+        """
+        scores = state.gains(ENEMY) + WEIGHT_BAN_RATE * state.matrix.ban_rates
+        return [self._candidate(state.matrix, index, float(scores[index])) for index in _top(scores, top_k)]
+
+    def _candidate(self, matrix: CounterMatrix, index: int, score: float) -> DraftCandidate:
+        """
+        构建推荐项
+        """
+        return DraftCandidate(
+            hero_id=int(matrix.hero_ids[index]),
+            hero_name=matrix.names[index],
+            position=matrix.positions[index],
+            win_rate=round(float(matrix.win_rates[index]), 4),
+            score=round(score, 4)
+        )
+
+
+# 创建全局选人推荐引擎实例
+# 引擎不保存状态，可以被多个请求同时使用
+draft_engine = DraftEngine()
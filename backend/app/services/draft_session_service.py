@@ -0,0 +1,212 @@
+# 导入类型提示
+# Optional: 可选类型（可以为None）
+from typing import Optional
+
+# 导入uuid模块，用于生成会话ID
+import uuid
+
+# 导入Session类
+# Session: SQLAlchemy的数据库会话，用于与数据库交互
+from sqlalchemy.orm import Session
+
+# 导入进程内缓存，用于保存选人会话
+from app.core.cache import TTLCache
+
+# 导入配置设置
+from app.core.config import settings
+
+# 导入选人推荐相关的Schema
+from app.schemas.hero import DraftRequest, DraftEvent, DraftSessionResponse, DraftSuggestion
+
+# 导入克制矩阵服务和选人推荐引擎
+from app.services.counter_matrix import counter_matrix_service
+from app.services.draft_engine import DraftState, draft_engine, OUR, ENEMY, TEAM_SIZE, MAX_BANS
+
+
+class _DraftSession:
+    """
+    选人会话的内部状态
+
+    字段说明:
+        session_id: 会话ID
+        state: 选人状态（随事件增量更新）
+        first_pick: 我方是否为先选方
+        top_k: 推荐数量
+        step: 已处理的事件数量
+        searched: 最近一次完整搜索的结果
+        searched_step: 完整搜索时的事件数量（与step不同时结果已过期）
+    """
+
+    __slots__ = ("session_id", "state", "first_pick", "top_k", "step", "searched", "searched_step")
+
+    def __init__(self, session_id: str, state: DraftState, first_pick: bool, top_k: int):
+        self.session_id = session_id
+        self.state = state
+        self.first_pick = first_pick
+        self.top_k = top_k
+        self.step = 0
+        self.searched: Optional[DraftSuggestion] = None
+        self.searched_step = -1
+
+    def to_schema(self, suggestion: DraftSuggestion) -> DraftSessionResponse:
+        """
+        转换为响应模型
+        """
+        names = self.state.matrix.names
+        turns = self.state.remaining_turns(self.first_pick)
+        return DraftSessionResponse(
+            session_id=self.session_id,
+            first_pick=self.first_pick,
+            our_picks=[names[i] for i in self.state.picks[OUR]],
+            enemy_picks=[names[i] for i in self.state.picks[ENEMY]],
+            bans=[names[i] for i in self.state.bans],
+            next_side=turns[0] if turns else None,
+            suggestion=suggestion
+        )
+
+
+class DraftSessionService:
+    """
+    选人会话服务类
+
+    负责管理BP阶段的选人会话，逐个接收选人和禁用事件
+
+    主要功能:
+        - 创建会话（可以带上已有的选人和禁用）
+        - 接收选人/禁用事件，增量更新选人状态并返回快速推荐
+        - 按需执行完整的束搜索推荐，同一步骤内复用结果
+        - 会话保存在内存中，一段时间没有操作后自动淘汰
+
+    设计说明:
+        - 每个事件只更新一行/一列的克制得分和位置覆盖，O(英雄数)，
+          不需要像/bp/suggestion那样每次从头计算
+        - 事件后的快速推荐只看下一次选人的收益，同样是O(英雄数)
+        - 会话创建时固定使用当时的克制矩阵，英雄数据更新不影响进行中的会话
+
+    使用场景:
+        - 客户端在真实的选人过程中逐步提交选人结果
+    """
+
+    def __init__(self):
+        """
+        初始化选人会话服务
+        """
+        # 会话存储: session_id -> _DraftSession
+        self._sessions = TTLCache(max_size=settings.DRAFT_SESSION_MAX, ttl=settings.DRAFT_SESSION_TTL)
+
+    def create(self, request: DraftRequest, db: Session) -> DraftSessionResponse:
+        """
+        创建选人会话
+
+        参数:
+            request: 初始的选人状态
+            db: 数据库会话对象
+
+        返回:
+            DraftSessionResponse: 会话状态和快速推荐
+
+        异常:
+            ValueError: 有英雄不存在，或禁用英雄超过上限
+        """
+        matrix = counter_matrix_service.get(db)
+        state = DraftState.from_names(matrix, request.our_picks, request.enemy_picks, request.bans)
+
+        session = _DraftSession(uuid.uuid4().hex, state, request.first_pick, request.top_k)
+        self._sessions.set(session.session_id, session)
+
+        return session.to_schema(draft_engine.rank(state, session.top_k))
+
+    def get(self, session_id: str) -> Optional[DraftSessionResponse]:
+        """
+        获取会话状态
+
+        参数:
+            session_id: 会话ID
+
+        返回:
+            Optional[DraftSessionResponse]: 会话状态和快速推荐，不存在或已过期返回None
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+
+        self._sessions.touch(session_id)
+        return session.to_schema(draft_engine.rank(session.state, session.top_k))
+
+    def apply(self, session_id: str, event: DraftEvent) -> Optional[DraftSessionResponse]:
+        """
+        处理一次选人或禁用
+
+        参数:
+            session_id: 会话ID
+            event: 选人事件
+
+        返回:
+            Optional[DraftSessionResponse]: 更新后的会话状态和快速推荐，会话不存在返回None
+
+        异常:
+            ValueError: 英雄不存在、已被选择或禁用，该方已选满，或禁用英雄已达上限
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+
+        state = session.state
+        index = state.matrix.index.get(event.hero_name)
+        if index is None:
+            raise ValueError(f"英雄不存在: {event.hero_name}")
+        if not state.available[index]:
+            raise ValueError(f"英雄已被选择或禁用: {event.hero_name}")
+
+        if event.action == "ban":
+            if len(state.bans) >= MAX_BANS:
+                raise ValueError(f"最多禁用{MAX_BANS}个英雄")
+            state.ban(index)
+        else:
+            if len(state.picks[event.side]) >= TEAM_SIZE:
+                raise ValueError("该方已选满5个英雄")
+            state.pick(event.side, index)
+
+        session.step += 1
+        self._sessions.touch(session_id)
+
+        return session.to_schema(draft_engine.rank(state, session.top_k))
+
+    def suggest(self, session_id: str) -> Optional[DraftSuggestion]:
+        """
+        对会话的当前状态执行完整搜索
+
+        参数:
+            session_id: 会话ID
+
+        返回:
+            Optional[DraftSuggestion]: 搜索推荐，会话不存在返回None
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+
+        # 状态没有变化时复用上次的结果
+        if session.searched_step != session.step:
+            session.searched = draft_engine.search(session.state, session.first_pick, session.top_k)
+            session.searched_step = session.step
+
+        self._sessions.touch(session_id)
+        return session.searched
+
+    def close(self, session_id: str) -> bool:
+        """
+        结束会话
+
+        参数:
+            session_id: 会话ID
+
+        返回:
+            bool: 会话存在返回True
+        """
+        return self._sessions.pop(session_id) is not None
+
+
+# 创建全局选人会话服务实例
+# API端点共享同一个实例
+draft_session_service = DraftSessionService()
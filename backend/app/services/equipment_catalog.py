@@ -0,0 +1,300 @@
+# 导入类型提示
+# Dict: 字典类型
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+# Tuple: 元组类型
+from typing import Dict, List, Optional, Tuple
+
+# 导入二分查找模块，用于按价格区间查找装备
+from bisect import bisect_left, bisect_right
+
+# 导入只读字典视图，防止快照被意外修改
+from types import MappingProxyType
+
+# 导入线程锁，保证版本号递增和快照替换的原子性
+from threading import Lock
+
+# 导入拼音转换库，用于生成全拼和首字母检索键
+from pypinyin import lazy_pinyin
+
+# 导入Session类
+# Session: SQLAlchemy的数据库会话，用于与数据库交互
+from sqlalchemy.orm import Session
+
+# 导入文本规范化函数
+from app.core.text import normalize_text
+
+# 导入装备模型
+from app.models.hero import Equipment
+
+# 导入装备相关的Schema
+from app.schemas.equipment import EquipmentSummary, EquipmentDetail, EquipmentSearchResult
+
+
+# 匹配方式的得分（与英雄搜索一致）
+MATCH_SCORES = {
+    "exact": 1.0,
+    "prefix": 0.8,
+    "infix": 0.5
+}
+
+# 拼音匹配的系数（同等情况下汉字匹配排在前面）
+PINYIN_FACTOR = 0.9
+
+
+class _PriceIndex:
+    """
+    按价格排序的装备列表，支持价格区间的二分查找
+
+    字段说明:
+        items: 按(价格, ID)排序的装备列表项
+        prices: 与items对应的价格
+    """
+
+    __slots__ = ("items", "prices")
+
+    def __init__(self, items: List[EquipmentSummary]):
+        self.items = tuple(sorted(items, key=lambda item: (item.price, item.id)))
+        self.prices = [item.price for item in self.items]
+
+    def range(self, min_price: Optional[int], max_price: Optional[int]) -> Tuple[EquipmentSummary, ...]:
+        """
+        获取价格在[min_price, max_price]内的装备
+        """
+        start = bisect_left(self.prices, min_price) if min_price is not None else 0
+        end = bisect_right(self.prices, max_price) if max_price is not None else len(self.prices)
+        return self.items[start:end]
+
+
+class EquipmentCatalogSnapshot:
+    """
+    装备目录快照（不可变）
+
+    某一时刻全部装备数据的只读副本，按名称、类型和价格建立索引
+
+    字段说明:
+        version: 快照版本号（每次重新加载递增）
+        details: 装备ID -> 装备详情
+        by_name: 装备名称 -> 装备详情
+        by_price: 全部装备的价格索引
+        by_type: 装备类型 -> 该类型装备的价格索引
+        types: 装备类型列表
+        search_keys: (检索键, 系数, 装备列表项)列表，检索键为名称、全拼和首字母
+
+    设计说明:
+        - 响应模型在加载时一次性构建，请求时直接返回，不再查询数据库
+        - 合成关系统一转换为{"id": ..., "name": ...}格式，缺少build_into时由其他装备的build_from反推
+    """
+
+    __slots__ = ("version", "details", "by_name", "by_price", "by_type", "types", "search_keys")
+
+    def __init__(self, version: int, equipments: List[Equipment]):
+        """
+        从装备记录构建快照
+
+        参数:
+            version: 快照版本号
+            equipments: 装备记录
+        """
+        self.version = version
+
+        equipments = sorted(equipments, key=lambda item: item.id)
+        by_id = {eq.id: eq for eq in equipments}
+        by_name = {eq.name: eq for eq in equipments}
+
+        def ref(value) -> Optional[dict]:
+            """
+            合成关系中的装备引用转换为{"id": ..., "name": ...}
+            """
+            if isinstance(value, dict):
+                eq = by_id.get(value.get("id")) or by_name.get(value.get("name"))
+            elif isinstance(value, int):
+                eq = by_id.get(value)
+            else:
+                eq = by_name.get(value)
+            return {"id": eq.id, "name": eq.name} if eq is not None else None
+
+        build_from = {eq.id: [r for r in map(ref, eq.build_from or []) if r] for eq in equipments}
+
+        # 反推可以合成的装备
+        derived_into: Dict[int, List[dict]] = {}
+        for eq in equipments:
+            for component in {r["id"] for r in build_from[eq.id]}:
+                derived_into.setdefault(component, []).append({"id": eq.id, "name": eq.name})
+
+        details = {
+            eq.id: EquipmentDetail(
+                id=eq.id,
+                name=eq.name,
+                type=eq.type,
+                price=eq.price or 0,
+                stats=eq.stats or {},
+                passive=eq.passive,
+                active=eq.active,
+                build_from=build_from[eq.id],
+                build_into=[r for r in map(ref, eq.build_into or []) if r] or derived_into.get(eq.id, []),
+                version=eq.version
+            )
+            for eq in equipments
+        }
+        self.details = MappingProxyType(details)
+        self.by_name = MappingProxyType({detail.name: detail for detail in details.values()})
+
+        # 列表项和价格索引
+        summaries = [
+            EquipmentSummary(id=d.id, name=d.name, type=d.type, price=d.price, stats=d.stats)
+            for d in details.values()
+        ]
+        self.by_price = _PriceIndex(summaries)
+        groups: Dict[str, List[EquipmentSummary]] = {}
+        for summary in summaries:
+            groups.setdefault(summary.type or "", []).append(summary)
+        self.by_type = MappingProxyType({key: _PriceIndex(items) for key, items in groups.items()})
+        self.types = tuple(sorted(key for key in groups if key))
+
+        # 搜索键: 名称、全拼、首字母
+        self.search_keys: List[Tuple[str, float, EquipmentSummary]] = []
+        for summary in summaries:
+            name = normalize_text(summary.name)
+            self.search_keys.append((name, 1.0, summary))
+            syllables = [syllable.lower() for syllable in lazy_pinyin(name) if syllable.strip()]
+            full = "".join(syllables)
+            if full != name:
+                self.search_keys.append((full, PINYIN_FACTOR, summary))
+                self.search_keys.append(("".join(s[0] for s in syllables), PINYIN_FACTOR, summary))
+
+    def list_equipment(
+        self,
+        type: Optional[str] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None
+    ) -> List[EquipmentSummary]:
+        """
+        按类型和价格区间筛选装备
+
+        参数:
+            type: 装备类型
+            min_price: 最低价格（包含）
+            max_price: 最高价格（包含）
+
+        返回:
+            List[EquipmentSummary]: 装备列表（按价格升序，价格相同按ID）
+        """
+        if type:
+            index = self.by_type.get(type)
+            if index is None:
+                return []
+        else:
+            index = self.by_price
+        return list(index.range(min_price, max_price))
+
+    def search(self, query: str, limit: int = 10) -> List[EquipmentSearchResult]:
+        """
+        按名称搜索装备（支持拼音全拼和首字母）
+
+        参数:
+            query: 搜索词
+            limit: 返回数量
+
+        返回:
+            List[EquipmentSearchResult]: 按得分降序的搜索结果
+        """
+        query = normalize_text(query)
+        if not query:
+            return []
+
+        # 每件装备取最好的匹配: 装备ID -> (得分, 列表项)
+        best: Dict[int, Tuple[float, EquipmentSummary]] = {}
+        for key, factor, summary in self.search_keys:
+            position = key.find(query)
+            if position < 0:
+                continue
+            if key == query:
+                kind = "exact"
+            elif position == 0:
+                kind = "prefix"
+            else:
+                kind = "infix"
+            score = MATCH_SCORES[kind] * factor
+            if summary.id not in best or score > best[summary.id][0]:
+                best[summary.id] = (score, summary)
+
+        # 排序：得分降序，得分相同按价格、ID
+        ranked = sorted(best.values(), key=lambda item: (-item[0], item[1].price, item[1].id))[:limit]
+        return [
+            EquipmentSearchResult(**summary.model_dump(), score=round(score, 2))
+            for score, summary in ranked
+        ]
+
+
+class EquipmentCatalog:
+    """
+    装备目录
+
+    持有当前的装备目录快照，负责加载和原子替换
+
+    主要功能:
+        - 启动时加载全部装备数据
+        - 装备数据变化后构建新快照，整体替换当前快照
+
+    设计说明:
+        - 与英雄目录相同，读取时取得当前快照的引用后只读访问，不需要加锁
+        - 未加载时get()从数据库构建
+
+    使用场景:
+        - 装备列表、装备详情、装备搜索接口
+    """
+
+    def __init__(self):
+        """
+        初始化装备目录
+        """
+        # 当前快照
+        self._snapshot: Optional[EquipmentCatalogSnapshot] = None
+
+        # 版本号
+        self._version = 0
+
+        # 加载锁（保证版本号递增）
+        self._lock = Lock()
+
+    def load(self, db: Session):
+        """
+        从数据库加载装备数据，构建并替换快照
+
+        参数:
+            db: 数据库会话对象
+        """
+        equipments = db.query(Equipment).all()
+
+        with self._lock:
+            self._version += 1
+            self._snapshot = EquipmentCatalogSnapshot(self._version, equipments)
+
+    def get(self, db: Session) -> EquipmentCatalogSnapshot:
+        """
+        获取当前快照，未加载时从数据库构建
+
+        参数:
+            db: 数据库会话对象
+
+        返回:
+            EquipmentCatalogSnapshot: 当前快照
+        """
+        if self._snapshot is None:
+            self.load(db)
+        return self._snapshot
+
+    def snapshot(self) -> Optional[EquipmentCatalogSnapshot]:
+        """
+        获取当前快照
+
+        返回:
+            Optional[EquipmentCatalogSnapshot]: 当前快照，未加载时返回None
+        """
+        return self._snapshot
+
+
+# 创建全局装备目录实例
+# 应用启动时加载，装备数据变化后重新加载
+equipment_catalog = EquipmentCatalog()
@@ -0,0 +1,393 @@
+# 导入类型提示
+# Dict: 字典类型
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+# Tuple: 元组类型
+from typing import Dict, List, Optional, Tuple
+
+# 导入计数器，用于表示可以重复的装备栏
+from collections import Counter
+
+# 导入线程锁，保证版本号递增和合成图替换的原子性
+from threading import Lock
+
+# 导入numpy，用矩阵保存装备属性
+import numpy as np
+
+# 导入Session类
+# Session: SQLAlchemy的数据库会话，用于与数据库交互
+from sqlalchemy.orm import Session
+
+# 导入装备模型
+from app.models.hero import Equipment
+
+# 导入装备相关的Schema
+from app.schemas.equipment import EquipmentTreeNode, PurchaseStep, UpgradePlan
+
+
+class EquipmentGraph:
+    """
+    装备合成图（不可变）
+
+    由装备表的build_from/build_into构建，装备用连续的下标表示
+
+    字段说明:
+        version: 合成图版本号
+        ids: 下标 -> 装备ID
+        names: 下标 -> 装备名称
+        index: 装备名称 -> 下标
+        id_index: 装备ID -> 下标
+        prices: 下标 -> 装备价格
+        stats: 下标 -> 装备属性（如{"物理攻击": 60}）
+        stat_names: 属性名称列表（属性矩阵的列）
+        stat_matrix: 属性矩阵（装备数 × 属性数，只读）
+        components: 下标 -> 直接配件下标（同一配件需要多个时重复出现）
+        parents: 下标 -> 可以合成的装备下标
+        combine_costs: 下标 -> 合成费用（价格减去直接配件的价格，不小于0）
+        total_costs: 下标 -> 从基础装备开始购买的总花费
+        trees: 下标 -> 合成树
+
+    设计说明:
+        - 配件关系以build_from为准，build_into只用于补充build_from缺失的关系
+        - 引用不存在的装备或形成环的合成关系会被忽略
+        - 合成树、合成费用和总花费在构建时一次性计算，查询时直接返回
+    """
+
+    __slots__ = (
+        "version", "ids", "names", "index", "id_index", "prices",
+        "stats", "stat_names", "stat_matrix", "components", "parents", "combine_costs", "total_costs", "trees"
+    )
+
+    def __init__(self, version: int, equipments: List[Equipment]):
+        """
+        从装备记录构建合成图
+
+        参数:
+            version: 合成图版本号
+            equipments: 装备记录
+        """
+        self.version = version
+
+        equipments = sorted(equipments, key=lambda item: item.id)
+        self.ids = [eq.id for eq in equipments]
+        self.names = [eq.name for eq in equipments]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.id_index = {eq_id: i for i, eq_id in enumerate(self.ids)}
+        self.prices = [eq.price or 0 for eq in equipments]
+
+        # 属性矩阵（只保留数值属性）
+        self.stats = [
+            {key: value for key, value in (eq.stats or {}).items() if isinstance(value, (int, float))}
+            for eq in equipments
+        ]
+        self.stat_names = sorted({key for stats in self.stats for key in stats})
+        columns = {key: k for k, key in enumerate(self.stat_names)}
+        self.stat_matrix = np.zeros((len(equipments), len(self.stat_names)), dtype=np.float64)
+        for i, stats in enumerate(self.stats):
+            for key, value in stats.items():
+                self.stat_matrix[i, columns[key]] = value
+        self.stat_matrix.setflags(write=False)
+
+        # 配件关系
+        components: List[List[int]] = [
+            [c for c in (self._resolve(ref) for ref in eq.build_from or []) if c is not None]
+            for eq in equipments
+        ]
+        for i, eq in enumerate(equipments):
+            for ref in eq.build_into or []:
+                parent = self._resolve(ref)
+                if parent is not None and not eq.build_from and i not in components[parent]:
+                    components[parent].append(i)
+
+        # 去掉形成环的合成关系，同时按拓扑顺序（配件在前）排列装备
+        order = self._acyclic(components)
+        self.components: Tuple[Tuple[int, ...], ...] = tuple(tuple(items) for items in components)
+
+        parents: List[List[int]] = [[] for _ in equipments]
+        for i, items in enumerate(self.components):
+            for c in set(items):
+                parents[c].append(i)
+        self.parents: Tuple[Tuple[int, ...], ...] = tuple(tuple(items) for items in parents)
+
+        # 合成费用、总花费和合成树（配件先于装备计算，直接复用配件的结果）
+        self.combine_costs = [0] * len(equipments)
+        self.total_costs = [0] * len(equipments)
+        self.trees: Dict[int, EquipmentTreeNode] = {}
+        for i in order:
+            items = self.components[i]
+            self.combine_costs[i] = max(self.prices[i] - sum(self.prices[c] for c in items), 0)
+            self.total_costs[i] = self.combine_costs[i] + sum(self.total_costs[c] for c in items)
+            self.trees[i] = EquipmentTreeNode(
+                id=self.ids[i],
+                name=self.names[i],
+                price=self.prices[i],
+                combine_cost=self.combine_costs[i],
+                total_cost=self.total_costs[i],
+                components=[self.trees[c] for c in items]
+            )
+
+    def _resolve(self, ref) -> Optional[int]:
+        """
+        解析合成关系中的装备引用
+
+        参数:
+            ref: 装备引用（{"id": 1, "name": "铁剑"}、装备ID或装备名称）
+
+        返回:
+            Optional[int]: 装备下标，不存在返回None
+        """
+        if isinstance(ref, dict):
+            if ref.get("id") in self.id_index:
+                return self.id_index[ref["id"]]
+            return self.index.get(ref.get("name"))
+        if isinstance(ref, int):
+            return self.id_index.get(ref)
+        return self.index.get(ref)
+
+    @staticmethod
+    def _acyclic(components: List[List[int]]) -> List[int]:
+        """
+        删除形成环的配件关系
+
+        参数:
+            components: 配件关系（原地修改）
+
+        返回:
+            List[int]: 拓扑顺序（配件在前）
+        """
+        # 0: 未访问，1: 访问中，2: 已完成
+        state = [0] * len(components)
+        order: List[int] = []
+
+        for root in range(len(components)):
+            if state[root]:
+                continue
+            # 非递归深度优先搜索: (装备下标, 下一个要访问的配件位置)
+            stack = [(root, 0)]
+            state[root] = 1
+            while stack:
+                i, position = stack[-1]
+                items = components[i]
+                if position < len(items):
+                    stack[-1] = (i, position + 1)
+                    c = items[position]
+                    if state[c] == 1:
+                        # 指向访问中的装备，形成环，删除这条关系
+                        items[position] = -1
+                    elif state[c] == 0:
+                        state[c] = 1
+                        stack.append((c, 0))
+                else:
+                    components[i] = [c for c in items if c >= 0]
+                    state[i] = 2
+                    order.append(i)
+                    stack.pop()
+
+        return order
+
+    def tree(self, equipment_id: int) -> Optional[EquipmentTreeNode]:
+        """
+        获取装备的合成树
+
+        参数:
+            equipment_id: 装备ID
+
+        返回:
+            Optional[EquipmentTreeNode]: 合成树，装备不存在返回None
+        """
+        i = self.id_index.get(equipment_id)
+        return self.trees.get(i) if i is not None else None
+
+    def plan(
+        self,
+        targets: List[str],
+        inventory: List[str],
+        gold: Optional[int] = None,
+        prices: Optional[Dict[str, int]] = None
+    ) -> UpgradePlan:
+        """
+        计算从已有装备到目标出装的购买路线
+
+        参数:
+            targets: 目标出装（按购买优先级排序）
+            inventory: 已有装备
+            gold: 当前金币，None表示不限金币
+            prices: 合成图中不存在的装备的价格（按没有配件的装备处理）
+
+        返回:
+            UpgradePlan: 购买步骤和剩余花费
+
+        业务逻辑:
+            1. 已有装备按配件抵扣，买一件装备的花费 = 合成费用 + 未拥有配件的花费
+            2. 按优先级依次处理目标装备：金币够就直接买下目标装备；
+               不够就按合成树从上到下购买买得起的配件（越接近目标的配件越先买），
+               然后停止，不为后面的目标购买配件
+            3. 最后计算完成全部目标还需要的金币
+
+        说明:
+            - 复杂度与目标装备合成树的大小相关，与装备总数无关
+        """
+        names = self.names
+        index, combine_costs, components = self.index, self.combine_costs, self.components
+
+        # 合成图中不存在的装备按没有配件的装备处理，下标接在合成图的装备之后
+        extra_names = [name for name in prices or {} if name not in self.index]
+        if extra_names:
+            index = {**self.index, **{name: len(names) + k for k, name in enumerate(extra_names)}}
+            combine_costs = self.combine_costs + [prices[name] or 0 for name in extra_names]
+            components = self.components + ((),) * len(extra_names)
+
+        def name_of(i: int) -> str:
+            return names[i] if i < len(names) else extra_names[i - len(names)]
+
+        def price_of(i: int) -> int:
+            return self.prices[i] if i < len(names) else combine_costs[i]
+
+        def remaining(i: int, held: Counter) -> int:
+            """
+            买下装备i的花费（从held中消耗已有配件）
+            """
+            if held[i] > 0:
+                held[i] -= 1
+                return 0
+            return combine_costs[i] + sum(remaining(c, held) for c in components[i])
+
+        unknown = [name for name in targets if name not in index]
+        target_ids = [index[name] for name in targets if name in index]
+        held = Counter(index[name] for name in inventory if name in index)
+
+        purchases: List[PurchaseStep] = []
+        budget = gold
+        completed: List[int] = []
+        pending: List[Tuple[int, Counter]] = []
+
+        def acquire(i: int, target: int, reserved: Counter) -> bool:
+            """
+            为目标装备获得装备i（买下或保留已有的），获得的装备放入reserved
+            """
+            nonlocal held, budget
+            if held[i] > 0:
+                held[i] -= 1
+                reserved[i] += 1
+                return True
+
+            trial = held.copy()
+            cost = remaining(i, trial)
+            if budget is None or cost <= budget:
+                held = trial
+                if budget is not None:
+                    budget -= cost
+                reserved[i] += 1
+                purchases.append(PurchaseStep(
+                    name=name_of(i),
+                    cost=cost,
+                    price=price_of(i),
+                    target=name_of(target),
+                    completes_target=i == target
+                ))
+                return True
+
+            # 买不起整件装备时购买配件
+            for c in components[i]:
+                acquire(c, target, reserved)
+            return False
+
+        for position, target in enumerate(target_ids):
+            reserved: Counter = Counter()
+            if not acquire(target, target, reserved):
+                # 金币不够买下当前目标时停止，剩余金币留给当前目标，后面的目标暂不购买
+                pending.append((target, reserved))
+                pending.extend((later, Counter()) for later in target_ids[position + 1:])
+                break
+            # 已完成的目标装备留在装备栏中，不再作为其他目标的配件
+            completed.append(target)
+
+        # 未完成的目标还需要的金币（优先使用为该目标购买的配件）
+        remaining_cost = 0
+        for target, reserved in pending:
+            held.update(reserved)
+            remaining_cost += remaining(target, held)
+
+        return UpgradePlan(
+            purchases=purchases,
+            spent=sum(step.cost for step in purchases),
+            gold_left=budget,
+            remaining_cost=remaining_cost,
+            completed=[name_of(i) for i in completed],
+            unknown=unknown
+        )
+
+
+class EquipmentGraphService:
+    """
+    装备合成图服务类
+
+    持有当前的装备合成图，负责构建和原子替换
+
+    主要功能:
+        - 启动时从装备表构建合成图，装备数据变化后重新构建
+        - 查询装备的合成树和总花费
+        - 根据已有装备和金币计算下一步购买的装备
+
+    设计说明:
+        - 与英雄目录相同，读取时取得当前合成图的引用后只读访问，不需要加锁
+        - 未加载时get()从数据库构建
+
+    使用场景:
+        - 装备合成树接口
+        - 出装升级路线接口（"我有1500金币下一步买什么"）
+    """
+
+    def __init__(self):
+        """
+        初始化装备合成图服务
+        """
+        # 当前合成图
+        self._graph: Optional[EquipmentGraph] = None
+
+        # 版本号
+        self._version = 0
+
+        # 构建锁（保证版本号递增）
+        self._lock = Lock()
+
+    def load(self, db: Session):
+        """
+        从数据库读取装备数据，构建并替换合成图
+
+        参数:
+            db: 数据库会话对象
+        """
+        equipments = db.query(Equipment).all()
+
+        with self._lock:
+            self._version += 1
+            self._graph = EquipmentGraph(self._version, equipments)
+
+    def get(self, db: Session) -> EquipmentGraph:
+        """
+        获取当前合成图，未加载时从数据库构建
+
+        参数:
+            db: 数据库会话对象
+
+        返回:
+            EquipmentGraph: 当前合成图
+        """
+        if self._graph is None:
+            self.load(db)
+        return self._graph
+
+    def graph(self) -> Optional[EquipmentGraph]:
+        """
+        获取当前合成图
+
+        返回:
+            Optional[EquipmentGraph]: 当前合成图，未加载时返回None
+        """
+        return self._graph
+
+
+# 创建全局装备合成图服务实例
+# 应用启动时构建，装备数据变化后重新构建
+equipment_graph_service = EquipmentGraphService()
@@ -0,0 +1,323 @@
+# 导入类型提示
+# Dict: 字典类型
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+# Set: 集合类型
+# Tuple: 元组类型
+from typing import Dict, List, Optional, Set, Tuple
+
+# 导入只读字典视图，防止快照被意外修改
+from types import MappingProxyType
+
+# 导入线程锁，保证版本号递增和快照替换的原子性
+from threading import Lock
+
+# 导入datetime类，用于记录加载时间
+from datetime import datetime
+
+# 导入Session类
+# Session: SQLAlchemy的数据库会话，用于与数据库交互
+from sqlalchemy.orm import Session
+
+# 导入英雄相关的模型
+from app.models.hero import Hero, HeroEquipment, HeroInscription
+
+# 导入英雄相关的Schema
+from app.schemas.hero import HeroResponse, HeroDetailResponse, EquipmentResponse
+
+# 导入出装和铭文推荐的排序键（与物化推荐表的顺序一致）
+from app.services.build_recommendation_service import equipment_sort_key, inscription_sort_key
+
+
+class HeroCatalogSnapshot:
+    """
+    英雄目录快照（不可变）
+
+    某一时刻全部英雄数据的只读副本，按常用查询条件建立索引
+
+    字段说明:
+        version: 快照版本号（每次重新加载递增）
+        loaded_at: 加载时间
+        heroes: 英雄列表项（按ID排序）
+        details: 英雄ID -> 英雄详情
+        by_name: 英雄名称 -> 英雄详情
+        by_position: 位置 -> 英雄列表项
+        by_difficulty: 难度 -> 英雄列表项
+        equipment: 英雄ID -> 出装推荐列表（按胜率、选用率降序）
+        inscriptions: 英雄ID -> 铭文推荐列表（字典格式，与接口返回一致，按胜率降序）
+        base_version: 局部更新时所基于的快照版本号（整体加载时为None）
+        changed: 局部更新的英雄ID（新增、修改、删除）
+
+    设计说明:
+        - 响应模型在加载时一次性构建，请求时直接返回，不再查询数据库
+        - 所有容器都是元组或只读字典，多个请求可以同时读取
+        - 局部更新时沿用基础快照中未变化英雄的响应模型，只构建变化的英雄
+    """
+
+    __slots__ = (
+        "version", "loaded_at", "heroes", "details", "by_name",
+        "by_position", "by_difficulty", "equipment", "inscriptions", "base_version", "changed"
+    )
+
+    def __init__(
+        self,
+        version: int,
+        heroes: List[Hero],
+        equipments: List[HeroEquipment],
+        inscriptions: List[HeroInscription],
+        base: Optional["HeroCatalogSnapshot"] = None,
+        changed: Set[int] = frozenset()
+    ):
+        """
+        从数据库记录构建快照
+
+        参数:
+            version: 快照版本号
+            heroes: 英雄记录（局部更新时只包括变化的英雄）
+            equipments: 出装推荐记录（局部更新时只包括变化的英雄）
+            inscriptions: 铭文推荐记录（局部更新时只包括变化的英雄）
+            base: 局部更新所基于的快照（可选）
+            changed: 局部更新的英雄ID
+        """
+        self.version = version
+        self.loaded_at = datetime.utcnow()
+        self.base_version = base.version if base is not None else None
+        self.changed = frozenset(changed)
+
+        heroes = sorted(heroes, key=lambda hero: hero.id)
+
+        def kept(field: str) -> dict:
+            """
+            基础快照中未变化英雄的数据（整体加载时为空）
+            """
+            if base is None:
+                return {}
+            mapping = getattr(base, field)
+            if field == "heroes":
+                mapping = {item.id: item for item in mapping}
+            return {hero_id: value for hero_id, value in mapping.items() if hero_id not in self.changed}
+
+        # 英雄列表项
+        items = kept("heroes")
+        items.update(
+            (hero.id, HeroResponse(
+                id=hero.id,
+                name=hero.name,
+                title=hero.title,
+                position=hero.position,
+                difficulty=hero.difficulty,
+                image_url=hero.image_url,
+                win_rate=hero.win_rate,
+                pick_rate=hero.pick_rate,
+                ban_rate=hero.ban_rate
+            ))
+            for hero in heroes
+        )
+        self.heroes: Tuple[HeroResponse, ...] = tuple(items[hero_id] for hero_id in sorted(items))
+
+        # 英雄详情
+        details = kept("details")
+        details.update(
+            (hero.id, HeroDetailResponse(
+                id=hero.id,
+                name=hero.name,
+                title=hero.title,
+                position=hero.position,
+                difficulty=hero.difficulty,
+                description=hero.description,
+                image_url=hero.image_url,
+                skills=hero.skills or [],
+                passive_skill=hero.passive_skill,
+                win_rate=hero.win_rate,
+                pick_rate=hero.pick_rate,
+                ban_rate=hero.ban_rate,
+                counter_heroes=hero.counter_heroes,
+                countered_by_heroes=hero.countered_by_heroes
+            ))
+            for hero in heroes
+        )
+        self.details = MappingProxyType(dict(sorted(details.items())))
+        self.by_name = MappingProxyType({detail.name: detail for detail in details.values()})
+
+        # 位置和难度索引
+        self.by_position = self._group(self.heroes, "position")
+        self.by_difficulty = self._group(self.heroes, "difficulty")
+
+        # 出装推荐
+        equipment: Dict[int, List[EquipmentResponse]] = kept("equipment")
+        for eq in sorted(equipments, key=equipment_sort_key):
+            equipment.setdefault(eq.hero_id, []).append(EquipmentResponse(
+                id=eq.id,
+                rank=eq.rank,
+                position=eq.position,
+                equipment_list=eq.equipment_list or [],
+                win_rate=eq.win_rate,
+                pick_rate=eq.pick_rate
+            ))
+        self.equipment = MappingProxyType({hero_id: tuple(items) for hero_id, items in equipment.items()})
+
+        # 铭文推荐
+        inscription_map: Dict[int, List[dict]] = kept("inscriptions")
+        for ins in sorted(inscriptions, key=inscription_sort_key):
+            inscription_map.setdefault(ins.hero_id, []).append(MappingProxyType({
+                "id": ins.id,
+                "rank": ins.rank,
+                "inscription_name": ins.inscription_name,
+                "inscription_config": ins.inscription_config,
+                "description": ins.description,
+                "win_rate": ins.win_rate
+            }))
+        self.inscriptions = MappingProxyType({hero_id: tuple(items) for hero_id, items in inscription_map.items()})
+
+    @staticmethod
+    def _group(heroes: Tuple[HeroResponse, ...], field: str):
+        """
+        按字段分组建立索引
+        """
+        groups: Dict[str, List[HeroResponse]] = {}
+        for hero in heroes:
+            groups.setdefault(getattr(hero, field), []).append(hero)
+        return MappingProxyType({key: tuple(items) for key, items in groups.items()})
+
+    def list_heroes(
+        self,
+        position: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> List[HeroResponse]:
+        """
+        按条件筛选英雄列表
+
+        参数:
+            position: 位置过滤
+            difficulty: 难度过滤
+            search: 名称包含的关键词
+
+        返回:
+            List[HeroResponse]: 英雄列表（按ID排序）
+        """
+        # 从最小的索引开始筛选
+        if position:
+            candidates = self.by_position.get(position, ())
+        elif difficulty:
+            candidates = self.by_difficulty.get(difficulty, ())
+        else:
+            candidates = self.heroes
+
+        return [
+            hero for hero in candidates
+            if (not difficulty or hero.difficulty == difficulty)
+            and (not search or search in hero.name)
+        ]
+
+    def list_equipment(
+        self,
+        hero_id: int,
+        rank: Optional[str],
+        position: Optional[str] = None
+    ) -> List[EquipmentResponse]:
+        """
+        获取英雄的出装推荐（rank为空或"全部"、position为空时不过滤）
+        """
+        items = self.equipment.get(hero_id, ())
+        return [
+            item for item in items
+            if (not rank or rank == "全部" or item.rank == rank)
+            and (not position or item.position == position)
+        ]
+
+    def list_inscriptions(self, hero_id: int, rank: Optional[str]) -> List[dict]:
+        """
+        获取英雄的铭文推荐（rank为空或"全部"时不过滤）
+        """
+        items = self.inscriptions.get(hero_id, ())
+        if rank and rank != "全部":
+            items = [item for item in items if item["rank"] == rank]
+        return [dict(item) for item in items]
+
+
+class HeroCatalog:
+    """
+    英雄目录
+
+    持有当前的英雄目录快照，负责加载和原子替换
+
+    主要功能:
+        - 启动时加载全部英雄、出装和铭文数据
+        - 数据重新导入后构建新快照，整体替换当前快照
+        - 英雄数据版本切换后只重新读取变化的英雄
+
+    设计说明:
+        - 读取时取得当前快照的引用后只读访问，不需要加锁
+        - 替换是一次引用赋值，读者要么看到旧快照、要么看到新快照，不会看到一半的数据
+        - 未加载时snapshot()返回None，调用方退回到数据库查询
+
+    使用场景:
+        - 英雄列表、英雄详情、出装和铭文推荐接口
+        - BP建议等需要按名称查找英雄的场景
+    """
+
+    def __init__(self):
+        """
+        初始化英雄目录
+        """
+        # 当前快照
+        self._snapshot: Optional[HeroCatalogSnapshot] = None
+
+        # 版本号
+        self._version = 0
+
+        # 加载锁（保证版本号递增）
+        self._lock = Lock()
+
+    def load(self, db: Session):
+        """
+        从数据库加载英雄数据，构建并替换快照
+
+        参数:
+            db: 数据库会话对象
+        """
+        heroes = db.query(Hero).all()
+        equipments = db.query(HeroEquipment).all()
+        inscriptions = db.query(HeroInscription).all()
+
+        with self._lock:
+            self._version += 1
+            self._snapshot = HeroCatalogSnapshot(self._version, heroes, equipments, inscriptions)
+
+    def update(self, db: Session, hero_ids: Set[int]):
+        """
+        只重新读取变化的英雄，基于当前快照构建并替换新快照（未加载时整体加载）
+
+        参数:
+            db: 数据库会话对象
+            hero_ids: 变化（新增、修改、删除）的英雄ID
+        """
+        if self._snapshot is None:
+            self.load(db)
+            return
+
+        ids = list(hero_ids)
+        heroes = db.query(Hero).filter(Hero.id.in_(ids)).all()
+        equipments = db.query(HeroEquipment).filter(HeroEquipment.hero_id.in_(ids)).all()
+        inscriptions = db.query(HeroInscription).filter(HeroInscription.hero_id.in_(ids)).all()
+
+        with self._lock:
+            self._version += 1
+            self._snapshot = HeroCatalogSnapshot(
+                self._version, heroes, equipments, inscriptions, base=self._snapshot, changed=hero_ids
+            )
+
+    def snapshot(self) -> Optional[HeroCatalogSnapshot]:
+        """
+        获取当前快照
+
+        返回:
+            Optional[HeroCatalogSnapshot]: 当前快照，未加载时返回None
+        """
+        return self._snapshot
+
+
+# 创建全局英雄目录实例
+# 应用启动时加载，英雄数据变化后重新加载
+hero_catalog = HeroCatalog()
@@ -0,0 +1,300 @@
+# 导入类型提示
+# Any: 任意类型
+# Dict: 字典类型
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+# Tuple: 元组类型
+from typing import Any, Dict, List, Optional, Tuple
+
+# 导入JSON模块，用于读取数据文件
+import json
+
+# 导入time模块，用于统计各阶段耗时
+import time
+
+# 导入datetime类，用于设置创建和更新时间
+from datetime import datetime
+
+# 导入SQLAlchemy的插入、更新和删除语句，用于批量写入（executemany）
+from sqlalchemy import insert, update, delete
+
+# 导入Session类
+# Session: SQLAlchemy的数据库会话，用于与数据库交互
+from sqlalchemy.orm import Session
+
+# 导入英雄相关的模型
+from app.models.hero import Hero, HeroEquipment, HeroInscription, Equipment
+
+# 导入出装铭文推荐服务，出装或铭文变化后重建物化推荐表
+from app.services.build_recommendation_service import build_recommendation_service
+
+# 导入英雄数据版本服务，英雄数据按版本导入
+from app.services.hero_version_service import hero_version_service, content_hash
+
+
+# 装备数据字段
+EQUIPMENT_FIELDS = ("name", "type", "price", "stats", "passive", "active", "build_from", "build_into", "version")
+
+# 出装推荐字段
+BUILD_FIELDS = ("rank", "position", "equipment_list", "win_rate", "pick_rate", "version")
+
+# 铭文推荐字段
+INSCRIPTION_FIELDS = ("rank", "inscription_name", "inscription_config", "description", "win_rate", "version")
+
+
+def load_data_file(path: str) -> Dict[str, Any]:
+    """
+    读取英雄数据文件（JSON）
+
+    参数:
+        path: 数据文件路径
+
+    返回:
+        Dict[str, Any]: 数据文件内容
+
+    数据文件格式:
+        - heroes: 英雄列表（字段与Hero模型一致），可以包含builds和inscriptions指定该英雄的出装和铭文推荐
+        - equipments: 装备列表（字段与Equipment模型一致）
+        - default_builds: 位置 -> 出装推荐列表（英雄没有指定出装、数据库中也没有出装时使用）
+        - default_inscriptions: 位置 -> 铭文推荐列表（英雄没有指定铭文、数据库中也没有铭文时使用）
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class LoadReport:
+    """
+    导入结果
+
+    字段说明:
+        version_id: 生效的英雄数据版本号（英雄数据没有变化时为None）
+        heroes: 英雄的(新增, 修改, 删除, 未变化)数量
+        equipments: 装备的(新增, 更新, 未变化)数量
+        builds: 重新写入出装推荐的英雄数量
+        inscriptions: 重新写入铭文推荐的英雄数量
+        recommendations: 重建的推荐记录数量（出装和铭文都没有变化时为None）
+        timings: 阶段名称 -> 耗时（秒）
+    """
+
+    __slots__ = ("version_id", "heroes", "equipments", "builds", "inscriptions", "recommendations", "timings")
+
+    def __init__(self):
+        self.version_id: Optional[int] = None
+        self.heroes: Tuple[int, int, int, int] = (0, 0, 0, 0)
+        self.equipments: Tuple[int, int, int] = (0, 0, 0)
+        self.builds = 0
+        self.inscriptions = 0
+        self.recommendations: Optional[int] = None
+        self.timings: Dict[str, float] = {}
+
+    def lines(self) -> List[str]:
+        """
+        导入结果的文字说明（用于脚本输出）
+        """
+        added, changed, removed, unchanged = self.heroes
+        version = f"版本 {self.version_id} 已生效" if self.version_id is not None else "没有变化，未生成新版本"
+        lines = [
+            f"英雄：新增 {added}，修改 {changed}，删除 {removed}，未变化 {unchanged}（{version}）",
+            f"装备：新增 {self.equipments[0]}，更新 {self.equipments[1]}，未变化 {self.equipments[2]}",
+            f"出装推荐：重新写入 {self.builds} 个英雄；铭文推荐：重新写入 {self.inscriptions} 个英雄",
+        ]
+        if self.recommendations is not None:
+            lines.append(f"出装铭文推荐表已重建，共 {self.recommendations} 条")
+        lines.append("耗时：" + "，".join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in self.timings.items()))
+        return lines
+
+
+class HeroDataLoader:
+    """
+    英雄数据导入器
+
+    从数据文件批量导入英雄、装备、出装推荐和铭文推荐
+
+    主要功能:
+        - 在一个事务中导入全部数据，失败时整体回滚
+        - 按内容哈希跳过没有变化的记录，只写入新增和变化的记录
+        - 插入、更新、删除按executemany批量执行，不逐个创建ORM对象
+        - 记录各阶段耗时
+
+    设计说明:
+        - 英雄数据通过英雄数据版本服务导入（生成版本和差异，应用只更新变化的英雄）
+        - 装备按名称对应，数据文件中没有的字段沿用数据库中的值
+        - 英雄指定了出装（或铭文）时，与数据库中的记录内容不同则整体替换；
+          没有指定时只为没有出装（或铭文）的英雄写入所在位置的默认推荐，不覆盖已有的推荐
+        - 出装或铭文有变化时，提交后重建物化推荐表
+
+    使用场景:
+        - scripts/import_real_hero_data.py
+        - database/init_data.py
+    """
+
+    def load(
+        self,
+        db: Session,
+        data: Dict[str, Any],
+        source: str,
+        complete: bool = False
+    ) -> LoadReport:
+        """
+        导入数据
+
+        参数:
+            db: 数据库会话对象
+            data: 数据文件内容（格式见load_data_file）
+            source: 数据来源（记录在英雄数据版本中）
+            complete: 英雄数据是否完整（True时删除数据中没有的英雄）
+
+        返回:
+            LoadReport: 导入结果和各阶段耗时
+        """
+        report = LoadReport()
+        started = time.perf_counter()
+        now = datetime.utcnow()
+        heroes = data.get("heroes", [])
+
+        try:
+            # 装备
+            step = time.perf_counter()
+            report.equipments = self._upsert_equipments(db, data.get("equipments", []), now)
+            report.timings["装备"] = time.perf_counter() - step
+
+            # 英雄（新版本）
+            step = time.perf_counter()
+            version = hero_version_service.publish(db, heroes, source, complete=complete, commit=False)
+            hero_ids = dict(db.query(Hero.name, Hero.id).all())
+            if version is not None:
+                report.version_id = version.id
+                changed = len(version.added) + len(version.changed)
+                report.heroes = (
+                    len(version.added), len(version.changed), len(version.removed), len(heroes) - changed
+                )
+            else:
+                report.heroes = (0, 0, 0, len(heroes))
+            report.timings["英雄"] = time.perf_counter() - step
+
+            # 出装和铭文推荐
+            step = time.perf_counter()
+            report.builds = self._replace_rows(
+                db, HeroEquipment, BUILD_FIELDS, heroes, hero_ids, "builds", data.get("default_builds", {})
+            )
+            report.inscriptions = self._replace_rows(
+                db, HeroInscription, INSCRIPTION_FIELDS, heroes, hero_ids, "inscriptions",
+                data.get("default_inscriptions", {})
+            )
+            report.timings["出装铭文"] = time.perf_counter() - step
+
+            # 一次提交
+            step = time.perf_counter()
+            db.commit()
+            report.timings["提交"] = time.perf_counter() - step
+        except Exception:
+            db.rollback()
+            raise
+
+        # 出装、铭文或英雄有变化时重建物化推荐表
+        if report.builds or report.inscriptions or report.heroes[2]:
+            step = time.perf_counter()
+            report.recommendations = build_recommendation_service.rebuild(db)
+            report.timings["推荐表"] = time.perf_counter() - step
+
+        report.timings["合计"] = time.perf_counter() - started
+        return report
+
+    def _upsert_equipments(self, db: Session, items: List[Dict[str, Any]], now: datetime) -> Tuple[int, int, int]:
+        """
+        批量新增和更新装备，返回(新增, 更新, 未变化)数量
+
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+        """
+        rows = db.query(Equipment.id, *[getattr(Equipment, field) for field in EQUIPMENT_FIELDS]).all()
+        current = {row[1]: (row[0], dict(zip(EQUIPMENT_FIELDS, row[1:]))) for row in rows}
+        empty = {field: None for field in EQUIPMENT_FIELDS}
+
+        inserts: Dict[str, dict] = {}
+        updates: Dict[int, dict] = {}
+        unchanged = 0
+        for item in items:
+            old = current.get(item["name"])
+            content = {
+                **(old[1] if old is not None else empty),
+                **{field: item[field] for field in EQUIPMENT_FIELDS if field in item}
+            }
+            if old is None:
+                inserts[item["name"]] = {**content, "created_at": now, "updated_at": now}
+            elif content_hash(content) != content_hash(old[1]):
+                updates[old[0]] = {"id": old[0], **content, "updated_at": now}
+            else:
+                unchanged += 1
+
+        if inserts:
+            db.execute(insert(Equipment), list(inserts.values()))
+        if updates:
+            db.execute(update(Equipment), list(updates.values()))
+        return len(inserts), len(updates), unchanged
+
+    def _replace_rows(
+        self,
+        db: Session,
+        model,
+        fields: Tuple[str, ...],
+        heroes: List[Dict[str, Any]],
+        hero_ids: Dict[str, int],
+        key: str,
+        defaults: Dict[str, List[Dict[str, Any]]]
+    ) -> int:
+        """
+        按英雄替换出装或铭文推荐（内容没有变化的英雄跳过），返回重新写入的英雄数量
+
+        参数:
+            model: HeroEquipment或HeroInscription
+            fields: 比较和写入的字段
+            heroes: 数据文件中的英雄
+            hero_ids: 英雄名称 -> 英雄ID
+            key: 英雄数据中指定推荐的字段（builds或inscriptions）
+            defaults: 位置 -> 默认推荐
+
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+        """
+        # 数据库中每个英雄的推荐（内容哈希排序后比较，与顺序无关）
+        existing: Dict[int, List[str]] = {}
+        for row in db.query(model.hero_id, *[getattr(model, field) for field in fields]).all():
+            existing.setdefault(row[0], []).append(content_hash(dict(zip(fields, row[1:]))))
+
+        replaced: List[int] = []
+        rows: List[dict] = []
+        for hero in heroes:
+            hero_id = hero_ids.get(hero["name"])
+            if hero_id is None:
+                continue
+
+            if key in hero:
+                items = hero[key]
+            elif hero_id not in existing:
+                items = defaults.get(hero.get("position"), [])
+            else:
+                continue
+
+            # 位置默认为英雄的位置
+            wanted = [
+                {field: item.get(field, hero.get("position") if field == "position" else None) for field in fields}
+                for item in items
+            ]
+            if sorted(map(content_hash, wanted)) == sorted(existing.get(hero_id, [])):
+                continue
+
+            replaced.append(hero_id)
+            rows.extend({"hero_id": hero_id, **item} for item in wanted)
+
+        if replaced:
+            db.execute(delete(model).where(model.hero_id.in_(replaced)))
+            if rows:
+                db.execute(insert(model), rows)
+        return len(replaced)
+
+
+# 创建全局英雄数据导入器实例
+hero_data_loader = HeroDataLoader()
@@ -0,0 +1,218 @@
+# 导入类型提示
+# Callable: 可调用对象类型
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+# Set: 集合类型
+# Tuple: 元组类型
+from typing import Callable, List, Optional, Set, Tuple
+
+# 导入异步IO模块，用于定期检查数据变化
+import asyncio
+
+# 导入SQLAlchemy的聚合函数
+from sqlalchemy import func
+
+# 导入Session类
+# Session: SQLAlchemy的数据库会话，用于与数据库交互
+from sqlalchemy.orm import Session
+
+# 导入会话工厂
+# 加载和检查在后台运行，使用独立的数据库会话
+from app.core.database import SessionLocal
+
+# 导入日志记录器
+from app.core.logger import get_logger
+
+# 导入英雄相关的模型
+from app.models.hero import Hero, HeroEquipment, HeroInscription, Equipment, HeroRelation
+
+# 导入英雄数据版本服务，用于获取两个生效版本之间变化的英雄
+from app.services.hero_version_service import hero_version_service
+
+
+# 模块日志记录器
+logger = get_logger(__name__)
+
+# 加载函数: 参数为数据库会话，重建整个内存缓存
+Loader = Callable[[Session], None]
+
+# 局部更新函数: 参数为数据库会话和变化的英雄ID，只更新这些英雄
+Updater = Callable[[Session, Set[int]], None]
+
+
+class HeroDataWatcher:
+    """
+    英雄数据监视器
+
+    负责在启动时加载依赖英雄数据的内存缓存，并在数据变化后重新加载
+
+    主要功能:
+        - 登记加载函数（每个函数接收数据库会话，重建自己的内存数据）
+        - 启动时依次执行所有加载函数
+        - 定期计算英雄数据的指纹，变化时重新加载
+        - 只是切换了英雄数据版本时，按版本差异只更新变化的英雄
+
+    设计说明:
+        - 导入脚本在独立进程中运行，无法直接通知应用，因此使用定期检查
+        - 指纹由各表（包括英雄关系表）的记录数、最大ID、最后更新时间和生效的英雄数据版本组成，查询开销很小
+        - 登记了局部更新函数的缓存只更新变化的英雄，其他缓存整体重新加载
+        - 直接修改heroes表（没有发布新版本）或出装、铭文、装备变化时整体重新加载
+        - 单个加载函数失败不影响其他加载函数
+
+    使用场景:
+        - 英雄人设、检索索引等基于英雄数据的内存缓存
+    """
+
+    def __init__(self):
+        """
+        初始化监视器
+        """
+        # 加载函数列表: (名称, 加载函数, 局部更新函数)
+        self._loaders: List[Tuple[str, Loader, Optional[Updater]]] = []
+
+        # 上次加载时的数据指纹
+        self._fingerprint: Optional[tuple] = None
+
+    def add_loader(self, name: str, loader: Loader, update: Optional[Updater] = None):
+        """
+        登记加载函数
+
+        参数:
+            name: 加载函数的名称（用于日志）
+            loader: 加载函数，参数为数据库会话
+            update: 局部更新函数（可选），参数为数据库会话和变化的英雄ID；
+                    不依赖英雄数据的缓存可以传入unaffected
+        """
+        self._loaders.append((name, loader, update))
+
+    @staticmethod
+    def unaffected(db: Session, hero_ids: Set[int]):
+        """
+        局部更新函数: 缓存不依赖英雄数据，英雄数据版本切换时不需要更新
+        """
+
+    def fingerprint(self, db: Session) -> tuple:
+        """
+        计算英雄数据的指纹
+
+        参数:
+            db: 数据库会话对象
+
+        返回:
+            tuple: 数据指纹，数据变化时指纹随之变化
+        """
+        return (
+            tuple(db.query(func.count(Hero.id), func.max(Hero.id), func.max(Hero.updated_at)).one())
+            + tuple(db.query(func.count(HeroRelation.id), func.max(HeroRelation.updated_at)).one()),
+            tuple(db.query(func.count(HeroEquipment.id), func.max(HeroEquipment.id)).one()),
+            tuple(db.query(func.count(HeroInscription.id), func.max(HeroInscription.id)).one()),
+            tuple(db.query(func.count(Equipment.id), func.max(Equipment.id), func.max(Equipment.updated_at)).one()),
+            hero_version_service.active_marker(db),
+        )
+
+    def reload_all(self):
+        """
+        执行所有加载函数
+
+        业务逻辑:
+            1. 记录当前数据指纹
+            2. 依次执行加载函数，失败时记录错误继续执行
+        """
+        db = SessionLocal()
+        try:
+            self._fingerprint = self.fingerprint(db)
+            for name, loader, _ in self._loaders:
+                try:
+                    loader(db)
+                except Exception as e:
+                    # 加载失败时记录错误，相关功能退化为按需处理
+                    logger.error("%s加载失败: %s", name, e)
+        finally:
+            db.close()
+
+    def reload_heroes(self, hero_ids: Set[int]):
+        """
+        英雄数据版本切换后，只更新变化的英雄
+
+        参数:
+            hero_ids: 变化（新增、修改、删除）的英雄ID
+
+        业务逻辑:
+            1. 记录当前数据指纹
+            2. 登记了局部更新函数的缓存只更新变化的英雄，其他缓存整体重新加载
+        """
+        db = SessionLocal()
+        try:
+            self._fingerprint = self.fingerprint(db)
+            for name, loader, update in self._loaders:
+                try:
+                    if update is not None:
+                        update(db, hero_ids)
+                    else:
+                        loader(db)
+                except Exception as e:
+                    # 加载失败时记录错误，相关功能退化为按需处理
+                    logger.error("%s加载失败: %s", name, e)
+        finally:
+            db.close()
+
+    def check(self) -> bool:
+        """
+        检查英雄数据是否变化，变化时重新加载
+
+        返回:
+            bool: 数据发生变化并已重新加载返回True
+        """
+        db = SessionLocal()
+        try:
+            current = self.fingerprint(db)
+            if current == self._fingerprint:
+                return False
+            hero_ids = self._changed_heroes(db, current)
+        finally:
+            db.close()
+
+        if hero_ids is None:
+            self.reload_all()
+        else:
+            self.reload_heroes(hero_ids)
+        return True
+
+    def _changed_heroes(self, db: Session, current: tuple) -> Optional[Set[int]]:
+        """
+        判断数据变化是否只是英雄数据版本切换，是则返回变化的英雄ID
+
+        参数:
+            db: 数据库会话对象
+            current: 当前数据指纹
+
+        返回:
+            Optional[Set[int]]: 变化的英雄ID，需要整体重新加载时返回None
+
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+        """
+        previous = self._fingerprint
+        if previous is None or previous[1:-1] != current[1:-1] or previous[-1] == current[-1]:
+            return None
+        return hero_version_service.changed_since(db, previous[-1])
+
+    async def watch(self, interval: float):
+        """
+        定期检查英雄数据（在应用运行期间作为后台任务执行）
+
+        参数:
+            interval: 检查间隔（秒）
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                # 在线程中查询数据库，避免阻塞事件循环
+                await asyncio.to_thread(self.check)
+            except Exception as e:
+                logger.error("英雄数据检查失败: %s", e)
+
+
+# 创建全局监视器实例
+hero_data_watcher = HeroDataWatcher()
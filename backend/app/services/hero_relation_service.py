@@ -0,0 +1,460 @@
+# 导入类型提示
+# Dict: 字典类型
+# Iterable: 可迭代类型
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+# Set: 集合类型
+# Tuple: 元组类型
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# 导入线程锁，保证版本号递增和索引替换的原子性
+from threading import Lock
+
+# 导入堆队列，用于合并倒排列表时保留得分最高的k个英雄
+import heapq
+
+# 导入datetime类，用于记录生成时间
+from datetime import datetime
+
+# 导入SQLAlchemy的插入、更新、删除语句和聚合函数
+from sqlalchemy import insert, update, delete, func
+
+# 导入Session类
+# Session: SQLAlchemy的数据库会话，用于与数据库交互
+from sqlalchemy.orm import Session
+
+# 导入英雄和英雄关系模型
+from app.models.hero import Hero, HeroRelation
+
+
+# 克制关系类型
+COUNTERS = "counters"
+
+# 两边英雄数据都记录了克制关系时的权重（A的counter_heroes包含B，且B的countered_by_heroes包含A）
+BOTH_SIDES_WEIGHT = 1.0
+
+# 只有一边英雄数据记录了克制关系时的权重
+ONE_SIDE_WEIGHT = 0.5
+
+# 由英雄克制列表迁移的关系来源
+SOURCE_JSON = "json"
+
+# 关系: (发起英雄ID, 目标英雄ID, 关系类型)
+RelationKey = Tuple[int, int, str]
+
+
+def derive_relations(heroes: Iterable[tuple]) -> Dict[RelationKey, float]:
+    """
+    由英雄的克制列表推导克制关系
+
+    参数:
+        heroes: (英雄ID, 英雄名称, counter_heroes, countered_by_heroes)
+
+    返回:
+        Dict[RelationKey, float]: 克制关系 -> 权重
+
+    说明:
+        - A的counter_heroes包含B、B的countered_by_heroes包含A，都记为A克制B
+        - 两边都记录时权重为BOTH_SIDES_WEIGHT，只有一边记录时为ONE_SIDE_WEIGHT
+        - 不在英雄表中的英雄没有ID，相关的关系忽略；英雄不克制自己
+    """
+    heroes = list(heroes)
+    ids = {name: hero_id for hero_id, name, _, _ in heroes}
+
+    # 关系 -> 记录该关系的英雄数据数量（1或2）
+    sides: Dict[RelationKey, int] = {}
+    for hero_id, _, counter_heroes, countered_by_heroes in heroes:
+        for name in set(counter_heroes or []):
+            target_id = ids.get(name)
+            if target_id is not None and target_id != hero_id:
+                key = (hero_id, target_id, COUNTERS)
+                sides[key] = sides.get(key, 0) + 1
+        for name in set(countered_by_heroes or []):
+            source_id = ids.get(name)
+            if source_id is not None and source_id != hero_id:
+                key = (source_id, hero_id, COUNTERS)
+                sides[key] = sides.get(key, 0) + 1
+
+    return {key: BOTH_SIDES_WEIGHT if count > 1 else ONE_SIDE_WEIGHT for key, count in sides.items()}
+
+
+class RelationIndex:
+    """
+    英雄关系邻接索引（不可变）
+
+    字段说明:
+        version: 索引版本号（每次重新加载递增）
+        names: 英雄ID -> 英雄名称
+        ids: 英雄名称 -> 英雄ID
+        positions: 英雄ID -> 英雄定位
+        counters: 英雄ID -> {被该英雄克制的英雄ID: 权重}
+        countered_by: 英雄ID -> {克制该英雄的英雄ID: 权重}（由counters反向推导）
+        postings: 英雄ID -> 克制该英雄的(英雄ID, 权重)，按权重降序、ID升序（倒排列表）
+
+    设计说明:
+        - 构建后只读，读取时取得当前索引的引用即可，不需要加锁
+        - 正反两个方向由同一组关系构建，始终一致
+        - 倒排列表在构建时排好序，查询克制阵容的英雄时按阈值算法合并，不需要遍历全部英雄
+    """
+
+    __slots__ = ("version", "names", "ids", "positions", "counters", "countered_by", "postings")
+
+    def __init__(
+        self,
+        version: int,
+        heroes: Iterable[tuple],
+        relations: Iterable[tuple]
+    ):
+        """
+        构建邻接索引
+
+        参数:
+            version: 索引版本号
+            heroes: (英雄ID, 英雄名称, 英雄定位)
+            relations: (发起英雄ID, 目标英雄ID, 权重)，只包括克制关系
+        """
+        self.version = version
+        self.names: Dict[int, str] = {}
+        self.positions: Dict[int, Optional[str]] = {}
+        for hero_id, name, position in heroes:
+            self.names[hero_id] = name
+            self.positions[hero_id] = position
+        self.ids: Dict[str, int] = {name: hero_id for hero_id, name in self.names.items()}
+
+        self.counters: Dict[int, Dict[int, float]] = {}
+        self.countered_by: Dict[int, Dict[int, float]] = {}
+        for hero_id, target_id, weight in relations:
+            if hero_id in self.names and target_id in self.names:
+                self.counters.setdefault(hero_id, {})[target_id] = weight
+                self.countered_by.setdefault(target_id, {})[hero_id] = weight
+
+        self.postings: Dict[int, Tuple[Tuple[int, float], ...]] = {
+            target_id: tuple(_ranked(counters.items())) for target_id, counters in self.countered_by.items()
+        }
+
+    def counters_of(self, hero_id: int) -> List[Tuple[int, float]]:
+        """
+        获取被某个英雄克制的英雄
+
+        返回:
+            List[Tuple[int, float]]: (英雄ID, 权重)，按权重降序、ID升序
+        """
+        return _ranked(self.counters.get(hero_id, {}).items())
+
+    def countered_by_of(self, hero_id: int) -> List[Tuple[int, float]]:
+        """
+        获取克制某个英雄的英雄
+
+        返回:
+            List[Tuple[int, float]]: (英雄ID, 权重)，按权重降序、ID升序
+        """
+        return list(self.postings.get(hero_id, ()))
+
+    def counters_of_all(self, hero_ids: List[int]) -> List[Tuple[int, float]]:
+        """
+        获取同时克制所有指定英雄的英雄（各英雄克制者集合的交集）
+
+        参数:
+            hero_ids: 被克制的英雄ID
+
+        返回:
+            List[Tuple[int, float]]: (英雄ID, 权重之和)，按权重之和降序、ID升序
+        """
+        if not hero_ids:
+            return []
+
+        # 从克制者最少的英雄开始求交集
+        groups = sorted((self.countered_by.get(hero_id, {}) for hero_id in set(hero_ids)), key=len)
+        common = set(groups[0])
+        for group in groups[1:]:
+            common &= group.keys()
+            if not common:
+                return []
+        return _ranked((hero_id, sum(group[hero_id] for group in groups)) for hero_id in common)
+
+    def top_counters(
+        self,
+        enemy_ids: Iterable[int],
+        k: int,
+        positions: Optional[Set[str]] = None,
+        pool: Optional[Set[int]] = None,
+        exclude: Iterable[int] = ()
+    ) -> List[Tuple[int, float, List[int]]]:
+        """
+        获取最克制敌方阵容的k个英雄
+
+        参数:
+            enemy_ids: 敌方英雄ID
+            k: 返回数量
+            positions: 只推荐这些定位的英雄（为空表示不限）
+            pool: 只推荐这些英雄（如我方还能选的英雄，None表示不限）
+            exclude: 不参与推荐的英雄ID（如已选、已禁用的英雄，敌方英雄总是排除）
+
+        返回:
+            List[Tuple[int, float, List[int]]]: (英雄ID, 克制权重之和, 克制的敌方英雄ID)，
+                                                按权重之和降序、克制人数降序、ID升序
+
+        算法（阈值算法）:
+            1. 各敌方英雄的倒排列表按权重降序，逐层读取每个列表的第depth项
+            2. 新出现的英雄通过正反两个方向的邻接表直接算出完整得分，保留得分最高的k个
+            3. 尚未出现的英雄在每个列表中的权重都不超过第depth项，其得分不超过这一层的权重之和（阈值）
+            4. 第k名的得分已经大于阈值时停止，之后的英雄不可能进入前k名
+        """
+        if k <= 0:
+            return []
+
+        enemies = list(dict.fromkeys(enemy_id for enemy_id in enemy_ids if enemy_id in self.names))
+        lists = [self.postings.get(enemy_id, ()) for enemy_id in enemies]
+        skipped = set(exclude)
+        skipped.update(enemies)
+
+        # 最小堆: (得分, 克制人数, -英雄ID, 克制的敌方英雄ID)，堆顶为当前第k名
+        top: List[tuple] = []
+        seen: Set[int] = set()
+        depth = 0
+        while True:
+            threshold = 0.0
+            exhausted = True
+            for postings in lists:
+                if depth >= len(postings):
+                    continue
+                exhausted = False
+                hero_id, weight = postings[depth]
+                threshold += weight
+                if hero_id in seen:
+                    continue
+                seen.add(hero_id)
+                if hero_id in skipped or (pool is not None and hero_id not in pool):
+                    continue
+                if positions and self.positions.get(hero_id) not in positions:
+                    continue
+
+                # 直接读取该英雄克制的全部敌方英雄，算出完整得分
+                targets = self.counters.get(hero_id, {})
+                covered = [enemy_id for enemy_id in enemies if enemy_id in targets]
+                item = (sum(targets[enemy_id] for enemy_id in covered), len(covered), -hero_id, covered)
+                if len(top) < k:
+                    heapq.heappush(top, item)
+                elif item[:3] > top[0][:3]:
+                    heapq.heapreplace(top, item)
+
+            if exhausted or (len(top) >= k and top[0][0] > threshold):
+                break
+            depth += 1
+
+        return [(-negative_id, score, covered) for score, _, negative_id, covered in sorted(top, reverse=True)]
+
+
+def _ranked(items: Iterable[Tuple[int, float]]) -> List[Tuple[int, float]]:
+    """
+    按权重降序、英雄ID升序排序
+    """
+    return sorted(items, key=lambda item: (-item[1], item[0]))
+
+
+class HeroRelationService:
+    """
+    英雄关系服务类
+
+    负责英雄关系表（hero_relations）的生成和查询
+
+    主要功能:
+        - 由英雄的counter_heroes / countered_by_heroes迁移生成克制关系（按英雄ID），
+          只写入与表中不同的关系
+        - 加载邻接索引，按英雄查询克制和被克制的英雄（反方向由同一组关系推导）
+        - 查询同时克制多个英雄的英雄：索引已加载时求交集，否则在数据库中按目标英雄分组查询
+        - 查询最克制敌方阵容的k个英雄：合并敌方英雄的倒排列表，可按定位和可选英雄过滤
+
+    设计说明:
+        - 英雄数据版本生效时在同一个事务中重建关系表，关系与英雄数据一起切换
+        - 启动时关系表为空（刚升级）时先由英雄的克制列表迁移再加载
+        - 只在启动预热和英雄数据监视器中加载（load），请求路径不加载、不迁移
+        - 未加载时index()返回None，BP建议退回到英雄的克制列表，关系查询接口从关系表临时构建索引
+
+    使用场景:
+        - 英雄关系接口、克制查询接口
+        - BP建议的克制英雄推荐
+        - scripts/migrate_hero_relations.py
+    """
+
+    def __init__(self):
+        """
+        初始化英雄关系服务
+        """
+        # 当前邻接索引
+        self._index: Optional[RelationIndex] = None
+
+        # 版本号
+        self._version = 0
+
+        # 构建锁（保证版本号递增）
+        self._lock = Lock()
+
+    def rebuild(self, db: Session, commit: bool = True) -> Tuple[int, int, int]:
+        """
+        由英雄的克制列表重建关系表
+
+        参数:
+            db: 数据库会话对象
+            commit: 是否提交事务（False时由调用方提交）
+
+        返回:
+            Tuple[int, int, int]: 新增、更新、删除的关系数量
+
+        业务逻辑:
+            1. 读取全部英雄的克制列表，推导克制关系和权重
+            2. 与关系表比较，只插入新增的关系、更新权重变化的关系、删除不再存在的关系
+            3. 提交事务（或由调用方提交）
+        """
+        wanted = derive_relations(
+            db.query(Hero.id, Hero.name, Hero.counter_heroes, Hero.countered_by_heroes).all()
+        )
+        existing = {
+            (hero_id, target_id, relation): (row_id, weight)
+            for row_id, hero_id, target_id, relation, weight in db.query(
+                HeroRelation.id, HeroRelation.hero_id, HeroRelation.target_id,
+                HeroRelation.relation, HeroRelation.weight
+            ).filter(HeroRelation.source == SOURCE_JSON).all()
+        }
+
+        now = datetime.utcnow()
+        inserts = [
+            {
+                "hero_id": hero_id, "target_id": target_id, "relation": relation,
+                "weight": weight, "source": SOURCE_JSON, "updated_at": now
+            }
+            for (hero_id, target_id, relation), weight in wanted.items()
+            if (hero_id, target_id, relation) not in existing
+        ]
+        updates = [
+            {"id": existing[key][0], "weight": weight, "updated_at": now}
+            for key, weight in wanted.items()
+            if key in existing and abs(existing[key][1] - weight) > 1e-6
+        ]
+        removed = [row_id for key, (row_id, _) in existing.items() if key not in wanted]
+
+        try:
+            if removed:
+                db.execute(delete(HeroRelation).where(HeroRelation.id.in_(removed)))
+            if updates:
+                db.execute(update(HeroRelation), updates)
+            if inserts:
+                db.execute(insert(HeroRelation), inserts)
+            if commit:
+                db.commit()
+            else:
+                db.flush()
+        except Exception:
+            db.rollback()
+            raise
+        return len(inserts), len(updates), len(removed)
+
+    def load(self, db: Session):
+        """
+        从数据库读取英雄和克制关系，构建并替换邻接索引
+
+        参数:
+            db: 数据库会话对象
+
+        说明:
+            - 关系表为空时（刚升级，还没有迁移）先由英雄的克制列表迁移
+        """
+        if db.query(HeroRelation.id).first() is None:
+            self.rebuild(db)
+
+        index = self._build(db, 0)
+
+        with self._lock:
+            self._version += 1
+            index.version = self._version
+            self._index = index
+
+    def current(self, db: Session) -> RelationIndex:
+        """
+        获取当前邻接索引，未加载时（启动预热失败）从关系表临时构建
+
+        参数:
+            db: 数据库会话对象
+
+        返回:
+            RelationIndex: 当前索引
+
+        说明:
+            - 临时构建的索引不保存、不迁移，只读取关系表；请求路径上不写入数据库
+        """
+        index = self._index
+        if index is not None:
+            return index
+        return self._build(db, 0)
+
+    def index(self) -> Optional[RelationIndex]:
+        """
+        获取当前邻接索引
+
+        返回:
+            Optional[RelationIndex]: 当前索引，未加载时返回None
+        """
+        return self._index
+
+    def counters_of_all(self, db: Session, hero_ids: List[int]) -> List[Tuple[int, float]]:
+        """
+        查询同时克制所有指定英雄的英雄
+
+        参数:
+            db: 数据库会话对象
+            hero_ids: 被克制的英雄ID
+
+        返回:
+            List[Tuple[int, float]]: (英雄ID, 权重之和)，按权重之和降序、ID升序
+
+        说明:
+            - 索引已加载时在内存中求交集，否则在数据库中查询
+        """
+        index = self._index
+        if index is not None:
+            return index.counters_of_all(hero_ids)
+        return self._counters_of_all_sql(db, hero_ids)
+
+    def _build(self, db: Session, version: int) -> RelationIndex:
+        """
+        读取英雄和克制关系，构建邻接索引
+
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+        """
+        heroes = db.query(Hero.id, Hero.name, Hero.position).all()
+        relations = db.query(HeroRelation.hero_id, HeroRelation.target_id, HeroRelation.weight).filter(
+            HeroRelation.relation == COUNTERS
+        ).all()
+        return RelationIndex(version, heroes, relations)
+
+    def _counters_of_all_sql(self, db: Session, hero_ids: List[int]) -> List[Tuple[int, float]]:
+        """
+        在数据库中查询同时克制所有指定英雄的英雄
+
+        按目标英雄索引（idx_hero_relations_target）取出关系，按发起英雄分组，
+        克制的目标英雄数量等于指定英雄数量的即为结果
+
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+        """
+        targets = set(hero_ids)
+        if not targets:
+            return []
+
+        total = func.sum(HeroRelation.weight)
+        rows = (
+            db.query(HeroRelation.hero_id, total)
+            .filter(HeroRelation.relation == COUNTERS, HeroRelation.target_id.in_(targets))
+            .group_by(HeroRelation.hero_id)
+            .having(func.count(func.distinct(HeroRelation.target_id)) == len(targets))
+            .all()
+        )
+        return _ranked((hero_id, float(weight)) for hero_id, weight in rows)
+
+
+# 创建全局英雄关系服务实例
+# 应用启动时加载，英雄数据变化后重新加载
+hero_relation_service = HeroRelationService()
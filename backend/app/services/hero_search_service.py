@@ -0,0 +1,313 @@
+# 导入类型提示
+# Dict: 字典类型
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+# Tuple: 元组类型
+from typing import Dict, List, Optional, Tuple
+
+# 导入二分查找模块，用于在有序的检索键中查找前缀范围
+from bisect import bisect_left
+
+# 导入线程锁，保证版本号递增和索引替换的原子性
+from threading import Lock
+
+# 导入拼音转换库，用于生成全拼和首字母检索键
+from pypinyin import lazy_pinyin
+
+# 导入Session类
+# Session: SQLAlchemy的数据库会话，用于与数据库交互
+from sqlalchemy.orm import Session
+
+# 导入字符二元组切分函数，用于描述的全文检索
+from app.core.text import char_bigrams, normalize_text, query_bigrams
+
+# 导入英雄模型
+from app.models.hero import Hero
+
+# 导入英雄相关的Schema
+from app.schemas.hero import HeroSearchResult
+
+
+# 英雄的常用别名和简称
+# key: 英雄名称
+# value: 别名列表
+HERO_ALIASES = {
+    "亚瑟": ["亚瑟王"],
+    "鲁班七号": ["鲁班", "小鲁班", "鲁班七"],
+    "妲己": ["狐狸"],
+    "孙悟空": ["猴子", "大圣", "悟空"],
+    "张飞": ["翼德"],
+    "程咬金": ["老程", "咬金"],
+    "安琪拉": ["安琪", "小火球"],
+    "韩信": ["兵仙"],
+    "兰陵王": ["兰陵", "隐身刺客"],
+    "王昭君": ["昭君"],
+    "甄姬": ["洛神"],
+    "马可波罗": ["马可", "马哥"],
+    "百里守约": ["守约", "狙击手"],
+    "伽罗": ["伽罗姐姐"]
+}
+
+# 各字段的权重
+FIELD_WEIGHTS = {
+    "name": 10.0,
+    "alias": 8.0,
+    "title": 5.0,
+    "skill": 3.0
+}
+
+# 匹配方式的系数
+# exact: 完全匹配，prefix: 前缀匹配，infix: 从中间开始匹配
+MATCH_FACTORS = {
+    "exact": 1.0,
+    "prefix": 0.8,
+    "infix": 0.5
+}
+
+# 拼音匹配的系数（同等情况下汉字匹配排在前面）
+PINYIN_FACTOR = 0.9
+
+# 描述全文匹配的得分
+DESCRIPTION_SCORE = 1.0
+
+
+def _pinyin_keys(text: str) -> Tuple[str, str, List[int]]:
+    """
+    生成文本的全拼和首字母
+
+    参数:
+        text: 规范化后的文本
+
+    返回:
+        Tuple: (全拼, 首字母, 全拼中每个音节的起始位置)
+    """
+    syllables = [syllable.lower() for syllable in lazy_pinyin(text) if syllable.strip()]
+    starts = []
+    offset = 0
+    for syllable in syllables:
+        starts.append(offset)
+        offset += len(syllable)
+    initials = "".join(syllable[0] for syllable in syllables)
+    return "".join(syllables), initials, starts
+
+
+class HeroSearchIndex:
+    """
+    英雄搜索索引（不可变）
+
+    字段说明:
+        version: 索引版本号
+        results: 英雄ID -> 搜索结果模板
+        keys: 有序的检索键
+        entries: 与keys对应的(英雄ID, 字段, 原文, 字段得分, 是否从开头匹配)
+        description_postings: 描述二元组 -> 英雄ID集合
+
+    设计说明:
+        - 名称、别名、称号、技能名称分别生成汉字、全拼、首字母三种检索键，
+          每种检索键再生成所有后缀（拼音按音节），所以前缀查找也能匹配中间的文字
+        - 检索键排序后用二分查找定位前缀范围，查询复杂度与匹配数量相关，与英雄数量无关
+        - 描述较长，使用字符二元组倒排表，所有二元组都出现才算匹配
+    """
+
+    __slots__ = ("version", "results", "keys", "entries", "description_postings")
+
+    def __init__(self, version: int, heroes: List[Hero]):
+        """
+        从英雄记录构建索引
+
+        参数:
+            version: 索引版本号
+            heroes: 英雄记录
+        """
+        self.version = version
+        self.results: Dict[int, HeroSearchResult] = {}
+        self.description_postings: Dict[str, set] = {}
+        pairs: List[Tuple[str, Tuple[int, str, str, float, bool]]] = []
+
+        for hero in heroes:
+            self.results[hero.id] = HeroSearchResult(
+                id=hero.id,
+                name=hero.name,
+                title=hero.title,
+                position=hero.position,
+                difficulty=hero.difficulty,
+                image_url=hero.image_url,
+                win_rate=hero.win_rate,
+                pick_rate=hero.pick_rate,
+                ban_rate=hero.ban_rate,
+                score=0.0
+            )
+
+            # 短文本字段
+            fields = [("name", hero.name)]
+            fields += [("alias", alias) for alias in HERO_ALIASES.get(hero.name, [])]
+            if hero.title:
+                fields.append(("title", hero.title))
+            fields += [("skill", skill.get("name")) for skill in hero.skills or [] if skill.get("name")]
+
+            for field, text in fields:
+                pairs.extend(self._keys(hero.id, field, text))
+
+            # 描述
+            for term in set(char_bigrams(hero.description or "")):
+                self.description_postings.setdefault(term, set()).add(hero.id)
+
+        pairs.sort(key=lambda pair: pair[0])
+        self.keys = [key for key, _ in pairs]
+        self.entries = [entry for _, entry in pairs]
+
+    @staticmethod
+    def _keys(hero_id: int, field: str, text: str) -> List[Tuple[str, Tuple[int, str, str, float, bool]]]:
+        """
+        生成一个字段的所有检索键
+
+        返回:
+            List: (检索键, (英雄ID, 字段, 原文, 字段得分, 是否从开头匹配))列表
+        """
+        weight = FIELD_WEIGHTS[field]
+        normalized = normalize_text(text)
+        keys = []
+
+        def add(key: str, start: int, factor: float):
+            keys.append((key, (hero_id, field, text, weight * factor, start == 0)))
+
+        # 汉字的所有后缀
+        for start in range(len(normalized)):
+            add(normalized[start:], start, 1.0)
+
+        # 全拼（按音节的后缀）和首字母的所有后缀
+        full, initials, starts = _pinyin_keys(normalized)
+        if full != normalized:
+            for start in starts:
+                add(full[start:], start, PINYIN_FACTOR)
+            for start in range(len(initials)):
+                add(initials[start:], start, PINYIN_FACTOR)
+
+        return keys
+
+    def search(self, query: str, limit: int = 10) -> List[HeroSearchResult]:
+        """
+        搜索英雄
+
+        参数:
+            query: 搜索词（汉字、全拼或首字母）
+            limit: 返回数量
+
+        返回:
+            List[HeroSearchResult]: 按得分降序的搜索结果
+        """
+        query = normalize_text(query)
+        if not query:
+            return []
+
+        # 每个英雄取最好的匹配: 英雄ID -> (得分, 字段, 原文)
+        best: Dict[int, Tuple[float, str, str]] = {}
+
+        # 前缀范围
+        start = bisect_left(self.keys, query)
+        end = bisect_left(self.keys, query + "\uffff")
+        for position in range(start, end):
+            hero_id, field, text, weight, from_start = self.entries[position]
+            if not from_start:
+                kind = "infix"
+            elif self.keys[position] == query:
+                kind = "exact"
+            else:
+                kind = "prefix"
+            score = weight * MATCH_FACTORS[kind]
+            if hero_id not in best or score > best[hero_id][0]:
+                best[hero_id] = (score, field, text)
+
+        # 描述全文匹配
+        terms = query_bigrams(query)
+        if terms and all(term in self.description_postings for term in terms):
+            matched = set.intersection(*(self.description_postings[term] for term in terms))
+            for hero_id in matched:
+                if hero_id not in best:
+                    best[hero_id] = (DESCRIPTION_SCORE, "description", query)
+
+        # 排序：得分降序，得分相同按英雄ID
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], item[0]))[:limit]
+        return [
+            self.results[hero_id].model_copy(update={
+                "score": round(score, 2),
+                "matched_field": field,
+                "matched_text": text
+            })
+            for hero_id, (score, field, text) in ranked
+        ]
+
+
+class HeroSearchService:
+    """
+    英雄搜索服务类
+
+    持有当前的英雄搜索索引，负责构建和原子替换
+
+    主要功能:
+        - 按名称、别名、称号、技能名称和描述搜索英雄
+        - 支持汉字、全拼（lubanqihao）和首字母（lbqh），支持前缀和中间匹配
+        - 英雄数据变化后重新构建索引
+
+    设计说明:
+        - 与英雄目录相同，读取时取得当前索引的引用后只读访问，不需要加锁
+        - 未加载时get()从数据库构建
+
+    使用场景:
+        - 英雄搜索框的输入提示
+        - 英雄列表的关键词过滤
+    """
+
+    def __init__(self):
+        """
+        初始化英雄搜索服务
+        """
+        # 当前索引
+        self._index: Optional[HeroSearchIndex] = None
+
+        # 版本号
+        self._version = 0
+
+        # 构建锁（保证版本号递增）
+        self._lock = Lock()
+
+    def load(self, db: Session):
+        """
+        从数据库读取英雄数据，构建并替换索引
+
+        参数:
+            db: 数据库会话对象
+        """
+        heroes = db.query(Hero).all()
+
+        with self._lock:
+            self._version += 1
+            self._index = HeroSearchIndex(self._version, heroes)
+
+    def get(self, db: Session) -> HeroSearchIndex:
+        """
+        获取当前索引，未加载时从数据库构建
+
+        参数:
+            db: 数据库会话对象
+
+        返回:
+            HeroSearchIndex: 当前索引
+        """
+        if self._index is None:
+            self.load(db)
+        return self._index
+
+    def index(self) -> Optional[HeroSearchIndex]:
+        """
+        获取当前索引
+
+        返回:
+            Optional[HeroSearchIndex]: 当前索引，未加载时返回None
+        """
+        return self._index
+
+
+# 创建全局英雄搜索服务实例
+# 应用启动时构建，英雄数据变化后重新构建
+hero_search_service = HeroSearchService()
@@ -1,24 +1,89 @@
 # 导入类型提示
 # List: 列表类型
 # Optional: 可选类型（可以为None）
-from typing import List, Optional
+# Dict: 字典类型
+# Any: 任意类型
+# Tuple: 元组类型
+from typing import List, Optional, Dict, Any, Tuple
+
+# 导入base64和json模块，用于编码分页游标
+import base64
+import json
 
 # 导入Session类
 # Session: SQLAlchemy的数据库会话，用于与数据库交互
-from sqlalchemy.orm import Session
+# load_only: 只加载指定的列，跳过描述、技能等大字段
+from sqlalchemy.orm import Session, load_only
 
 # 导入英雄相关的模型
 # Hero: 英雄模型
-# HeroEquipment: 英雄装备模型
-# HeroInscription: 英雄铭文模型
-from app.models.hero import Hero, HeroEquipment, HeroInscription
+from app.models.hero import Hero
+
+# 导入装备相关的Schema
+# UpgradePlan: 升级路线响应模型
+# BuildOptimization: 金币预算出装优化响应模型
+from app.schemas.equipment import UpgradePlan, BuildOptimization
 
 # 导入英雄相关的Schema
 # HeroResponse: 英雄响应模型
 # HeroDetailResponse: 英雄详情响应模型
 # EquipmentResponse: 装备响应模型
 # BPSuggestion: BP建议模型
-from app.schemas.hero import HeroResponse, HeroDetailResponse, EquipmentResponse, BPSuggestion
+# DraftRequest: 选人推荐请求模型
+# DraftSuggestion: 选人推荐响应模型
+# HeroSearchResult: 英雄搜索结果模型
+# HeroMatchStatsResponse: 英雄对局统计模型
+# HeroRelationEntry: 英雄关系条目模型
+# HeroRelationsResponse: 英雄克制关系模型
+# CommonCountersResponse: 共同克制者模型
+# CounterPickRequest: 克制阵容推荐请求模型
+# CounterPick: 克制阵容推荐项模型
+# CounterPickResponse: 克制阵容推荐响应模型
+from app.schemas.hero import (
+    HeroResponse, HeroDetailResponse, EquipmentResponse, BPSuggestion,
+    DraftRequest, DraftSuggestion, HeroSearchResult, HeroMatchStatsResponse,
+    HeroRelationEntry, HeroRelationsResponse, CommonCountersResponse,
+    CounterPickRequest, CounterPick, CounterPickResponse
+)
+
+# 导入英雄目录
+# hero_catalog: 内存中的英雄数据快照，加载后英雄查询不再访问数据库
+from app.services.hero_catalog import hero_catalog
+
+# 导入出装铭文推荐服务（物化推荐表的点查）
+from app.services.build_recommendation_service import build_recommendation_service
+
+# 导入装备合成图服务（出装升级路线）
+from app.services.equipment_graph import equipment_graph_service
+
+# 导入金币预算出装优化器
+from app.services.build_optimizer import build_optimizer
+
+# 导入克制矩阵服务和选人推荐引擎
+from app.services.counter_matrix import counter_matrix_service
+from app.services.draft_engine import DraftState, draft_engine
+
+# 导入英雄搜索服务
+# hero_search_service: 名称、别名、称号、技能和拼音的内存搜索索引
+from app.services.hero_search_service import hero_search_service
+
+# 导入英雄对局统计服务
+# hero_stats_service: 对局数足够的英雄使用对局统计的胜率和选用率
+from app.services.hero_stats_service import hero_stats_service
+
+# 导入英雄关系服务
+# hero_relation_service: 按英雄ID索引的克制关系（邻接索引和关系表）
+from app.services.hero_relation_service import hero_relation_service, RelationIndex
+
+
+# 英雄列表的字段（与HeroResponse一致，fields参数只能从中选择）
+HERO_LIST_FIELDS = tuple(HeroResponse.model_fields)
+
+# 一套出装的装备数量
+BUILD_SIZE = 6
+
+# BP建议中推荐的克制英雄数量
+BP_COUNTER_PICKS = 5
 
 
 class HeroService:
@@ -59,11 +124,11 @@ class HeroService:
         参数:
             position: 英雄位置过滤（如"射手"、"法师"等）
             difficulty: 难度过滤（如"简单"、"困难"等）
-            search: 搜索关键词（英雄名称）
+            search: 搜索关键词（名称、别名、称号、技能名称、描述，支持拼音和首字母）
             db: 数据库会话对象
         
         返回:
-            List[HeroResponse]: 英雄列表
+            List[HeroResponse]: 英雄列表（指定搜索关键词时按相关度排序，否则按ID排序）
         
         功能:
             - 查询英雄列表
@@ -78,10 +143,31 @@ class HeroService:
             4. 如果指定了搜索关键词，添加搜索条件
             5. 执行查询获取英雄列表
             6. 转换为响应模型列表
+        
+        英雄目录:
+            - 英雄目录已加载时直接从内存快照筛选，不查询数据库
+            - 搜索关键词使用英雄搜索索引匹配
+        
+        对局统计:
+            - 对局数达到阈值的英雄，胜率和选用率使用对局统计的值
         """
+        # 使用搜索索引匹配关键词，再按位置和难度过滤
+        if search:
+            index = hero_search_service.get(db)
+            return [
+                hero_stats_service.overlay(hero) for hero in index.search(search, limit=len(index.results))
+                if (not position or hero.position == position)
+                and (not difficulty or hero.difficulty == difficulty)
+            ]
+        
+        # 英雄目录已加载时直接从快照筛选
+        snapshot = hero_catalog.snapshot()
+        if snapshot is not None:
+            return [hero_stats_service.overlay(hero) for hero in snapshot.list_heroes(position, difficulty, search)]
+        
         # 构建基础查询
-        # 从Hero表查询所有英雄
-        query = db.query(Hero)
+        # 从Hero表查询所有英雄，只加载列表需要的列
+        query = db.query(Hero).options(load_only(*self._list_columns(HERO_LIST_FIELDS)))
         
         # 如果指定了位置，添加位置过滤条件
         if position:
@@ -102,7 +188,7 @@ class HeroService:
         # 将数据库模型转换为响应模型列表
         # 使用列表推导式，简洁高效
         return [
-            HeroResponse(
+            hero_stats_service.overlay(HeroResponse(
                 id=hero.id,
                 name=hero.name,
                 title=hero.title,
@@ -112,10 +198,122 @@ class HeroService:
                 win_rate=hero.win_rate,
                 pick_rate=hero.pick_rate,
                 ban_rate=hero.ban_rate
-            )
+            ))
             for hero in heroes
         ]
     
+    def get_hero_page(
+        self,
+        position: Optional[str],
+        difficulty: Optional[str],
+        search: Optional[str],
+        cursor: Optional[str],
+        limit: Optional[int],
+        fields: Optional[List[str]],
+        db: Session
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        分页获取英雄列表（可以只返回部分字段）
+        
+        参数:
+            position: 英雄位置过滤
+            difficulty: 难度过滤
+            search: 搜索关键词
+            cursor: 上一页返回的游标（第一页为None）
+            limit: 每页数量（None表示不分页）
+            fields: 需要返回的字段（None表示全部字段）
+            db: 数据库会话对象
+        
+        返回:
+            Tuple[List[Dict[str, Any]], Optional[str]]: (当前页的英雄, 下一页的游标，没有下一页为None)
+        
+        异常:
+            ValueError: 字段名称或游标无效
+        
+        分页方式:
+            - 按ID排序时，游标记录上一页最后一个英雄的ID（WHERE id > ?），
+              翻页时英雄增删不会导致重复或遗漏
+            - 按相关度排序（指定搜索关键词）时，游标记录已返回的数量
+        
+        查询优化:
+            - 英雄目录已加载时从内存快照分页，不查询数据库
+            - 否则只查询需要的列，不读取描述、技能等大字段
+        """
+        # 校验字段
+        fields = list(fields) if fields else list(HERO_LIST_FIELDS)
+        unknown = [field for field in fields if field not in HERO_LIST_FIELDS]
+        if unknown:
+            raise ValueError(f"不支持的字段: {', '.join(unknown)}")
+        include = set(fields)
+        
+        start = self._decode_cursor(cursor)
+        
+        # 按相关度排序：按数量分页
+        if search:
+            heroes = self.get_hero_list(position, difficulty, search, db)
+            offset = max(start.get("offset", 0), 0)
+            end = offset + limit if limit else len(heroes)
+            next_cursor = self._encode_cursor({"offset": end}) if end < len(heroes) else None
+            return [hero.model_dump(include=include) for hero in heroes[offset:end]], next_cursor
+        
+        # 按ID排序：按上一页最后一个英雄的ID分页
+        after = start.get("after", 0)
+        snapshot = hero_catalog.snapshot()
+        if snapshot is not None:
+            heroes = [hero for hero in snapshot.list_heroes(position, difficulty) if hero.id > after]
+            page = heroes[:limit] if limit else heroes
+            items = [hero_stats_service.overlay(hero).model_dump(include=include) for hero in page]
+            last_id = page[-1].id if page else None
+            has_more = len(heroes) > len(page)
+        else:
+            # 只查询需要的列（ID用于计算游标，名称用于查找对局统计，始终查询）
+            columns = self._list_columns(["id", "name"] + fields)
+            query = db.query(*columns).filter(Hero.id > after)
+            if position:
+                query = query.filter(Hero.position == position)
+            if difficulty:
+                query = query.filter(Hero.difficulty == difficulty)
+            query = query.order_by(Hero.id)
+            
+            # 多查询一条，判断是否还有下一页
+            if limit:
+                query = query.limit(limit + 1)
+            rows = query.all()
+            has_more = bool(limit) and len(rows) > limit
+            rows = rows[:limit] if limit else rows
+            items = [{field: getattr(row, field) for field in fields} for row in rows]
+            
+            # 对局数达到阈值的英雄使用对局统计的胜率和选用率
+            for item, row in zip(items, rows):
+                rates = hero_stats_service.rates(row.name)
+                if rates is None:
+                    continue
+                for key, value in zip(("win_rate", "pick_rate"), rates):
+                    if key in include:
+                        item[key] = value
+            last_id = rows[-1].id if rows else None
+        
+        next_cursor = self._encode_cursor({"after": last_id}) if has_more else None
+        return items, next_cursor
+    
+    def search_heroes(self, query: str, limit: int, db: Session) -> List[HeroSearchResult]:
+        """
+        搜索英雄（输入提示）
+        
+        参数:
+            query: 搜索词（汉字、全拼或首字母，如"鲁班"、"luban"、"lbqh"）
+            limit: 返回数量
+            db: 数据库会话对象
+        
+        返回:
+            List[HeroSearchResult]: 按相关度排序的搜索结果，包含匹配的字段和原文
+        
+        匹配范围:
+            - 名称、别名、称号、技能名称：前缀匹配和中间匹配，支持拼音和首字母
+            - 描述：包含搜索词的所有字符二元组
+        """
+        return [hero_stats_service.overlay(hero) for hero in hero_search_service.get(db).search(query, limit)]
+    
     def get_hero_detail(self, hero_id: int, db: Session) -> Optional[HeroDetailResponse]:
         """
         获取英雄详情
@@ -135,7 +333,16 @@ class HeroService:
             1. 根据hero_id查询英雄
             2. 如果英雄不存在，返回None
             3. 如果英雄存在，返回英雄详情对象
+        
+        英雄目录:
+            - 英雄目录已加载时直接从内存快照读取，不查询数据库
         """
+        # 英雄目录已加载时直接从快照读取
+        snapshot = hero_catalog.snapshot()
+        if snapshot is not None:
+            hero = snapshot.details.get(hero_id)
+            return hero_stats_service.overlay(hero) if hero is not None else None
+        
         # 从数据库查询英雄
         # filter: 添加查询条件（英雄ID等于指定值）
         # first(): 获取第一条记录，如果没有则返回None
@@ -145,8 +352,8 @@ class HeroService:
         if not hero:
             return None
         
-        # 英雄存在，返回英雄详情对象
-        return HeroDetailResponse(
+        # 英雄存在，返回英雄详情对象（对局数足够时使用对局统计的胜率和选用率）
+        return hero_stats_service.overlay(HeroDetailResponse(
             id=hero.id,
             name=hero.name,
             title=hero.title,
@@ -161,13 +368,150 @@ class HeroService:
             ban_rate=hero.ban_rate,
             counter_heroes=hero.counter_heroes,
             countered_by_heroes=hero.countered_by_heroes
+        ))
+    
+    def get_hero_stats(self, hero_id: int, db: Session) -> Optional[HeroMatchStatsResponse]:
+        """
+        获取英雄的对局统计
+        
+        参数:
+            hero_id: 英雄ID
+            db: 数据库会话对象
+        
+        返回:
+            Optional[HeroMatchStatsResponse]: 对局统计（汇总和按段位、位置细分），英雄不存在时返回None
+        
+        业务逻辑:
+            1. 查找英雄名称（英雄目录已加载时不查询数据库）
+            2. 从对局统计服务读取该英雄的计数，计算胜率、选用率和场均数据
+        """
+        snapshot = hero_catalog.snapshot()
+        if snapshot is not None:
+            hero = snapshot.details.get(hero_id)
+            name = hero.name if hero is not None else None
+        else:
+            name = db.query(Hero.name).filter(Hero.id == hero_id).scalar()
+        
+        # 如果英雄不存在，返回None
+        if name is None:
+            return None
+        
+        return hero_stats_service.breakdown(hero_id, name, db)
+    
+    def get_hero_relations(self, hero_id: int, db: Session) -> Optional[HeroRelationsResponse]:
+        """
+        获取英雄的克制关系
+        
+        参数:
+            hero_id: 英雄ID
+            db: 数据库会话对象
+        
+        返回:
+            Optional[HeroRelationsResponse]: 被该英雄克制的英雄和克制该英雄的英雄，英雄不存在时返回None
+        
+        说明:
+            - 两个方向由英雄关系表的同一组关系得到，始终一致
+              （英雄数据的counter_heroes和countered_by_heroes各自记录，可能不一致）
+        """
+        index = hero_relation_service.current(db)
+        name = index.names.get(hero_id)
+        
+        # 如果英雄不存在，返回None
+        if name is None:
+            return None
+        
+        return HeroRelationsResponse(
+            hero_id=hero_id,
+            hero_name=name,
+            counters=self._relation_entries(index, index.counters_of(hero_id)),
+            countered_by=self._relation_entries(index, index.countered_by_of(hero_id))
+        )
+    
+    def get_common_counters(self, names: List[str], limit: int, db: Session) -> CommonCountersResponse:
+        """
+        查询同时克制所有指定英雄的英雄
+        
+        参数:
+            names: 英雄名称列表
+            limit: 返回数量
+            db: 数据库会话对象
+        
+        返回:
+            CommonCountersResponse: 按权重之和降序的共同克制者，以及未知的英雄名称
+        
+        异常:
+            ValueError: 没有英雄表中存在的英雄
+        """
+        index = hero_relation_service.current(db)
+        names = list(dict.fromkeys(names))
+        known = [name for name in names if name in index.ids]
+        if not known:
+            raise ValueError("请至少指定一个存在的英雄")
+        
+        counters = hero_relation_service.counters_of_all(db, [index.ids[name] for name in known])
+        return CommonCountersResponse(
+            heroes=known,
+            unknown=[name for name in names if name not in index.ids],
+            counters=self._relation_entries(index, counters[:limit])
+        )
+    
+    def get_counter_picks(self, request: CounterPickRequest, db: Session) -> CounterPickResponse:
+        """
+        推荐最克制敌方阵容的英雄
+        
+        参数:
+            request: 敌方英雄、定位和可选英雄过滤、推荐数量
+            db: 数据库会话对象
+        
+        返回:
+            CounterPickResponse: 按克制权重之和降序的推荐英雄，以及未知的英雄名称
+        
+        异常:
+            ValueError: 没有英雄表中存在的敌方英雄
+        
+        业务逻辑:
+            1. 获取英雄关系索引（未加载时从关系表临时构建）
+            2. 将英雄名称转换为ID，可选英雄和排除的英雄同样转换
+            3. 合并敌方英雄的倒排列表，取得分最高的top_k个英雄
+        """
+        index = hero_relation_service.current(db)
+        names = list(dict.fromkeys(request.enemy_heroes))
+        enemies = [name for name in names if name in index.ids]
+        if not enemies:
+            raise ValueError("请至少指定一个存在的敌方英雄")
+        
+        pool = None
+        if request.pool:
+            pool = {index.ids[name] for name in request.pool if name in index.ids}
+        
+        picks = index.top_counters(
+            [index.ids[name] for name in enemies],
+            request.top_k,
+            positions=set(request.positions) or None,
+            pool=pool,
+            exclude=[index.ids[name] for name in request.exclude if name in index.ids]
+        )
+        return CounterPickResponse(
+            enemy_heroes=enemies,
+            unknown=[name for name in names if name not in index.ids],
+            picks=[
+                CounterPick(
+                    hero_id=hero_id,
+                    hero_name=index.names[hero_id],
+                    position=index.positions.get(hero_id),
+                    score=round(score, 4),
+                    countered=[index.names[enemy_id] for enemy_id in covered]
+                )
+                for hero_id, score, covered in picks
+            ]
         )
     
     def get_hero_equipment(
         self,
         hero_id: int,
         rank: str,
-        db: Session
+        db: Session,
+        position: Optional[str] = None
     ) -> List[EquipmentResponse]:
         """
         获取英雄装备推荐
@@ -176,44 +520,36 @@ class HeroService:
             hero_id: 英雄ID
             rank: 段位（如"黄金"、"钻石"等）
             db: 数据库会话对象
+            position: 位置，为空表示全部位置
         
         返回:
-            List[EquipmentResponse]: 装备推荐列表
+            List[EquipmentResponse]: 装备推荐列表（按胜率、选用率降序）
         
         功能:
             - 查询英雄的装备推荐
-            - 支持按段位过滤
+            - 支持按段位、位置过滤
             - 提供不同位置的出装建议
         
         业务逻辑:
-            1. 构建基础查询
-            2. 如果指定了段位且不是"全部"，添加段位过滤条件
-            3. 执行查询获取装备列表
-            4. 转换为响应模型列表
-        """
-        # 构建基础查询
-        # 从HeroEquipment表查询该英雄的装备
-        query = db.query(HeroEquipment).filter(HeroEquipment.hero_id == hero_id)
-        
-        # 如果指定了段位且不是"全部"，添加段位过滤条件
-        if rank and rank != "全部":
-            query = query.filter(HeroEquipment.rank == rank)
-        
-        # 执行查询获取所有匹配的装备
-        equipments = query.all()
+            1. 段位为空或"全部"时取段位汇总，位置为空时取位置汇总
+            2. 按(英雄, 段位, 位置)查询物化推荐表
+            3. 转换为响应模型列表
         
-        # 将数据库模型转换为响应模型列表
-        return [
-            EquipmentResponse(
-                id=eq.id,
-                rank=eq.rank,
-                position=eq.position,
-                equipment_list=eq.equipment_list or [],
-                win_rate=eq.win_rate,
-                pick_rate=eq.pick_rate
-            )
-            for eq in equipments
-        ]
+        英雄目录:
+            - 英雄目录已加载时直接从内存快照读取，不查询数据库
+        """
+        # 英雄目录已加载时直接从快照读取
+        snapshot = hero_catalog.snapshot()
+        if snapshot is not None:
+            return snapshot.list_equipment(hero_id, rank, position)
+        
+        # 按唯一组合索引点查物化推荐表（已按胜率、选用率排好序）
+        recommendation = build_recommendation_service.get(hero_id, rank, position, db)
+        if recommendation is None:
+            return []
+        
+        # 将推荐记录转换为响应模型列表
+        return [EquipmentResponse(**item) for item in recommendation.equipment or []]
     
     def get_hero_inscription(
         self,
@@ -238,21 +574,24 @@ class HeroService:
             - 返回铭文配置和描述
         
         业务逻辑:
-            1. 构建基础查询
-            2. 如果指定了段位且不是"全部"，添加段位过滤条件
-            3. 执行查询获取铭文列表
-            4. 转换为字典格式返回
-        """
-        # 构建基础查询
-        # 从HeroInscription表查询该英雄的铭文
-        query = db.query(HeroInscription).filter(HeroInscription.hero_id == hero_id)
-        
-        # 如果指定了段位且不是"全部"，添加段位过滤条件
-        if rank and rank != "全部":
-            query = query.filter(HeroInscription.rank == rank)
+            1. 段位为空或"全部"时取段位汇总
+            2. 按(英雄, 段位)查询物化推荐表的位置汇总行
+            3. 转换为字典格式返回
         
-        # 执行查询获取所有匹配的铭文
-        inscriptions = query.all()
+        英雄目录:
+            - 英雄目录已加载时直接从内存快照读取，不查询数据库
+        """
+        # 英雄目录已加载时直接从快照读取
+        snapshot = hero_catalog.snapshot()
+        if snapshot is not None:
+            return {
+                "hero_id": hero_id,
+                "rank": rank,
+                "inscriptions": snapshot.list_inscriptions(hero_id, rank)
+            }
+        
+        # 按唯一组合索引点查物化推荐表（已按胜率排好序）
+        recommendation = build_recommendation_service.get(hero_id, rank, None, db)
         
         # 转换为字典格式返回
         return {
@@ -261,19 +600,108 @@ class HeroService:
             # 段位
             "rank": rank,
             # 铭文列表
-            "inscriptions": [
-                {
-                    "id": ins.id,
-                    "rank": ins.rank,
-                    "inscription_name": ins.inscription_name,
-                    "inscription_config": ins.inscription_config,
-                    "description": ins.description,
-                    "win_rate": ins.win_rate
-                }
-                for ins in inscriptions
-            ]
+            "inscriptions": (recommendation.inscriptions or []) if recommendation is not None else []
         }
     
+    def get_build_plan(
+        self,
+        hero_id: int,
+        gold: Optional[int],
+        inventory: List[str],
+        position: Optional[str],
+        db: Session
+    ) -> Optional[UpgradePlan]:
+        """
+        根据英雄的推荐出装计算下一步购买的装备
+        
+        参数:
+            hero_id: 英雄ID
+            gold: 当前金币，为空表示不限金币
+            inventory: 已有装备名称
+            position: 位置，为空表示全部位置
+            db: 数据库会话对象
+        
+        返回:
+            Optional[UpgradePlan]: 购买路线，英雄不存在返回None
+        
+        业务逻辑:
+            1. 获取英雄的目标出装
+            2. 在装备合成图中计算购买路线，合成图中没有的装备按推荐中的价格处理
+        """
+        build = self._target_build(hero_id, position, db)
+        if build is None:
+            return None
+        
+        targets, items = build
+        prices = {name: item.get("price") or 0 for name, item in items.items()}
+        return equipment_graph_service.get(db).plan(targets, inventory, gold, prices)
+    
+    def optimize_build(
+        self,
+        hero_id: int,
+        gold: int,
+        position: Optional[str],
+        db: Session
+    ) -> Optional[BuildOptimization]:
+        """
+        在金币预算内优化英雄推荐出装的购买方案
+        
+        参数:
+            hero_id: 英雄ID
+            gold: 金币预算
+            position: 位置，为空表示全部位置
+            db: 数据库会话对象
+        
+        返回:
+            Optional[BuildOptimization]: 购买项和获得的属性，英雄不存在返回None
+        
+        业务逻辑:
+            1. 获取英雄的目标出装
+            2. 在目标装备的合成树中选择属性价值最大的购买方案，
+               合成图中没有的装备按推荐中的价格和属性处理
+        """
+        build = self._target_build(hero_id, position, db)
+        if build is None:
+            return None
+        
+        targets, items = build
+        return build_optimizer.optimize(equipment_graph_service.get(db), targets, gold, items)
+    
+    def _target_build(
+        self,
+        hero_id: int,
+        position: Optional[str],
+        db: Session
+    ) -> Optional[Tuple[List[str], Dict[str, dict]]]:
+        """
+        获取英雄的目标出装（私有方法）
+        
+        参数:
+            hero_id: 英雄ID
+            position: 位置，为空表示全部位置
+            db: 数据库会话对象
+        
+        返回:
+            Optional[Tuple]: (目标装备名称, 名称 -> 推荐中的装备数据)，英雄不存在返回None
+        
+        说明:
+            - 按胜率顺序合并英雄的出装推荐，去重后取前6件
+        """
+        if self.get_hero_detail(hero_id, db) is None:
+            return None
+        
+        targets: List[str] = []
+        items: Dict[str, dict] = {}
+        for recommendation in self.get_hero_equipment(hero_id, "全部", db, position):
+            for item in recommendation.equipment_list:
+                item = item if isinstance(item, dict) else {"name": item}
+                name = item.get("name")
+                if name and name not in items and len(targets) < BUILD_SIZE:
+                    targets.append(name)
+                    items[name] = item
+        
+        return targets, items
+    
     def get_bp_suggestion(
         self,
         our_heroes: List[str],
@@ -308,18 +736,26 @@ class HeroService:
             - Ban阶段：禁选英雄
             - Pick阶段：选择英雄
             - 目标：优化阵容，提高胜率
+        
+        查询优化:
+            - 双方英雄一次性按名称批量查找，各项分析共用查找结果
+            - 英雄目录已加载时不查询数据库
+            - counter英雄推荐合并内存中英雄关系索引的倒排列表，索引未加载时使用已查找英雄的克制列表
         """
+        # 一次性查找双方所有英雄
+        heroes = self._resolve_heroes(our_heroes + enemy_heroes, db)
+        
         # 分析我方阵容的短板
-        shortcomings = self._analyze_shortcomings(our_heroes, db)
+        shortcomings = self._analyze_shortcomings(our_heroes, heroes)
         
         # 生成禁选建议
-        ban_suggestions = self._generate_ban_suggestions(enemy_heroes, db)
+        ban_suggestions = self._generate_ban_suggestions(enemy_heroes, heroes)
         
         # 获取counter英雄推荐
-        counter_recommendations = self._get_counter_recommendations(our_heroes, enemy_heroes, db)
+        counter_recommendations = self._get_counter_recommendations(our_heroes, enemy_heroes, heroes)
         
         # 评估整体阵容优势
-        overall_rating = self._evaluate_overall_rating(our_heroes, enemy_heroes, db)
+        overall_rating = self._evaluate_overall_rating(our_heroes, enemy_heroes, heroes)
         
         # 返回BP建议对象
         return BPSuggestion(
@@ -329,13 +765,116 @@ class HeroService:
             overall_rating=overall_rating
         )
     
-    def _analyze_shortcomings(self, heroes: List[str], db: Session) -> str:
+    def get_draft_suggestion(self, request: DraftRequest, db: Session) -> DraftSuggestion:
+        """
+        获取选人和禁用推荐
+        
+        参数:
+            request: 当前的选人状态（双方已选、已禁用英雄）
+            db: 数据库会话对象
+        
+        返回:
+            DraftSuggestion: 选人推荐、禁用推荐和搜索统计
+        
+        异常:
+            ValueError: 有英雄不存在
+        
+        业务逻辑:
+            1. 获取克制矩阵（未加载时从数据库构建）
+            2. 构建选人状态（有英雄不存在时报错）
+            3. 在时间预算内搜索后续选人，生成推荐
+        """
+        # 获取克制矩阵
+        matrix = counter_matrix_service.get(db)
+        
+        # 构建选人状态
+        state = DraftState.from_names(matrix, request.our_picks, request.enemy_picks, request.bans)
+        
+        # 搜索推荐
+        return draft_engine.search(state, first_pick=request.first_pick, top_k=request.top_k)
+    
+    def _relation_entries(self, index: RelationIndex, items: List[Tuple[int, float]]) -> List[HeroRelationEntry]:
+        """
+        将(英雄ID, 权重)转换为英雄关系条目
+        """
+        return [
+            HeroRelationEntry(
+                hero_id=hero_id,
+                hero_name=index.names[hero_id],
+                position=index.positions.get(hero_id),
+                weight=round(weight, 4)
+            )
+            for hero_id, weight in items
+        ]
+    
+    def _list_columns(self, fields: List[str]) -> List[Any]:
+        """
+        获取英雄列表字段对应的数据库列（去重，保持顺序）
+        """
+        return [getattr(Hero, field) for field in dict.fromkeys(fields)]
+    
+    def _encode_cursor(self, value: Dict[str, int]) -> str:
+        """
+        编码分页游标（URL安全的base64）
+        """
+        return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+    
+    def _decode_cursor(self, cursor: Optional[str]) -> Dict[str, int]:
+        """
+        解码分页游标
+        
+        异常:
+            ValueError: 游标无效
+        """
+        if not cursor:
+            return {}
+        try:
+            value = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return {key: int(value[key]) for key in value if key in ("after", "offset")}
+        except Exception:
+            raise ValueError("无效的分页游标")
+    
+    def _resolve_heroes(self, names: List[str], db: Session) -> Dict[str, Any]:
+        """
+        按名称批量查找英雄
+        
+        参数:
+            names: 英雄名称列表（可以重复，可以包含不存在的英雄）
+            db: 数据库会话对象
+        
+        返回:
+            Dict[str, Any]: 英雄名称 -> 英雄数据（包含position、win_rate、ban_rate、
+                            countered_by_heroes等字段），不存在的英雄不在结果中
+        
+        业务逻辑:
+            1. 英雄目录已加载时直接从名称索引查找
+            2. 否则使用一次IN查询获取所有英雄
+        
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+        """
+        # 去重
+        unique_names = set(names)
+        if not unique_names:
+            return {}
+        
+        # 英雄目录已加载时直接从名称索引查找
+        snapshot = hero_catalog.snapshot()
+        if snapshot is not None:
+            return {name: snapshot.by_name[name] for name in unique_names if name in snapshot.by_name}
+        
+        # 一次查询获取所有英雄
+        heroes = db.query(Hero).filter(Hero.name.in_(unique_names)).all()
+        return {hero.name: hero for hero in heroes}
+    
+    def _analyze_shortcomings(self, heroes: List[str], resolved: Dict[str, Any]) -> str:
         """
         分析阵容短板
         
         参数:
             heroes: 英雄名称列表
-            db: 数据库会话对象
+            resolved: 已查找的英雄（名称 -> 英雄数据）
         
         返回:
             str: 阵容短板描述
@@ -365,8 +904,8 @@ class HeroService:
         
         # 遍历英雄列表
         for hero_name in heroes:
-            # 查询英雄信息
-            hero = db.query(Hero).filter(Hero.name == hero_name).first()
+            # 查找英雄信息
+            hero = resolved.get(hero_name)
             
             # 如果英雄存在，添加其位置
             if hero:
@@ -383,13 +922,13 @@ class HeroService:
         # 阵容完整
         return "阵容结构较为完整"
     
-    def _generate_ban_suggestions(self, enemy_heroes: List[str], db: Session) -> List[str]:
+    def _generate_ban_suggestions(self, enemy_heroes: List[str], resolved: Dict[str, Any]) -> List[str]:
         """
         生成禁选建议
         
         参数:
             enemy_heroes: 敌方英雄列表
-            db: 数据库会话对象
+            resolved: 已查找的英雄（名称 -> 英雄数据）
         
         返回:
             List[str]: 禁选建议列表
@@ -417,8 +956,8 @@ class HeroService:
         
         # 遍历敌方英雄列表
         for hero_name in enemy_heroes:
-            # 查询英雄信息
-            hero = db.query(Hero).filter(Hero.name == hero_name).first()
+            # 查找英雄信息
+            hero = resolved.get(hero_name)
             
             # 如果英雄存在且禁用率超过30%，建议禁选
             if hero and hero.ban_rate > 0.3:
@@ -432,7 +971,7 @@ class HeroService:
         self,
         our_heroes: List[str],
         enemy_heroes: List[str],
-        db: Session
+        resolved: Dict[str, Any]
     ) -> List[str]:
         """
         获取counter英雄推荐
@@ -440,41 +979,49 @@ class HeroService:
         参数:
             our_heroes: 我方英雄列表
             enemy_heroes: 敌方英雄列表
-            db: 数据库会话对象
+            resolved: 已查找的英雄（名称 -> 英雄数据）
         
         返回:
-            List[str]: counter英雄推荐列表
+            List[str]: counter英雄推荐列表，如"安琪拉: counter 妲己, 程咬金"
         
         功能:
-            - 针对敌方英雄推荐counter英雄
+            - 针对整个敌方阵容推荐counter英雄
             - 帮助玩家选择克制英雄
         
         业务逻辑:
-            1. 遍历敌方英雄列表
-            2. 查询每个英雄的counter英雄
-            3. 生成推荐列表
-            4. 返回counter英雄推荐
+            1. 获取内存中的英雄关系索引（不查询数据库）
+            2. 合并敌方英雄的倒排列表，取克制权重之和最高的英雄（排除双方已选英雄）
+            3. 生成推荐列表，列出每个英雄克制的敌方英雄
+            4. 索引未加载时（启动预热失败），按敌方英雄逐个列出克制列表中的前3个英雄
         
         私有方法:
             - 以下划线开头，表示内部方法
             - 只在类内部使用，不对外暴露
         
         Counter策略:
-            - 选择克制敌方英雄的角色
+            - 优先选择同时克制多个敌方英雄的角色
             - 提高对线优势
         """
-        # 初始化推荐列表
-        recommendations = []
-        
-        # 遍历敌方英雄列表
-        for hero_name in enemy_heroes:
-            # 查询英雄信息
-            hero = db.query(Hero).filter(Hero.name == hero_name).first()
-            
-            # 如果英雄存在且有counter英雄信息
-            if hero and hero.countered_by_heroes:
-                # 添加counter推荐，最多显示前3个
-                recommendations.append(f"counter {hero_name}: {', '.join(hero.countered_by_heroes[:3])}")
+        index = hero_relation_service.index()
+        
+        if index is not None:
+            # 合并敌方英雄的倒排列表，双方已选的英雄不参与推荐
+            picks = index.top_counters(
+                [index.ids[name] for name in enemy_heroes if name in index.ids],
+                BP_COUNTER_PICKS,
+                exclude=[index.ids[name] for name in our_heroes if name in index.ids]
+            )
+            recommendations = [
+                f"{index.names[hero_id]}: counter {', '.join(index.names[enemy_id] for enemy_id in covered)}"
+                for hero_id, _, covered in picks
+            ]
+        else:
+            # 索引未加载：使用已查找英雄的克制列表
+            recommendations = []
+            for hero_name in enemy_heroes:
+                hero = resolved.get(hero_name)
+                if hero and hero.countered_by_heroes:
+                    recommendations.append(f"counter {hero_name}: {', '.join(hero.countered_by_heroes[:3])}")
         
         # 如果有推荐，返回推荐列表
         # 否则返回默认推荐
@@ -484,7 +1031,7 @@ class HeroService:
         self,
         our_heroes: List[str],
         enemy_heroes: List[str],
-        db: Session
+        resolved: Dict[str, Any]
     ) -> str:
         """
         评估整体阵容优势
@@ -492,14 +1039,14 @@ class HeroService:
         参数:
             our_heroes: 我方英雄列表
             enemy_heroes: 敌方英雄列表
-            db: 数据库会话对象
+            resolved: 已查找的英雄（名称 -> 英雄数据）
         
         返回:
             str: 阵容优势评价（"优势"、"劣势"、"均势"）
         
         功能:
             - 比较双方阵容的整体实力
-            - 基于英雄胜率进行评估
+            - 基于英雄胜率进行评估（对局数足够的英雄使用对局统计的胜率）
         
         业务逻辑:
             1. 计算我方英雄的平均胜率
@@ -522,15 +1069,15 @@ class HeroService:
         
         # 计算我方英雄的总胜率
         for hero_name in our_heroes:
-            hero = db.query(Hero).filter(Hero.name == hero_name).first()
+            hero = resolved.get(hero_name)
             if hero:
-                our_win_rate += hero.win_rate
+                our_win_rate += hero_stats_service.win_rate(hero_name, hero.win_rate)
         
         # 计算敌方英雄的总胜率
         for hero_name in enemy_heroes:
-            hero = db.query(Hero).filter(Hero.name == hero_name).first()
+            hero = resolved.get(hero_name)
             if hero:
-                enemy_win_rate += hero.win_rate
+                enemy_win_rate += hero_stats_service.win_rate(hero_name, hero.win_rate)
         
         # 比较双方胜率，返回阵容优势评价
         if our_win_rate > enemy_win_rate:
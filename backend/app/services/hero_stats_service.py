@@ -0,0 +1,542 @@
+# 导入类型提示
+# Any: 任意类型
+# Dict: 字典类型
+# Iterable: 可迭代类型
+# Optional: 可选类型（可以为None）
+# Tuple: 元组类型
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+# 导入正则表达式模块，用于把段位归并为段位大类
+import re
+
+# 导入线程锁，保证计数器合并和版本号递增的原子性
+from threading import Lock
+
+# 导入datetime类，用于记录计数行的更新时间
+from datetime import datetime
+
+# 导入SQLAlchemy的事件、聚合函数和查询构造函数
+from sqlalchemy import and_, case, event, func, update
+
+# 导入Session类
+# Session: SQLAlchemy的数据库会话，用于与数据库交互
+from sqlalchemy.orm import Session
+
+# 导入配置设置
+from app.core.config import settings
+
+# 导入对局相关的模型
+from app.models.match import Match, HeroMatchStats
+
+# 导入英雄对局统计的Schema
+from app.schemas.hero import HeroStatsLine, HeroMatchStatsResponse
+
+
+# 段位汇总行的段位
+ALL_RANKS = "全部"
+
+# 位置汇总行的位置
+ALL_POSITIONS = ""
+
+# 计为胜利的对局结果（小写）
+WIN_RESULTS = ("victory", "win", "胜利", "胜")
+
+# 计数字段（与hero_match_stats表的列一致，第一个为对局数，第二个为胜场数）
+COUNTER_FIELDS = (
+    "games", "wins", "kills", "deaths", "assists", "gold", "damage",
+    "damage_taken", "healing", "duration", "kda", "participation_rate"
+)
+
+# 累加的对局字段（COUNTER_FIELDS中对局数和胜场数之后的字段）
+SUM_FIELDS = COUNTER_FIELDS[2:]
+
+# 每局的玩家数量（所有位置），以及每局中同一位置的玩家数量
+PLAYERS_PER_MATCH = 10
+PLAYERS_PER_POSITION = 2
+
+# 段位末尾的小段、星数（"钻石II"、"王者50星" -> "钻石"、"王者"）
+RANK_SUFFIX = re.compile(r"[\sIVXⅠ-Ⅻ0-9一二三四五六七八九十星★]+$")
+
+# 会话info中暂存未提交差值的键
+PENDING_KEY = "hero_match_stats_pending"
+
+
+def rank_bracket(rank: Optional[str]) -> Optional[str]:
+    """
+    段位归并为段位大类
+
+    参数:
+        rank: 对局记录的段位，如"钻石II"、"王者50星"
+
+    返回:
+        Optional[str]: 段位大类，如"钻石"、"王者"，没有段位时为None
+    """
+    if not rank:
+        return None
+    return RANK_SUFFIX.sub("", rank.strip()) or rank.strip()
+
+
+def stat_keys(hero_name: str, rank: Optional[str], position: Optional[str]) -> set:
+    """
+    一场对局计入的计数行
+
+    参数:
+        hero_name: 英雄名称
+        rank: 段位
+        position: 位置
+
+    返回:
+        set: (英雄名称, 段位大类, 位置)集合，包含段位汇总行和位置汇总行
+    """
+    bracket = rank_bracket(rank)
+    position = position or ALL_POSITIONS
+    ranks = (ALL_RANKS, bracket) if bracket else (ALL_RANKS,)
+    return {(hero_name, r, p) for r in ranks for p in (ALL_POSITIONS, position)}
+
+
+class HeroStatsService:
+    """
+    英雄对局统计服务类
+
+    由对局数据汇总每个英雄（以及每个英雄在每个段位、位置下）的对局数、胜场数和各项表现数据
+
+    主要功能:
+        - 导入、删除对局时按差值增减hero_match_stats表的计数，不需要重新扫描matches表
+        - 在内存中保存全部计数，计算胜率、选用率和场均数据
+        - 对局数达到阈值的英雄，英雄接口和BP建议使用对局统计的胜率和选用率
+
+    设计说明:
+        - 计数行的更新与对局的写入在同一个事务中，提交后再合并到内存，回滚时丢弃
+        - 启动时从计数表加载，汇总行的对局数与matches表不一致时（如脚本直接写入了对局）按分组查询重建
+        - 禁用率无法从对局记录中得到，仍然使用英雄数据中的值
+        - 英雄接口使用的胜率、选用率（四舍五入后）有变化时版本号才递增，
+          缓存英雄接口响应时作为数据版本的一部分，并记录变化的英雄，只清除这些英雄的响应
+
+    使用场景:
+        - 英雄列表、详情的胜率和选用率
+        - 英雄对局统计接口
+        - BP建议和选人推荐的胜率
+    """
+
+    def __init__(self):
+        """
+        初始化英雄对局统计服务
+        """
+        # 计数器: (英雄名称, 段位大类, 位置) -> 计数（与COUNTER_FIELDS对应），未加载时为None
+        self._counters: Optional[Dict[Tuple[str, str, str], Tuple[float, ...]]] = None
+
+        # 每个(段位大类, 位置)的对局总数（用于计算选用率）
+        self._totals: Dict[Tuple[str, str], int] = {}
+
+        # 对局数达到阈值的英雄
+        self._live: set = set()
+
+        # 英雄接口当前使用的胜率和选用率: 英雄名称 -> (胜率, 选用率)
+        self._published: Dict[str, Tuple[float, float]] = {}
+
+        # 最近一次版本变化: (版本号, 变化前的版本号, 胜率或选用率变化的英雄名称)
+        self._last_change: Tuple[int, Optional[int], FrozenSet[str]] = (0, None, frozenset())
+
+        # 启动以来合并的对局变化数量（导入和删除都计入）
+        self._changes = 0
+
+        # 版本号
+        self._version = 0
+
+        # 合并锁
+        self._lock = Lock()
+
+    @property
+    def version(self) -> int:
+        """
+        当前版本号（加载计数，或合并后英雄接口使用的胜率、选用率变化时递增）
+        """
+        return self._version
+
+    def last_change(self) -> Tuple[int, Optional[int], FrozenSet[str]]:
+        """
+        获取最近一次版本变化
+
+        返回:
+            Tuple[int, Optional[int], FrozenSet[str]]:
+                (版本号, 变化前的版本号, 胜率或选用率变化的英雄名称)，加载计数时变化前的版本号为None（全部英雄可能变化）
+        """
+        return self._last_change
+
+    @property
+    def changes(self) -> int:
+        """
+        启动以来合并的对局变化数量（导入和删除的对局数之和，用于判断派生数据是否需要重新计算）
+        """
+        return self._changes
+
+    def load(self, db: Session):
+        """
+        从计数表加载全部计数
+
+        参数:
+            db: 数据库会话对象
+
+        业务逻辑:
+            1. 读取计数表
+            2. 汇总行的对局数与matches表的对局数不一致时重建计数表
+            3. 替换内存中的计数
+        """
+        rows = db.query(HeroMatchStats).all()
+        counted = sum(row.games for row in rows if row.rank == ALL_RANKS and row.position == ALL_POSITIONS)
+        if counted != self._match_count(db):
+            self.rebuild(db)
+            return
+
+        counters = {
+            (row.hero_name, row.rank, row.position): tuple(getattr(row, field) or 0 for field in COUNTER_FIELDS)
+            for row in rows if row.games > 0
+        }
+        self._replace(counters)
+
+    def rebuild(self, db: Session) -> int:
+        """
+        按matches表重建计数表（全量扫描，只在计数不一致时使用）
+
+        参数:
+            db: 数据库会话对象
+
+        返回:
+            int: 写入的计数行数量
+        """
+        # 按(英雄, 段位, 位置)分组汇总
+        wins = func.sum(case((func.lower(Match.result).in_(WIN_RESULTS), 1), else_=0))
+        sums = [func.coalesce(func.sum(getattr(Match, field)), 0) for field in SUM_FIELDS]
+        groups = db.query(
+            Match.hero_name, Match.rank, Match.position, func.count(Match.id), wins, *sums
+        ).filter(
+            Match.hero_name.isnot(None), Match.hero_name != ""
+        ).group_by(Match.hero_name, Match.rank, Match.position).all()
+
+        # 分组结果计入各计数行（段位归并为段位大类，并生成汇总行）
+        counters: Dict[Tuple[str, str, str], Tuple[float, ...]] = {}
+        for hero_name, rank, position, *values in groups:
+            for key in stat_keys(hero_name, rank, position):
+                counters[key] = self._add(counters.get(key), values)
+
+        # 整体替换计数表
+        now = datetime.utcnow()
+        db.query(HeroMatchStats).delete(synchronize_session=False)
+        db.bulk_insert_mappings(HeroMatchStats, [
+            dict(zip(COUNTER_FIELDS, values), hero_name=key[0], rank=key[1], position=key[2], updated_at=now)
+            for key, values in counters.items()
+        ])
+        db.commit()
+
+        self._replace(counters)
+        return len(counters)
+
+    def add(self, db: Session, matches: Iterable[Any]):
+        """
+        记录新导入的对局（在提交对局的事务之前调用）
+
+        参数:
+            db: 数据库会话对象
+            matches: 对局记录（Match或包含对局字段的行）
+        """
+        self._record(db, matches, 1)
+
+    def remove(self, db: Session, *criteria):
+        """
+        记录将要删除的对局（在删除对局之前、同一个事务中调用）
+
+        参数:
+            db: 数据库会话对象
+            criteria: 筛选将要删除的对局的查询条件
+        """
+        columns = [Match.hero_name, Match.rank, Match.position, Match.result] + [getattr(Match, f) for f in SUM_FIELDS]
+        self._record(db, db.query(*columns).filter(*criteria).all(), -1)
+
+    def rates(self, hero_name: str) -> Optional[Tuple[float, float]]:
+        """
+        获取英雄的对局胜率和选用率
+
+        参数:
+            hero_name: 英雄名称
+
+        返回:
+            Optional[Tuple[float, float]]: (胜率, 选用率)，未加载或对局数未达到阈值时返回None
+        """
+        counters = self._counters
+        if counters is None:
+            return None
+        values = counters.get((hero_name, ALL_RANKS, ALL_POSITIONS))
+        if values is None or values[0] < settings.HERO_STATS_MIN_GAMES:
+            return None
+        total = self._totals.get((ALL_RANKS, ALL_POSITIONS), 0)
+        return (
+            round(values[1] / values[0], 4),
+            round(min(values[0] * PLAYERS_PER_MATCH / total, 1.0), 4) if total else 0.0
+        )
+
+    def grouped(self) -> Dict[Tuple[str, str], Tuple[Dict[str, Tuple[int, int]], int]]:
+        """
+        按(段位大类, 位置)分组获取每个英雄的对局数和胜场数
+
+        返回:
+            Dict[Tuple[str, str], Tuple[Dict[str, Tuple[int, int]], int]]:
+                (段位大类, 位置) -> (英雄名称 -> (对局数, 胜场数), 对局总数)，未加载时为空
+        """
+        counters = self._counters
+        if counters is None:
+            return {}
+        groups: Dict[Tuple[str, str], Dict[str, Tuple[int, int]]] = {}
+        for (hero_name, rank, position), values in list(counters.items()):
+            groups.setdefault((rank, position), {})[hero_name] = (int(values[0]), int(values[1]))
+        return {key: (counts, self._totals.get(key, 0)) for key, counts in groups.items()}
+
+    def win_rate(self, hero_name: str, default: float) -> float:
+        """
+        获取英雄的胜率（对局数未达到阈值时返回默认值）
+
+        参数:
+            hero_name: 英雄名称
+            default: 默认胜率（英雄数据中的胜率）
+
+        返回:
+            float: 胜率
+        """
+        rates = self.rates(hero_name)
+        return rates[0] if rates is not None else default
+
+    def overlay(self, hero: Any) -> Any:
+        """
+        用对局统计的胜率和选用率替换英雄响应中的值
+
+        参数:
+            hero: 英雄响应模型（包含name、win_rate、pick_rate字段）
+
+        返回:
+            Any: 替换后的副本，没有可用的对局统计时返回原对象
+        """
+        rates = self.rates(hero.name)
+        if rates is None:
+            return hero
+        return hero.model_copy(update={"win_rate": rates[0], "pick_rate": rates[1]})
+
+    def breakdown(self, hero_id: int, hero_name: str, db: Session) -> HeroMatchStatsResponse:
+        """
+        获取英雄的对局统计（汇总和按段位、位置细分）
+
+        参数:
+            hero_id: 英雄ID
+            hero_name: 英雄名称
+            db: 数据库会话对象
+
+        返回:
+            HeroMatchStatsResponse: 英雄对局统计
+        """
+        if self._counters is None:
+            self.load(db)
+        counters = self._counters
+
+        overall_key = (hero_name, ALL_RANKS, ALL_POSITIONS)
+        overall = counters.get(overall_key)
+        lines = sorted(
+            (key for key in counters if key[0] == hero_name and key != overall_key),
+            key=lambda key: (-counters[key][0], key[1], key[2])
+        )
+        return HeroMatchStatsResponse(
+            hero_id=hero_id,
+            hero_name=hero_name,
+            live=overall is not None and overall[0] >= settings.HERO_STATS_MIN_GAMES,
+            overall=self._line(overall_key, overall) if overall is not None else None,
+            breakdown=[self._line(key, counters[key]) for key in lines]
+        )
+
+    def _record(self, db: Session, matches: Iterable[Any], sign: int):
+        """
+        按差值更新计数表，并暂存差值等待事务提交
+
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+        """
+        deltas: Dict[Tuple[str, str, str], Tuple[float, ...]] = {}
+        for match in matches:
+            if not match.hero_name:
+                continue
+            won = 1 if (match.result or "").lower() in WIN_RESULTS else 0
+            values = [sign, sign * won] + [sign * (getattr(match, field) or 0) for field in SUM_FIELDS]
+            for key in stat_keys(match.hero_name, match.rank, match.position):
+                deltas[key] = self._add(deltas.get(key), values)
+        if not deltas:
+            return
+
+        # 原子地增减计数（UPDATE col = col + 差值），计数行不存在时插入
+        now = datetime.utcnow()
+        for (hero_name, rank, position), values in deltas.items():
+            result = db.execute(
+                update(HeroMatchStats)
+                .where(and_(
+                    HeroMatchStats.hero_name == hero_name,
+                    HeroMatchStats.rank == rank,
+                    HeroMatchStats.position == position
+                ))
+                .values(updated_at=now, **{
+                    field: getattr(HeroMatchStats, field) + value
+                    for field, value in zip(COUNTER_FIELDS, values)
+                })
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0 and values[0] > 0:
+                db.add(HeroMatchStats(
+                    hero_name=hero_name, rank=rank, position=position, updated_at=now,
+                    **dict(zip(COUNTER_FIELDS, values))
+                ))
+
+        # 事务提交后再合并到内存
+        db.info.setdefault(PENDING_KEY, []).append(deltas)
+
+    def _merge(self, deltas: Dict[Tuple[str, str, str], Tuple[float, ...]]):
+        """
+        将已提交的差值合并到内存计数
+
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+        """
+        with self._lock:
+            if self._counters is None:
+                return
+            self._changes += int(sum(abs(values[0]) for key, values in deltas.items() if key[1:] == (ALL_RANKS, ALL_POSITIONS)))
+            for key, values in deltas.items():
+                merged = self._add(self._counters.get(key), values)
+                if merged[0] > 0:
+                    self._counters[key] = merged
+                else:
+                    self._counters.pop(key, None)
+                total = (key[1], key[2])
+                self._totals[total] = self._totals.get(total, 0) + values[0]
+                if total == (ALL_RANKS, ALL_POSITIONS):
+                    if merged[0] >= settings.HERO_STATS_MIN_GAMES:
+                        self._live.add(key[0])
+                    else:
+                        self._live.discard(key[0])
+
+            # 选用率按对局总数计算，任何对局变化都可能影响使用对局统计的英雄，
+            # 只有四舍五入后的胜率或选用率变化（或英雄开始、停止使用对局统计）时才递增版本号
+            published = self._published_rates()
+            changed = frozenset(
+                name for name in published.keys() | self._published.keys()
+                if published.get(name) != self._published.get(name)
+            )
+            if changed:
+                self._published = published
+                self._version += 1
+                self._last_change = (self._version, self._version - 1, changed)
+
+    def _replace(self, counters: Dict[Tuple[str, str, str], Tuple[float, ...]]):
+        """
+        替换内存中的全部计数
+
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+        """
+        totals: Dict[Tuple[str, str], int] = {}
+        live = set()
+        for (hero_name, rank, position), values in counters.items():
+            totals[(rank, position)] = totals.get((rank, position), 0) + values[0]
+            if (rank, position) == (ALL_RANKS, ALL_POSITIONS) and values[0] >= settings.HERO_STATS_MIN_GAMES:
+                live.add(hero_name)
+        with self._lock:
+            self._counters = counters
+            self._totals = totals
+            self._live = live
+            self._published = self._published_rates()
+            self._version += 1
+            self._last_change = (self._version, None, frozenset())
+
+    def _published_rates(self) -> Dict[str, Tuple[float, float]]:
+        """
+        计算英雄接口使用的胜率和选用率（对局数达到阈值的英雄，在合并锁内调用）
+
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+        """
+        published = {}
+        for hero_name in self._live:
+            rates = self.rates(hero_name)
+            if rates is not None:
+                published[hero_name] = rates
+        return published
+
+    def _line(self, key: Tuple[str, str, str], values: Tuple[float, ...]) -> HeroStatsLine:
+        """
+        计数转换为统计项（胜率、选用率和场均数据）
+
+        选用率:
+            - 每局10名玩家（同一位置2名），选用率 = 对局数 * 每局玩家数 / 对局总数
+
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+        """
+        _, rank, position = key
+        counts = dict(zip(COUNTER_FIELDS, values))
+        games = int(counts["games"])
+        total = self._totals.get((rank, position), 0)
+        players = PLAYERS_PER_POSITION if position else PLAYERS_PER_MATCH
+        return HeroStatsLine(
+            rank=rank,
+            position=position,
+            games=games,
+            wins=int(counts["wins"]),
+            win_rate=round(counts["wins"] / games, 4),
+            pick_rate=round(min(games * players / total, 1.0), 4) if total else 0.0,
+            **{f"avg_{field}": round(counts[field] / games, 2 if field != "participation_rate" else 4) for field in SUM_FIELDS}
+        )
+
+    def _add(self, values: Optional[Tuple[float, ...]], delta: Iterable[float]) -> Tuple[float, ...]:
+        """
+        两组计数相加（values为None时返回delta）
+
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+        """
+        delta = tuple(delta)
+        if values is None:
+            return delta
+        return tuple(a + b for a, b in zip(values, delta))
+
+    def _match_count(self, db: Session) -> int:
+        """
+        统计计入英雄对局统计的对局数量（有英雄名称的对局）
+
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+        """
+        return db.query(func.count(Match.id)).filter(
+            Match.hero_name.isnot(None), Match.hero_name != ""
+        ).scalar() or 0
+
+
+# 创建全局英雄对局统计服务实例
+# 应用启动时加载，导入和删除对局时增量更新
+hero_stats_service = HeroStatsService()
+
+
+@event.listens_for(Session, "after_commit")
+def _merge_committed_stats(session: Session):
+    """
+    事务提交后，将暂存的计数差值合并到内存
+    """
+    for deltas in session.info.pop(PENDING_KEY, ()):
+        hero_stats_service._merge(deltas)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_stats(session: Session):
+    """
+    事务回滚后，丢弃暂存的计数差值
+    """
+    session.info.pop(PENDING_KEY, None)
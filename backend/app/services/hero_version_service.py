@@ -0,0 +1,388 @@
+# 导入类型提示
+# Any: 任意类型
+# Dict: 字典类型
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+# Set: 集合类型
+from typing import Any, Dict, List, Optional, Set
+
+# 导入哈希模块，用于计算英雄数据的内容哈希
+import hashlib
+
+# 导入JSON模块，用于按固定格式序列化英雄数据
+import json
+
+# 导入datetime类，用于记录版本生效时间
+from datetime import datetime
+
+# 导入SQLAlchemy的插入、更新和删除语句，用于批量写入（executemany）
+from sqlalchemy import insert, update, delete
+
+# 导入Session类
+# Session: SQLAlchemy的数据库会话，用于与数据库交互
+from sqlalchemy.orm import Session
+
+# 导入英雄和英雄数据版本模型
+from app.models.hero import (
+    Hero, HeroEquipment, HeroInscription, HeroBuildRecommendation, HeroDataVersion, HeroRevision
+)
+
+# 导入英雄关系服务，英雄数据变化后在同一个事务中重建克制关系
+from app.services.hero_relation_service import hero_relation_service
+
+
+# 英雄数据字段（版本内容和内容哈希只包括这些字段）
+HERO_FIELDS = (
+    "name", "title", "position", "difficulty", "description", "image_url", "skills", "passive_skill",
+    "win_rate", "ban_rate", "pick_rate", "counter_heroes", "countered_by_heroes", "version"
+)
+
+# 合并版本差异时最多追溯的版本数量，超过后按整体变化处理
+MAX_DIFF_CHAIN = 100
+
+
+def hero_content(source: Any) -> Dict[str, Any]:
+    """
+    提取英雄数据（字典或Hero记录）
+
+    参数:
+        source: 英雄数据字典（导入数据）或Hero记录
+
+    返回:
+        Dict[str, Any]: 只包含HERO_FIELDS的英雄数据，缺少的字段为None
+    """
+    if isinstance(source, dict):
+        return {field: source.get(field) for field in HERO_FIELDS}
+    return {field: getattr(source, field) for field in HERO_FIELDS}
+
+
+def content_hash(content: Dict[str, Any]) -> str:
+    """
+    计算英雄数据的内容哈希（键排序后序列化，字段顺序不影响结果）
+
+    参数:
+        content: 英雄数据
+
+    返回:
+        str: SHA-256哈希（十六进制）
+
+    注意:
+        - 胜率等浮点数保留6位小数，避免数据库的单精度FLOAT读回后产生误差
+    """
+    content = {key: round(value, 6) if isinstance(value, float) else value for key, value in content.items()}
+    text = json.dumps(content, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class HeroDataDiff:
+    """
+    英雄数据差异
+
+    字段说明:
+        added: 新增的英雄名称
+        changed: 数据变化的英雄名称
+        removed: 删除的英雄名称
+    """
+
+    __slots__ = ("added", "changed", "removed")
+
+    def __init__(self, added: List[str], changed: List[str], removed: List[str]):
+        self.added = added
+        self.changed = changed
+        self.removed = removed
+
+    def __bool__(self) -> bool:
+        """
+        是否有变化
+        """
+        return bool(self.added or self.changed or self.removed)
+
+    def summary(self) -> str:
+        """
+        差异摘要（用于导入脚本的输出）
+        """
+        return f"新增 {len(self.added)} 个，修改 {len(self.changed)} 个，删除 {len(self.removed)} 个英雄"
+
+
+class HeroVersionService:
+    """
+    英雄数据版本服务类
+
+    负责英雄数据的版本化导入和版本切换
+
+    主要功能:
+        - 导入时写入新版本的全部英雄数据（hero_revisions），不直接覆盖heroes表
+        - 按内容哈希计算新版本与当前数据的差异
+        - 在一个事务中只更新变化的英雄并切换生效版本，读者要么看到旧数据、要么看到新数据
+        - 记录每个版本的差异，内存缓存按差异只更新变化的英雄
+        - 切换回任意旧版本
+
+    设计说明:
+        - heroes表始终是当前生效版本的数据，查询接口不需要关心版本
+        - 英雄按名称对应，改名视为删除旧英雄、新增新英雄
+        - 导入的数据不完整时（只包含部分英雄），未包含的英雄沿用当前数据
+        - 插入、更新、删除都按executemany批量执行，不逐个加载ORM对象
+        - commit=False时不提交，由调用方在同一个事务中继续写入其他数据
+
+    使用场景:
+        - 英雄数据导入脚本
+        - 英雄数据监视器判断需要更新的英雄
+    """
+
+    def active_version(self, db: Session) -> Optional[HeroDataVersion]:
+        """
+        获取当前生效的版本
+
+        参数:
+            db: 数据库会话对象
+
+        返回:
+            Optional[HeroDataVersion]: 当前生效的版本，还没有版本时返回None
+        """
+        return db.query(HeroDataVersion).filter(HeroDataVersion.status == "active").first()
+
+    def publish(
+        self,
+        db: Session,
+        heroes: List[Dict[str, Any]],
+        source: str,
+        complete: bool = False,
+        commit: bool = True
+    ) -> Optional[HeroDataVersion]:
+        """
+        导入英雄数据: 写入新版本并立即生效
+
+        参数:
+            db: 数据库会话对象
+            heroes: 英雄数据列表（字段与Hero模型一致，其他字段忽略）
+            source: 数据来源
+            complete: 是否为完整的英雄数据（True时删除数据中没有的英雄）
+            commit: 是否提交事务（False时由调用方提交）
+
+        返回:
+            Optional[HeroDataVersion]: 生效的新版本，数据与当前生效版本相同时不生成版本，返回None
+        """
+        current = self._current(db)
+        contents = self._contents(current, heroes, complete)
+        if self.active_version(db) is not None and not self._diff(
+            {name: content_hash(content) for name, content in contents.items()}, current
+        ):
+            return None
+
+        version = self._stage(db, contents, source)
+        self.activate(db, version.id, commit)
+        return version
+
+    def activate(self, db: Session, version_id: int, commit: bool = True) -> HeroDataDiff:
+        """
+        切换生效版本（也用于切换回旧版本）
+
+        参数:
+            db: 数据库会话对象
+            version_id: 目标版本号
+            commit: 是否提交事务（False时由调用方提交）
+
+        返回:
+            HeroDataDiff: 相对切换前数据的差异
+
+        异常:
+            ValueError: 版本不存在
+
+        业务逻辑:
+            1. 读取目标版本的全部英雄数据，与heroes表比较内容哈希
+            2. 只插入、更新、删除有差异的英雄
+            3. 有差异时重建英雄克制关系表
+            4. 原生效版本标记为superseded，目标版本标记为active，记录差异
+            5. 一次提交，失败时整体回滚
+        """
+        version = db.query(HeroDataVersion).filter(HeroDataVersion.id == version_id).first()
+        if version is None:
+            raise ValueError(f"英雄数据版本不存在: {version_id}")
+
+        try:
+            revisions = db.query(HeroRevision.hero_name, HeroRevision.content_hash, HeroRevision.data).filter(
+                HeroRevision.version_id == version_id
+            ).all()
+            contents = {name: data for name, _, data in revisions}
+            current = self._current(db)
+            diff = self._diff({name: digest for name, digest, _ in revisions}, current)
+            now = datetime.utcnow()
+
+            # 删除的英雄（同时删除出装、铭文推荐和物化推荐）
+            removed_ids = [current[name][0] for name in diff.removed]
+            if removed_ids:
+                for model in (HeroEquipment, HeroInscription, HeroBuildRecommendation):
+                    db.execute(delete(model).where(model.hero_id.in_(removed_ids)))
+                db.execute(delete(Hero).where(Hero.id.in_(removed_ids)))
+
+            # 修改的英雄（按主键批量更新）
+            if diff.changed:
+                db.execute(update(Hero), [
+                    {"id": current[name][0], **contents[name], "updated_at": now} for name in diff.changed
+                ])
+
+            # 新增的英雄
+            added_ids: Dict[str, int] = {}
+            if diff.added:
+                db.execute(insert(Hero), [
+                    {**contents[name], "created_at": now, "updated_at": now} for name in diff.added
+                ])
+                added_ids = dict(db.query(Hero.name, Hero.id).filter(Hero.name.in_(diff.added)).all())
+
+            # 英雄数据有变化时重建克制关系（关系按英雄ID保存，与英雄数据一起切换）
+            if diff:
+                hero_relation_service.rebuild(db, commit=False)
+
+            # 切换生效版本
+            previous = self.active_version(db)
+            if previous is not None and previous.id != version.id:
+                previous.status = "superseded"
+            version.previous_id = previous.id if previous is not None and previous.id != version.id else None
+            version.status = "active"
+            version.activated_at = now
+            version.added = [added_ids[name] for name in diff.added]
+            version.changed = [current[name][0] for name in diff.changed]
+            version.removed = removed_ids
+
+            if commit:
+                db.commit()
+            else:
+                db.flush()
+        except Exception:
+            db.rollback()
+            raise
+        return diff
+
+    def active_marker(self, db: Session) -> Optional[tuple]:
+        """
+        获取当前生效版本的标记（版本号和生效时间，切换回旧版本时生效时间也会变化）
+
+        参数:
+            db: 数据库会话对象
+
+        返回:
+            Optional[tuple]: (版本号, 生效时间)，还没有版本时返回None
+        """
+        row = db.query(HeroDataVersion.id, HeroDataVersion.activated_at).filter(
+            HeroDataVersion.status == "active"
+        ).first()
+        return tuple(row) if row is not None else None
+
+    def changed_since(self, db: Session, marker: Optional[tuple]) -> Optional[Set[int]]:
+        """
+        获取某个生效版本之后变化的英雄ID
+
+        参数:
+            db: 数据库会话对象
+            marker: 起始生效版本的标记（active_marker()的返回值）
+
+        返回:
+            Optional[Set[int]]: 从起始版本到当前生效版本之间新增、修改、删除的英雄ID，
+                                无法确定时（没有起始版本、版本记录不完整）返回None，调用方按整体变化处理
+        """
+        if marker is None:
+            return None
+
+        hero_ids: Set[int] = set()
+        version = self.active_version(db)
+        for _ in range(MAX_DIFF_CHAIN):
+            if version is None:
+                return None
+            if (version.id, version.activated_at) == marker:
+                return hero_ids
+            hero_ids.update(version.added or [])
+            hero_ids.update(version.changed or [])
+            hero_ids.update(version.removed or [])
+            if version.previous_id is None:
+                return None
+            version = db.query(HeroDataVersion).filter(HeroDataVersion.id == version.previous_id).first()
+        return None
+
+    def _current(self, db: Session) -> Dict[str, tuple]:
+        """
+        读取heroes表的当前数据: 英雄名称 -> (英雄ID, 英雄数据)
+
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+        """
+        rows = db.query(Hero.id, *[getattr(Hero, field) for field in HERO_FIELDS]).all()
+        return {row[1]: (row[0], dict(zip(HERO_FIELDS, row[1:]))) for row in rows}
+
+    def _contents(
+        self,
+        current: Dict[str, tuple],
+        heroes: List[Dict[str, Any]],
+        complete: bool
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        整理新版本的全部英雄数据: 英雄名称 -> 英雄数据
+
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+
+        注意:
+            - 导入数据中没有的字段（如导入脚本不包含的image_url）沿用当前数据
+        """
+        empty = hero_content({})
+        contents = {
+            hero["name"]: {
+                **(current[hero["name"]][1] if hero["name"] in current else empty),
+                **{field: hero[field] for field in HERO_FIELDS if field in hero}
+            }
+            for hero in heroes
+        }
+        if not complete:
+            for name, (_, content) in current.items():
+                contents.setdefault(name, content)
+        return contents
+
+    def _diff(self, hashes: Dict[str, str], current: Dict[str, tuple]) -> HeroDataDiff:
+        """
+        按内容哈希比较新版本与heroes表
+
+        参数:
+            hashes: 新版本的英雄名称 -> 内容哈希
+            current: heroes表的当前数据（_current()的返回值）
+
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+        """
+        return HeroDataDiff(
+            added=sorted(name for name in hashes if name not in current),
+            changed=sorted(
+                name for name, digest in hashes.items()
+                if name in current and digest != content_hash(current[name][1])
+            ),
+            removed=sorted(name for name in current if name not in hashes)
+        )
+
+    def _stage(self, db: Session, contents: Dict[str, Dict[str, Any]], source: str) -> HeroDataVersion:
+        """
+        写入新版本的全部英雄数据（未生效，不提交）
+
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+        """
+        version = HeroDataVersion(status="staged", source=source, hero_count=len(contents))
+        db.add(version)
+        db.flush()
+
+        # 批量写入版本内容
+        db.execute(insert(HeroRevision), [
+            {
+                "version_id": version.id,
+                "hero_name": name,
+                "content_hash": content_hash(content),
+                "data": content
+            }
+            for name, content in contents.items()
+        ])
+        return version
+
+
+# 创建全局英雄数据版本服务实例
+hero_version_service = HeroVersionService()
@@ -42,6 +42,7 @@ class IntentService:
         - match_analysis: 对局分析相关
         - monster_timer: 野怪计时相关
         - entertainment: 娱乐互动相关
+        - tier_list: 版本强势英雄相关
     """
     
     # ==================== 意图模式定义 ====================
@@ -131,6 +132,18 @@ class IntentService:
             r".*搞笑.*",
             # 匹配包含"趣味"的问题
             r".*趣味.*"
+        ],
+        
+        # 版本强势英雄相关的意图
+        "tier_list": [
+            # 匹配包含"强势"的问题
+            r".*强势.*",
+            # 匹配包含"版本之子"的问题
+            r".*版本之子.*",
+            # 匹配包含"T0"、"T1"的问题
+            r".*T[01].*",
+            # 匹配包含"上分英雄"的问题
+            r".*上分.*英雄.*"
         ]
     }
     
@@ -0,0 +1,295 @@
+# 导入类型提示
+# Dict: 字典类型
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+# Tuple: 元组类型
+from typing import Dict, List, Optional, Tuple
+
+# 导入数学模块，用于计算IDF
+import math
+
+# 导入计数器，用于统计词频
+from collections import Counter
+
+# 导入Session类
+# Session: SQLAlchemy的数据库会话，用于与数据库交互
+from sqlalchemy.orm import Session
+
+# 导入配置设置
+from app.core.config import settings
+
+# 导入字符二元组切分函数
+from app.core.text import char_bigrams, normalize_text, query_bigrams
+
+# 导入英雄相关的模型
+from app.models.hero import Hero, HeroEquipment, HeroInscription, Equipment
+
+# 导入英雄定位的中文名称
+from app.services.persona_service import POSITION_NAMES
+
+
+# BM25参数
+# k1: 词频饱和度，越大词频的影响越大
+# b: 文档长度归一化程度（0不归一化，1完全归一化）
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# 指定英雄的资料的附加分
+# 对话关联了英雄时，该英雄的资料即使与问题字面不重合也会被检索到
+HERO_BONUS = 1.0
+
+# 问题中提到装备全名时该装备资料的附加分
+# 装备名称同时出现在多条出装资料中，只按词项打分时装备本身的资料（价格、属性）会排在出装列表之后
+EQUIPMENT_NAME_BONUS = 2.0
+
+
+class KnowledgeIndex:
+    """
+    英雄知识检索索引（不可变）
+
+    使用字符二元组（bigram）作为词项的BM25倒排索引
+
+    字段说明:
+        facts: 资料文本列表
+        hero_ids: 每条资料对应的英雄ID（装备资料为None）
+        postings: 倒排表，词项 -> [(资料下标, 词频)]
+        idf: 词项 -> 逆文档频率
+        norms: 每条资料的长度归一化因子 k1 * (1 - b + b * 长度 / 平均长度)
+        hero_facts: 英雄ID -> 资料下标列表
+        equipment_facts: 规范化的装备名称 -> 装备资料下标
+
+    设计说明:
+        - 构建完成后不再修改，重新加载时整体替换
+    """
+
+    __slots__ = ("facts", "hero_ids", "postings", "idf", "norms", "hero_facts", "equipment_facts")
+
+    def __init__(self, facts: List[Tuple[str, Optional[int]]], equipment_facts: Optional[Dict[str, int]] = None):
+        """
+        构建索引
+
+        参数:
+            facts: (资料文本, 英雄ID) 列表
+            equipment_facts: 装备名称 -> 该装备的资料下标（可选）
+        """
+        self.facts = [text for text, _ in facts]
+        self.hero_ids = [hero_id for _, hero_id in facts]
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.hero_facts: Dict[int, List[int]] = {}
+        self.equipment_facts: Dict[str, int] = {
+            normalize_text(name): index for name, index in (equipment_facts or {}).items() if normalize_text(name)
+        }
+
+        # 统计每条资料的词频
+        lengths = []
+        for index, text in enumerate(self.facts):
+            terms = char_bigrams(text)
+            lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self.postings.setdefault(term, []).append((index, tf))
+            if self.hero_ids[index] is not None:
+                self.hero_facts.setdefault(self.hero_ids[index], []).append(index)
+
+        # 计算IDF（BM25的平滑形式，保证非负）
+        total = len(self.facts)
+        self.idf = {
+            term: math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+        # 预先计算长度归一化因子，查询时只做加法和除法
+        average = (sum(lengths) / total) if total else 1.0
+        self.norms = [BM25_K1 * (1 - BM25_B + BM25_B * length / (average or 1.0)) for length in lengths]
+
+    def search(self, query: str, top_k: int, hero_id: Optional[int] = None) -> List[str]:
+        """
+        检索与问题最相关的资料
+
+        参数:
+            query: 用户的问题
+            top_k: 返回的资料数量
+            hero_id: 对话关联的英雄ID（可选），该英雄的资料获得附加分
+
+        返回:
+            List[str]: 按相关度降序排列的资料文本
+        """
+        scores: Dict[int, float] = {}
+
+        # 累加问题中每个词项的BM25得分
+        for term in query_bigrams(query):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf[term]
+            for index, tf in postings:
+                scores[index] = scores.get(index, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + self.norms[index])
+
+        # 关联英雄的资料加分
+        if hero_id is not None:
+            for index in self.hero_facts.get(hero_id, ()):
+                scores[index] = scores.get(index, 0.0) + HERO_BONUS
+
+        # 问题中提到的装备，该装备的资料加分
+        normalized = normalize_text(query)
+        for name, index in self.equipment_facts.items():
+            if name in normalized:
+                scores[index] = scores.get(index, 0.0) + EQUIPMENT_NAME_BONUS
+
+        # 取得分最高的top_k条
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [self.facts[index] for index, _ in ranked]
+
+
+class KnowledgeService:
+    """
+    英雄知识检索服务类
+
+    负责从英雄、出装、铭文和装备数据构建检索索引，为AI提示词提供相关资料
+
+    主要功能:
+        - 启动时和英雄数据变化后重建索引
+        - 根据用户问题检索最相关的几条资料
+
+    设计说明:
+        - 每条资料是一句简短的事实（如英雄定位、技能、克制关系、出装）
+        - 提示词中附带相关资料，AI无需编造数据，回答更短更准确
+        - 索引整体替换，检索时不需要加锁
+
+    使用场景:
+        - 聊天回复的提示词构建
+    """
+
+    def __init__(self):
+        """
+        初始化检索服务
+        """
+        # 当前索引（未加载时为None）
+        self._index: Optional[KnowledgeIndex] = None
+
+    def load(self, db: Session):
+        """
+        从数据库加载资料并重建索引
+
+        参数:
+            db: 数据库会话对象
+
+        业务逻辑:
+            1. 查询英雄、出装、铭文和装备
+            2. 将每条记录转换为简短的资料文本
+            3. 构建新索引并整体替换
+        """
+        facts: List[Tuple[str, Optional[int]]] = []
+
+        # 英雄名称，用于出装和铭文资料
+        heroes = db.query(Hero).all()
+        hero_names = {hero.id: hero.name for hero in heroes}
+
+        for hero in heroes:
+            facts.extend((text, hero.id) for text in self._hero_facts(hero))
+
+        # 出装（同一英雄同一段位的装备合并为一条）
+        builds: Dict[Tuple[int, str], List[str]] = {}
+        for build in db.query(HeroEquipment).all():
+            names = builds.setdefault((build.hero_id, build.rank or "全部"), [])
+            for item in build.equipment_list or []:
+                if item.get("name") and item["name"] not in names:
+                    names.append(item["name"])
+        for (hero_id, rank), names in builds.items():
+            if hero_id in hero_names and names:
+                facts.append((f"{hero_names[hero_id]}出装（{rank}）：{'、'.join(names)}", hero_id))
+
+        # 铭文
+        for inscription in db.query(HeroInscription).all():
+            if inscription.hero_id not in hero_names:
+                continue
+            name = (inscription.inscription_config or {}).get("name") or inscription.inscription_name
+            text = f"{hero_names[inscription.hero_id]}铭文：{name}"
+            if inscription.description:
+                text += f"，{inscription.description}"
+            facts.append((text, inscription.hero_id))
+
+        # 装备（记录每件装备的资料下标，问题中提到装备名称时加分）
+        equipment_facts: Dict[str, int] = {}
+        for equipment in db.query(Equipment).all():
+            parts = [f"装备{equipment.name}"]
+            if equipment.type:
+                parts.append(f"类型{equipment.type}")
+            if equipment.price:
+                parts.append(f"价格{equipment.price}金币")
+            if equipment.stats:
+                parts.append("属性" + "、".join(f"{key}+{value}" for key, value in equipment.stats.items()))
+            if equipment.passive:
+                parts.append(f"被动：{equipment.passive}")
+            equipment_facts[equipment.name] = len(facts)
+            facts.append(("，".join(parts), None))
+
+        # 整体替换
+        self._index = KnowledgeIndex(facts, equipment_facts)
+
+    def search(self, query: str, hero_id: Optional[int] = None, top_k: Optional[int] = None) -> List[str]:
+        """
+        检索与问题相关的资料
+
+        参数:
+            query: 用户的问题
+            hero_id: 对话关联的英雄ID（可选）
+            top_k: 返回的资料数量，默认使用KNOWLEDGE_TOP_K
+
+        返回:
+            List[str]: 相关资料列表，索引未加载时返回空列表
+        """
+        index = self._index
+        if index is None:
+            return []
+        return index.search(query, settings.KNOWLEDGE_TOP_K if top_k is None else top_k, hero_id)
+
+    def _hero_facts(self, hero: Hero) -> List[str]:
+        """
+        将英雄数据转换为资料文本
+
+        参数:
+            hero: 英雄模型对象
+
+        返回:
+            List[str]: 资料列表（简介、技能、数据、克制关系）
+        """
+        facts = []
+
+        # 简介
+        profile = f"{hero.name}"
+        if hero.title:
+            profile += f"（{hero.title}）"
+        profile += f"：定位{POSITION_NAMES.get(hero.position, hero.position or '未知')}"
+        if hero.difficulty:
+            profile += f"，难度{hero.difficulty}"
+        if hero.description:
+            profile += f"。{hero.description}"
+        facts.append(profile)
+
+        # 技能
+        skills = [skill for skill in (hero.skills or []) if skill.get("name")]
+        if skills or hero.passive_skill:
+            parts = []
+            if hero.passive_skill and hero.passive_skill.get("name"):
+                parts.append(f"被动{hero.passive_skill['name']}（{hero.passive_skill.get('description', '')}）")
+            parts.extend(f"{skill['name']}（{skill.get('description', '')}）" for skill in skills)
+            facts.append(f"{hero.name}技能：{'；'.join(parts)}")
+
+        # 数据
+        facts.append(
+            f"{hero.name}数据：胜率{(hero.win_rate or 0) * 100:.1f}%，"
+            f"禁用率{(hero.ban_rate or 0) * 100:.1f}%，出场率{(hero.pick_rate or 0) * 100:.1f}%"
+        )
+
+        # 克制关系
+        if hero.counter_heroes:
+            facts.append(f"{hero.name}克制{'、'.join(hero.counter_heroes)}")
+        if hero.countered_by_heroes:
+            facts.append(f"{hero.name}被{'、'.join(hero.countered_by_heroes)}克制")
+
+        return facts
+
+
+# 创建全局检索服务实例
+# 应用启动时加载，英雄数据变化后重新加载
+knowledge_service = KnowledgeService()
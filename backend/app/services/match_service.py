@@ -8,7 +8,8 @@ from sqlalchemy.orm import Session
 
 # 导入对局模型
 # Match: 对局数据库模型
-from app.models.match import Match
+# Analysis: 分析报告数据库模型（删除对局时一并删除）
+from app.models.match import Match, Analysis
 
 # 导入对局相关的Schema
 # MatchData: 对局数据模型
@@ -19,6 +20,14 @@ from app.schemas.match import MatchData, MatchSummary
 # uuid: 用于生成唯一标识符
 import uuid
 
+# 导入数据清除服务
+# data_purge_service: 用户数据正在后台删除时，隐藏边界内的对局
+from app.services.data_purge_service import data_purge_service
+
+# 导入英雄对局统计服务
+# hero_stats_service: 导入和删除对局时增量更新英雄的对局统计
+from app.services.hero_stats_service import hero_stats_service
+
 
 class MatchService:
     """
@@ -64,8 +73,9 @@ class MatchService:
             1. 生成唯一的对局ID
             2. 创建对局模型实例
             3. 设置对局数据
-            4. 保存到数据库
-            5. 返回导入结果
+            4. 在同一个事务中更新英雄对局统计
+            5. 保存到数据库
+            6. 返回导入结果
         
         异步处理:
             - async: 异步方法，不阻塞主线程
@@ -127,6 +137,8 @@ class MatchService:
         
         # 将对局记录添加到数据库会话
         db.add(match)
+        # 更新英雄对局统计（与对局记录一起提交）
+        hero_stats_service.add(db, [match])
         # 提交事务，保存对局记录
         db.commit()
         
@@ -170,9 +182,14 @@ class MatchService:
         # order_by: 按创建时间倒序排列（desc()表示降序）
         # limit(): 限制返回的记录数量
         # all(): 获取所有匹配的记录
-        matches = db.query(Match).filter(
-            Match.user_id == user_id
-        ).order_by(Match.created_at.desc()).limit(limit).all()
+        query = db.query(Match).filter(Match.user_id == user_id)
+        
+        # 正在后台删除的对局不返回
+        hidden_cutoff = data_purge_service.hidden_match_cutoff(user_id, db)
+        if hidden_cutoff is not None:
+            query = query.filter(Match.created_at > hidden_cutoff)
+        
+        matches = query.order_by(Match.created_at.desc()).limit(limit).all()
         
         # 将数据库记录转换为对局摘要对象列表
         # 使用列表推导式，简洁高效
@@ -223,6 +240,11 @@ class MatchService:
         if not match:
             return None
         
+        # 对局正在后台删除，按不存在处理
+        hidden_cutoff = data_purge_service.hidden_match_cutoff(match.user_id, db)
+        if hidden_cutoff is not None and match.created_at <= hidden_cutoff:
+            return None
+        
         # 对局存在，返回对局摘要对象
         return MatchSummary(
             id=match.id,
@@ -251,8 +273,10 @@ class MatchService:
             - 用于用户清理对局历史
         
         业务逻辑:
-            1. 根据match_id删除对局记录
-            2. 提交事务
+            1. 从英雄对局统计中减去该对局
+            2. 删除对局的分析报告
+            3. 根据match_id删除对局记录
+            4. 提交事务
         
         注意:
             - 此操作不可逆，请谨慎使用
@@ -262,6 +286,12 @@ class MatchService:
             - 用户删除对局记录
             - 数据清理
         """
+        # 从英雄对局统计中减去该对局（与删除一起提交）
+        hero_stats_service.remove(db, Match.id == match_id)
+        
+        # 先删除对局的分析报告，避免留下孤立的分析报告
+        db.query(Analysis).filter(Analysis.match_id == match_id).delete()
+        
         # 删除指定的对局记录
         # filter: 添加查询条件（对局ID等于指定值）
         # delete(): 删除所有匹配的记录
@@ -0,0 +1,388 @@
+# 导入类型提示
+# Dict: 字典类型
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+# Set: 集合类型
+from typing import Dict, List, Optional, Set
+
+# 导入随机模块，用于从回复池中随机选择
+import random
+
+# 导入正则表达式模块，用于规范化用户消息
+import re
+
+# 导入Session类
+# Session: SQLAlchemy的数据库会话，用于与数据库交互
+from sqlalchemy.orm import Session
+
+# 导入进程内缓存，用于缓存重复的对话问题
+from app.core.cache import TTLCache
+
+# 导入配置设置
+from app.core.config import settings
+
+# 导入英雄模型
+from app.models.hero import Hero
+
+# 导入英雄关系服务，克制问题的回复读取英雄关系索引
+from app.services.hero_relation_service import hero_relation_service
+
+
+# 英雄定位的中文名称
+POSITION_NAMES = {
+    "tank": "坦克",
+    "warrior": "战士",
+    "assassin": "刺客",
+    "mage": "法师",
+    "archer": "射手",
+    "support": "辅助"
+}
+
+# 各定位的第一人称自我介绍（定位问题和打招呼的回复）
+POSITION_LINES = {
+    "tank": "站在队伍最前面扛伤害、保护队友，开团就交给我吧！",
+    "warrior": "能打能抗，边路单挑我可从来不怕！",
+    "assassin": "在野区游走，找准时机切掉敌方后排就是我的任务！",
+    "mage": "站在后排用技能打出爆发和控制，团战输出看我的！",
+    "archer": "稳稳发育，后期持续输出就靠我了！",
+    "support": "跟着队友游走，开视野、保护C位，团队胜利最重要！"
+}
+
+# 常见问题分类的关键词
+# key: 问题分类
+# value: 触发该分类的关键词列表
+COMMON_QUESTION_KEYWORDS = {
+    # 打招呼、自我介绍
+    "greeting": ["你好", "您好", "哈喽", "嗨", "hi", "hello", "在吗", "你是谁", "介绍一下", "自我介绍"],
+    # 技能相关
+    "skills": ["技能", "大招", "被动"],
+    # 定位相关
+    "position": ["定位", "走哪路", "什么位置", "分路"],
+    # 克制相关
+    "counter": ["克制", "怕谁", "counter", "打得过"]
+}
+
+# 部分英雄的经典台词
+# 作为打招呼回复池的补充，保持英雄的语言风格
+CLASSIC_GREETINGS = {
+    "鲁班七号": ["哼哼，我是鲁班七号，机关造物！有什么问题尽管问，本大师都能解决！"],
+    "亚瑟": ["我乃亚瑟，圣光之盾！为了正义，我绝不退缩！"],
+    "妲己": ["哎呀~你有什么问题想问妲己吗？"]
+}
+
+
+class HeroPersona:
+    """
+    英雄人设
+
+    预编译的英雄角色扮演数据
+
+    字段说明:
+        hero_name: 英雄名称
+        prompt: 角色扮演系统提示词
+        replies: 常见问题的预生成回复池（key: 问题分类，value: 回复列表）
+    """
+
+    # 限定属性，减少内存占用
+    __slots__ = ("hero_name", "prompt", "replies")
+
+    def __init__(self, hero_name: str, prompt: str, replies: Dict[str, List[str]]):
+        self.hero_name = hero_name
+        self.prompt = prompt
+        self.replies = replies
+
+
+class PersonaService:
+    """
+    英雄人设服务类
+
+    负责英雄角色扮演对话的人设预编译和回复缓存
+
+    主要功能:
+        - 启动时根据英雄数据（称号、技能、描述）预编译人设提示词
+        - 为每个英雄预生成打招呼和常见问题的回复池，直接返回无需调用AI
+        - 缓存重复的对话问题的AI回复
+
+    设计说明:
+        - 人设字典整体替换，重新加载时读者不会看到一半的数据
+        - 回复缓存按（英雄名称, 规范化后的问题）为键
+        - 英雄数据版本切换后只重新编译变化的英雄，只清除这些英雄的回复缓存
+
+    使用场景:
+        - 英雄角色扮演（娱乐互动）
+    """
+
+    def __init__(self):
+        """
+        初始化人设服务
+        """
+        # 预编译的人设: 英雄名称 -> HeroPersona
+        self._personas: Dict[str, HeroPersona] = {}
+
+        # 英雄ID -> 英雄名称（局部更新时按ID找到旧的人设）
+        self._names: Dict[int, str] = {}
+
+        # 对话回复缓存: (英雄名称, 规范化问题) -> 回复
+        self._dialogue_cache = TTLCache(max_size=5000, ttl=settings.HERO_DIALOGUE_CACHE_TTL)
+
+    def load(self, db: Session):
+        """
+        从数据库加载英雄数据，预编译所有英雄的人设
+
+        参数:
+            db: 数据库会话对象
+
+        业务逻辑:
+            1. 查询所有英雄
+            2. 为每个英雄构建人设提示词和回复池
+            3. 整体替换人设字典
+            4. 清空回复缓存（人设变化后旧回复可能不再适用）
+        """
+        # 查询所有英雄
+        heroes = db.query(Hero).all()
+
+        # 构建新的人设字典
+        personas = {hero.name: self._build_persona(hero) for hero in heroes}
+
+        # 整体替换
+        self._personas = personas
+        self._names = {hero.id: hero.name for hero in heroes}
+
+        # 清空回复缓存
+        self._dialogue_cache.clear()
+
+    def update(self, db: Session, hero_ids: Set[int]):
+        """
+        只重新编译变化的英雄的人设
+
+        参数:
+            db: 数据库会话对象
+            hero_ids: 变化（新增、修改、删除）的英雄ID
+
+        业务逻辑:
+            1. 移除这些英雄的旧人设（英雄可能改名或被删除）
+            2. 查询这些英雄并重新编译人设
+            3. 整体替换人设字典，只清除这些英雄的回复缓存
+        """
+        heroes = db.query(Hero).filter(Hero.id.in_(list(hero_ids))).all()
+
+        # 受影响的英雄名称（旧名称和新名称）
+        stale = {self._names[hero_id] for hero_id in hero_ids if hero_id in self._names}
+        stale.update(hero.name for hero in heroes)
+
+        personas = {name: persona for name, persona in self._personas.items() if name not in stale}
+        personas.update((hero.name, self._build_persona(hero)) for hero in heroes)
+        names = {hero_id: name for hero_id, name in self._names.items() if hero_id not in hero_ids}
+        names.update((hero.id, hero.name) for hero in heroes)
+
+        # 整体替换
+        self._personas = personas
+        self._names = names
+
+        # 清除这些英雄的回复缓存
+        self._dialogue_cache.discard(lambda key: key[0] in stale)
+
+    def has_persona(self, hero_name: str) -> bool:
+        """
+        判断英雄是否有预编译的人设
+
+        参数:
+            hero_name: 英雄名称
+
+        返回:
+            bool: 有人设返回True，英雄不存在（或人设未加载）返回False
+        """
+        return hero_name in self._personas
+
+    def get_prompt(self, hero_name: str) -> str:
+        """
+        获取英雄的人设提示词
+
+        参数:
+            hero_name: 英雄名称
+
+        返回:
+            str: 人设提示词，英雄未加载时返回通用提示词
+        """
+        persona = self._personas.get(hero_name)
+        if persona:
+            return persona.prompt
+
+        # 通用提示词（英雄不在数据库中）
+        return f"""你现在是王者荣耀英雄{hero_name}，请用该英雄的语音风格和语气回答用户的问题。
+保持角色设定，使用符合英雄性格的语言风格。"""
+
+    def get_instant_reply(self, hero_name: str, message: str) -> Optional[str]:
+        """
+        从预生成的回复池获取即时回复
+
+        参数:
+            hero_name: 英雄名称
+            message: 用户的消息内容
+
+        返回:
+            Optional[str]: 即时回复，英雄没有人设（不存在或未加载）或消息不属于常见问题时返回None
+        """
+        # 没有人设的英雄不生成回复
+        persona = self._personas.get(hero_name)
+        if persona is None:
+            return None
+
+        # 识别常见问题分类
+        category = self._classify(message)
+        if not category:
+            return None
+
+        # 克制关系读取当前的英雄关系索引（与克制查询接口一致）
+        if category == "counter":
+            return self._counter_reply(hero_name)
+
+        # 从该英雄的回复池中随机选择
+        if persona.replies.get(category):
+            return random.choice(persona.replies[category])
+
+        return None
+
+    def get_cached_reply(self, hero_name: str, message: str) -> Optional[str]:
+        """
+        查询缓存的对话回复
+
+        参数:
+            hero_name: 英雄名称
+            message: 用户的消息内容
+
+        返回:
+            Optional[str]: 缓存的回复，未命中返回None
+        """
+        return self._dialogue_cache.get((hero_name, self._normalize(message)))
+
+    def cache_reply(self, hero_name: str, message: str, reply: str):
+        """
+        缓存对话回复
+
+        参数:
+            hero_name: 英雄名称
+            message: 用户的消息内容
+            reply: AI生成的回复
+        """
+        self._dialogue_cache.set((hero_name, self._normalize(message)), reply)
+
+    def _build_persona(self, hero: Hero) -> HeroPersona:
+        """
+        根据英雄数据构建人设
+
+        参数:
+            hero: 英雄模型对象
+
+        返回:
+            HeroPersona: 预编译的人设
+        """
+        # 英雄定位的中文名称
+        position_name = POSITION_NAMES.get(hero.position, hero.position or "")
+
+        # 技能名称列表
+        skill_names = [skill.get("name", "") for skill in (hero.skills or []) if skill.get("name")]
+
+        # 被动技能名称
+        passive_name = (hero.passive_skill or {}).get("name")
+
+        # 构建人设提示词
+        lines = [
+            f"你现在是王者荣耀英雄{hero.name}" + (f"，称号「{hero.title}」" if hero.title else "") + "。",
+            "请用该英雄的语音风格和语气回答用户的问题，保持角色设定，使用符合英雄性格的语言风格。",
+        ]
+        if position_name:
+            lines.append(f"你的定位是{position_name}。")
+        if hero.description:
+            lines.append(f"角色背景：{hero.description}")
+        if skill_names:
+            lines.append(f"你的技能：{'、'.join(skill_names)}。")
+        if passive_name:
+            lines.append(f"你的被动：{passive_name}。")
+        lines.append("回答简短有趣，不超过100字。")
+        prompt = "\n".join(lines)
+
+        # 构建常见问题回复池
+        replies: Dict[str, List[str]] = {}
+
+        # 打招呼
+        greetings = list(CLASSIC_GREETINGS.get(hero.name, []))
+        greetings.append(f"我是{hero.name}" + (f"，{hero.title}" if hero.title else "") + "！很高兴认识你！")
+        if hero.position in POSITION_LINES:
+            # 以英雄的口吻介绍自己的定位（英雄描述是第三人称，不直接使用）
+            greetings.append(f"{hero.name}在此！{POSITION_LINES[hero.position]}")
+        replies["greeting"] = greetings
+
+        # 技能
+        if skill_names:
+            replies["skills"] = [f"想了解我的技能？{'、'.join(skill_names)}，" + (f"再加上被动「{passive_name}」，" if passive_name else "") + "上了峡谷你就知道厉害了！"]
+
+        # 定位
+        if position_name:
+            replies["position"] = [f"我是一名{position_name}，" + POSITION_LINES.get(hero.position, "在峡谷里发挥我的作用！")]
+
+        return HeroPersona(hero.name, prompt, replies)
+
+    def _counter_reply(self, hero_name: str) -> Optional[str]:
+        """
+        根据英雄关系索引生成克制问题的回复（私有方法）
+
+        参数:
+            hero_name: 英雄名称
+
+        返回:
+            Optional[str]: 回复，索引未加载或没有克制关系时返回None（交给AI回答）
+        """
+        index = hero_relation_service.index()
+        hero_id = index.ids.get(hero_name) if index is not None else None
+        if hero_id is None:
+            return None
+
+        # 按权重取前3个
+        counters = [index.names[target_id] for target_id, _ in index.counters_of(hero_id)[:3]]
+        countered_by = [index.names[source_id] for source_id, _ in index.countered_by_of(hero_id)[:3]]
+        parts = []
+        if counters:
+            parts.append(f"遇到{'、'.join(counters)}，我可不怕")
+        if countered_by:
+            parts.append(f"不过碰上{'、'.join(countered_by)}得小心点")
+        return "，".join(parts) + "。" if parts else None
+
+    def _classify(self, message: str) -> Optional[str]:
+        """
+        识别消息属于哪类常见问题
+
+        参数:
+            message: 用户的消息内容
+
+        返回:
+            Optional[str]: 问题分类，不属于常见问题返回None
+        """
+        normalized = self._normalize(message)
+
+        # 只对短消息做分类，长问题交给AI回答
+        if not normalized or len(normalized) > 12:
+            return None
+
+        for category, keywords in COMMON_QUESTION_KEYWORDS.items():
+            if any(keyword in normalized for keyword in keywords):
+                return category
+
+        return None
+
+    def _normalize(self, message: str) -> str:
+        """
+        规范化用户消息（去除空白和标点，转为小写）
+
+        参数:
+            message: 用户的消息内容
+
+        返回:
+            str: 规范化后的消息
+        """
+        return re.sub(r"[\s\W_]+", "", message or "").lower()
+
+
+# 创建全局人设服务实例
+# 应用启动时加载，AI服务共享同一个实例
+persona_service = PersonaService()
@@ -0,0 +1,290 @@
+# 导入类型提示
+# Any: 任意类型
+# Dict: 字典类型
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+# Set: 集合类型
+from typing import Any, Dict, List, Optional, Set
+
+# 导入异步IO模块，用于后台预计算
+import asyncio
+
+# 导入进程内缓存，用于保存预计算的回答
+from app.core.cache import TTLCache
+
+# 导入配置设置
+from app.core.config import settings
+
+# 导入日志记录器
+from app.core.logger import get_logger
+
+# 导入文本规范化函数（建议文本和用户消息按同一规则比较）
+from app.core.text import normalize_text
+
+# 导入英雄目录（快速路径直接读取内存中的英雄数据）
+from app.services.hero_catalog import hero_catalog
+
+# 导入英雄关系服务，对位建议读取英雄关系索引
+from app.services.hero_relation_service import hero_relation_service
+
+
+# 模块日志记录器
+logger = get_logger(__name__)
+
+
+class SuggestionPrefetchService:
+    """
+    建议预计算服务类
+
+    负责在回复用户后，提前计算用户最可能点击的建议（chip）的回答
+
+    主要功能:
+        - 每次回复后，在后台为排名靠前的建议预计算回答
+        - 英雄相关的建议（铭文、出装、对位）直接使用英雄目录快照中的数据
+        - 其他建议只有点击率足够高时才调用AI生成回答
+        - 用户点击建议时直接返回预计算的回答
+        - 统计每个建议的展示次数和点击次数
+
+    设计说明:
+        - 预计算结果按（用户ID, 规范化的建议文本）缓存，短时间后过期
+        - 用户发出新消息时，丢弃该用户上一轮的预计算结果
+        - 快速路径不访问数据库；英雄目录未加载时快速路径不回答
+        - 建议展示次数达到CHAT_PREFETCH_AI_MIN_SHOWN且点击率不低于
+          CHAT_PREFETCH_AI_MIN_CLICK_RATE时才调用AI，点击率低的建议不产生额外的AI调用
+        - 预计算失败不影响正常对话
+
+    使用场景:
+        - 聊天回复下方的建议按钮（如"查看铭文搭配"、"查看对位英雄"）
+    """
+
+    def __init__(self):
+        """
+        初始化预计算服务
+        """
+        # 预计算的回答: (user_id, 规范化文本) -> 回答
+        self._answers = TTLCache(max_size=20000, ttl=settings.CHAT_PREFETCH_TTL)
+
+        # 每个用户本轮预计算的键: user_id -> 键列表（用于丢弃上一轮的结果）
+        self._user_keys = TTLCache(max_size=10000, ttl=settings.CHAT_PREFETCH_TTL)
+
+        # 每个用户上一轮展示的建议: user_id -> 规范化文本集合（用于统计点击）
+        self._shown = TTLCache(max_size=10000, ttl=settings.CHAT_PREFETCH_TTL)
+
+        # 建议的展示和点击次数: 规范化文本 -> [展示次数, 点击次数]
+        # 建议文本来自固定的建议列表，数量有限
+        self._clicks: Dict[str, List[int]] = {}
+
+        # 正在运行的后台任务（保持引用，防止被垃圾回收）
+        self._tasks: Set[asyncio.Task] = set()
+
+    def take(self, user_id: str, message: str) -> Optional[str]:
+        """
+        获取预计算的回答
+
+        参数:
+            user_id: 用户ID
+            message: 用户的消息内容（点击建议时即建议文本）
+
+        返回:
+            Optional[str]: 预计算的回答，未命中返回None
+
+        注意:
+            - 消息与上一轮展示的某个建议相同时记为一次点击
+        """
+        normalized = normalize_text(message)
+
+        # 统计点击（每个建议每轮最多记一次）
+        shown = self._shown.get(user_id)
+        if shown and normalized in shown:
+            shown.discard(normalized)
+            self._clicks.setdefault(normalized, [0, 0])[1] += 1
+
+        return self._answers.get((user_id, normalized))
+
+    def click_rate(self, suggestion: str) -> Optional[float]:
+        """
+        获取建议的点击率
+
+        参数:
+            suggestion: 建议文本
+
+        返回:
+            Optional[float]: 点击率，展示次数不足CHAT_PREFETCH_AI_MIN_SHOWN时返回None
+        """
+        shown, clicked = self._clicks.get(normalize_text(suggestion), (0, 0))
+        if shown < settings.CHAT_PREFETCH_AI_MIN_SHOWN:
+            return None
+        return clicked / shown
+
+    def schedule(
+        self,
+        ai_service,
+        intent_service,
+        user_id: str,
+        suggestions: List[str],
+        context: List[Dict[str, Any]],
+        hero_id: Optional[int] = None,
+        hero_name: Optional[str] = None
+    ):
+        """
+        在后台为排名靠前的建议预计算回答
+
+        参数:
+            ai_service: AI服务实例（生成非快速路径的回答）
+            intent_service: 意图识别服务实例（识别建议的意图）
+            user_id: 用户ID
+            suggestions: 本轮回复的建议列表（按展示顺序）
+            context: 包含本轮对话的上下文
+            hero_id: 本轮关联的英雄ID（可选）
+            hero_name: 本轮消息中提到的英雄名称（可选）
+
+        业务逻辑:
+            1. 丢弃该用户上一轮的预计算结果，记录本轮展示的建议
+            2. 取前CHAT_PREFETCH_SUGGESTIONS个建议
+            3. 为每个建议启动后台任务
+        """
+        # 丢弃上一轮的预计算结果
+        for key in self._user_keys.pop(user_id, []):
+            self._answers.pop(key)
+
+        # 记录本轮展示的建议
+        shown = {normalize_text(s) for s in suggestions}
+        self._shown.set(user_id, shown)
+        for normalized in shown:
+            self._clicks.setdefault(normalized, [0, 0])[0] += 1
+
+        # 取排名靠前的建议
+        top_suggestions = suggestions[:settings.CHAT_PREFETCH_SUGGESTIONS]
+        if not top_suggestions:
+            return
+
+        # 记录本轮的键
+        self._user_keys.set(user_id, [(user_id, normalize_text(s)) for s in top_suggestions])
+
+        # 为每个建议启动后台任务
+        for suggestion in top_suggestions:
+            task = asyncio.create_task(self._prefetch(
+                ai_service, intent_service, user_id, suggestion, context, hero_id, hero_name
+            ))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _prefetch(
+        self,
+        ai_service,
+        intent_service,
+        user_id: str,
+        suggestion: str,
+        context: List[Dict[str, Any]],
+        hero_id: Optional[int],
+        hero_name: Optional[str]
+    ):
+        """
+        预计算单个建议的回答
+
+        业务逻辑:
+            1. 优先使用快速路径（英雄目录快照中的数据）
+            2. 快速路径无法回答时，建议的点击率足够高才调用AI
+            3. 保存到缓存（如果该建议仍属于用户当前这一轮）
+        """
+        key = (user_id, normalize_text(suggestion))
+        try:
+            # 快速路径：直接使用英雄数据
+            answer = self._fast_path_answer(suggestion, hero_id, hero_name)
+
+            # 快速路径无法回答时调用AI（点击率低或数据不足的建议不预计算）
+            if answer is None:
+                rate = self.click_rate(suggestion)
+                if rate is None or rate < settings.CHAT_PREFETCH_AI_MIN_CLICK_RATE:
+                    return
+                intent_result = intent_service.recognize(suggestion)
+                answer = await ai_service.generate_response(
+                    message=suggestion,
+                    intent=intent_result.intent,
+                    context=context,
+                    hero_id=hero_id,
+                    fallback_on_error=False
+                )
+
+            # 用户已经发出新消息，本轮结果作废
+            if key not in (self._user_keys.get(user_id) or []):
+                return
+
+            self._answers.set(key, answer)
+        except Exception as e:
+            # 预计算失败不影响正常对话
+            logger.warning("建议预计算失败: %s", e)
+
+    def _fast_path_answer(
+        self,
+        suggestion: str,
+        hero_id: Optional[int],
+        hero_name: Optional[str]
+    ) -> Optional[str]:
+        """
+        使用英雄目录快照中的数据直接回答建议
+
+        参数:
+            suggestion: 建议文本
+            hero_id: 关联的英雄ID
+            hero_name: 提到的英雄名称
+
+        返回:
+            Optional[str]: 回答，无法用英雄数据回答（或英雄目录未加载）时返回None
+        """
+        # 没有关联英雄时无法走快速路径
+        if hero_id is None and not hero_name:
+            return None
+
+        snapshot = hero_catalog.snapshot()
+        if snapshot is None:
+            return None
+
+        # 查找英雄
+        hero = snapshot.details.get(hero_id) if hero_id is not None else snapshot.by_name.get(hero_name)
+        if hero is None:
+            return None
+
+        if "铭文" in suggestion:
+            # 铭文搭配（快照中已按胜率降序）
+            inscriptions = snapshot.inscriptions.get(hero.id, ())[:3]
+            if not inscriptions:
+                return None
+            lines = [f"{hero.name}推荐铭文："]
+            for ins in inscriptions:
+                name = (ins["inscription_config"] or {}).get("name") or ins["inscription_name"]
+                lines.append(f"• {name}" + (f"：{ins['description']}" if ins["description"] else ""))
+            return "\n".join(lines)
+
+        if "出装" in suggestion:
+            # 出装推荐（快照中已按胜率、选用率降序）
+            names = []
+            for eq in snapshot.equipment.get(hero.id, ()):
+                for item in eq.equipment_list or []:
+                    if item.get("name") and item["name"] not in names:
+                        names.append(item["name"])
+            if not names:
+                return None
+            return f"{hero.name}推荐出装：{'、'.join(names[:6])}。可根据对局情况调整防御装。"
+
+        if "对位" in suggestion or "counter" in suggestion:
+            # 对位英雄（英雄关系索引中的克制关系，按权重降序）
+            index = hero_relation_service.index()
+            if index is None:
+                return None
+            counters = [index.names[target_id] for target_id, _ in index.counters_of(hero.id)]
+            countered_by = [index.names[source_id] for source_id, _ in index.countered_by_of(hero.id)]
+            if not counters and not countered_by:
+                return None
+            lines = []
+            if counters:
+                lines.append(f"{hero.name}克制：{'、'.join(counters)}")
+            if countered_by:
+                lines.append(f"{hero.name}被克制：{'、'.join(countered_by)}")
+            return "\n".join(lines)
+
+        return None
+
+
+# 创建全局预计算服务实例
+suggestion_prefetch_service = SuggestionPrefetchService()
@@ -0,0 +1,391 @@
+# 导入类型提示
+# Dict: 字典类型
+# List: 列表类型
+# Optional: 可选类型（可以为None）
+# Tuple: 元组类型
+from typing import Dict, List, Optional, Tuple
+
+# 导入异步IO模块，用于定期重新计算榜单
+import asyncio
+
+# 导入time模块，用于判断榜单的计算时间
+import time
+
+# 导入线程锁，保证版本号递增和榜单替换的原子性
+from threading import Lock
+
+# 导入只读字典视图，防止榜单被意外修改
+from types import MappingProxyType
+
+# 导入datetime类，用于记录榜单的计算时间
+from datetime import datetime
+
+# 导入NumPy，用于向量化计算平滑后的胜率、选用率和综合评分
+import numpy as np
+
+# 导入Session类
+# Session: SQLAlchemy的数据库会话，用于与数据库交互
+from sqlalchemy.orm import Session
+
+# 导入配置设置
+from app.core.config import settings
+
+# 导入日志记录器
+from app.core.logger import get_logger
+
+# 导入英雄模型
+from app.models.hero import Hero
+
+# 导入版本强势英雄榜的Schema
+from app.schemas.hero import TierListEntry, TierListResponse
+
+# 导入英雄对局统计服务（榜单的对局数据来源）
+from app.services.hero_stats_service import (
+    hero_stats_service, ALL_RANKS, ALL_POSITIONS, PLAYERS_PER_MATCH, PLAYERS_PER_POSITION
+)
+
+# 导入英雄定位的中文名称，用于识别聊天消息中的位置
+from app.services.persona_service import POSITION_NAMES
+
+
+# 模块日志记录器
+logger = get_logger(__name__)
+
+# 强度梯队
+TIERS = ("T0", "T1", "T2", "T3", "T4")
+
+# 每个梯队的累计比例上限（按综合评分排名，前10%为T0，前30%为T1……）
+TIER_CUTOFFS = np.array([0.1, 0.3, 0.6, 0.85, 1.0])
+
+# 综合评分的权重: 胜率、选用率、禁用率（标准化后加权）
+SCORE_WEIGHTS = np.array([0.6, 0.25, 0.15])
+
+# 聊天回答中每个梯队展示的英雄数量
+ANSWER_TOP_N = 5
+
+
+class TierListSnapshot:
+    """
+    版本强势英雄榜快照（不可变）
+
+    某一时刻按对局数据计算的全部榜单，每个(段位大类, 位置)一份
+
+    字段说明:
+        version: 榜单版本号（每次重新计算递增）
+        updated_at: 计算时间
+        built_at: 计算时间（time.monotonic()，用于判断是否需要重新计算）
+        stats_changes: 计算时对局统计的变化数量
+        lists: (段位大类, 位置) -> 榜单
+        ranks: 有榜单的段位大类
+
+    算法:
+        - 胜率: (胜场 + m * 英雄数据中的胜率) / (对局数 + m)
+        - 选用率: (对局数 + m * 英雄数据中的选用率) / (该段位、位置的对局场次 + m)，
+          对局场次 = 对局记录数 / 每局玩家数（全部位置10名，同一位置2名）
+        - 禁用率无法从对局记录中得到，使用英雄数据中的值
+        - 三项指标在同一榜单内标准化后加权得到综合评分，再按排名比例划分梯队
+        - m为TIER_LIST_PRIOR_GAMES，对局少的英雄向英雄数据中的值收缩，没有对局数据时与英雄数据一致
+        - 每份榜单对所有英雄一次向量运算，不逐个英雄计算
+    """
+
+    __slots__ = ("version", "updated_at", "built_at", "stats_changes", "lists", "ranks")
+
+    def __init__(
+        self,
+        version: int,
+        heroes: List[tuple],
+        groups: Dict[Tuple[str, str], Tuple[Dict[str, Tuple[int, int]], int]],
+        stats_changes: int
+    ):
+        """
+        计算全部榜单
+
+        参数:
+            version: 榜单版本号
+            heroes: 英雄记录 (ID, 名称, 定位, 胜率, 选用率, 禁用率)，按ID排序
+            groups: 对局统计 (段位大类, 位置) -> (英雄名称 -> (对局数, 胜场数), 对局总数)
+            stats_changes: 对局统计的变化数量
+        """
+        self.version = version
+        self.updated_at = datetime.utcnow()
+        self.built_at = time.monotonic()
+        self.stats_changes = stats_changes
+
+        # 英雄属性数组
+        ids = np.array([hero[0] for hero in heroes], dtype=np.int64)
+        names = [hero[1] for hero in heroes]
+        positions = np.array([hero[2] or "" for hero in heroes], dtype=object)
+        priors = np.array([
+            [hero[3] if hero[3] is not None else 0.5, hero[4] or 0.0, hero[5] or 0.0] for hero in heroes
+        ], dtype=np.float64).reshape(-1, 3)
+        index = {name: i for i, name in enumerate(names)}
+
+        # 需要计算的榜单: 有对局数据的(段位大类, 位置)，以及全部段位下每个英雄定位
+        keys = {(ALL_RANKS, ALL_POSITIONS)} | set(groups)
+        keys |= {(ALL_RANKS, position) for position in set(positions) if position}
+
+        lists: Dict[Tuple[str, str], TierListResponse] = {}
+        for rank, position in keys:
+            counts, total = groups.get((rank, position), ({}, 0))
+
+            # 对局数和胜场数
+            games = np.zeros(len(names))
+            wins = np.zeros(len(names))
+            for name, (g, w) in counts.items():
+                i = index.get(name)
+                if i is not None:
+                    games[i], wins[i] = g, w
+
+            # 参与榜单的英雄: 全部位置时为所有英雄，否则为该定位的英雄和在该位置有对局的英雄
+            members = np.ones(len(names), dtype=bool) if not position else (positions == position) | (games > 0)
+            if not members.any():
+                continue
+
+            lists[(rank, position)] = self._rank(
+                rank, position, version, ids, names, positions, priors, games, wins, total, members
+            )
+
+        self.lists = MappingProxyType(lists)
+        self.ranks = tuple(sorted({rank for rank, _ in lists}, key=lambda rank: (rank != ALL_RANKS, rank)))
+
+    def _rank(
+        self,
+        rank: str,
+        position: str,
+        version: int,
+        ids: np.ndarray,
+        names: List[str],
+        positions: np.ndarray,
+        priors: np.ndarray,
+        games: np.ndarray,
+        wins: np.ndarray,
+        total: int,
+        members: np.ndarray
+    ) -> TierListResponse:
+        """
+        计算一份榜单（向量化）
+
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+        """
+        m = settings.TIER_LIST_PRIOR_GAMES
+        matches = total / (PLAYERS_PER_POSITION if position else PLAYERS_PER_MATCH)
+
+        # 平滑后的胜率、选用率和禁用率: 形状为(英雄数, 3)
+        features = np.column_stack((
+            (wins + m * priors[:, 0]) / (games + m),
+            np.minimum((games + m * priors[:, 1]) / (matches + m), 1.0),
+            priors[:, 2]
+        ))[members]
+
+        # 标准化后加权（某项指标全部相同时该项不影响评分）
+        std = features.std(axis=0)
+        z = (features - features.mean(axis=0)) / np.where(std > 0, std, 1.0)
+        scores = z @ SCORE_WEIGHTS
+
+        # 评分降序（相同时按英雄ID），按排名比例划分梯队
+        member_ids = ids[members]
+        order = np.lexsort((member_ids, -scores))
+        tiers = np.searchsorted(TIER_CUTOFFS, np.arange(len(order)) / len(order), side="right")
+
+        rows = np.flatnonzero(members)
+        return TierListResponse(
+            rank=rank,
+            position=position,
+            version=version,
+            updated_at=self.updated_at,
+            games=int(total),
+            heroes=[
+                TierListEntry(
+                    hero_id=int(member_ids[k]),
+                    hero_name=names[rows[k]],
+                    position=positions[rows[k]] or None,
+                    tier=TIERS[min(int(tier), len(TIERS) - 1)],
+                    score=round(float(scores[k]), 3),
+                    win_rate=round(float(features[k, 0]), 4),
+                    pick_rate=round(float(features[k, 1]), 4),
+                    ban_rate=round(float(features[k, 2]), 4),
+                    games=int(games[rows[k]])
+                )
+                for k, tier in zip(order, tiers)
+            ]
+        )
+
+    def get(self, rank: str = ALL_RANKS, position: str = ALL_POSITIONS) -> Optional[TierListResponse]:
+        """
+        获取某个段位大类、位置的榜单
+
+        参数:
+            rank: 段位大类（"全部"表示所有段位）
+            position: 位置（空字符串表示所有位置）
+
+        返回:
+            Optional[TierListResponse]: 榜单，没有数据时返回None
+        """
+        return self.lists.get((rank or ALL_RANKS, position or ALL_POSITIONS))
+
+
+class TierListService:
+    """
+    版本强势英雄榜服务类
+
+    持有当前的榜单快照，负责计算和原子替换
+
+    主要功能:
+        - 启动时和英雄数据变化后计算榜单
+        - 新增（或删除）TIER_LIST_REFRESH_MATCHES场对局后，下次读取时重新计算
+        - 读取的段位、位置还没有榜单而对局数据已有变化时，立即重新计算（新段位的第一份榜单）
+        - 后台每TIER_LIST_REFRESH_INTERVAL秒检查一次，对局数据有变化时重新计算
+        - 为聊天中的"当前版本强势英雄"直接生成回答，不调用AI
+
+    设计说明:
+        - 榜单按对局统计服务的内存计数计算，不查询对局表
+        - 读取时返回当前快照的引用，不需要加锁
+
+    使用场景:
+        - 版本强势英雄榜接口
+        - 聊天快捷命令"当前版本强势英雄"
+    """
+
+    def __init__(self):
+        """
+        初始化版本强势英雄榜服务
+        """
+        # 英雄记录 (ID, 名称, 定位, 胜率, 选用率, 禁用率)，未加载时为None
+        self._heroes: Optional[List[tuple]] = None
+
+        # 当前快照
+        self._snapshot: Optional[TierListSnapshot] = None
+
+        # 版本号
+        self._version = 0
+
+        # 计算锁（保证版本号递增）
+        self._lock = Lock()
+
+    def load(self, db: Session):
+        """
+        从数据库读取英雄数据并计算榜单
+
+        参数:
+            db: 数据库会话对象
+        """
+        rows = db.query(
+            Hero.id, Hero.name, Hero.position, Hero.win_rate, Hero.pick_rate, Hero.ban_rate
+        ).order_by(Hero.id).all()
+        self._heroes = [tuple(row) for row in rows]
+        self.refresh()
+
+    def refresh(self):
+        """
+        按当前的对局统计重新计算榜单（英雄数据未加载时不计算）
+        """
+        heroes = self._heroes
+        if heroes is None:
+            return
+        changes = hero_stats_service.changes
+        groups = hero_stats_service.grouped()
+
+        with self._lock:
+            self._version += 1
+            self._snapshot = TierListSnapshot(self._version, heroes, groups, changes)
+
+    def get(
+        self,
+        db: Optional[Session] = None,
+        rank: Optional[str] = None,
+        position: str = ALL_POSITIONS
+    ) -> Optional[TierListSnapshot]:
+        """
+        获取当前榜单，新增对局达到TIER_LIST_REFRESH_MATCHES场时先重新计算
+
+        参数:
+            db: 数据库会话对象（未加载时用于读取英雄数据，为None时不加载）
+            rank: 需要读取的段位大类（可选），当前快照没有该段位、位置的榜单
+                  而对局数据已有变化时先重新计算
+            position: 需要读取的位置（与rank一起使用）
+
+        返回:
+            Optional[TierListSnapshot]: 当前榜单，未加载且没有数据库会话时返回None
+        """
+        snapshot = self._snapshot
+        if self._heroes is None or snapshot is None:
+            if db is None:
+                return None
+            self.load(db)
+            return self._snapshot
+
+        changes = hero_stats_service.changes - snapshot.stats_changes
+        if changes >= settings.TIER_LIST_REFRESH_MATCHES:
+            self.refresh()
+        elif changes and rank is not None and snapshot.get(rank, position) is None:
+            self.refresh()
+        return self._snapshot
+
+    async def watch(self, interval: float):
+        """
+        定期重新计算榜单（在应用运行期间作为后台任务执行）
+
+        参数:
+            interval: 检查间隔（秒）
+        """
+        while True:
+            await asyncio.sleep(interval)
+            snapshot = self._snapshot
+            if snapshot is None or hero_stats_service.changes == snapshot.stats_changes:
+                continue
+            try:
+                # 在线程中计算，避免阻塞事件循环
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                logger.error("版本强势英雄榜计算失败: %s", e)
+
+    def answer(self, message: str, db: Optional[Session] = None) -> Optional[str]:
+        """
+        回答"当前版本强势英雄"类问题
+
+        参数:
+            message: 用户消息（可以包含段位和位置，如"钻石局强势射手"）
+            db: 数据库会话对象（可选）
+
+        返回:
+            Optional[str]: 回答，榜单未加载时返回None（由AI回答）
+        """
+        snapshot = self.get(db)
+        if snapshot is None:
+            return None
+
+        # 识别消息中的位置和段位（去掉游戏名称，避免"王者荣耀"被识别为王者段位）
+        text = message.replace("王者荣耀", "")
+        lowered = text.lower()
+        position = next(
+            (code for code, name in POSITION_NAMES.items() if name in text or code in lowered),
+            ALL_POSITIONS
+        )
+        rank = next((rank for rank in snapshot.ranks if rank != ALL_RANKS and rank in text), ALL_RANKS)
+        tier_list = snapshot.get(rank, position) or snapshot.get(rank) or snapshot.get()
+        if tier_list is None:
+            return None
+
+        # 标题: 段位、位置和对局数
+        scope = "全部段位" if tier_list.rank == ALL_RANKS else tier_list.rank
+        if tier_list.position:
+            scope += "、" + POSITION_NAMES.get(tier_list.position, tier_list.position)
+        lines = [f"当前版本强势英雄（{scope}，{tier_list.games}条对局记录）："]
+
+        # 前两个梯队的英雄
+        for tier in TIERS[:2]:
+            heroes = [hero for hero in tier_list.heroes if hero.tier == tier][:ANSWER_TOP_N]
+            if heroes:
+                lines.append(f"{tier}：" + "、".join(
+                    f"{hero.hero_name}（胜率{hero.win_rate * 100:.1f}%）" for hero in heroes
+                ))
+
+        lines.append("胜率和选用率由对局数据平滑计算，对局较少的英雄参考英雄资料中的数据。")
+        return "\n".join(lines)
+
+
+# 创建全局版本强势英雄榜服务实例
+# 应用启动时计算，对局数据和英雄数据变化后重新计算
+tier_list_service = TierListService()
@@ -20,6 +20,14 @@ from app.schemas.user import UserProfile, UserPreferences, UserCreate
 from datetime import datetime
 
 
+class UserPurgingError(Exception):
+    """
+    用户数据正在后台删除
+
+    删除任务完成前，用户账户不能重新注册，资料和偏好设置不能修改（接口返回409）
+    """
+
+
 class UserService:
     """
     用户服务类
@@ -67,7 +75,15 @@ class UserService:
             3. 设置默认的偏好设置
             4. 保存到数据库
             5. 返回用户资料对象
+        
+        异常:
+            UserPurgingError: 同一ID的用户数据正在后台删除
         """
+        # 同一ID的用户正在删除，删除任务完成前不能重新注册
+        existing = db.query(User).filter(User.id == user_data.id).first()
+        if existing is not None and self._is_hidden(existing, db):
+            raise UserPurgingError(f"用户数据正在删除: {user_data.id}")
+        
         # 创建用户模型实例
         # 使用传入的用户数据初始化用户对象
         user = User(
@@ -146,6 +162,10 @@ class UserService:
         if not user:
             return None
         
+        # 用户数据正在后台删除，按不存在处理
+        if self._is_hidden(user, db):
+            return None
+        
         # 用户存在，返回用户资料对象
         return UserProfile(
             id=user.id,
@@ -180,10 +200,17 @@ class UserService:
             4. 更新修改时间
             5. 保存到数据库
             6. 返回更新后的资料
+        
+        异常:
+            UserPurgingError: 用户数据正在后台删除
         """
         # 从数据库查询用户
         user = db.query(User).filter(User.id == user_id).first()
         
+        # 用户数据正在后台删除，不能修改
+        if user and self._is_hidden(user, db):
+            raise UserPurgingError(f"用户数据正在删除: {user_id}")
+        
         # 如果用户不存在，创建新用户
         if not user:
             user = User(id=user_id)
@@ -232,15 +259,15 @@ class UserService:
         
         业务逻辑:
             1. 查询用户是否存在
-            2. 如果不存在，返回默认偏好设置
+            2. 如果不存在（或正在后台删除），返回默认偏好设置
             3. 如果存在，读取用户偏好设置
             4. 使用默认值填充缺失的设置
         """
         # 从数据库查询用户
         user = db.query(User).filter(User.id == user_id).first()
         
-        # 如果用户不存在，返回默认偏好设置
-        if not user:
+        # 如果用户不存在或正在后台删除，返回默认偏好设置
+        if not user or self._is_hidden(user, db):
             return UserPreferences()
         
         # 获取用户的偏好设置，如果为空则使用空字典
@@ -284,10 +311,17 @@ class UserService:
             5. 更新修改时间
             6. 保存到数据库
             7. 返回更新后的设置
+        
+        异常:
+            UserPurgingError: 用户数据正在后台删除
         """
         # 从数据库查询用户
         user = db.query(User).filter(User.id == user_id).first()
         
+        # 用户数据正在后台删除，不能修改
+        if user and self._is_hidden(user, db):
+            raise UserPurgingError(f"用户数据正在删除: {user_id}")
+        
         # 如果用户不存在，创建新用户
         if not user:
             user = User(id=user_id)
@@ -314,7 +348,7 @@ class UserService:
         # 返回更新后的偏好设置对象
         return preferences
     
-    def clear_all_data(self, user_id: str, db: Session):
+    def clear_all_data(self, user_id: str, db: Session) -> str:
         """
         清除用户的所有数据
         
@@ -323,39 +357,40 @@ class UserService:
             db: 数据库会话对象
         
         返回:
-            None
+            str: 删除任务ID，用于查询删除进度
         
         功能:
             - 删除用户的所有对话记录
-            - 删除用户的所有对局记录
+            - 删除用户的所有对局记录及其分析报告
             - 删除用户账户
             - 用于用户注销或数据清理
         
         业务逻辑:
-            1. 删除用户的所有对话记录
-            2. 删除用户的所有对局记录
-            3. 删除用户账户
-            4. 提交事务
+            1. 创建删除任务，记录删除边界
+            2. 边界内的对话、对局和用户资料立即对用户不可见
+            3. 由调用方在后台执行任务，按对话、对局（含分析报告）、用户账户的顺序分批删除
         
         注意:
             - 此操作不可逆，请谨慎使用
             - 删除顺序很重要（先删除子记录，再删除父记录）
         """
-        # 导入相关的模型
+        # 导入数据清除服务
         # 在方法内部导入，避免循环导入
-        from app.models.conversation import Conversation
-        from app.models.match import Match
-        
-        # 删除用户的所有对话记录
-        # filter: 添加查询条件（用户ID等于指定值）
-        # delete(): 删除所有匹配的记录
-        db.query(Conversation).filter(Conversation.user_id == user_id).delete()
+        from app.services.data_purge_service import data_purge_service
         
-        # 删除用户的所有对局记录
-        db.query(Match).filter(Match.user_id == user_id).delete()
+        # 创建删除任务
+        return data_purge_service.create_job(user_id, "all", db)
+    
+    def _is_hidden(self, user: User, db: Session) -> bool:
+        """
+        判断用户是否正在后台删除（删除任务完成前按不存在处理）
         
-        # 删除用户账户
-        db.query(User).filter(User.id == user_id).delete()
+        私有方法:
+            - 以下划线开头，表示内部方法
+            - 只在类内部使用，不对外暴露
+        """
+        # 在方法内部导入，避免循环导入
+        from app.services.data_purge_service import data_purge_service
         
-        # 提交事务，保存所有删除操作
-        db.commit()
+        hidden_cutoff = data_purge_service.hidden_match_cutoff(user.id, db)
+        return hidden_cutoff is not None and user.created_at <= hidden_cutoff
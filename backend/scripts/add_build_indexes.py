@@ -0,0 +1,33 @@
+import sqlite3
+
+INDEXES = [
+    ("idx_hero_equipments_hero_rank", "hero_equipments", "hero_id, rank"),
+    ("idx_hero_inscriptions_hero_rank", "hero_inscriptions", "hero_id, rank"),
+]
+
+def add_build_indexes():
+    db_path = "backend/honor_of_kings.db"
+    
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    
+    try:
+        for name, table, columns in INDEXES:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name = ?", (name,))
+            
+            if cursor.fetchone() is None:
+                cursor.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+                print(f"✓ 成功添加 {name} 索引到 {table} 表")
+            else:
+                print(f"✓ {name} 索引已存在，跳过添加")
+        
+        conn.commit()
+            
+    except Exception as e:
+        print(f"✗ 添加索引失败：{e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    add_build_indexes()
@@ -0,0 +1,70 @@
+"""
+金币预算出装优化性能测试
+
+用随机生成的装备目录（三层合成树，不同规模）测试出装优化的耗时
+
+运行方式（在backend目录下）:
+    python scripts/benchmark_build_optimizer.py
+"""
+import sys
+import os
+import random
+import time
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.equipment_graph import EquipmentGraph
+from app.services.build_optimizer import build_optimizer
+
+CATALOG_SIZES = [60, 120, 240, 480]
+BUDGETS = [1000, 3000, 6000, 15000]
+ROUNDS = 20
+STATS = ["物理攻击", "法术攻击", "攻击速度", "暴击率", "生命值", "物理防御", "法术防御", "冷却缩减", "移动速度"]
+
+
+def make_catalog(size, rng):
+    """
+    生成随机装备目录（基础装备、中级装备、大件装备各占三分之一）
+    """
+    def stats():
+        return {key: rng.randint(5, 200) for key in rng.sample(STATS, rng.randint(1, 3))}
+
+    tiers = [size // 3, size // 3, size - 2 * (size // 3)]
+    items = []
+    for tier, count in enumerate(tiers):
+        lower = [item for item in items if item.tier == tier - 1]
+        for _ in range(count):
+            components = rng.sample(lower, rng.randint(1, 2)) if lower else []
+            price = sum(c.price for c in components) + rng.randint(200, 800)
+            items.append(SimpleNamespace(
+                id=len(items) + 1,
+                name=f"装备{len(items) + 1}",
+                price=price,
+                stats=stats(),
+                build_from=[{"id": c.id} for c in components],
+                build_into=None,
+                tier=tier
+            ))
+    return items
+
+
+rng = random.Random(42)
+print(f"{'装备数':>6} {'预算':>6} {'平均耗时(ms)':>12} {'最大耗时(ms)':>12} {'平均花费':>8}")
+for size in CATALOG_SIZES:
+    items = make_catalog(size, rng)
+    graph = EquipmentGraph(1, items)
+    finals = [item.name for item in items if item.tier == 2]
+    for budget in BUDGETS:
+        elapsed, spent = [], []
+        for _ in range(ROUNDS):
+            targets = rng.sample(finals, 6)
+            started = time.perf_counter()
+            result = build_optimizer.optimize(graph, targets, budget)
+            elapsed.append((time.perf_counter() - started) * 1000)
+            spent.append(result.spent)
+            assert result.spent <= budget
+        print(
+            f"{size:>6} {budget:>6} {sum(elapsed) / ROUNDS:>12.2f} {max(elapsed):>12.2f} "
+            f"{sum(spent) / ROUNDS:>8.0f}"
+        )
@@ -0,0 +1,79 @@
+"""
+克制阵容推荐性能测试
+
+用随机生成的英雄池（不同规模）测试倒排列表合并（阈值算法）的耗时，
+并与逐个英雄计算得分的结果比较，确认前k名一致
+
+运行方式（在backend目录下）:
+    python scripts/benchmark_counter_picks.py
+"""
+import sys
+import os
+import random
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.counter_matrix import POSITIONS
+from app.services.hero_relation_service import RelationIndex, BOTH_SIDES_WEIGHT, ONE_SIDE_WEIGHT
+
+POOL_SIZES = [20, 50, 100, 200, 400]
+ROUNDS = 200
+TOP_K = 5
+
+
+def make_index(size, rng):
+    """
+    生成随机的英雄关系索引（每个英雄克制6个英雄）
+    """
+    heroes = [(i + 1, f"英雄{i}", rng.choice(POSITIONS)) for i in range(size)]
+    relations = [
+        (hero_id, target_id, rng.choice((BOTH_SIDES_WEIGHT, ONE_SIDE_WEIGHT)))
+        for hero_id, _, _ in heroes
+        for target_id in rng.sample([other for other, _, _ in heroes if other != hero_id], 6)
+    ]
+    return RelationIndex(1, heroes, relations)
+
+
+def brute_force(index, enemies, k, positions, exclude):
+    """
+    逐个英雄计算得分（对照）
+    """
+    scored = []
+    for hero_id in index.names:
+        if hero_id in exclude or hero_id in enemies:
+            continue
+        if positions and index.positions[hero_id] not in positions:
+            continue
+        targets = index.counters.get(hero_id, {})
+        covered = [enemy_id for enemy_id in enemies if enemy_id in targets]
+        if covered:
+            scored.append((-sum(targets[enemy_id] for enemy_id in covered), -len(covered), hero_id))
+    return [hero_id for _, _, hero_id in sorted(scored)[:k]]
+
+
+rng = random.Random(42)
+print(f"{'英雄池':>6} {'合并平均(us)':>12} {'合并最大(us)':>12} {'逐个计算平均(us)':>16} {'结果不一致':>10}")
+for size in POOL_SIZES:
+    index = make_index(size, rng)
+    ids = list(index.names)
+    merged, scanned, mismatches = [], [], 0
+    for _ in range(ROUNDS):
+        enemies = rng.sample(ids, rng.randint(1, 5))
+        exclude = set(rng.sample(ids, 4))
+        positions = set(rng.sample(POSITIONS, 2)) if rng.random() < 0.5 else None
+
+        started = time.perf_counter()
+        picks = index.top_counters(enemies, TOP_K, positions=positions, exclude=exclude)
+        merged.append((time.perf_counter() - started) * 1e6)
+
+        started = time.perf_counter()
+        expected = brute_force(index, enemies, TOP_K, positions, exclude)
+        scanned.append((time.perf_counter() - started) * 1e6)
+
+        mismatches += [hero_id for hero_id, _, _ in picks] != expected
+
+    print(
+        f"{size:>6} {sum(merged) / ROUNDS:>12.1f} {max(merged):>12.1f} "
+        f"{sum(scanned) / ROUNDS:>16.1f} {mismatches:>10}"
+    )
@@ -0,0 +1,79 @@
+"""
+选人推荐引擎性能测试
+
+用随机生成的英雄池（不同规模）测试选人推荐的耗时和搜索深度
+
+运行方式（在backend目录下）:
+    python scripts/benchmark_draft.py
+"""
+import sys
+import os
+import random
+import time
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.counter_matrix import CounterMatrix, POSITIONS
+from app.services.draft_engine import DraftState, draft_engine
+from app.services.hero_relation_service import RelationIndex, derive_relations
+
+POOL_SIZES = [20, 50, 100, 200, 400]
+ROUNDS = 20
+
+
+def make_heroes(size, rng):
+    """
+    生成随机英雄（每个英雄克制3个、被3个英雄克制）
+    """
+    names = [f"英雄{i}" for i in range(size)]
+    return [
+        SimpleNamespace(
+            id=i + 1,
+            name=name,
+            position=rng.choice(POSITIONS),
+            win_rate=rng.uniform(0.45, 0.55),
+            ban_rate=rng.uniform(0.0, 0.4),
+            counter_heroes=rng.sample(names, 3),
+            countered_by_heroes=rng.sample(names, 3)
+        )
+        for i, name in enumerate(names)
+    ]
+
+
+def make_relations(heroes):
+    """
+    由随机英雄的克制列表生成英雄关系邻接索引
+    """
+    relations = derive_relations(
+        (hero.id, hero.name, hero.counter_heroes, hero.countered_by_heroes) for hero in heroes
+    )
+    return RelationIndex(
+        1,
+        [(hero.id, hero.name, hero.position) for hero in heroes],
+        [(hero_id, target_id, weight) for (hero_id, target_id, _), weight in relations.items()]
+    )
+
+
+rng = random.Random(42)
+print(f"{'英雄池':>6} {'平均耗时(ms)':>12} {'最大耗时(ms)':>12} {'平均深度':>8} {'平均节点':>8} {'超时次数':>8}")
+for size in POOL_SIZES:
+    heroes = make_heroes(size, rng)
+    matrix = CounterMatrix(1, heroes, make_relations(heroes))
+    elapsed, depths, nodes, timeouts = [], [], [], 0
+    for _ in range(ROUNDS):
+        # 随机的选人进度
+        picked = rng.sample(matrix.names, rng.randint(0, 6))
+        state = DraftState.from_names(matrix, picked[0::2], picked[1::2], rng.sample(matrix.names, 4))
+
+        started = time.perf_counter()
+        result = draft_engine.search(state, first_pick=rng.random() < 0.5)
+        elapsed.append((time.perf_counter() - started) * 1000)
+        depths.append(result.depth)
+        nodes.append(result.nodes)
+        timeouts += not result.complete
+
+    print(
+        f"{size:>6} {sum(elapsed) / ROUNDS:>12.2f} {max(elapsed):>12.2f} "
+        f"{sum(depths) / ROUNDS:>8.1f} {sum(nodes) / ROUNDS:>8.0f} {timeouts:>8}"
+    )
@@ -0,0 +1,81 @@
+"""
+检查BP建议的数据库查询次数
+
+BP建议按名称批量查找双方英雄：
+    - 英雄目录未加载时，无论阵容多大都只执行1次查询
+    - 英雄目录已加载时不查询数据库
+    - counter英雄推荐使用启动时加载的英雄关系索引，不查询数据库
+
+运行方式（在backend目录下）:
+    python scripts/check_bp_queries.py
+"""
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+
+from app.core.database import SessionLocal, engine, init_db
+from app.models.hero import Hero
+from app.services.hero_catalog import hero_catalog
+from app.services.hero_relation_service import hero_relation_service
+from app.services.hero_service import HeroService
+
+# 记录执行的SQL语句
+statements = []
+
+
+def count_statement(conn, cursor, statement, parameters, context, executemany):
+    statements.append(statement)
+
+
+def count_queries(our_heroes, enemy_heroes, db):
+    """
+    调用BP建议，返回执行的查询次数
+    """
+    statements.clear()
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        hero_service.get_bp_suggestion(our_heroes, enemy_heroes, db)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+    return len(statements)
+
+
+hero_service = HeroService()
+
+init_db()
+db = SessionLocal()
+try:
+    names = [name for (name,) in db.query(Hero.name).order_by(Hero.id).limit(10).all()]
+    if len(names) < 2:
+        print("英雄数据不足，请先运行 import_real_hero_data.py")
+        sys.exit(1)
+
+    failed = False
+
+    # 英雄关系索引与应用启动时一样预先加载
+    hero_relation_service.load(db)
+
+    # 英雄目录未加载：每种阵容大小都只查询1次
+    hero_catalog._snapshot = None
+    for size in range(1, len(names) // 2 + 1):
+        count = count_queries(names[:size], names[-size:], db)
+        print(f"目录未加载 双方各{size}个英雄: {count}次查询")
+        if count > 1:
+            failed = True
+
+    # 英雄目录已加载：不查询数据库
+    hero_catalog.load(db)
+    count = count_queries(names[:5], names[-5:] + ["不存在的英雄"], db)
+    print(f"目录已加载 双方各5个英雄: {count}次查询")
+    if count != 0:
+        failed = True
+
+    if failed:
+        print("检查失败：BP建议存在逐个英雄查询")
+        sys.exit(1)
+    print("检查通过")
+finally:
+    db.close()
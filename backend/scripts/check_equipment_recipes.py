@@ -0,0 +1,96 @@
+"""
+检查随仓库发布的装备数据能否用于升级路线和出装优化
+
+读取database/hero_data.json中的装备（不访问数据库），构建装备合成图后检查：
+    - 所有build_from/build_into引用的装备都存在，没有被忽略的合成关系
+    - 每件大件装备都有配件，且价格不低于配件价格之和
+    - 默认出装中的每件装备，金币不够买下整件时，升级路线会先购买买得起的配件
+    - 默认出装在不同金币预算下的优化结果不超出预算，金币够买下任意一件目标装备时结果不为空
+
+运行方式（在backend目录下）:
+    python scripts/check_equipment_recipes.py [数据文件]
+"""
+import sys
+import os
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.equipment_graph import EquipmentGraph
+from app.services.build_optimizer import build_optimizer
+from app.services.hero_data_loader import load_data_file
+
+# 默认数据文件: 仓库根目录下的database/hero_data.json
+DATA_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "database", "hero_data.json"
+)
+
+BUDGETS = [300, 800, 1500, 3000, 6000]
+
+data = load_data_file(sys.argv[1] if len(sys.argv) > 1 else DATA_FILE)
+equipments = [
+    SimpleNamespace(
+        id=k + 1,
+        name=item["name"],
+        price=item.get("price"),
+        stats=item.get("stats"),
+        build_from=item.get("build_from"),
+        build_into=item.get("build_into")
+    )
+    for k, item in enumerate(data.get("equipments", []))
+]
+graph = EquipmentGraph(1, equipments)
+failed = False
+
+# 合成关系
+for eq in equipments:
+    for ref in (eq.build_from or []) + (eq.build_into or []):
+        if graph._resolve(ref) is None:
+            print(f"FAIL {eq.name}: 合成关系引用了不存在的装备 {ref}")
+            failed = True
+
+components = {c for items in graph.components for c in items}
+finals = [i for i in range(len(equipments)) if i not in components]
+for i in finals:
+    name, price = graph.names[i], graph.prices[i]
+    parts = graph.components[i]
+    if not parts:
+        print(f"FAIL {name}: 没有配件，金币不够时无法规划购买")
+        failed = True
+    elif sum(graph.prices[c] for c in parts) > price:
+        print(f"FAIL {name}: 配件价格之和高于装备价格")
+        failed = True
+print(f"装备 {len(equipments)} 件，大件 {len(finals)} 件，配件 {len(components)} 件")
+
+# 默认出装: 升级路线和出装优化
+for position, builds in data.get("default_builds", {}).items():
+    for build in builds:
+        targets = [item["name"] for item in build.get("equipment_list", [])]
+        for name in targets:
+            i = graph.index.get(name)
+            if i is None or not graph.components[i]:
+                continue
+            cheapest_part = min(graph.prices[c] for c in graph.components[i])
+            plan = graph.plan([name], [], gold=graph.prices[i] - 1)
+            if not plan.purchases and cheapest_part < graph.prices[i]:
+                print(f"FAIL {position} {name}: 金币不够买下整件时没有购买配件")
+                failed = True
+
+        known = [graph.index[name] for name in targets if name in graph.index]
+        cheapest = min((graph.total_costs[i] for i in known), default=0)
+        for gold in BUDGETS:
+            result = build_optimizer.optimize(graph, targets, gold)
+            if result.unknown:
+                print(f"FAIL {position}: 出装中的装备不存在 {result.unknown}")
+                failed = True
+            if result.spent > gold:
+                print(f"FAIL {position} {gold}: 花费超出预算")
+                failed = True
+            if not result.purchases and gold >= cheapest:
+                print(f"FAIL {position} {gold}: 优化结果为空")
+                failed = True
+            print(f"{position:>8} {gold:>6}金币: " + "、".join(p.name for p in result.purchases) + f"（花费 {result.spent}）")
+
+if failed:
+    sys.exit(1)
+print("OK")
@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal, init_db
+from app.models.hero import HeroDataVersion
+from app.services.hero_version_service import hero_version_service
+
+
+def list_versions(db):
+    versions = db.query(HeroDataVersion).order_by(HeroDataVersion.id.desc()).limit(20).all()
+    if not versions:
+        print("还没有英雄数据版本")
+        return
+
+    for version in versions:
+        marker = "*" if version.status == "active" else " "
+        print(
+            f"{marker} 版本 {version.id}  {version.status:<10}  {version.source or '-'}  "
+            f"英雄 {version.hero_count}  新增 {len(version.added or [])}  修改 {len(version.changed or [])}  "
+            f"删除 {len(version.removed or [])}  生效时间 {version.activated_at or '-'}"
+        )
+
+
+def activate(db, version_id: int):
+    diff = hero_version_service.activate(db, version_id)
+    print(f"✓ 英雄数据版本 {version_id} 已生效：{diff.summary()}")
+    print("运行中的应用会在下次检查英雄数据时只更新变化的英雄")
+
+
+if __name__ == "__main__":
+    init_db()
+    db = SessionLocal()
+    try:
+        if len(sys.argv) > 2 and sys.argv[1] == "activate":
+            activate(db, int(sys.argv[2]))
+        else:
+            list_versions(db)
+    except Exception as e:
+        print(f"✗ 操作失败：{e}")
+        db.rollback()
+    finally:
+        db.close()
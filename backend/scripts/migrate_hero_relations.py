@@ -0,0 +1,26 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal, init_db
+from app.models.hero import HeroRelation
+from app.services.hero_relation_service import hero_relation_service
+
+
+def migrate(db):
+    added, updated, removed = hero_relation_service.rebuild(db)
+    total = db.query(HeroRelation).count()
+    print(f"✓ 英雄克制关系已迁移：新增 {added}，更新权重 {updated}，删除 {removed}，共 {total} 条")
+    print("运行中的应用会在下次检查英雄数据时重新加载克制关系")
+
+
+if __name__ == "__main__":
+    init_db()
+    db = SessionLocal()
+    try:
+        migrate(db)
+    except Exception as e:
+        print(f"✗ 迁移失败：{e}")
+        db.rollback()
+    finally:
+        db.close()
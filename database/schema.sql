@@ -47,7 +47,8 @@ CREATE TABLE IF NOT EXISTS hero_equipments (
     version VARCHAR(20),
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (hero_id) REFERENCES heroes(id) ON DELETE CASCADE,
-    INDEX idx_hero_id (hero_id)
+    INDEX idx_hero_id (hero_id),
+    INDEX idx_hero_equipments_hero_rank (hero_id, rank)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 CREATE TABLE IF NOT EXISTS hero_inscriptions (
@@ -61,7 +62,58 @@ CREATE TABLE IF NOT EXISTS hero_inscriptions (
     version VARCHAR(20),
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (hero_id) REFERENCES heroes(id) ON DELETE CASCADE,
-    INDEX idx_hero_id (hero_id)
+    INDEX idx_hero_id (hero_id),
+    INDEX idx_hero_inscriptions_hero_rank (hero_id, rank)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS hero_build_recommendations (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    hero_id INT NOT NULL,
+    rank VARCHAR(20) NOT NULL,
+    position VARCHAR(20) NOT NULL DEFAULT '',
+    equipment JSON,
+    inscriptions JSON,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (hero_id) REFERENCES heroes(id) ON DELETE CASCADE,
+    UNIQUE INDEX idx_hero_build_recommendations_key (hero_id, rank, position)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS hero_data_versions (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    previous_id INT,
+    status VARCHAR(20) NOT NULL DEFAULT 'staged',
+    source VARCHAR(100),
+    hero_count INT DEFAULT 0,
+    added JSON,
+    changed JSON,
+    removed JSON,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    activated_at DATETIME,
+    INDEX idx_status (status)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS hero_revisions (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    version_id INT NOT NULL,
+    hero_name VARCHAR(50) NOT NULL,
+    content_hash VARCHAR(64) NOT NULL,
+    data JSON,
+    FOREIGN KEY (version_id) REFERENCES hero_data_versions(id) ON DELETE CASCADE,
+    UNIQUE INDEX idx_hero_revisions_version_name (version_id, hero_name)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS hero_relations (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    hero_id INT NOT NULL,
+    target_id INT NOT NULL,
+    relation VARCHAR(20) NOT NULL DEFAULT 'counters',
+    weight FLOAT NOT NULL DEFAULT 1,
+    source VARCHAR(20),
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (hero_id) REFERENCES heroes(id) ON DELETE CASCADE,
+    FOREIGN KEY (target_id) REFERENCES heroes(id) ON DELETE CASCADE,
+    UNIQUE INDEX idx_hero_relations_key (hero_id, target_id, relation),
+    INDEX idx_hero_relations_target (target_id, relation)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 CREATE TABLE IF NOT EXISTS equipments (
@@ -125,6 +177,27 @@ CREATE TABLE IF NOT EXISTS matches (
     INDEX idx_created_at (created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+CREATE TABLE IF NOT EXISTS hero_match_stats (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    hero_name VARCHAR(50) NOT NULL,
+    rank VARCHAR(50) NOT NULL,
+    position VARCHAR(20) NOT NULL DEFAULT '',
+    games INT NOT NULL DEFAULT 0,
+    wins INT NOT NULL DEFAULT 0,
+    kills INT NOT NULL DEFAULT 0,
+    deaths INT NOT NULL DEFAULT 0,
+    assists INT NOT NULL DEFAULT 0,
+    gold INT NOT NULL DEFAULT 0,
+    damage INT NOT NULL DEFAULT 0,
+    damage_taken INT NOT NULL DEFAULT 0,
+    healing INT NOT NULL DEFAULT 0,
+    duration INT NOT NULL DEFAULT 0,
+    kda FLOAT NOT NULL DEFAULT 0.0,
+    participation_rate FLOAT NOT NULL DEFAULT 0.0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    UNIQUE INDEX idx_hero_match_stats_key (hero_name, rank, position)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 CREATE TABLE IF NOT EXISTS analyses (
     id VARCHAR(50) PRIMARY KEY,
     match_id VARCHAR(50) NOT NULL,
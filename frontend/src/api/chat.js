@@ -13,6 +13,21 @@ export function sendMessage(data) {
   })
 }
 
+/**
+ * 查询回答凭据（获取后台生成的完整回答）
+ * @param {string} ticketId - 回答凭据ID
+ * @param {number} wait - 最长等待秒数（长轮询），默认为0立即返回
+ * @returns {Promise} 返回请求的Promise对象
+ */
+export function getAnswerTicket(ticketId, wait = 0) {
+  return request({
+    url: `/api/v1/chat/ticket/${ticketId}`,
+    method: 'get',
+    params: { wait },
+    timeout: (wait + 5) * 1000
+  })
+}
+
 /**
  * 获取聊天历史记录
  * @param {string} userId - 用户ID
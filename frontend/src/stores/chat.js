@@ -1,6 +1,6 @@
 import { defineStore } from 'pinia'
 import { ref } from 'vue'
-import { sendMessage, getChatHistory, clearChatHistory } from '@/api/chat'
+import { sendMessage, getChatHistory, clearChatHistory, getAnswerTicket } from '@/api/chat'
 
 export const useChatStore = defineStore('chat', () => {
   const messages = ref([])
@@ -44,6 +44,11 @@ export const useChatStore = defineStore('chat', () => {
       
       currentIntent.value = response.intent
       
+      // 快速回答：后台继续生成完整回答，完成后替换当前消息
+      if (response.ticket_id && !response.is_final) {
+        upgradeAnswer(messages.value[messages.value.length - 1], response.ticket_id)
+      }
+      
       return response
     } catch (error) {
       messages.value.push({
@@ -57,6 +62,26 @@ export const useChatStore = defineStore('chat', () => {
     }
   }
   
+  // 长轮询回答凭据：每次最多等待30秒，仍在生成时继续查询（凭据保留10分钟）
+  const TICKET_WAIT_SECONDS = 30
+  const TICKET_MAX_POLLS = 20
+  
+  async function upgradeAnswer(message, ticketId) {
+    try {
+      for (let poll = 0; poll < TICKET_MAX_POLLS; poll++) {
+        const ticket = await getAnswerTicket(ticketId, TICKET_WAIT_SECONDS)
+        if (ticket.status === 'pending') continue
+        // completed: 完整回答；failed: 服务端给出的最终回答（不带"生成中"提示）
+        if (ticket.response) {
+          message.content = ticket.response
+        }
+        return
+      }
+    } catch (error) {
+      console.error('获取完整回答失败', error)
+    }
+  }
+  
   async function loadHistory() {
     try {
       const userId = localStorage.getItem('user_id')